@@ -160,6 +160,13 @@ if 'loc_cache' not in CACHES:
         'LOCATION': 'edx_location_mem_cache',
     }
 
+CONFIGURATION_MODEL_SNAPSHOT_TIMEOUT = ENV_TOKENS.get(
+    'CONFIGURATION_MODEL_SNAPSHOT_TIMEOUT', CONFIGURATION_MODEL_SNAPSHOT_TIMEOUT
+)
+COURSE_STRUCTURE_LOCAL_CACHE_SIZE = ENV_TOKENS.get(
+    'COURSE_STRUCTURE_LOCAL_CACHE_SIZE', COURSE_STRUCTURE_LOCAL_CACHE_SIZE
+)
+
 SESSION_COOKIE_DOMAIN = ENV_TOKENS.get('SESSION_COOKIE_DOMAIN')
 SESSION_COOKIE_HTTPONLY = ENV_TOKENS.get('SESSION_COOKIE_HTTPONLY', True)
 SESSION_ENGINE = ENV_TOKENS.get('SESSION_ENGINE', SESSION_ENGINE)
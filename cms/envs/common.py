@@ -72,6 +72,12 @@ from lms.envs.common import (
     # Enable or disable theming
     ENABLE_COMPREHENSIVE_THEMING,
 
+    # ConfigurationModel snapshots
+    CONFIGURATION_MODEL_SNAPSHOT_TIMEOUT,
+
+    # In-process cache of split modulestore course structures
+    COURSE_STRUCTURE_LOCAL_CACHE_SIZE,
+
     # constants for redirects app
     REDIRECT_CACHE_TIMEOUT,
     REDIRECT_CACHE_KEY_PREFIX,
@@ -463,6 +469,10 @@ CODE_JAIL = {
         # How many CPU seconds can jailed code use?
         'CPU': 1,
     },
+
+    # How many sandboxes each process keeps started and waiting to run
+    # Python code for capa problems.  Zero starts a sandbox for each run.
+    'warm_sandboxes': 0,
 }
 
 ############################ DJANGO_BUILTINS ################################
@@ -18,6 +18,7 @@ from openedx.core.lib.xblock_utils import xblock_local_resource_url
 
 import xmodule.x_module
 import cms.lib.xblock.runtime
+from capa.safe_exec.sandbox_pool import SANDBOX_POOL
 
 from startup_configurations.validate_config import validate_cms_config
 from openedx.core.djangoapps.theming.core import enable_theming
@@ -42,6 +43,9 @@ def run():
 
     add_mimetypes()
 
+    # Keep sandboxes waiting to run the Python code of capa problems.
+    SANDBOX_POOL.configure(settings.CODE_JAIL.get('warm_sandboxes', 0))
+
     # In order to allow descriptors to use a handler url, we need to
     # monkey-patch the x_module library.
     # TODO: Remove this code when Runtimes are no longer created by modulestores
@@ -1,6 +1,12 @@
 """
 Django Model baseclass for database-backed configuration.
 """
+from collections import namedtuple
+import copy
+import time
+from uuid import uuid4
+
+from django.conf import settings
 from django.db import connection, models
 from django.contrib.auth.models import User
 from django.core.cache import caches, InvalidCacheBackendError
@@ -15,6 +21,31 @@ except InvalidCacheBackendError:
     from django.core.cache import cache
 
 
+# A process-local copy of a current configuration entry, valid until
+# `expiration` as long as the model's cached version equals `version`.
+Snapshot = namedtuple('Snapshot', ['expiration', 'version', 'value'])
+
+# Snapshots of current configuration entries, keyed by model name and then
+# by cache key name.
+_snapshots = {}  # pylint: disable=invalid-name
+
+
+def get_snapshot_timeout():
+    """
+    Returns the number of seconds a process reuses a snapshot of a current
+    configuration entry before checking the cache for a newer version of
+    the model.  0 means snapshots are not used.
+    """
+    return getattr(settings, 'CONFIGURATION_MODEL_SNAPSHOT_TIMEOUT', 0)
+
+
+def clear_snapshots():
+    """
+    Discards the snapshots of all configuration models in this process.
+    """
+    _snapshots.clear()
+
+
 class ConfigurationModelManager(models.Manager):
     """
     Query manager for ConfigurationModel
@@ -111,6 +142,9 @@ class ConfigurationModel(models.Model):
         cache.delete(self.cache_key_name(*[getattr(self, key) for key in self.KEY_FIELDS]))
         if self.KEY_FIELDS:
             cache.delete(self.key_values_cache_key_name())
+        # Invalidate the snapshots of this model in all processes.
+        cache.set(self.version_cache_key_name(), uuid4().hex, None)
+        _snapshots.pop(type(self).__name__, None)
 
     @classmethod
     def cache_key_name(cls, *args):
@@ -124,26 +158,102 @@ class ConfigurationModel(models.Model):
         else:
             return 'configuration/{}/current'.format(cls.__name__)
 
+    @classmethod
+    def version_cache_key_name(cls):
+        """Return the name of the key to use to cache the version of this configuration"""
+        return 'configuration/{}/version'.format(cls.__name__)
+
     @classmethod
     def current(cls, *args):
         """
-        Return the active configuration entry, either from cache,
-        from the database, or by creating a new empty entry (which is not
-        persisted).
+        Return the active configuration entry, either from a snapshot, from
+        cache, from the database, or by creating a new empty entry (which is
+        not persisted).
         """
-        cached = cache.get(cls.cache_key_name(*args))
-        if cached is not None:
-            return cached
+        cache_key = cls.cache_key_name(*args)
+        snapshot_timeout = get_snapshot_timeout()
+        if not snapshot_timeout:
+            cached = cache.get(cache_key)
+            if cached is not None:
+                return cached
+            return cls._current_from_db(cache_key, *args)
+
+        model_snapshots = _snapshots.setdefault(cls.__name__, {})
+        snapshot = model_snapshots.get(cache_key)
+        now = time.time()
+        if snapshot is not None and snapshot.expiration > now:
+            return copy.copy(snapshot.value)
+
+        version_key = cls.version_cache_key_name()
+        cached_values = cache.get_many([cache_key, version_key])
+        version = cached_values.get(version_key)
+        # Without a cached version, as after it's evicted, there's no telling
+        # whether the snapshot is still current.
+        if snapshot is not None and version is not None and snapshot.version == version:
+            current = snapshot.value
+        else:
+            current = cached_values.get(cache_key)
+            if current is None:
+                current = cls._current_from_db(cache_key, *args)
+
+        model_snapshots[cache_key] = Snapshot(now + snapshot_timeout, version, current)
+        return copy.copy(current)
 
+    @classmethod
+    def _current_from_db(cls, cache_key, *args):
+        """
+        Return the active configuration entry from the database, or a new
+        empty entry, and cache it under cache_key.
+        """
         key_dict = dict(zip(cls.KEY_FIELDS, args))
         try:
             current = cls.objects.filter(**key_dict).order_by('-change_date')[0]
         except IndexError:
             current = cls(**key_dict)
 
-        cache.set(cls.cache_key_name(*args), current, cls.cache_timeout)
+        cache.set(cache_key, current, cls.cache_timeout)
         return current
 
+    @classmethod
+    def preload(cls):
+        """
+        Load the active configuration entries for all combinations of
+        KEY_FIELDS with a single query, and cache them so that subsequent
+        calls to `current` for any of these combinations don't query the
+        database.
+
+        Returns a dict of the entries, keyed by their tuple of KEY_FIELDS
+        values.
+        """
+        if not cls.KEY_FIELDS:
+            return {(): cls.current()}
+
+        # Read the version first, so that changes saved while loading the
+        # entries invalidate their snapshots.  Snapshots are only reused
+        # along with a cached version, so set one if there's none.
+        version_key = cls.version_cache_key_name()
+        version = cache.get(version_key)
+        if version is None:
+            version = uuid4().hex
+            cache.set(version_key, version, None)
+        entries = {
+            tuple(getattr(entry, key) for key in cls.KEY_FIELDS): entry
+            for entry in cls.objects.current_set()
+        }
+        cache.set_many(
+            {cls.cache_key_name(*key_values): entry for key_values, entry in entries.iteritems()},
+            cls.cache_timeout,
+        )
+
+        snapshot_timeout = get_snapshot_timeout()
+        if snapshot_timeout:
+            expiration = time.time() + snapshot_timeout
+            _snapshots.setdefault(cls.__name__, {}).update({
+                cls.cache_key_name(*key_values): Snapshot(expiration, version, entry)
+                for key_values, entry in entries.iteritems()
+            })
+        return entries
+
     @classmethod
     def is_enabled(cls, *key_fields):
         """
@@ -6,13 +6,15 @@ Tests of ConfigurationModel
 import ddt
 from django.contrib.auth.models import User
 from django.db import models
+from django.core.cache.backends.locmem import LocMemCache
 from django.test import TestCase
+from django.test.utils import override_settings
 from rest_framework.test import APIRequestFactory
 
 from freezegun import freeze_time
 
 from mock import patch, Mock
-from config_models.models import ConfigurationModel
+from config_models.models import ConfigurationModel, clear_snapshots
 from config_models.views import ConfigurationModelCurrentAPIView
 
 
@@ -415,6 +417,106 @@ class KeyedConfigurationModelTests(TestCase):
         self.assertFalse(ExampleKeyedConfig.equal_to_current({}))
 
 
+@override_settings(CONFIGURATION_MODEL_SNAPSHOT_TIMEOUT=60)
+class ConfigurationModelSnapshotTests(TestCase):
+    """
+    Tests of the process-local snapshots of ``ConfigurationModels``.
+    """
+    def setUp(self):
+        super(ConfigurationModelSnapshotTests, self).setUp()
+        self.user = User()
+        self.user.save()
+
+        self.cache = Mock(wraps=LocMemCache('config-models-snapshot-tests', {}))
+        patcher = patch('config_models.models.cache', self.cache)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        clear_snapshots()
+        self.addCleanup(clear_snapshots)
+
+    def test_snapshot_reused(self):
+        ExampleConfig(changed_by=self.user, string_field='first').save()
+        self.assertEquals(ExampleConfig.current().string_field, 'first')
+
+        self.cache.reset_mock()
+        with self.assertNumQueries(0):
+            current = ExampleConfig.current()
+        self.assertEquals(current.string_field, 'first')
+        self.assertEquals(self.cache.mock_calls, [])
+
+    def test_snapshot_is_copied(self):
+        ExampleConfig(changed_by=self.user, string_field='first').save()
+        ExampleConfig.current().string_field = 'changed'
+        self.assertEquals(ExampleConfig.current().string_field, 'first')
+
+    def test_save_invalidates_snapshot(self):
+        ExampleConfig(changed_by=self.user, string_field='first').save()
+        self.assertEquals(ExampleConfig.current().string_field, 'first')
+
+        ExampleConfig(changed_by=self.user, string_field='second').save()
+        self.assertEquals(ExampleConfig.current().string_field, 'second')
+
+    def test_save_in_other_process(self):
+        with freeze_time('2016-01-01 00:00:00'):
+            ExampleConfig(changed_by=self.user, string_field='first').save()
+            self.assertEquals(ExampleConfig.current().string_field, 'first')
+
+        with freeze_time('2016-01-01 00:00:30'):
+            # Another process saves a new entry, without touching this process's snapshots.
+            ExampleConfig.objects.bulk_create([ExampleConfig(changed_by=self.user, string_field='second')])
+            self.cache.delete(ExampleConfig.cache_key_name())
+            self.cache.set(ExampleConfig.version_cache_key_name(), 'other-version', None)
+
+            self.assertEquals(ExampleConfig.current().string_field, 'first')
+
+        with freeze_time('2016-01-01 00:01:01'):
+            self.assertEquals(ExampleConfig.current().string_field, 'second')
+
+    def test_expired_snapshot_with_same_version(self):
+        with freeze_time('2016-01-01 00:00:00'):
+            ExampleConfig(changed_by=self.user, string_field='first').save()
+            self.assertEquals(ExampleConfig.current().string_field, 'first')
+
+        self.cache.reset_mock()
+        with freeze_time('2016-01-01 00:01:01'):
+            with self.assertNumQueries(0):
+                self.assertEquals(ExampleConfig.current().string_field, 'first')
+        self.assertEquals(self.cache.get_many.call_count, 1)
+        self.assertFalse(self.cache.set.called)
+
+    def test_preload(self):
+        ExampleKeyedConfig(left='left_a', right='right_a', string_field='a', changed_by=self.user).save()
+        ExampleKeyedConfig(left='left_b', right='right_b', string_field='b', changed_by=self.user).save()
+        ExampleKeyedConfig(left='left_b', right='right_b', string_field='b2', changed_by=self.user).save()
+        ExampleKeyedConfig(left='left_c', right='right_c', string_field='c', changed_by=self.user).save()
+
+        with self.assertNumQueries(1):
+            entries = ExampleKeyedConfig.preload()
+        self.assertEquals(set(entries), {('left_a', 'right_a'), ('left_b', 'right_b'), ('left_c', 'right_c')})
+
+        # The entries are read from the snapshots, and from the cache once the snapshots are gone.
+        for _ in range(2):
+            with self.assertNumQueries(0):
+                self.assertEquals(ExampleKeyedConfig.current('left_a', 'right_a').string_field, 'a')
+                self.assertEquals(ExampleKeyedConfig.current('left_b', 'right_b').string_field, 'b2')
+                self.assertEquals(ExampleKeyedConfig.current('left_c', 'right_c').string_field, 'c')
+            clear_snapshots()
+
+    def test_expired_snapshot_without_version(self):
+        with freeze_time('2016-01-01 00:00:00'):
+            ExampleConfig(changed_by=self.user, string_field='first').save()
+            self.assertEquals(ExampleConfig.current().string_field, 'first')
+
+        with freeze_time('2016-01-01 00:00:30'):
+            # Another process saves a new entry, and the version is evicted from the cache.
+            ExampleConfig.objects.bulk_create([ExampleConfig(changed_by=self.user, string_field='second')])
+            self.cache.delete(ExampleConfig.cache_key_name())
+            self.cache.delete(ExampleConfig.version_cache_key_name())
+
+        with freeze_time('2016-01-01 00:01:01'):
+            self.assertEquals(ExampleConfig.current().string_field, 'second')
+
+
 @ddt.ddt
 class ConfigurationModelAPITests(TestCase):
     """
@@ -2,12 +2,16 @@
 Middleware to serve assets.
 """
 
+import calendar
 import logging
 import datetime
+from uuid import uuid4
+
 import newrelic.agent
 from django.http import (
     HttpResponse, HttpResponseNotModified, HttpResponseForbidden,
     HttpResponseBadRequest, HttpResponseNotFound, HttpResponsePermanentRedirect)
+from django.utils.http import parse_etags, parse_http_date_safe, quote_etag
 from student.models import CourseEnrollment
 from contentserver.models import CourseAssetCacheTtlConfig, CdnUserAgentsConfig
 
@@ -102,24 +106,22 @@ class StaticContentServer(object):
 
             # Figure out if the client sent us a conditional request, and let them know
             # if this asset has changed since then.
-            last_modified_at_str = content.last_modified_at.strftime(HTTP_DATE_FORMAT)
-            if 'HTTP_IF_MODIFIED_SINCE' in request.META:
-                if_modified_since = request.META['HTTP_IF_MODIFIED_SINCE']
-                if if_modified_since == last_modified_at_str:
-                    return HttpResponseNotModified()
+            if self.is_not_modified(request, content):
+                newrelic.agent.add_custom_parameter('contentserver.not_modified', True)
+                response = HttpResponseNotModified()
+                self.set_caching_headers(content, response)
+                return response
 
             # *** File streaming within a byte range ***
             # If a Range is provided, parse Range attribute of the request
             # Add Content-Range in the response if Range is structurally correct
             # Request -> Range attribute structure: "Range: bytes=first-[last]"
             # Response -> Content-Range attribute structure: "Content-Range: bytes first-last/totalLength"
+            # Multiple ranges are sent back as a multipart/byteranges message.
             # http://www.w3.org/Protocols/rfc2616/rfc2616-sec14.html#sec14.35
             response = None
-            if request.META.get('HTTP_RANGE'):
-                # If we have a StaticContent, get a StaticContentStream.  Can't manipulate the bytes otherwise.
-                if type(content) == StaticContent:
-                    content = AssetManager.find(loc, as_stream=True)
-
+            content_type = content.content_type
+            if request.META.get('HTTP_RANGE') and self.is_range_current(request, content):
                 header_value = request.META['HTTP_RANGE']
                 try:
                     unit, ranges = parse_range_header(header_value, content.length)
@@ -129,34 +131,42 @@ class StaticContentServer(object):
                         u"%s in Range header: %s for content: %s", exception.message, header_value, unicode(loc)
                     )
                 else:
+                    # Only ranges that lie within the content can be sent back.
+                    satisfiable_ranges = [
+                        (first, last) for first, last in ranges if 0 <= first <= last < content.length
+                    ]
+
                     if unit != 'bytes':
                         # Only accept ranges in bytes
                         log.warning(u"Unknown unit in Range header: %s for content: %s", header_value, unicode(loc))
-                    elif len(ranges) > 1:
-                        # According to Http/1.1 spec content for multiple ranges should be sent as a multipart message.
-                        # http://www.w3.org/Protocols/rfc2616/rfc2616-sec14.html#sec14.16
-                        # But we send back the full content.
+                    elif not satisfiable_ranges:
                         log.warning(
-                            u"More than 1 ranges in Range header: %s for content: %s", header_value, unicode(loc)
+                            u"Cannot satisfy ranges in Range header: %s for content: %s", header_value, unicode(loc)
+                        )
+                        response = HttpResponse(status=416)  # Requested Range Not Satisfiable
+                        response['Content-Range'] = 'bytes */{length}'.format(length=content.length)
+                        return response
+                    elif len(satisfiable_ranges) == 1:
+                        first, last = satisfiable_ranges[0]
+                        response = HttpResponse(content.stream_data_in_range(first, last))
+                        response['Content-Range'] = 'bytes {first}-{last}/{length}'.format(
+                            first=first, last=last, length=content.length
                         )
+                        response['Content-Length'] = str(last - first + 1)
+                        response.status_code = 206  # Partial Content
+
+                        newrelic.agent.add_custom_parameter('contentserver.ranged', True)
                     else:
-                        first, last = ranges[0]
-
-                        if 0 <= first <= last < content.length:
-                            # If the byte range is satisfiable
-                            response = HttpResponse(content.stream_data_in_range(first, last))
-                            response['Content-Range'] = 'bytes {first}-{last}/{length}'.format(
-                                first=first, last=last, length=content.length
-                            )
-                            response['Content-Length'] = str(last - first + 1)
-                            response.status_code = 206  # Partial Content
-
-                            newrelic.agent.add_custom_parameter('contentserver.ranged', True)
-                        else:
-                            log.warning(
-                                u"Cannot satisfy ranges in Range header: %s for content: %s", header_value, unicode(loc)
-                            )
-                            return HttpResponse(status=416)  # Requested Range Not Satisfiable
+                        # According to Http/1.1 spec content for multiple ranges should be sent as a multipart message.
+                        # http://www.w3.org/Protocols/rfc2616/rfc2616-sec14.html#sec14.16
+                        boundary = uuid4().hex
+                        body, body_length = multipart_byteranges(content, satisfiable_ranges, boundary)
+                        response = HttpResponse(body)
+                        response['Content-Length'] = str(body_length)
+                        response.status_code = 206  # Partial Content
+                        content_type = 'multipart/byteranges; boundary={boundary}'.format(boundary=boundary)
+
+                        newrelic.agent.add_custom_parameter('contentserver.ranged', True)
 
             # If Range header is absent or syntactically invalid return a full content response.
             if response is None:
@@ -168,7 +178,7 @@ class StaticContentServer(object):
 
             # "Accept-Ranges: bytes" tells the user that only "bytes" ranges are allowed
             response['Accept-Ranges'] = 'bytes'
-            response['Content-Type'] = content.content_type
+            response['Content-Type'] = content_type
 
             # Set any caching headers, and do any response cleanup needed.  Based on how much
             # middleware we have in place, there's no easy way to use the built-in Django
@@ -203,11 +213,72 @@ class StaticContentServer(object):
 
         response['Last-Modified'] = content.last_modified_at.strftime(HTTP_DATE_FORMAT)
 
+        etag = StaticContentServer.get_etag(content)
+        if etag is not None:
+            response['ETag'] = etag
+
         # Force the Vary header to only vary responses on Origin, so that XHR and browser requests get cached
         # separately and don't screw over one another. i.e. a browser request that doesn't send Origin, and
         # caches a version of the response without CORS headers, in turn breaking XHR requests.
         force_header_for_response(response, 'Vary', 'Origin')
 
+    @staticmethod
+    def get_etag(content):
+        """
+        Returns a strong entity tag for the given content, derived from its digest,
+        or None if the content has no digest.
+        """
+        content_digest = getattr(content, "content_digest", None)
+        if not content_digest:
+            return None
+        return quote_etag(content_digest)
+
+    @staticmethod
+    def is_not_modified(request, content):
+        """
+        Determines whether the conditional headers of the given request, if any,
+        indicate that the client already has the current version of the content.
+
+        If-None-Match takes precedence over If-Modified-Since, as the latter is
+        ignored when both are present.  See RFC 7232, section 6.
+        """
+        if_none_match = request.META.get('HTTP_IF_NONE_MATCH')
+        if if_none_match is not None:
+            content_digest = getattr(content, "content_digest", None)
+            if not content_digest:
+                return False
+            # GET and HEAD requests use the weak comparison, and parse_etags drops any W/ prefix.
+            requested_etags = parse_etags(if_none_match)
+            return '*' in requested_etags or content_digest in requested_etags
+
+        if_modified_since = request.META.get('HTTP_IF_MODIFIED_SINCE')
+        if if_modified_since is not None:
+            if_modified_since = parse_http_date_safe(if_modified_since)
+            # Invalid dates are ignored.  HTTP dates have a one second resolution.
+            if if_modified_since is not None:
+                return calendar.timegm(content.last_modified_at.utctimetuple()) <= if_modified_since
+
+        return False
+
+    @staticmethod
+    def is_range_current(request, content):
+        """
+        Determines whether the Range header of the given request applies to the
+        current version of the content, as indicated by its If-Range header.
+
+        If-Range must be a strong match of the entity tag, or an exact match of
+        the last modified date.  Otherwise the full content is sent back.
+        """
+        if_range = request.META.get('HTTP_IF_RANGE')
+        if if_range is None:
+            return True
+
+        if_range = if_range.strip()
+        return (
+            if_range == StaticContentServer.get_etag(content) or
+            if_range == content.last_modified_at.strftime(HTTP_DATE_FORMAT)
+        )
+
     @staticmethod
     def is_cdn_request(request):
         """
@@ -321,3 +392,40 @@ def parse_range_header(header_value, content_length):
         raise ValueError('Invalid syntax')
 
     return unit, ranges
+
+
+def multipart_byteranges(content, ranges, boundary):
+    """
+    Returns the body of a multipart/byteranges message for the given (first, last)
+    byte ranges of the content, as a tuple of an iterator over the chunks of the
+    body and the length of the body in bytes.
+
+    See spec for details: http://www.w3.org/Protocols/rfc2616/rfc2616-sec19.html#sec19.2
+    """
+    part_headers = [
+        (
+            u'\r\n--{boundary}\r\n'
+            u'Content-Type: {content_type}\r\n'
+            u'Content-Range: bytes {first}-{last}/{length}\r\n\r\n'
+        ).format(
+            boundary=boundary, content_type=content.content_type, first=first, last=last, length=content.length
+        ).encode('utf-8')
+        for first, last in ranges
+    ]
+    closing_boundary = '\r\n--{boundary}--\r\n'.format(boundary=boundary)
+
+    body_length = len(closing_boundary)
+    for part_header, (first, last) in zip(part_headers, ranges):
+        body_length += len(part_header) + last - first + 1
+
+    def stream_body():
+        """
+        Streams the body part of each range, followed by the closing boundary.
+        """
+        for part_header, (first, last) in zip(part_headers, ranges):
+            yield part_header
+            for chunk in content.stream_data_in_range(first, last):
+                yield chunk
+        yield closing_boundary
+
+    return stream_body(), body_length
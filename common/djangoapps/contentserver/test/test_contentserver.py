@@ -241,17 +241,120 @@ class ContentStoreToyCourseTest(SharedModuleStoreTestCase):
 
     def test_range_request_multiple_ranges(self):
         """
-        Test that multiple ranges in request outputs the full content.
+        Test that multiple ranges in request outputs a multipart/byteranges message
+        with a body part per range.
         """
         first_byte = self.length_unlocked / 4
         last_byte = self.length_unlocked / 2
         resp = self.client.get(self.url_unlocked, HTTP_RANGE='bytes={first}-{last}, -100'.format(
             first=first_byte, last=last_byte))
 
+        self.assertEqual(resp.status_code, 206)  # HTTP_206_PARTIAL_CONTENT
+        self.assertNotIn('Content-Range', resp)
+        self.assertTrue(resp['Content-Type'].startswith('multipart/byteranges; boundary='))
+
+        body = ''.join(resp.streaming_content) if resp.streaming else resp.content
+        self.assertEqual(resp['Content-Length'], str(len(body)))
+        self.assertIn('Content-Range: bytes {first}-{last}/{length}'.format(
+            first=first_byte, last=last_byte, length=self.length_unlocked), body)
+        self.assertIn('Content-Range: bytes {first}-{last}/{length}'.format(
+            first=self.length_unlocked - 100, last=self.length_unlocked - 1, length=self.length_unlocked), body)
+        boundary = resp['Content-Type'].split('boundary=')[1]
+        self.assertTrue(body.endswith('\r\n--{boundary}--\r\n'.format(boundary=boundary)))
+
+    def test_range_request_multiple_ranges_one_satisfiable(self):
+        """
+        Test that multiple ranges in request of which only one is satisfiable
+        outputs that range alone.
+        """
+        resp = self.client.get(self.url_unlocked, HTTP_RANGE='bytes=0-9, {first}-'.format(
+            first=self.length_unlocked))
+
+        self.assertEqual(resp.status_code, 206)  # HTTP_206_PARTIAL_CONTENT
+        self.assertEqual(resp['Content-Range'], 'bytes 0-9/{length}'.format(length=self.length_unlocked))
+        self.assertEqual(resp['Content-Length'], '10')
+
+    def test_range_request_if_range_mismatch(self):
+        """
+        Test that a range request whose If-Range doesn't match the current version
+        of the asset outputs the full content.
+        """
+        resp = self.client.get(self.url_unlocked, HTTP_RANGE='bytes=0-9', HTTP_IF_RANGE='"{}"'.format(FAKE_MD5_HASH))
+
         self.assertEqual(resp.status_code, 200)
         self.assertNotIn('Content-Range', resp)
         self.assertEqual(resp['Content-Length'], str(self.length_unlocked))
 
+    def test_range_request_if_range_match(self):
+        """
+        Test that a range request whose If-Range matches the ETag of the asset
+        outputs partial content.
+        """
+        etag = self.client.get(self.url_unlocked)['ETag']
+        resp = self.client.get(self.url_unlocked, HTTP_RANGE='bytes=0-9', HTTP_IF_RANGE=etag)
+
+        self.assertEqual(resp.status_code, 206)  # HTTP_206_PARTIAL_CONTENT
+        self.assertEqual(resp['Content-Length'], '10')
+
+    def test_etag_header_sent(self):
+        """
+        Test that the ETag of an asset is its quoted digest.
+        """
+        digest = self.contentstore.get_attr(self.unlocked_asset, 'md5')
+        resp = self.client.get(self.url_unlocked)
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp['ETag'], '"{}"'.format(digest))
+
+    @ddt.data(
+        ('{etag}', 304),
+        ('W/{etag}', 304),
+        ('"{fake}", {etag}', 304),
+        ('*', 304),
+        ('"{fake}"', 200),
+    )
+    @ddt.unpack
+    def test_if_none_match(self, header_value, expected_status_code):
+        """
+        Test that If-None-Match is evaluated against the ETag of the asset.
+        """
+        etag = self.client.get(self.url_unlocked)['ETag']
+        resp = self.client.get(
+            self.url_unlocked, HTTP_IF_NONE_MATCH=header_value.format(etag=etag, fake=FAKE_MD5_HASH)
+        )
+        self.assertEqual(resp.status_code, expected_status_code)
+        self.assertEqual(resp['ETag'], etag)
+
+    @ddt.data(
+        (datetime.timedelta(seconds=0), 304),
+        (datetime.timedelta(days=1), 304),
+        (datetime.timedelta(days=-1), 200),
+    )
+    @ddt.unpack
+    def test_if_modified_since(self, offset, expected_status_code):
+        """
+        Test that If-Modified-Since dates on or after the last modification of
+        the asset output 304 Not Modified.
+        """
+        last_modified = datetime.datetime.strptime(
+            self.client.get(self.url_unlocked)['Last-Modified'], HTTP_DATE_FORMAT
+        )
+        resp = self.client.get(
+            self.url_unlocked, HTTP_IF_MODIFIED_SINCE=(last_modified + offset).strftime(HTTP_DATE_FORMAT)
+        )
+        self.assertEqual(resp.status_code, expected_status_code)
+
+    def test_if_none_match_takes_precedence(self):
+        """
+        Test that If-Modified-Since is ignored when If-None-Match is present.
+        """
+        last_modified = self.client.get(self.url_unlocked)['Last-Modified']
+        resp = self.client.get(
+            self.url_unlocked,
+            HTTP_IF_NONE_MATCH='"{}"'.format(FAKE_MD5_HASH),
+            HTTP_IF_MODIFIED_SINCE=last_modified,
+        )
+        self.assertEqual(resp.status_code, 200)
+
     @ddt.data(
         'bytes 0-',
         'bits=0-',
@@ -0,0 +1,92 @@
+"""
+Per-enrollment data of the learner dashboard, loaded in bulk.
+
+Rather than querying each source once per enrollment, DashboardData loads
+the certificate statuses and the redeemed registration codes of all the
+enrollments shown on a user's dashboard at once, with one query per
+source.  It holds plain data only, so it can be cached: when
+DASHBOARD_DATA_CACHE_TIMEOUT is set, it's cached per user for that many
+seconds, and invalidated whenever the user's enrollments, certificates or
+registration code redemptions are saved or deleted.
+
+The time spent in each section of the dashboard is reported to datadog
+with dashboard_section_timer.
+"""
+from django.conf import settings
+from django.core.cache import cache
+
+import dogstats_wrapper as dog_stats_api
+from certificates.models import certificate_statuses_for_student
+from shoppingcart.models import CourseRegistrationCode
+from student.models import DASHBOARD_DATA_CACHE_KEY
+
+
+def dashboard_section_timer(section):
+    """
+    Returns a context manager timing the given section of the dashboard,
+    reported as the student.dashboard.section metric.
+    """
+    return dog_stats_api.timer('student.dashboard.section', tags=[u'section:{}'.format(section)])
+
+
+def get_dashboard_data(user, course_enrollments):
+    """
+    Returns the DashboardData of the given enrollments of the user, from
+    the cache if it's enabled and holds the data of the same courses.
+    """
+    course_ids = frozenset(enrollment.course_id for enrollment in course_enrollments)
+    cache_timeout = getattr(settings, 'DASHBOARD_DATA_CACHE_TIMEOUT', 0)
+    cache_key = DASHBOARD_DATA_CACHE_KEY.format(user_id=user.id)
+
+    if cache_timeout:
+        dashboard_data = cache.get(cache_key)
+        if dashboard_data is not None and dashboard_data.course_ids == course_ids:
+            return dashboard_data
+
+    dashboard_data = DashboardData.load(user, course_ids)
+    if cache_timeout:
+        cache.set(cache_key, dashboard_data, cache_timeout)
+    return dashboard_data
+
+
+class DashboardData(object):
+    """
+    Data of a user's enrollments shown on the dashboard that's loaded in
+    bulk.
+
+    Attributes:
+        course_ids (frozenset): The keys of the courses the data is for.
+        certificate_statuses (dict): Maps each course key to the status of
+            the user's certificate in the course, as returned by
+            certificate_status_for_student.
+        unpaid_course_ids (frozenset): The keys of the courses in which
+            the user redeemed a registration code generated for an invoice
+            that isn't valid.
+    """
+
+    def __init__(self, course_ids, certificate_statuses, unpaid_course_ids):
+        self.course_ids = course_ids
+        self.certificate_statuses = certificate_statuses
+        self.unpaid_course_ids = unpaid_course_ids
+
+    @classmethod
+    def load(cls, user, course_ids):
+        """
+        Loads the DashboardData of the given courses for the user.
+        """
+        with dashboard_section_timer('certificate_statuses'):
+            certificate_statuses = certificate_statuses_for_student(user, course_ids)
+
+        with dashboard_section_timer('registration_codes'):
+            # Registration codes may be generated via the Bulk Purchase
+            # Scenario, only the codes generated for an invoice are checked.
+            unpaid_course_ids = frozenset(
+                CourseRegistrationCode.objects.filter(
+                    course_id__in=course_ids,
+                    registrationcoderedemption__redeemed_by=user,
+                    invoice_item__isnull=False,
+                    invoice_item__invoice__is_valid=False,
+                ).values_list('course_id', flat=True)
+            )
+
+        return cls(course_ids, certificate_statuses, unpaid_course_ids)
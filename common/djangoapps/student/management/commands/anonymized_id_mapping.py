@@ -13,7 +13,7 @@ import csv
 from django.contrib.auth.models import User
 from django.core.management.base import BaseCommand, CommandError
 
-from student.models import anonymous_id_for_user
+from student.models import anonymous_ids_for_users
 from opaque_keys.edx.locations import SlashSeparatedCourseKey
 
 
@@ -48,6 +48,9 @@ class Command(BaseCommand):
             self.stdout.write("No students enrolled in %s" % course_key.to_deprecated_string())
             return
 
+        anonymous_ids = anonymous_ids_for_users(students, None)
+        course_anonymous_ids = anonymous_ids_for_users(students, course_key)
+
         # Write mapping to output file in CSV format with a simple header
         try:
             with open(output_filename, 'wb') as output_file:
@@ -60,8 +63,8 @@ class Command(BaseCommand):
                 for student in students:
                     csv_writer.writerow((
                         student.id,
-                        anonymous_id_for_user(student, None),
-                        anonymous_id_for_user(student, course_key)
+                        anonymous_ids[student.id],
+                        course_anonymous_ids[student.id]
                     ))
         except IOError:
             raise CommandError("Error writing to file: %s" % output_filename)
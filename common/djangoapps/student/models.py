@@ -204,6 +204,80 @@ def user_by_anonymous_id(uid):
         return None
 
 
+def anonymous_ids_for_users(users, course_id, save=True):
+    """
+    Return a dict of user ids to the unique ids of the users for the
+    course, as returned by `anonymous_id_for_user`, for many users at once.
+
+    `AnonymousUser`s are skipped.  When `save` is True, the ids that
+    aren't saved yet are saved with a single bulk insert.
+    """
+    users = [user for user in users if not user.is_anonymous()]
+    digests = {user.id: anonymous_id_for_user(user, course_id, save=False) for user in users}
+    if not save or not digests:
+        return digests
+
+    stored_ids = dict(
+        AnonymousUserId.objects.filter(
+            user_id__in=digests.keys(),
+            course_id=course_id,
+        ).values_list('user_id', 'anonymous_user_id')
+    )
+    for user_id, stored_id in stored_ids.iteritems():
+        if stored_id != digests[user_id]:
+            log.error(
+                u"Stored anonymous user id %(anonymous_user_id)r for "
+                u"user %(user_id)r in course %(course_id)r doesn't match "
+                u"computed id %(digest)r", {
+                    "anonymous_user_id": stored_id,
+                    "user_id": user_id,
+                    "course_id": course_id,
+                    "digest": digests[user_id],
+                }
+            )
+
+    missing_users = {user.id: user for user in users if user.id not in stored_ids}.values()
+    try:
+        with transaction.atomic():
+            AnonymousUserId.objects.bulk_create([
+                AnonymousUserId(user=user, anonymous_user_id=digests[user.id], course_id=course_id)
+                for user in missing_users
+            ])
+    except IntegrityError:
+        # Another thread has already created some of these entries, so
+        # create the others one at a time.
+        for user in missing_users:
+            try:
+                with transaction.atomic():
+                    AnonymousUserId.objects.get_or_create(
+                        defaults={'anonymous_user_id': digests[user.id]},
+                        user=user,
+                        course_id=course_id
+                    )
+            except IntegrityError:
+                pass
+
+    return digests
+
+
+def users_by_anonymous_ids(uids):
+    """
+    Return a dict of anonymous_user_ids to users, using the AnonymousUserId
+    lookup table, for many anonymous_user_ids at once.
+
+    Anonymous ids that don't match any user are left out, rather than
+    raising an exception, as in `user_by_anonymous_id`.
+    """
+    uids = [uid for uid in uids if uid is not None]
+    if not uids:
+        return {}
+
+    return {
+        anonymous_user_id.anonymous_user_id: anonymous_user_id.user
+        for anonymous_user_id in AnonymousUserId.objects.filter(anonymous_user_id__in=uids).select_related('user')
+    }
+
+
 class UserStanding(models.Model):
     """
     This table contains a student's account's status.
@@ -892,6 +966,18 @@ class CourseEnrollmentManager(models.Manager):
     Custom manager for CourseEnrollment with Table-level filter methods.
     """
 
+    # The counts returned by enrollment_counts are cached, and kept up to
+    # date as enrollments are saved.  They are recomputed from the database
+    # after this many seconds, to reconcile them with changes made without
+    # saving CourseEnrollment objects, such as bulk updates.
+    ENROLLMENT_COUNTS_CACHE_TIMEOUT = 300
+    ENROLLMENT_COUNTS_CACHE_KEY = u"enrollment_counts.{course_id}"
+    ENROLLMENT_COUNT_CACHE_KEY = u"enrollment_counts.{course_id}.{mode}"
+
+    # is_course_full only counts the enrollments of a course exactly when
+    # its cached total count is within this many enrollments of the limit.
+    COURSE_FULL_RECHECK_MARGIN = 50
+
     def num_enrolled_in(self, course_id):
         """
         Returns the count of active enrollments in a course.
@@ -939,8 +1025,14 @@ class CourseEnrollmentManager(models.Manager):
         capacity
         """
         is_course_full = False
-        if course.max_student_enrollments_allowed is not None:
-            is_course_full = self.num_enrolled_in_exclude_admins(course.id) >= course.max_student_enrollments_allowed
+        max_enrollments = course.max_student_enrollments_allowed
+        if max_enrollments is not None:
+            # The cached total count includes the course's staff, so it can only
+            # exceed the count that's limited; while it's clearly below the limit,
+            # the exact count isn't needed.
+            recheck_threshold = max_enrollments - self.COURSE_FULL_RECHECK_MARGIN
+            if recheck_threshold <= 0 or self.enrollment_counts(course.id)['total'] >= recheck_threshold:
+                is_course_full = self.num_enrolled_in_exclude_admins(course.id) >= max_enrollments
 
         return is_course_full
 
@@ -955,19 +1047,91 @@ class CourseEnrollmentManager(models.Manager):
         """
         Returns a dictionary that stores the total enrollment count for a course, as well as the
         enrollment count for each individual mode.
+
+        The counts are cached, see ENROLLMENT_COUNTS_CACHE_TIMEOUT.
+        """
+        counts = self._get_cached_enrollment_counts(course_id)
+        if counts is None:
+            counts = self._count_enrollments(course_id)
+            self._set_cached_enrollment_counts(course_id, counts)
+        return defaultdict(int, counts)
+
+    def update_enrollment_counts(self, course_id, old_state, new_state):
+        """
+        Updates the cached enrollment counts of the course for an enrollment
+        changed from old_state to new_state, which are CourseEnrollmentState
+        tuples, or None for an enrollment that didn't or doesn't exist.
+        """
+        deltas = defaultdict(int)
+        if old_state is not None and old_state.is_active:
+            deltas[old_state.mode] -= 1
+            deltas['total'] -= 1
+        if new_state is not None and new_state.is_active:
+            deltas[new_state.mode] += 1
+            deltas['total'] += 1
+
+        try:
+            for mode, delta in deltas.iteritems():
+                if delta:
+                    cache.incr(self.ENROLLMENT_COUNT_CACHE_KEY.format(course_id=course_id, mode=mode), delta)
+        except ValueError:
+            # Some of the counts aren't cached, so have all of them
+            # recomputed when they're next read.
+            cache.delete(self.ENROLLMENT_COUNTS_CACHE_KEY.format(course_id=course_id))
+
+    def _count_enrollments(self, course_id):
+        """
+        Returns a dictionary of the enrollment counts of the course, counted
+        in the database.  See enrollment_counts.
         """
         # Unfortunately, Django's "group by"-style queries look super-awkward
         query = use_read_replica_if_available(
             super(CourseEnrollmentManager, self).get_queryset().filter(course_id=course_id, is_active=True).values(
                 'mode').order_by().annotate(Count('mode')))
         total = 0
-        enroll_dict = defaultdict(int)
+        enroll_dict = {}
         for item in query:
             enroll_dict[item['mode']] = item['mode__count']
             total += item['mode__count']
         enroll_dict['total'] = total
         return enroll_dict
 
+    def _get_cached_enrollment_counts(self, course_id):
+        """
+        Returns the cached dictionary of the enrollment counts of the course,
+        or None if they aren't all cached.
+        """
+        modes = cache.get(self.ENROLLMENT_COUNTS_CACHE_KEY.format(course_id=course_id))
+        if modes is None:
+            return None
+
+        keys = {self.ENROLLMENT_COUNT_CACHE_KEY.format(course_id=course_id, mode=mode): mode for mode in modes}
+        cached_counts = cache.get_many(keys.keys())
+        if len(cached_counts) != len(keys):
+            return None
+        return {keys[key]: count for key, count in cached_counts.iteritems()}
+
+    def _set_cached_enrollment_counts(self, course_id, counts):
+        """
+        Caches the dictionary of the enrollment counts of the course.
+
+        Each count is cached under its own key, so that it can be updated
+        atomically, and the list of modes is cached last, so that the
+        counts are only read once they're all cached.
+        """
+        cache.set_many(
+            {
+                self.ENROLLMENT_COUNT_CACHE_KEY.format(course_id=course_id, mode=mode): count
+                for mode, count in counts.iteritems()
+            },
+            self.ENROLLMENT_COUNTS_CACHE_TIMEOUT
+        )
+        cache.set(
+            self.ENROLLMENT_COUNTS_CACHE_KEY.format(course_id=course_id),
+            counts.keys(),
+            self.ENROLLMENT_COUNTS_CACHE_TIMEOUT
+        )
+
     def enrolled_and_dropped_out_users(self, course_id):
         """Return a queryset of Users in the course."""
         return User.objects.filter(
@@ -1026,6 +1190,13 @@ class CourseEnrollment(models.Model):
         # When the property .course_overview is accessed for the first time, this variable will be set.
         self._course_overview = None
 
+        # The mode and active state of the enrollment as last read from or
+        # saved to the database, from which the cached enrollment counts are
+        # updated when it's saved.  Fields that aren't loaded, as with
+        # .only() or .defer(), are left as None here, rather than loaded, and
+        # are read from the database right before the enrollment is saved.
+        self._saved_state = CourseEnrollmentState(self.__dict__.get('mode'), self.__dict__.get('is_active'))
+
     def __unicode__(self):
         return (
             "[CourseEnrollment] {}: {} ({}); active: ({})"
@@ -1651,6 +1822,64 @@ def invalidate_enrollment_mode_cache(sender, instance, **kwargs):  # pylint: dis
     cache.delete(cache_key)
 
 
+@receiver(models.signals.pre_save, sender=CourseEnrollment)
+@receiver(models.signals.pre_delete, sender=CourseEnrollment)
+def load_saved_enrollment_state(sender, instance, **kwargs):  # pylint: disable=unused-argument
+    """
+    Read the saved mode and active state of the enrollment from the database,
+    if they weren't loaded with it, before it's saved or deleted.
+    """
+    saved_state = instance._saved_state  # pylint: disable=protected-access
+    if instance._state.adding or None not in saved_state:  # pylint: disable=protected-access
+        return
+    row = CourseEnrollment.objects.filter(pk=instance.pk).values_list('mode', 'is_active').first()
+    if row:
+        instance._saved_state = CourseEnrollmentState(*row)  # pylint: disable=protected-access
+
+
+@receiver(models.signals.post_save, sender=CourseEnrollment)
+def update_enrollment_counts_on_save(sender, instance, created, **kwargs):  # pylint: disable=unused-argument
+    """Update the cached enrollment counts of the course for the saved enrollment. """
+    new_state = CourseEnrollmentState(instance.mode, instance.is_active)
+    CourseEnrollment.objects.update_enrollment_counts(
+        instance.course_id,
+        None if created else instance._saved_state,  # pylint: disable=protected-access
+        new_state,
+    )
+    instance._saved_state = new_state  # pylint: disable=protected-access
+
+
+@receiver(models.signals.post_delete, sender=CourseEnrollment)
+def update_enrollment_counts_on_delete(sender, instance, **kwargs):  # pylint: disable=unused-argument
+    """Update the cached enrollment counts of the course for the deleted enrollment. """
+    CourseEnrollment.objects.update_enrollment_counts(
+        instance.course_id,
+        instance._saved_state,  # pylint: disable=protected-access
+        None,
+    )
+
+
+# Cache key of a user's student.dashboard_data.DashboardData.
+DASHBOARD_DATA_CACHE_KEY = u"student.dashboard_data.{user_id}"
+
+
+def invalidate_dashboard_data(user_id):
+    """
+    Deletes the cached dashboard data of the given user, see
+    student.dashboard_data.
+    """
+    cache.delete(DASHBOARD_DATA_CACHE_KEY.format(user_id=user_id))
+
+
+@receiver(models.signals.post_save, sender=CourseEnrollment)
+@receiver(models.signals.post_delete, sender=CourseEnrollment)
+@receiver(models.signals.post_save, sender=GeneratedCertificate)
+@receiver(models.signals.post_delete, sender=GeneratedCertificate)
+def invalidate_dashboard_data_cache(sender, instance, **kwargs):  # pylint: disable=unused-argument
+    """Invalidate the cached dashboard data of the user of the enrollment or certificate. """
+    invalidate_dashboard_data(instance.user_id)
+
+
 class ManualEnrollmentAudit(models.Model):
     """
     Table for tracking which enrollments were performed through manual enrollment.
@@ -0,0 +1,112 @@
+"""
+Tests for the bulk loaded data of the learner dashboard.
+"""
+import unittest
+
+from django.conf import settings
+from django.test.utils import override_settings
+
+from certificates.models import CertificateStatuses  # pylint: disable=import-error
+from certificates.tests.factories import GeneratedCertificateFactory  # pylint: disable=import-error
+import shoppingcart.models  # pylint: disable=import-error
+from student.dashboard_data import get_dashboard_data
+from student.tests.factories import UserFactory, CourseEnrollmentFactory
+from xmodule.modulestore.tests.django_utils import SharedModuleStoreTestCase
+from xmodule.modulestore.tests.factories import CourseFactory
+
+
+@unittest.skipUnless(settings.ROOT_URLCONF == 'lms.urls', 'Test only valid in lms')
+class DashboardDataTest(SharedModuleStoreTestCase):
+    """
+    Tests for student.dashboard_data.
+    """
+    @classmethod
+    def setUpClass(cls):
+        super(DashboardDataTest, cls).setUpClass()
+        cls.courses = [CourseFactory.create(number='course{}'.format(index)) for index in range(3)]
+
+    def setUp(self):
+        super(DashboardDataTest, self).setUp()
+        self.user = UserFactory.create()
+        self.enrollments = [
+            CourseEnrollmentFactory.create(user=self.user, course_id=course.id) for course in self.courses
+        ]
+
+    def _create_unpaid_registration_code_redemption(self, course):
+        """
+        Redeems, for the user, a registration code generated for an invoice
+        that isn't valid, and returns the invoice.
+        """
+        invoice = shoppingcart.models.Invoice.objects.create(
+            total_amount=100, company_name='Test', company_contact_name='Test',
+            company_contact_email='test@example.com', recipient_name='Test',
+            recipient_email='test@example.com', course_id=course.id, is_valid=False,
+        )
+        invoice_item = shoppingcart.models.CourseRegistrationCodeInvoiceItem.objects.create(
+            invoice=invoice, qty=1, unit_price=100, course_id=course.id,
+        )
+        registration_code = shoppingcart.models.CourseRegistrationCode.objects.create(
+            code='unpaid{}'.format(course.id.course), course_id=course.id, created_by=self.user,
+            invoice=invoice, invoice_item=invoice_item,
+        )
+        shoppingcart.models.RegistrationCodeRedemption.objects.create(
+            registration_code=registration_code, redeemed_by=self.user,
+        )
+        return invoice
+
+    def test_load(self):
+        GeneratedCertificateFactory.create(
+            user=self.user, course_id=self.courses[0].id, status=CertificateStatuses.downloadable,
+        )
+        self._create_unpaid_registration_code_redemption(self.courses[1])
+
+        # One query for the certificates and one for the registration codes.
+        with self.assertNumQueries(2):
+            dashboard_data = get_dashboard_data(self.user, self.enrollments)
+
+        self.assertEqual(dashboard_data.course_ids, frozenset(course.id for course in self.courses))
+        self.assertEqual(
+            dashboard_data.certificate_statuses[self.courses[0].id]['status'], CertificateStatuses.downloadable
+        )
+        self.assertEqual(
+            dashboard_data.certificate_statuses[self.courses[2].id]['status'], CertificateStatuses.unavailable
+        )
+        self.assertEqual(dashboard_data.unpaid_course_ids, frozenset([self.courses[1].id]))
+
+    @override_settings(DASHBOARD_DATA_CACHE_TIMEOUT=60)
+    def test_cache(self):
+        get_dashboard_data(self.user, self.enrollments)
+        with self.assertNumQueries(0):
+            get_dashboard_data(self.user, self.enrollments)
+
+        # The cached data is for other courses.
+        with self.assertNumQueries(2):
+            get_dashboard_data(self.user, self.enrollments[:1])
+
+    @override_settings(DASHBOARD_DATA_CACHE_TIMEOUT=60)
+    def test_cache_invalidation(self):
+        get_dashboard_data(self.user, self.enrollments)
+
+        certificate = GeneratedCertificateFactory.create(
+            user=self.user, course_id=self.courses[0].id, status=CertificateStatuses.downloadable,
+        )
+        dashboard_data = get_dashboard_data(self.user, self.enrollments)
+        self.assertEqual(
+            dashboard_data.certificate_statuses[self.courses[0].id]['status'], CertificateStatuses.downloadable
+        )
+
+        certificate.status = CertificateStatuses.notpassing
+        certificate.save()
+        dashboard_data = get_dashboard_data(self.user, self.enrollments)
+        self.assertEqual(
+            dashboard_data.certificate_statuses[self.courses[0].id]['status'], CertificateStatuses.notpassing
+        )
+
+        invoice = self._create_unpaid_registration_code_redemption(self.courses[1])
+        self.assertEqual(
+            get_dashboard_data(self.user, self.enrollments).unpaid_course_ids, frozenset([self.courses[1].id])
+        )
+
+        invoice.is_valid = True
+        invoice.save()
+        self.assertEqual(get_dashboard_data(self.user, self.enrollments).unpaid_course_ids, frozenset())
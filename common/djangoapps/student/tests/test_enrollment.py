@@ -3,17 +3,19 @@ Tests for student enrollment.
 """
 import ddt
 import unittest
-from mock import patch
+from mock import Mock, patch
 from nose.plugins.attrib import attr
 
 from django.conf import settings
 from django.core.urlresolvers import reverse
 from course_modes.models import CourseMode
+from opaque_keys.edx.locator import CourseLocator
+from openedx.core.djangolib.testing.utils import CacheIsolationTestCase
 from xmodule.modulestore.tests.django_utils import SharedModuleStoreTestCase
 from xmodule.modulestore.tests.factories import CourseFactory
 from util.testing import UrlResetMixin
 from embargo.test_utils import restrict_course
-from student.tests.factories import UserFactory, CourseModeFactory
+from student.tests.factories import UserFactory, CourseModeFactory, CourseEnrollmentFactory
 from student.models import CourseEnrollment, CourseFullError
 from student.roles import (
     CourseInstructorRole,
@@ -281,3 +283,74 @@ class EnrollmentTest(UrlResetMixin, SharedModuleStoreTestCase):
             params['email_opt_in'] = email_opt_in
 
         return self.client.post(reverse('change_enrollment'), params)
+
+
+@attr(shard=3)
+class EnrollmentCountsTest(CacheIsolationTestCase):
+    """
+    Test the cached enrollment counts of courses.
+    """
+    ENABLED_CACHES = ['default']
+
+    def setUp(self):
+        super(EnrollmentCountsTest, self).setUp()
+        self.course_key = CourseLocator('edX', 'Counts', 'Course')
+        self.enrollments = [
+            CourseEnrollmentFactory(course_id=self.course_key, mode=mode)
+            for mode in ('audit', 'audit', 'verified')
+        ]
+
+    def test_counts_updated_on_save(self):
+        with self.assertNumQueries(1):
+            counts = CourseEnrollment.objects.enrollment_counts(self.course_key)
+        self.assertEqual(counts, {'audit': 2, 'verified': 1, 'total': 3})
+
+        self.enrollments[0].is_active = False
+        self.enrollments[0].save()
+        self.enrollments[1].mode = 'verified'
+        self.enrollments[1].save()
+
+        with self.assertNumQueries(0):
+            counts = CourseEnrollment.objects.enrollment_counts(self.course_key)
+        self.assertEqual(counts, {'audit': 0, 'verified': 2, 'total': 2})
+        self.assertEqual(counts['honor'], 0)
+
+    def test_counts_updated_on_save_of_deferred_fields(self):
+        CourseEnrollment.objects.enrollment_counts(self.course_key)
+        enrollment = CourseEnrollment.objects.only('id', 'user', 'course_id').get(id=self.enrollments[0].id)
+        enrollment.save()
+        enrollment = CourseEnrollment.objects.defer('is_active').get(id=self.enrollments[1].id)
+        enrollment.mode = 'verified'
+        enrollment.save()
+
+        # the saved state of the fields that weren't loaded is read before saving
+        with self.assertNumQueries(0):
+            counts = CourseEnrollment.objects.enrollment_counts(self.course_key)
+        self.assertEqual(counts, {'audit': 1, 'verified': 2, 'total': 3})
+
+    def test_counts_recomputed_for_new_mode(self):
+        CourseEnrollment.objects.enrollment_counts(self.course_key)
+        self.enrollments[0].mode = 'honor'
+        self.enrollments[0].save()
+
+        # the new mode's count isn't cached, so all the counts are recomputed
+        with self.assertNumQueries(1):
+            counts = CourseEnrollment.objects.enrollment_counts(self.course_key)
+        self.assertEqual(counts, {'audit': 1, 'honor': 1, 'verified': 1, 'total': 3})
+
+    @patch('student.models.CourseEnrollmentManager.num_enrolled_in_exclude_admins')
+    def test_is_course_full(self, mock_num_enrolled):
+        CourseEnrollment.objects.enrollment_counts(self.course_key)
+        margin = CourseEnrollment.objects.COURSE_FULL_RECHECK_MARGIN
+
+        # far from the limit, the cached count is enough
+        course = Mock(id=self.course_key, max_student_enrollments_allowed=margin + 4)
+        with self.assertNumQueries(0):
+            self.assertFalse(CourseEnrollment.objects.is_course_full(course))
+        self.assertFalse(mock_num_enrolled.called)
+
+        # near the limit, the enrollments are counted exactly
+        mock_num_enrolled.return_value = margin + 3
+        course.max_student_enrollments_allowed = margin + 3
+        self.assertTrue(CourseEnrollment.objects.is_course_full(course))
+        mock_num_enrolled.assert_called_once_with(self.course_key)
@@ -36,8 +36,8 @@ from openedx.core.djangoapps.programs.tests import factories as programs_factori
 from openedx.core.djangoapps.programs.tests.mixins import ProgramsApiConfigMixin
 import shoppingcart  # pylint: disable=import-error
 from student.models import (
-    anonymous_id_for_user, user_by_anonymous_id, CourseEnrollment,
-    unique_id_for_user, LinkedInAddToProfileConfiguration, UserAttribute
+    anonymous_id_for_user, anonymous_ids_for_users, user_by_anonymous_id, users_by_anonymous_ids,
+    AnonymousUserId, CourseEnrollment, unique_id_for_user, LinkedInAddToProfileConfiguration, UserAttribute
 )
 from student.tests.factories import UserFactory, CourseModeFactory, CourseEnrollmentFactory
 from student.views import (
@@ -892,6 +892,35 @@ class AnonymousLookupTable(ModuleStoreTestCase):
         self.assertEqual(self.user, real_user)
         self.assertEqual(anonymous_id, anonymous_id_for_user(self.user, course2.id, save=False))
 
+    def test_bulk_roundtrip(self):
+        users = [self.user] + UserFactory.create_batch(2) + [AnonymousUser()]
+        # one of the ids is saved already
+        anonymous_id_for_user(users[1], self.course.id)
+
+        # select of the saved ids, and savepoint, insert, release for the others
+        with self.assertNumQueries(4):
+            anonymous_ids = anonymous_ids_for_users(users, self.course.id)
+
+        self.assertEqual(anonymous_ids, {
+            user.id: anonymous_id_for_user(user, self.course.id, save=False) for user in users[:3]
+        })
+        self.assertEqual(AnonymousUserId.objects.filter(course_id=self.course.id).count(), 3)
+
+        with self.assertNumQueries(1):
+            real_users = users_by_anonymous_ids(anonymous_ids.values() + ['unknown', None])
+        self.assertEqual(real_users, {anonymous_ids[user.id]: user for user in users[:3]})
+
+    def test_bulk_save_race(self):
+        users = UserFactory.create_batch(2)
+        with patch('student.models.AnonymousUserId.objects.filter') as mock_filter:
+            # the ids are created by another thread after being looked up
+            mock_filter.return_value.values_list.return_value = []
+            anonymous_id_for_user(users[0], self.course.id)
+            anonymous_ids = anonymous_ids_for_users(users, self.course.id)
+
+        for user in users:
+            self.assertEqual(user_by_anonymous_id(anonymous_ids[user.id]), user)
+
 
 @attr(shard=3)
 @httpretty.activate
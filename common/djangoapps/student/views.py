@@ -55,6 +55,7 @@ from student.models import (
     create_comments_service_user, PasswordHistory, UserSignupSource,
     DashboardConfiguration, LinkedInAddToProfileConfiguration, ManualEnrollmentAudit, ALLOWEDTOENROLL_TO_ENROLLED,
     LogoutViewConfiguration)
+from student.dashboard_data import dashboard_section_timer, get_dashboard_data
 from student.forms import AccountCreationForm, PasswordResetFormNoActive, get_registration_extension_form
 from lms.djangoapps.commerce.utils import EcommerceService  # pylint: disable=import-error
 from lms.djangoapps.verify_student.models import SoftwareSecurePhotoVerification  # pylint: disable=import-error
@@ -109,7 +110,7 @@ from student.helpers import (
 )
 from student.cookies import set_logged_in_cookies, delete_logged_in_cookies
 from student.models import anonymous_id_for_user, UserAttribute, EnrollStatusChange
-from shoppingcart.models import DonationConfiguration, CourseRegistrationCode
+from shoppingcart.models import DonationConfiguration
 
 from embargo import api as embargo_api
 
@@ -207,7 +208,7 @@ def process_survey_link(survey_link, user):
     return survey_link.format(UNIQUE_ID=unique_id_for_user(user))
 
 
-def cert_info(user, course_overview, course_mode):
+def cert_info(user, course_overview, course_mode, cert_status=None):
     """
     Get the certificate info needed to render the dashboard section for the given
     student and course.
@@ -216,6 +217,8 @@ def cert_info(user, course_overview, course_mode):
         user (User): A user.
         course_overview (CourseOverview): A course.
         course_mode (str): The enrollment mode (honor, verified, audit, etc.)
+        cert_status (dict): The status of the user's certificate in the course,
+            as returned by certificate_status_for_student.  Loaded if not given.
 
     Returns:
         dict: Empty dict if certificates are disabled or hidden, or a dictionary with keys:
@@ -230,12 +233,9 @@ def cert_info(user, course_overview, course_mode):
     """
     if not course_overview.may_certify():
         return {}
-    return _cert_info(
-        user,
-        course_overview,
-        certificate_status_for_student(user, course_overview.id),
-        course_mode
-    )
+    if cert_status is None:
+        cert_status = certificate_status_for_student(user, course_overview.id)
+    return _cert_info(user, course_overview, cert_status, course_mode)
 
 
 def reverification_info(statuses):
@@ -524,25 +524,29 @@ def is_course_blocked(request, redeemed_registration_codes, course_key):
         if redeemed_registration.invoice_item:
             if not redeemed_registration.invoice_item.invoice.is_valid:
                 blocked = True
-                # disabling email notifications for unpaid registration courses
-                Optout.objects.get_or_create(user=request.user, course_id=course_key)
-                log.info(
-                    u"User %s (%s) opted out of receiving emails from course %s",
-                    request.user.username,
-                    request.user.email,
-                    course_key,
-                )
-                track.views.server_track(
-                    request,
-                    "change-email1-settings",
-                    {"receive_emails": "no", "course": course_key.to_deprecated_string()},
-                    page='dashboard',
-                )
+                _opt_out_of_unpaid_course(request, course_key)
                 break
 
     return blocked
 
 
+def _opt_out_of_unpaid_course(request, course_key):
+    """Disable email notifications of the blocked, unpaid registration course. """
+    Optout.objects.get_or_create(user=request.user, course_id=course_key)
+    log.info(
+        u"User %s (%s) opted out of receiving emails from course %s",
+        request.user.username,
+        request.user.email,
+        course_key,
+    )
+    track.views.server_track(
+        request,
+        "change-email1-settings",
+        {"receive_emails": "no", "course": course_key.to_deprecated_string()},
+        page='dashboard',
+    )
+
+
 @login_required
 @ensure_csrf_cookie
 def dashboard(request):
@@ -565,14 +569,16 @@ def dashboard(request):
     # Build our (course, enrollment) list for the user, but ignore any courses that no
     # longer exist (because the course IDs have changed). Still, we don't delete those
     # enrollments, because it could have been a data push snafu.
-    course_enrollments = list(get_course_enrollments(user, course_org_filter, org_filter_out_set))
+    with dashboard_section_timer('enrollments'):
+        course_enrollments = list(get_course_enrollments(user, course_org_filter, org_filter_out_set))
 
     # sort the enrollment pairs by the enrollment date
     course_enrollments.sort(key=lambda x: x.created, reverse=True)
 
     # Retrieve the course modes for each course
     enrolled_course_ids = [enrollment.course_id for enrollment in course_enrollments]
-    __, unexpired_course_modes = CourseMode.all_and_unexpired_modes_for_courses(enrolled_course_ids)
+    with dashboard_section_timer('course_modes'):
+        __, unexpired_course_modes = CourseMode.all_and_unexpired_modes_for_courses(enrolled_course_ids)
     course_modes_by_course = {
         course_id: {
             mode.slug: mode
@@ -604,17 +610,23 @@ def dashboard(request):
         staff_access = True
         errored_courses = modulestore().get_errored_courses()
 
-    show_courseware_links_for = frozenset(
-        enrollment.course_id for enrollment in course_enrollments
-        if has_access(request.user, 'load', enrollment.course_overview)
-        and has_access(request.user, 'view_courseware_with_prerequisites', enrollment.course_overview)
-    )
+    with dashboard_section_timer('courseware_access'):
+        show_courseware_links_for = frozenset(
+            enrollment.course_id for enrollment in course_enrollments
+            if has_access(request.user, 'load', enrollment.course_overview)
+            and has_access(request.user, 'view_courseware_with_prerequisites', enrollment.course_overview)
+        )
 
     # Find programs associated with courses being displayed. This information
     # is passed in the template context to allow rendering of program-related
     # information on the dashboard.
-    meter = programs_utils.ProgramProgressMeter(user, enrollments=course_enrollments)
-    programs_by_run = meter.engaged_programs(by_run=True)
+    with dashboard_section_timer('programs'):
+        meter = programs_utils.ProgramProgressMeter(user, enrollments=course_enrollments)
+        programs_by_run = meter.engaged_programs(by_run=True)
+
+    # Load the certificate statuses and registration codes of all the
+    # enrollments at once.
+    dashboard_data = get_dashboard_data(user, course_enrollments)
 
     # Construct a dictionary of course mode information
     # used to render the course list.  We re-use the course modes dict
@@ -641,9 +653,15 @@ def dashboard(request):
     #
     # If a course is not included in this dictionary,
     # there is no verification messaging to display.
-    verify_status_by_course = check_verify_status_by_course(user, course_enrollments)
+    with dashboard_section_timer('verification_statuses'):
+        verify_status_by_course = check_verify_status_by_course(user, course_enrollments)
     cert_statuses = {
-        enrollment.course_id: cert_info(request.user, enrollment.course_overview, enrollment.mode)
+        enrollment.course_id: cert_info(
+            request.user,
+            enrollment.course_overview,
+            enrollment.mode,
+            cert_status=dashboard_data.certificate_statuses[enrollment.course_id],
+        )
         for enrollment in course_enrollments
     }
 
@@ -662,22 +680,15 @@ def dashboard(request):
     statuses = ["approved", "denied", "pending", "must_reverify"]
     reverifications = reverification_info(statuses)
 
-    show_refund_option_for = frozenset(
-        enrollment.course_id for enrollment in course_enrollments
-        if enrollment.refundable()
-    )
-
-    block_courses = frozenset(
-        enrollment.course_id for enrollment in course_enrollments
-        if is_course_blocked(
-            request,
-            CourseRegistrationCode.objects.filter(
-                course_id=enrollment.course_id,
-                registrationcoderedemption__redeemed_by=request.user
-            ),
-            enrollment.course_id
+    with dashboard_section_timer('refunds'):
+        show_refund_option_for = frozenset(
+            enrollment.course_id for enrollment in course_enrollments
+            if enrollment.refundable()
         )
-    )
+
+    block_courses = dashboard_data.unpaid_course_ids
+    for course_id in block_courses:
+        _opt_out_of_unpaid_course(request, course_id)
 
     enrolled_courses_either_paid = frozenset(
         enrollment.course_id for enrollment in course_enrollments
@@ -689,14 +700,21 @@ def dashboard(request):
     denied_banner = any(item.display for item in reverifications["denied"])
 
     # Populate the Order History for the side-bar.
-    order_history_list = order_history(user, course_org_filter=course_org_filter, org_filter_out_set=org_filter_out_set)
+    with dashboard_section_timer('order_history'):
+        order_history_list = order_history(
+            user, course_org_filter=course_org_filter, org_filter_out_set=org_filter_out_set
+        )
 
     # get list of courses having pre-requisites yet to be completed
     courses_having_prerequisites = frozenset(
         enrollment.course_id for enrollment in course_enrollments
         if enrollment.course_overview.pre_requisite_courses
     )
-    courses_requirements_not_met = get_pre_requisite_courses_not_completed(user, courses_having_prerequisites)
+    with dashboard_section_timer('prerequisites'):
+        courses_requirements_not_met = get_pre_requisite_courses_not_completed(user, courses_having_prerequisites)
+
+    with dashboard_section_timer('credit_statuses'):
+        credit_statuses = _credit_statuses(user, course_enrollments)
 
     if 'notlive' in request.GET:
         redirect_message = _("The course you are looking for does not start until {date}.").format(
@@ -720,7 +738,7 @@ def dashboard(request):
         'show_courseware_links_for': show_courseware_links_for,
         'all_course_modes': course_mode_info,
         'cert_statuses': cert_statuses,
-        'credit_statuses': _credit_statuses(user, course_enrollments),
+        'credit_statuses': credit_statuses,
         'show_email_settings_for': show_email_settings_for,
         'reverifications': reverifications,
         'verification_status': verification_status,
@@ -25,3 +25,13 @@ class BaseBackend(object):
     def send(self, event):
         """Send event to tracker."""
         pass
+
+    def send_many(self, events):
+        """
+        Send a batch of events to tracker.
+
+        Backends that can store several events at once should override
+        this with a more efficient implementation.
+        """
+        for event in events:
+            self.send(event)
@@ -0,0 +1,184 @@
+"""
+Event tracker backend that delivers events to another backend
+asynchronously, in batches.
+
+Events are put on a bounded in-process queue on the request path, and a
+background thread takes them off the queue in batches and hands each
+batch to the wrapped backend's `send_many`.  Configure it by wrapping the
+configuration of another backend::
+
+  TRACKING_BACKENDS = {
+      'mongo': {
+          'ENGINE': 'track.backends.asynchronous.AsyncBackend',
+          'OPTIONS': {
+              'backend': {
+                  'ENGINE': 'track.backends.mongodb.MongoBackend',
+                  'OPTIONS': {...}
+              },
+              'max_queue_size': 10000,
+              'batch_size': 100,
+              'flush_interval': 1.0,
+              'block_timeout': 0,
+          }
+      }
+  }
+
+"""
+
+from __future__ import absolute_import
+
+import atexit
+import logging
+import os
+import Queue
+import threading
+
+from dogapi import dog_stats_api
+
+from track.backends import BaseBackend
+
+
+log = logging.getLogger(__name__)
+
+# Put on the queue to stop the flusher thread once the queue is drained.
+_STOP = object()
+
+
+class AsyncBackend(BaseBackend):
+    """
+    Event tracker backend that queues events and delivers them to a
+    wrapped backend in batches, from a background thread.
+
+    When the queue is full, `send` waits up to `block_timeout` seconds for
+    space and then drops the event.  The number of events delivered,
+    dropped and failed are counted in `sent_count`, `dropped_count` and
+    `failed_count`, and reported to datadog.
+    """
+
+    def __init__(self, backend, max_queue_size=10000, batch_size=100, flush_interval=1.0, block_timeout=0, **kwargs):
+        """
+        :Parameters:
+
+          - `backend`: configuration of the wrapped backend, a dict with
+            an `ENGINE` and optional `OPTIONS`, as in TRACKING_BACKENDS
+          - `max_queue_size`: maximum number of events waiting for delivery
+          - `batch_size`: maximum number of events delivered at once
+          - `flush_interval`: maximum number of seconds the flusher thread
+            waits for a batch to fill up
+          - `block_timeout`: number of seconds `send` waits for space in a
+            full queue before dropping the event; 0 drops it immediately
+
+        """
+        super(AsyncBackend, self).__init__(**kwargs)
+
+        # Imported here since the tracker initializes its backends, this
+        # one included, when it is imported.
+        from track.tracker import _instantiate_backend_from_name
+        self.backend = _instantiate_backend_from_name(backend['ENGINE'], backend.get('OPTIONS', {}))
+
+        self.max_queue_size = max_queue_size
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.block_timeout = block_timeout
+
+        self.sent_count = 0
+        self.dropped_count = 0
+        self.failed_count = 0
+
+        self._lock = threading.Lock()
+        self._pid = None
+        self._queue = None
+        self._thread = None
+
+        atexit.register(self.close)
+
+    def send(self, event):
+        """Queue the event for delivery, dropping it if the queue is full."""
+        self._ensure_started()
+        try:
+            if self.block_timeout > 0:
+                self._queue.put(event, timeout=self.block_timeout)
+            else:
+                self._queue.put_nowait(event)
+        except Queue.Full:
+            self.dropped_count += 1
+            dog_stats_api.increment('track.async.dropped')
+
+    def flush(self):
+        """Block until all the events queued so far have been delivered."""
+        if self._is_running():
+            self._queue.join()
+
+    def close(self, timeout=5):
+        """
+        Deliver the queued events and stop the flusher thread, waiting at
+        most `timeout` seconds for it.
+        """
+        if self._is_running():
+            self._queue.put(_STOP)
+            self._thread.join(timeout)
+
+    def _is_running(self):
+        """Returns whether the flusher thread of this process is running."""
+        return self._pid == os.getpid() and self._thread is not None and self._thread.is_alive()
+
+    def _ensure_started(self):
+        """
+        Start the flusher thread, unless already started by this process.
+
+        Threads don't survive a fork, so a forked worker process starts its
+        own flusher thread with an empty queue on its first event.
+        """
+        if self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._pid != os.getpid():
+                self._queue = Queue.Queue(maxsize=self.max_queue_size)
+                self._thread = threading.Thread(target=self._run, name='track-async-flusher')
+                self._thread.daemon = True
+                self._thread.start()
+                self._pid = os.getpid()
+
+    def _run(self):
+        """Deliver queued events in batches until stopped."""
+        stopping = False
+        while not stopping:
+            try:
+                batch = [self._queue.get(timeout=self.flush_interval)]
+            except Queue.Empty:
+                continue
+
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except Queue.Empty:
+                    break
+
+            if _STOP in batch:
+                stopping = True
+                events = [event for event in batch if event is not _STOP]
+            else:
+                events = batch
+
+            try:
+                self._deliver(events)
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    def _deliver(self, events):
+        """Hand the given events to the wrapped backend."""
+        if not events:
+            return
+        try:
+            with dog_stats_api.timer('track.async.deliver'):
+                self.backend.send_many(events)
+        except Exception:  # pylint: disable=broad-except
+            # An exception must not stop the flusher thread, so the
+            # batch is dropped and delivery continues with the next one.
+            self.failed_count += len(events)
+            dog_stats_api.increment('track.async.failed', value=len(events))
+            log.exception('Error delivering %d events to %r', len(events), self.backend)
+        else:
+            self.sent_count += len(events)
+            dog_stats_api.increment('track.async.sent', value=len(events))
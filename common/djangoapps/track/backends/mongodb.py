@@ -97,3 +97,12 @@ class MongoBackend(BaseBackend):
             # during the next event.
             msg = 'Error inserting to MongoDB event tracker backend'
             log.exception(msg)
+
+    def send_many(self, events):
+        """Insert the events in to the Mongo collection with a single bulk insert"""
+        try:
+            # Keep inserting the remaining events if one of them fails.
+            self.collection.insert(events, manipulate=False, continue_on_error=True)
+        except (PyMongoError, BSONError):
+            msg = 'Error inserting to MongoDB event tracker backend'
+            log.exception(msg)
@@ -0,0 +1,101 @@
+"""Tests for the asynchronous event tracker backend."""
+from __future__ import absolute_import
+
+import threading
+
+from django.test import TestCase
+
+from track.backends import BaseBackend
+from track.backends.asynchronous import AsyncBackend
+
+
+class RecordingBackend(BaseBackend):
+    """Backend that records the batches of events it is sent."""
+
+    def __init__(self, fail=False, **kwargs):
+        super(RecordingBackend, self).__init__(**kwargs)
+        self.fail = fail
+        self.batches = []
+        self.release = threading.Event()
+        self.release.set()
+
+    def send(self, event):
+        self.send_many([event])
+
+    def send_many(self, events):
+        self.release.wait()
+        if self.fail:
+            raise ValueError('Failed to send events')
+        self.batches.append(list(events))
+
+
+class TestAsyncBackend(TestCase):
+    """Tests for AsyncBackend."""
+
+    def create_backend(self, fail=False, **kwargs):
+        """Returns an AsyncBackend wrapping a RecordingBackend."""
+        backend = AsyncBackend(
+            backend={
+                'ENGINE': 'track.backends.tests.test_asynchronous.RecordingBackend',
+                'OPTIONS': {'fail': fail},
+            },
+            **kwargs
+        )
+        self.addCleanup(backend.close)
+        return backend
+
+    def test_events_delivered_in_batches(self):
+        backend = self.create_backend(batch_size=3)
+        # Hold up delivery until all the events are queued.
+        backend.backend.release.clear()
+        backend.send({'test': 0})
+        for index in range(1, 7):
+            backend.send({'test': index})
+        backend.backend.release.set()
+        backend.flush()
+
+        events = [event for batch in backend.backend.batches for event in batch]
+        self.assertEqual(events, [{'test': index} for index in range(7)])
+        self.assertTrue(all(len(batch) <= 3 for batch in backend.backend.batches))
+        self.assertLess(len(backend.backend.batches), 7)
+        self.assertEqual(backend.sent_count, 7)
+        self.assertEqual(backend.dropped_count, 0)
+
+    def test_events_dropped_when_queue_full(self):
+        backend = self.create_backend(max_queue_size=2, batch_size=1)
+        backend.backend.release.clear()
+        for index in range(10):
+            backend.send({'test': index})
+        backend.backend.release.set()
+        backend.flush()
+
+        # At most one event is being delivered, and two are queued.
+        self.assertGreaterEqual(backend.dropped_count, 7)
+        self.assertEqual(backend.sent_count + backend.dropped_count, 10)
+
+    def test_failed_delivery(self):
+        backend = self.create_backend(fail=True)
+        backend.send({'test': 1})
+        backend.send({'test': 2})
+        backend.flush()
+
+        self.assertEqual(backend.failed_count, 2)
+        self.assertEqual(backend.sent_count, 0)
+
+        # The flusher thread keeps delivering after a failure.
+        backend.backend.fail = False
+        backend.send({'test': 3})
+        backend.flush()
+        self.assertEqual(backend.sent_count, 1)
+
+    def test_close_delivers_queued_events(self):
+        backend = self.create_backend()
+        backend.backend.release.clear()
+        for index in range(5):
+            backend.send({'test': index})
+        backend.backend.release.set()
+        backend.close()
+
+        events = [event for batch in backend.backend.batches for event in batch]
+        self.assertEqual(len(events), 5)
+        self.assertFalse(backend._thread.is_alive())  # pylint: disable=protected-access
@@ -30,24 +30,32 @@ def anonymous_id_from_user_id(user_id):
     return anonymous_id_for_user(user, None)
 
 
-def substitute_keywords(string, user_id, context):
+def get_keyword_function_map(user_id, context):
     """
-    Replaces all %%-encoded words using KEYWORD_FUNCTION_MAP mapping functions
-
-    Iterates through all keywords that must be substituted and replaces
-    them by calling the corresponding functions stored in KEYWORD_FUNCTION_MAP.
-
-    Functions stored in KEYWORD_FUNCTION_MAP must return a replacement string.
+    Returns the mapping of each %%-encoded word to the function returning
+    its replacement string for the given user and context.
     """
 
     # do this lazily to avoid unneeded database hits
-    KEYWORD_FUNCTION_MAP = {
+    return {
         '%%USER_ID%%': lambda: anonymous_id_from_user_id(user_id),
         '%%USER_FULLNAME%%': lambda: context.get('name'),
         '%%COURSE_DISPLAY_NAME%%': lambda: context.get('course_title'),
         '%%COURSE_END_DATE%%': lambda: context.get('course_end_date'),
     }
 
+
+def substitute_keywords(string, user_id, context):
+    """
+    Replaces all %%-encoded words using KEYWORD_FUNCTION_MAP mapping functions
+
+    Iterates through all keywords that must be substituted and replaces
+    them by calling the corresponding functions stored in KEYWORD_FUNCTION_MAP.
+
+    Functions stored in KEYWORD_FUNCTION_MAP must return a replacement string.
+    """
+    KEYWORD_FUNCTION_MAP = get_keyword_function_map(user_id, context)
+
     for key in KEYWORD_FUNCTION_MAP.keys():
         if key in string:
             substitutor = KEYWORD_FUNCTION_MAP[key]
@@ -4,11 +4,13 @@ Parser and evaluator for FormulaResponse and NumericalResponse
 Uses pyparsing to parse. Main function as of now is evaluator().
 """
 
+from collections import OrderedDict
 import math
 import operator
 import numbers
 import numpy
 import scipy.constants
+import threading
 import functions
 
 from pyparsing import (
@@ -72,6 +74,9 @@ SUFFIXES = {
     'c': 1e-2, 'm': 1e-3, 'u': 1e-6, 'n': 1e-9, 'p': 1e-12
 }
 
+# Maximum number of parsed expressions kept by `get_parsed_expression`.
+PARSE_CACHE_SIZE = 1000
+
 
 class UndefinedVariable(Exception):
     """
@@ -115,6 +120,16 @@ def eval_number(parse_result):
     return super_float("".join(parse_result))
 
 
+def is_value(token):
+    """
+    Return whether the token is a value rather than an operator string.
+
+    Values are numbers, or numpy arrays of them when `batch_evaluator`
+    evaluates many variable assignments at once.
+    """
+    return isinstance(token, (numbers.Number, numpy.ndarray))
+
+
 def eval_atom(parse_result):
     """
     Return the value wrapped by the atom.
@@ -122,7 +137,7 @@ def eval_atom(parse_result):
     In the case of parenthesis, ignore them.
     """
     # Find first number in the list
-    result = next(k for k in parse_result if isinstance(k, numbers.Number))
+    result = next(k for k in parse_result if is_value(k))
     return result
 
 
@@ -136,7 +151,7 @@ def eval_power(parse_result):
     # `reduce` will go from left to right; reverse the list.
     parse_result = reversed(
         [k for k in parse_result
-         if isinstance(k, numbers.Number)]  # Ignore the '^' marks.
+         if is_value(k)]  # Ignore the '^' marks.
     )
     # Having reversed it, raise `b` to the power of `a`.
     power = reduce(lambda a, b: b ** a, parse_result)
@@ -158,7 +173,7 @@ def eval_parallel(parse_result):
     if 0 in parse_result:
         return float('nan')
     reciprocals = [1. / e for e in parse_result
-                   if isinstance(e, numbers.Number)]
+                   if is_value(e)]
     return 1. / sum(reciprocals)
 
 
@@ -173,12 +188,12 @@ def eval_sum(parse_result):
     total = 0.0
     current_op = operator.add
     for token in parse_result:
-        if token == '+':
+        if is_value(token):
+            total = current_op(total, token)
+        elif token == '+':
             current_op = operator.add
         elif token == '-':
             current_op = operator.sub
-        else:
-            total = current_op(total, token)
     return total
 
 
@@ -191,12 +206,12 @@ def eval_product(parse_result):
     prod = 1.0
     current_op = operator.mul
     for token in parse_result:
-        if token == '*':
+        if is_value(token):
+            prod = current_op(prod, token)
+        elif token == '*':
             current_op = operator.mul
         elif token == '/':
             current_op = operator.truediv
-        else:
-            prod = current_op(prod, token)
     return prod
 
 
@@ -229,8 +244,7 @@ def evaluator(variables, functions, math_expr, case_sensitive=False):
         return float('nan')
 
     # Parse the tree.
-    math_interpreter = ParseAugmenter(math_expr, case_sensitive)
-    math_interpreter.parse_algebra()
+    math_interpreter = get_parsed_expression(math_expr, case_sensitive)
 
     # Get our variables together.
     all_variables, all_functions = add_defaults(variables, functions, case_sensitive)
@@ -238,11 +252,95 @@ def evaluator(variables, functions, math_expr, case_sensitive=False):
     # ...and check them
     math_interpreter.check_variables(all_variables, all_functions)
 
+    return evaluate_tree(math_interpreter, all_variables, all_functions)
+
+
+def batch_evaluator(variables_list, functions, math_expr, case_sensitive=False):
+    """
+    Evaluate an expression for each of many variable assignments.
+
+    Like `evaluator`, but take a list of variable dictionaries and return
+    the list of the values of the expression for each of them. The
+    expression is parsed once, and evaluated once with each variable bound
+    to the numpy array of its values when all the functions it uses are
+    numpy's or calc's. When that evaluation fails, for instance on a
+    domain or division error, or with a function that doesn't take arrays,
+    fall back to evaluating the expression for each assignment in turn, so
+    the values and errors are those `evaluator` would give.
+    """
+    # No need to go further.
+    if math_expr.strip() == "":
+        return [float('nan')] * len(variables_list)
+
+    math_interpreter = get_parsed_expression(math_expr, case_sensitive)
+
+    all_variables_list = []
+    for variables in variables_list:
+        all_variables, all_functions = add_defaults(variables, functions, case_sensitive)
+        math_interpreter.check_variables(all_variables, all_functions)
+        all_variables_list.append(all_variables)
+    if not all_variables_list:
+        return []
+
+    if len(all_variables_list) > 1:
+        results = _evaluate_vectorized(math_interpreter, all_variables_list, all_functions)
+        if results is not None:
+            return results
+
+    return [
+        evaluate_tree(math_interpreter, assignment, all_functions)
+        for assignment in all_variables_list
+    ]
+
+
+def _evaluate_vectorized(math_interpreter, all_variables_list, all_functions):
+    """
+    Evaluate the parsed expression once over all the variable assignments,
+    with each variable bound to the numpy array of its values.
+
+    Return the list of values, or None if the expression can't be evaluated
+    this way.
+    """
+    casify = _casify_function(math_interpreter.case_sensitive)
+    vectorized_functions = set(DEFAULT_FUNCTIONS.itervalues())
+    for name in math_interpreter.functions_used:
+        function = all_functions[casify(name)]
+        if not (isinstance(function, numpy.ufunc) or function in vectorized_functions):
+            return None
+
+    size = len(all_variables_list)
+    all_variables = dict(all_variables_list[0])
+    for name in math_interpreter.variables_used:
+        name = casify(name)
+        values = numpy.array([variables[name] for variables in all_variables_list])
+        # Integer arrays don't follow Python's integer arithmetic, e.g. for
+        # negative powers or overflows.
+        if values.dtype.kind not in 'fc':
+            return None
+        all_variables[name] = values
+
+    try:
+        # Raise on any floating point error, so the assignments it happens
+        # for are evaluated as `evaluator` would.
+        with numpy.errstate(divide='raise', over='raise', invalid='raise'):
+            result = evaluate_tree(math_interpreter, all_variables, all_functions)
+    except Exception:  # pylint: disable=broad-except
+        return None
+
+    if not math_interpreter.variables_used and is_value(result) and numpy.ndim(result) == 0:
+        return [result] * size
+    if isinstance(result, numpy.ndarray) and result.shape == (size,):
+        return result.tolist()
+    return None
+
+
+def evaluate_tree(math_interpreter, all_variables, all_functions):
+    """
+    Return the value of an expression parsed by `math_interpreter`, given
+    all the variables and functions, defaults included.
+    """
     # Create a recursion to evaluate the tree.
-    if case_sensitive:
-        casify = lambda x: x
-    else:
-        casify = lambda x: x.lower()  # Lowercase for case insens.
+    casify = _casify_function(math_interpreter.case_sensitive)
 
     evaluate_actions = {
         'number': eval_number,
@@ -258,6 +356,54 @@ def evaluator(variables, functions, math_expr, case_sensitive=False):
     return math_interpreter.reduce_tree(evaluate_actions)
 
 
+def _casify_function(case_sensitive):
+    """
+    Return the function normalizing the case of variable and function names.
+    """
+    if case_sensitive:
+        return lambda x: x
+    else:
+        return lambda x: x.lower()  # Lowercase for case insens.
+
+
+_PARSE_CACHE = OrderedDict()
+_PARSE_CACHE_LOCK = threading.Lock()
+
+
+def get_parsed_expression(math_expr, case_sensitive=False):
+    """
+    Return the `ParseAugmenter` of the expression, already parsed.
+
+    The parsed expressions are kept in a least recently used cache of
+    `PARSE_CACHE_SIZE` entries keyed by (math_expr, case_sensitive), since
+    building the grammar and parsing is the bulk of the time `evaluator`
+    takes. They must not be modified. Parse errors aren't cached.
+    """
+    key = (math_expr, case_sensitive)
+    with _PARSE_CACHE_LOCK:
+        math_interpreter = _PARSE_CACHE.pop(key, None)
+        if math_interpreter is not None:
+            _PARSE_CACHE[key] = math_interpreter
+            return math_interpreter
+
+    math_interpreter = ParseAugmenter(math_expr, case_sensitive)
+    math_interpreter.parse_algebra()
+
+    with _PARSE_CACHE_LOCK:
+        _PARSE_CACHE[key] = math_interpreter
+        while len(_PARSE_CACHE) > PARSE_CACHE_SIZE:
+            _PARSE_CACHE.popitem(last=False)
+    return math_interpreter
+
+
+def clear_parse_cache():
+    """
+    Empty the cache of `get_parsed_expression`.
+    """
+    with _PARSE_CACHE_LOCK:
+        _PARSE_CACHE.clear()
+
+
 class ParseAugmenter(object):
     """
     Holds the data for a particular parse.
@@ -3,6 +3,7 @@ Unit tests for calc.py
 """
 
 import unittest
+import mock
 import numpy
 import calc
 from pyparsing import ParseException
@@ -559,3 +560,108 @@ class EvaluatorTest(unittest.TestCase):
             calc.evaluator({'r1': 5}, {}, "r1+r2")
         with self.assertRaisesRegexp(calc.UndefinedVariable, 'r1 r3'):
             calc.evaluator(variables, {}, "r1*r3", case_sensitive=True)
+
+
+class ParseCacheTest(unittest.TestCase):
+    """
+    Run tests for calc.get_parsed_expression
+    """
+
+    def setUp(self):
+        super(ParseCacheTest, self).setUp()
+        calc.clear_parse_cache()
+        self.addCleanup(calc.clear_parse_cache)
+
+    def test_cached(self):
+        """
+        The same expression is parsed once for each case sensitivity.
+        """
+        parsed = calc.get_parsed_expression('x+1')
+        self.assertIs(parsed, calc.get_parsed_expression('x+1'))
+        self.assertIsNot(parsed, calc.get_parsed_expression('x+1', case_sensitive=True))
+        self.assertEqual(parsed.variables_used, set(['x']))
+
+    def test_case_sensitivity(self):
+        """
+        The cached parse of an expression checks variables with the case
+        sensitivity it is evaluated with.
+        """
+        self.assertEqual(calc.evaluator({'x': 1}, {}, 'X'), 1)
+        with self.assertRaisesRegexp(calc.UndefinedVariable, 'X'):
+            calc.evaluator({'x': 1}, {}, 'X', case_sensitive=True)
+
+    def test_least_recently_used(self):
+        """
+        The least recently used expression is dropped when the cache is full.
+        """
+        with mock.patch('calc.calc.PARSE_CACHE_SIZE', 2):
+            parsed = calc.get_parsed_expression('1')
+            calc.get_parsed_expression('2')
+            calc.get_parsed_expression('1')
+            calc.get_parsed_expression('3')
+            self.assertIs(parsed, calc.get_parsed_expression('1'))
+            self.assertIsNot(parsed, calc.get_parsed_expression('2'))
+
+    def test_parse_error(self):
+        """
+        Invalid expressions raise each time they are evaluated.
+        """
+        for _ in range(2):
+            with self.assertRaises(ParseException):
+                calc.evaluator({}, {}, '1+')
+
+
+class BatchEvaluatorTest(unittest.TestCase):
+    """
+    Run tests for calc.batch_evaluator
+    """
+    variables_list = [{'x': 1.0, 'y': 2.0}, {'x': -3.5, 'y': 0.25}, {'x': 7.0, 'y': 1e3}]
+
+    def assert_same_as_evaluator(self, math_expr, variables_list=None, functions=None):
+        """
+        Check that batch_evaluator gives the values evaluator gives for
+        each assignment.
+        """
+        variables_list = variables_list or self.variables_list
+        functions = functions or {}
+        values = calc.batch_evaluator(variables_list, functions, math_expr)
+        self.assertEqual(len(values), len(variables_list))
+        for variables, value in zip(variables_list, values):
+            expected = calc.evaluator(variables, functions, math_expr)
+            if numpy.isnan(expected):
+                self.assertTrue(numpy.isnan(value))
+            else:
+                self.assertAlmostEqual(value, expected)
+
+    def test_vectorized(self):
+        """
+        Expressions using numpy functions are evaluated once for all the
+        assignments.
+        """
+        with mock.patch('calc.calc.evaluate_tree', wraps=calc.calc.evaluate_tree) as evaluate_tree:
+            self.assert_same_as_evaluator('x^2 + 3*sin(y) - x/y + 2k')
+            self.assertEqual(evaluate_tree.call_count, 1 + len(self.variables_list))
+
+    def test_fallback(self):
+        """
+        Expressions that can't be evaluated on arrays are evaluated for each
+        assignment, with the values and errors of evaluator.
+        """
+        # Domain errors, non-ufunc and custom functions and parallel resistors.
+        self.assert_same_as_evaluator('sqrt(x)')
+        self.assert_same_as_evaluator('arccot(x)')
+        self.assert_same_as_evaluator('x || y')
+        self.assert_same_as_evaluator('f(x)', functions={'f': lambda x: x if x > 0 else 0})
+        self.assert_same_as_evaluator('fact(y)', variables_list=[{'y': 2}, {'y': 3}])
+
+        with self.assertRaises(ZeroDivisionError):
+            calc.batch_evaluator([{'x': 1.0}, {'x': 0.0}], {}, '1/x')
+        with self.assertRaises(ValueError):
+            calc.batch_evaluator([{'x': 1.0}, {'x': 0.5}], {}, 'fact(x)')
+
+    def test_no_variables(self):
+        """
+        Expressions without variables have the same value for every assignment.
+        """
+        self.assertEqual(calc.batch_evaluator(self.variables_list, {}, '2*3'), [6.0] * 3)
+        self.assertTrue(all(numpy.isnan(value) for value in calc.batch_evaluator(self.variables_list, {}, ' ')))
@@ -16,9 +16,11 @@ This is used by capa_module.
 from collections import OrderedDict
 from copy import deepcopy
 from datetime import datetime
+import hashlib
 import logging
 import os.path
 import re
+import threading
 
 from lxml import etree
 from pytz import UTC
@@ -69,8 +71,60 @@ html_problem_semantics = [
     "openendedrubric",
 ]
 
+# Maximum number of parsed problems kept in memory per process, see
+# ProblemTemplateCache.
+PROBLEM_TEMPLATE_CACHE_SIZE = 500
+
 log = logging.getLogger(__name__)
 
+
+class ProblemTemplateCache(object):
+    """
+    In-process LRU cache of the parsed problems that LoncapaProblem copies
+    its element tree and a11y data from.
+
+    The XML of a problem is the same for every learner, only the seed and
+    the state differ, so the stages of building a LoncapaProblem that don't
+    depend on them - parsing the XML, making it compatible and assigning
+    IDs to its responses, inputs and solutions - are done once per problem.
+    """
+    def __init__(self, max_size):
+        self.max_size = max_size
+        self._templates = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """
+        Returns the (element tree, a11y data) template cached under the key,
+        or None.  The template must not be modified.
+        """
+        with self._lock:
+            template = self._templates.pop(key, None)
+            if template is not None:
+                self._templates[key] = template
+            return template
+
+    def set(self, key, template):
+        """
+        Caches the (element tree, a11y data) template under the key,
+        evicting the least recently used templates beyond max_size.
+        """
+        with self._lock:
+            self._templates.pop(key, None)
+            self._templates[key] = template
+            while len(self._templates) > self.max_size:
+                self._templates.popitem(last=False)
+
+    def clear(self):
+        """
+        Removes all the cached templates.
+        """
+        with self._lock:
+            self._templates.clear()
+
+
+PROBLEM_TEMPLATE_CACHE = ProblemTemplateCache(PROBLEM_TEMPLATE_CACHE_SIZE)
+
 #-----------------------------------------------------------------------------
 # main class for this module
 
@@ -174,22 +228,17 @@ class LoncapaProblem(object):
         problem_text = re.sub(r"endouttext\s*/", "/text", problem_text)
         self.problem_text = problem_text
 
-        # parse problem XML file into an element tree
-        self.tree = etree.XML(problem_text)
-
-        self.make_xml_compatible(self.tree)
-
-        # handle any <include file="foo"> tags
-        self._process_includes()
+        # parse problem XML file into an element tree, with ID's added, or copy
+        # the one parsed for a previous instance of the problem
+        self.tree, self.problem_data = self._get_problem_template()
 
         # construct script processor context (eg for customresponse problems)
         self.context = self._extract_context(self.tree)
 
-        # Pre-parse the XML tree: modifies it to add ID's and perform some in-place
-        # transformations.  This also creates the dict (self.responders) of Response
+        # Pre-parse the XML tree: creates the dict (self.responders) of Response
         # instances for each question in the problem. The dict has keys = xml subtree of
         # Response, values = Response instance
-        self.problem_data = self._preprocess_problem(self.tree)
+        self._preprocess_problem(self.tree)
 
         if not self.student_answers:  # True when student_answers is an empty dict
             self.set_initial_display()
@@ -208,6 +257,41 @@ class LoncapaProblem(object):
 
         self.extracted_tree = self._extract_html(self.tree)
 
+    def _get_problem_template(self):
+        """
+        Returns the element tree of the problem, made compatible, with its
+        includes processed and the ID's of its responses, inputs and
+        solutions assigned, and its a11y data.
+
+        These only depend on the problem's XML and id, so they're copied
+        from PROBLEM_TEMPLATE_CACHE when cached there.  Problems including
+        files aren't cached, as the files are read from the course's
+        filestore.
+        """
+        problem_text = self.problem_text
+        if isinstance(problem_text, unicode):
+            problem_text = problem_text.encode('utf-8')
+        key = (self.problem_id, hashlib.sha1(problem_text).hexdigest())
+
+        template = PROBLEM_TEMPLATE_CACHE.get(key)
+        if template is None:
+            self.tree = etree.XML(self.problem_text)
+
+            self.make_xml_compatible(self.tree)
+
+            # handle any <include file="foo"> tags
+            has_includes = self.tree.find('.//include') is not None
+            self._process_includes()
+
+            problem_data = self._assign_ids(self.tree)
+            if has_includes:
+                return self.tree, problem_data
+            template = (self.tree, problem_data)
+            PROBLEM_TEMPLATE_CACHE.set(key, template)
+
+        tree, problem_data = template
+        return deepcopy(tree), deepcopy(problem_data)
+
     def make_xml_compatible(self, tree):
         """
         Adjust tree xml in-place for compatibility before creating
@@ -840,34 +924,27 @@ class LoncapaProblem(object):
 
         return tree
 
-    def _preprocess_problem(self, tree):  # private
+    def _assign_ids(self, tree):  # private
         """
         Assign IDs to all the responses
         Assign sub-IDs to all entries (textline, schematic, etc.)
-        Annoted correctness and value
+        Assign IDs to all the solutions
         In-place transformation
 
-        Also create capa Response instances for each responsetype and save as self.responders
-
-        Obtain all responder answers and save as self.responder_answers dict (key = response)
+        Returns the a11y data of the inputs, see response_a11y_data.
         """
         response_id = 1
         problem_data = {}
-        self.responders = {}
-        for response in tree.xpath('//' + "|//".join(responsetypes.registry.registered_tags())):
+        for response in self._get_responses(tree):
             responsetype_id = self.problem_id + "_" + str(response_id)
             # create and save ID for this response
             response.set('id', responsetype_id)
             response_id += 1
 
-            answer_id = 1
-            input_tags = inputtypes.registry.registered_tags()
-            inputfields = tree.xpath(
-                "|".join(['//' + response.tag + '[@id=$id]//' + x for x in input_tags]),
-                id=responsetype_id
-            )
+            inputfields = self._get_inputfields(tree, response)
 
             # assign one answer_id for each input type
+            answer_id = 1
             for entry in inputfields:
                 entry.attrib['response_id'] = str(response_id)
                 entry.attrib['answer_id'] = str(answer_id)
@@ -876,6 +953,43 @@ class LoncapaProblem(object):
 
             self.response_a11y_data(response, inputfields, responsetype_id, problem_data)
 
+        # <solution>...</solution> may not be associated with any specific response; give
+        # IDs for those separately
+        # TODO: We should make the namespaces consistent and unique (e.g. %s_problem_%i).
+        solution_id = 1
+        for solution in tree.findall('.//solution'):
+            solution.attrib['id'] = "%s_solution_%i" % (self.problem_id, solution_id)
+            solution_id += 1
+
+        return problem_data
+
+    def _get_responses(self, tree):  # private
+        """
+        Returns the response elements of the tree, in document order.
+        """
+        return tree.xpath('//' + "|//".join(responsetypes.registry.registered_tags()))
+
+    def _get_inputfields(self, tree, response):  # private
+        """
+        Returns the input elements of the response, once its ID is assigned.
+        """
+        input_tags = inputtypes.registry.registered_tags()
+        return tree.xpath(
+            "|".join(['//' + response.tag + '[@id=$id]//' + x for x in input_tags]),
+            id=response.get('id')
+        )
+
+    def _preprocess_problem(self, tree):  # private
+        """
+        Create capa Response instances for each responsetype of the tree, whose
+        IDs are assigned, and save as self.responders
+
+        Obtain all responder answers and save as self.responder_answers dict (key = response)
+        """
+        self.responders = {}
+        for response in self._get_responses(tree):
+            inputfields = self._get_inputfields(tree, response)
+
             # instantiate capa Response
             responsetype_cls = responsetypes.registry.get_class_for_tag(response.tag)
             responder = responsetype_cls(response, inputfields, self.context, self.capa_system, self.capa_module)
@@ -893,16 +1007,6 @@ class LoncapaProblem(object):
                           self.responders[response])  # FIXME
                 raise
 
-        # <solution>...</solution> may not be associated with any specific response; give
-        # IDs for those separately
-        # TODO: We should make the namespaces consistent and unique (e.g. %s_problem_%i).
-        solution_id = 1
-        for solution in tree.findall('.//solution'):
-            solution.attrib['id'] = "%s_solution_%i" % (self.problem_id, solution_id)
-            solution_id += 1
-
-        return problem_data
-
     def response_a11y_data(self, response, inputfields, responsetype_id, problem_data):
         """
         Construct data to be used for a11y.
@@ -1,3 +1,5 @@
 """Capa's specialized use of codejail.safe_exec."""
 
 from .safe_exec import safe_exec, update_hash
+
+__all__ = ["safe_exec", "update_hash"]
@@ -4,9 +4,14 @@ from codejail.safe_exec import safe_exec as codejail_safe_exec
 from codejail.safe_exec import not_safe_exec as codejail_not_safe_exec
 from codejail.safe_exec import json_safe, SafeExecException
 from . import lazymod
+from .sandbox_pool import SANDBOX_POOL
 from dogapi import dog_stats_api
 
+from collections import OrderedDict
 import hashlib
+import json
+import threading
+import time
 
 # Establish the Python environment for Capa.
 # Capa assumes float-friendly division always.
@@ -46,6 +51,67 @@ for name, modname in ASSUMED_IMPORTS:
 
 LAZY_IMPORTS = "".join(LAZY_IMPORTS)
 
+# Total size, in bytes of JSON, of the results kept in RESULT_CACHE.
+RESULT_CACHE_MAX_SIZE = 10 * 1024 * 1024
+
+
+class ResultCache(object):
+    """
+    In-process LRU cache of the results of safe_exec, bounded by the total
+    size of the results, in bytes of JSON, rather than by their number.
+
+    Results are kept as JSON, so that every get returns a new copy of the
+    globals, as a shared cache does.  Results that are larger than the whole
+    cache aren't kept.
+    """
+
+    def __init__(self, max_size):
+        self.max_size = max_size
+        self.size = 0
+        self._results = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """
+        Returns the (exception message, globals) result cached under the key,
+        or None.
+        """
+        with self._lock:
+            result_json = self._results.pop(key, None)
+            if result_json is None:
+                return None
+            self._results[key] = result_json
+        return tuple(json.loads(result_json))
+
+    def set(self, key, result):
+        """
+        Caches the (exception message, globals) result under the key,
+        evicting the least recently used results beyond max_size.
+        """
+        result_json = json.dumps(result)
+        with self._lock:
+            previous_json = self._results.pop(key, None)
+            if previous_json is not None:
+                self.size -= len(previous_json)
+            if len(result_json) > self.max_size:
+                return
+            self._results[key] = result_json
+            self.size += len(result_json)
+            while self.size > self.max_size:
+                _, evicted_json = self._results.popitem(last=False)
+                self.size -= len(evicted_json)
+
+    def clear(self):
+        """
+        Removes all the cached results.
+        """
+        with self._lock:
+            self._results.clear()
+            self.size = 0
+
+
+RESULT_CACHE = ResultCache(RESULT_CACHE_MAX_SIZE)
+
 
 def update_hash(hasher, obj):
     """
@@ -99,7 +165,8 @@ def safe_exec(
 
     `cache` is an object with .get(key) and .set(key, value) methods.  It will be used
     to cache the execution, taking into account the code, the values of the globals,
-    and the random seed.
+    and the random seed.  Results are also kept in the process's RESULT_CACHE, which
+    is checked first.
 
     `slug` is an arbitrary string, a description that's meaningful to the
     caller, that will be used in log messages.
@@ -114,7 +181,11 @@ def safe_exec(
         md5er.update(repr(code))
         update_hash(md5er, safe_globals)
         key = "safe_exec.%r.%s" % (random_seed, md5er.hexdigest())
-        cached = cache.get(key)
+        cached = RESULT_CACHE.get(key)
+        if cached is None:
+            cached = cache.get(key)
+            if cached is not None:
+                RESULT_CACHE.set(key, cached)
         if cached is not None:
             # We have a cached result.  The result is a pair: the exception
             # message, if any, else None; and the resulting globals dictionary.
@@ -130,10 +201,16 @@ def safe_exec(
     # Decide which code executor to use.
     if unsafely:
         exec_fn = codejail_not_safe_exec
+        sandbox = 'none'
+    elif SANDBOX_POOL.is_enabled():
+        exec_fn = SANDBOX_POOL.safe_exec
+        sandbox = 'warm'
     else:
         exec_fn = codejail_safe_exec
+        sandbox = 'codejail'
 
     # Run the code!  Results are side effects in globals_dict.
+    start = time.time()
     try:
         exec_fn(
             code_prolog + LAZY_IMPORTS + code, globals_dict,
@@ -143,11 +220,17 @@ def safe_exec(
         emsg = e.message
     else:
         emsg = None
+    dog_stats_api.histogram(
+        'capa.safe_exec.exec_time',
+        time.time() - start,
+        tags=[u'slug:{}'.format(slug), u'sandbox:{}'.format(sandbox)],
+    )
 
     # Put the result back in the cache.  This is complicated by the fact that
     # the globals dict might not be entirely serializable.
     if cache:
         cleaned_results = json_safe(globals_dict)
+        RESULT_CACHE.set(key, (emsg, cleaned_results))
         cache.set(key, (emsg, cleaned_results))
 
     # If an exception happened, raise it now.
@@ -0,0 +1,229 @@
+"""
+A pool of warm CodeJail sandboxes for capa's safe_exec.
+
+Starting a jailed Python process - sudo, then the sandboxed interpreter - is
+a large part of the time it takes to run a problem's code.  The pool starts
+sandboxes ahead of time, each one waiting for its job on stdin, so that a
+job only pays for sending its code and reading back the resulting globals.
+
+A sandbox runs exactly one job and then exits, so every job still gets a
+fresh interpreter.  Sandboxes are started with the command line, user and
+process limits that CodeJail is configured with, the same way CodeJail
+starts them, so they have the same security profile as
+codejail.safe_exec.safe_exec.
+"""
+
+import atexit
+import json
+import logging
+import os
+import os.path
+import shutil
+import subprocess
+import tempfile
+import threading
+
+from codejail import jail_code
+from codejail.safe_exec import SafeExecException, json_safe
+
+log = logging.getLogger(__name__)
+
+# The code each sandbox runs.  It is the code codejail.safe_exec runs, except
+# that the Python path is read from stdin along with the code and globals,
+# since the job isn't known yet when the sandbox is started.
+SANDBOX_RUNNER = """\
+import sys
+try:
+    import simplejson as json
+except ImportError:
+    import json
+
+class DevNull(object):
+    def write(self, *args, **kwargs):
+        pass
+
+sys.stdout = DevNull()
+
+code, g_dict, python_path = json.load(sys.stdin)
+for pybase in python_path:
+    sys.path.append(pybase)
+
+exec code in g_dict
+
+ok_types = (
+    type(None), int, long, float, str, unicode, list, tuple, dict
+)
+bad_keys = ("__builtins__",)
+def jsonable(v):
+    if not isinstance(v, ok_types):
+        return False
+    try:
+        json.dumps(v)
+    except Exception:
+        return False
+    return True
+g_dict = {
+    k:v
+    for k,v in g_dict.iteritems()
+    if jsonable(v) and k not in bad_keys
+}
+
+json.dump(g_dict, sys.__stdout__)
+"""
+
+
+class Sandbox(object):
+    """
+    A jailed Python process, started ahead of time to run one job.
+    """
+
+    def __init__(self):
+        self.homedir = tempfile.mkdtemp(prefix="codejail-")
+        # The sandbox user needs to be able to read the directory.
+        os.chmod(self.homedir, 0775)
+        with open(os.path.join(self.homedir, "jailed_code"), "w") as runner:
+            runner.write(SANDBOX_RUNNER)
+
+        cmd = []
+        user = jail_code.COMMANDS["python"]["user"]
+        if user:
+            cmd.extend(['sudo', '-u', user])
+        cmd.extend(jail_code.COMMANDS["python"]["cmdline_start"])
+        cmd.append("jailed_code")
+
+        self.subproc = subprocess.Popen(
+            cmd, preexec_fn=jail_code.set_process_limits, cwd=self.homedir, env={},
+            stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+        )
+
+    def is_ready(self):
+        """
+        Returns whether the process is still waiting for its job.
+        """
+        return self.subproc.poll() is None
+
+    def run(self, code, globals_dict, python_path=None, extra_files=None, slug=None):
+        """
+        Runs `code` with the globals in `globals_dict`, and updates them with
+        the resulting globals, as codejail.safe_exec.safe_exec does.
+
+        Raises SafeExecException if the code raised an exception or the
+        process was killed on a limit.
+        """
+        extra_files = extra_files or ()
+        extra_names = set(name for name, contents in extra_files)
+        path_names = []
+        for pydir in python_path or ():
+            pybase = os.path.basename(pydir)
+            path_names.append(pybase)
+            if pybase not in extra_names:
+                dest = os.path.join(self.homedir, pybase)
+                if os.path.isdir(pydir):
+                    shutil.copytree(pydir, dest)
+                else:
+                    shutil.copy(pydir, dest)
+        for name, contents in extra_files:
+            with open(os.path.join(self.homedir, name), "wb") as extra_file:
+                extra_file.write(contents)
+
+        log.info("Executing jailed code %s in warm sandbox %s, with PID %s", slug, self.homedir, self.subproc.pid)
+        # The real time limit applies from when the job is sent, not from
+        # when the sandbox was started.
+        realtime = jail_code.LIMITS["REALTIME"]
+        if realtime:
+            killer = jail_code.ProcessKillerThread(self.subproc, limit=realtime)
+            killer.start()
+
+        stdout, stderr = self.subproc.communicate(json.dumps([code, json_safe(globals_dict), path_names]))
+        if self.subproc.returncode != 0:
+            raise SafeExecException("Couldn't execute jailed code: %s" % stderr)
+        globals_dict.update(json.loads(stdout))
+
+    def close(self):
+        """
+        Stops the process if it is still waiting for its job, and removes its
+        directory.
+        """
+        if self.is_ready():
+            # Without a job, the process stops on reading the end of stdin.
+            self.subproc.stdin.close()
+        shutil.rmtree(self.homedir, ignore_errors=True)
+
+
+class SandboxPool(object):
+    """
+    Keeps `size` sandboxes started and waiting for jobs, for the process.
+
+    The pool is disabled while its size is zero, or while CodeJail isn't
+    configured to sandbox Python.
+    """
+
+    def __init__(self, size=0):
+        self.size = size
+        self._sandboxes = []
+        self._pid = os.getpid()
+        self._lock = threading.Lock()
+
+    def configure(self, size):
+        """
+        Sets the number of sandboxes to keep waiting for jobs.
+        """
+        self.close()
+        self.size = size
+
+    def is_enabled(self):
+        """
+        Returns whether safe_exec should run its jobs in the pool.
+        """
+        return self.size > 0 and jail_code.is_configured("python")
+
+    def safe_exec(self, code, globals_dict, python_path=None, extra_files=None, slug=None):
+        """
+        Runs `code` in a warm sandbox, with the same arguments and results
+        as codejail.safe_exec.safe_exec.
+        """
+        sandbox = self._take()
+        try:
+            sandbox.run(code, globals_dict, python_path=python_path, extra_files=extra_files, slug=slug)
+        finally:
+            sandbox.close()
+
+    def close(self):
+        """
+        Stops the sandboxes waiting for jobs.
+        """
+        with self._lock:
+            if self._pid == os.getpid():
+                for sandbox in self._sandboxes:
+                    sandbox.close()
+            self._sandboxes = []
+
+    def _take(self):
+        """
+        Returns a sandbox that is waiting for its job, and starts another one
+        to replace it in the pool.
+        """
+        with self._lock:
+            if self._pid != os.getpid():
+                # The sandboxes were started by the process this one was
+                # forked from, and belong to it.
+                self._pid = os.getpid()
+                self._sandboxes = []
+
+            sandbox = None
+            while self._sandboxes and sandbox is None:
+                candidate = self._sandboxes.pop(0)
+                if candidate.is_ready():
+                    sandbox = candidate
+                else:
+                    log.warning("Warm sandbox %s exited before running a job", candidate.homedir)
+                    candidate.close()
+
+            while len(self._sandboxes) < self.size:
+                self._sandboxes.append(Sandbox())
+
+        return sandbox if sandbox is not None else Sandbox()
+
+
+SANDBOX_POOL = SandboxPool()
+atexit.register(SANDBOX_POOL.close)
@@ -1,18 +1,26 @@
 """Test safe_exec.py"""
 
 import hashlib
+import json
 import os
 import os.path
 import random
+import sys
 import textwrap
 import unittest
 
+from mock import ANY, Mock, patch
 from nose.plugins.skip import SkipTest
 
 from capa.safe_exec import safe_exec, update_hash
+from capa.safe_exec.safe_exec import RESULT_CACHE, ResultCache
+from capa.safe_exec.sandbox_pool import SANDBOX_POOL, SandboxPool
 from codejail.safe_exec import SafeExecException
 from codejail.jail_code import is_configured
 
+# The module, since the package exports its safe_exec function by the same name.
+SAFE_EXEC_MODULE = sys.modules[safe_exec.__module__]
+
 
 class TestSafeExec(unittest.TestCase):
     def test_set_values(self):
@@ -110,6 +118,12 @@ class DictCache(object):
 class TestSafeExecCaching(unittest.TestCase):
     """Test that caching works on safe_exec."""
 
+    def setUp(self):
+        super(TestSafeExecCaching, self).setUp()
+        # Results kept in the process would hide changes made to the caches below.
+        RESULT_CACHE.clear()
+        self.addCleanup(RESULT_CACHE.clear)
+
     def test_cache_miss_then_hit(self):
         g = {}
         cache = {}
@@ -122,6 +136,7 @@ class TestSafeExecCaching(unittest.TestCase):
 
         # Fiddle with the cache, then try it again.
         cache[cache.keys()[0]] = (None, {'a': 17})
+        RESULT_CACHE.clear()
 
         g = {}
         safe_exec("a = int(math.pi)", g, cache=DictCache(cache))
@@ -153,6 +168,7 @@ class TestSafeExecCaching(unittest.TestCase):
 
         # Change the value stored in the cache, the result should change.
         cache[cache.keys()[0]] = ("Hey there!", {})
+        RESULT_CACHE.clear()
 
         with self.assertRaises(SafeExecException):
             safe_exec(code, g, cache=DictCache(cache))
@@ -163,9 +179,30 @@ class TestSafeExecCaching(unittest.TestCase):
 
         # Change it again, now no exception!
         cache[cache.keys()[0]] = (None, {'a': 17})
+        RESULT_CACHE.clear()
         safe_exec(code, g, cache=DictCache(cache))
         self.assertEqual(g['a'], 17)
 
+    def test_result_cache_hit(self):
+        # A result kept in the process is used without asking the cache.
+        cache = {}
+        safe_exec("a = int(math.pi)", {}, cache=DictCache(cache))
+        cache.clear()
+
+        g = {}
+        with patch.object(SAFE_EXEC_MODULE, 'codejail_safe_exec') as mock_safe_exec:
+            safe_exec("a = int(math.pi)", g, cache=DictCache(cache))
+        self.assertEqual(g['a'], 3)
+        self.assertFalse(mock_safe_exec.called)
+        self.assertEqual(cache, {})
+
+    def test_exec_time_published(self):
+        with patch.object(SAFE_EXEC_MODULE.dog_stats_api, 'histogram') as mock_histogram:
+            safe_exec("a = 1", {}, slug="one")
+        mock_histogram.assert_called_once_with(
+            'capa.safe_exec.exec_time', ANY, tags=[u'slug:one', u'sandbox:codejail']
+        )
+
     def test_unicode_submission(self):
         # Check that using non-ASCII unicode does not raise an encoding error.
         # Try several non-ASCII unicode characters.
@@ -177,6 +214,98 @@ class TestSafeExecCaching(unittest.TestCase):
                 self.fail("Tried executing code with non-ASCII unicode: {0}".format(code))
 
 
+class TestResultCache(unittest.TestCase):
+    """Test the bounds of ResultCache."""
+
+    def test_bounded_by_total_size(self):
+        result_size = len(json.dumps((None, {'a': 'x' * 10})))
+        cache = ResultCache(3 * result_size)
+        for key in "abcd":
+            cache.set(key, (None, {'a': 'x' * 10}))
+        self.assertEqual(cache.size, 3 * result_size)
+        # The least recently used result was evicted.
+        self.assertIsNone(cache.get("a"))
+        self.assertEqual(cache.get("b"), (None, {'a': 'x' * 10}))
+
+    def test_least_recently_used_evicted(self):
+        result_size = len(json.dumps((None, {'a': 1})))
+        cache = ResultCache(2 * result_size)
+        cache.set("a", (None, {'a': 1}))
+        cache.set("b", (None, {'a': 1}))
+        cache.get("a")
+        cache.set("c", (None, {'a': 1}))
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.get("a"), (None, {'a': 1}))
+
+    def test_too_large_result_not_kept(self):
+        cache = ResultCache(100)
+        cache.set("a", (None, {'a': 'x' * 10}))
+        cache.set("b", (None, {'a': 'x' * 1000}))
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.get("a"), (None, {'a': 'x' * 10}))
+
+    def test_results_are_copies(self):
+        cache = ResultCache(1000)
+        cache.set("a", (None, {'a': [1, 2]}))
+        cache.get("a")[1]['a'].append(3)
+        self.assertEqual(cache.get("a"), (None, {'a': [1, 2]}))
+
+
+class TestSandboxPool(unittest.TestCase):
+    """Test running safe_exec in warm sandboxes."""
+
+    def setUp(self):
+        super(TestSandboxPool, self).setUp()
+        self.pool = SandboxPool()
+        self.addCleanup(self.pool.close)
+
+    def test_disabled_without_size(self):
+        self.assertFalse(self.pool.is_enabled())
+
+    def test_keeps_sandboxes_ready(self):
+        self.pool.configure(2)
+        with patch('capa.safe_exec.sandbox_pool.Sandbox') as mock_sandbox_class:
+            mock_sandbox_class.side_effect = lambda: Mock()
+            first = self.pool._take()  # pylint: disable=protected-access
+            self.assertEqual(mock_sandbox_class.call_count, 3)
+
+            # An exited sandbox is replaced, the next ready one is used.
+            self.pool._sandboxes[0].is_ready.return_value = False  # pylint: disable=protected-access
+            waiting = self.pool._sandboxes[1]  # pylint: disable=protected-access
+            second = self.pool._take()  # pylint: disable=protected-access
+        self.assertIsNot(first, second)
+        self.assertIs(second, waiting)
+        self.assertEqual(len(self.pool._sandboxes), 2)  # pylint: disable=protected-access
+        self.assertEqual(mock_sandbox_class.call_count, 5)
+
+    def test_safe_exec_in_pool(self):
+        # Can't run warm sandboxes if CodeJail isn't configured for python.
+        if not is_configured("python"):
+            raise SkipTest
+
+        SANDBOX_POOL.configure(2)
+        self.addCleanup(SANDBOX_POOL.configure, 0)
+        with patch.object(SANDBOX_POOL, 'safe_exec', wraps=SANDBOX_POOL.safe_exec) as mock_pool_safe_exec:
+            g = {}
+            safe_exec("import sys; sys.leftover = 17; a = int(math.pi)", g)
+            self.assertEqual(g['a'], 3)
+
+            # Each job gets a fresh interpreter.
+            g = {}
+            safe_exec("import sys; a = hasattr(sys, 'leftover')", g)
+            self.assertFalse(g['a'])
+
+            pylib = os.path.dirname(__file__) + "/test_files/pylib"
+            g = {}
+            safe_exec("import constant; a = constant.THE_CONST", g, python_path=[pylib])
+            self.assertEqual(g['a'], 23)
+
+            with self.assertRaises(SafeExecException) as cm:
+                safe_exec("1/0", {})
+            self.assertIn("ZeroDivisionError", cm.exception.message)
+        self.assertEqual(mock_pool_safe_exec.call_count, 4)
+
+
 class TestUpdateHash(unittest.TestCase):
     """Test the safe_exec.update_hash function to be sure it canonicalizes properly."""
 
@@ -4,8 +4,10 @@ Test capa problem.
 import ddt
 import textwrap
 from lxml import etree
+from mock import patch
 import unittest
 
+from capa.capa_problem import PROBLEM_TEMPLATE_CACHE, ProblemTemplateCache
 from capa.tests.helpers import new_loncapa_problem
 
 
@@ -537,3 +539,56 @@ class CAPAMultiInputProblemTest(unittest.TestCase):
         """.format(group_label, input1_label, input2_label, inputtype=inputtype))
         problem = self.capa_problem(xml)
         self.assert_problem_html(problem.get_html(), group_label, input1_label, input2_label)
+
+
+class ProblemTemplateCacheTest(unittest.TestCase):
+    """ Tests for the cache of parsed problems """
+
+    XML = """
+    <problem>
+        <choiceresponse>
+            <label>Select the correct synonym of paranoid?</label>
+            <checkboxgroup>
+                <choice correct="true">over-suspicious</choice>
+                <choice correct="false">funny</choice>
+            </checkboxgroup>
+        </choiceresponse>
+        <solution><p>Over-suspicious.</p></solution>
+    </problem>
+    """
+
+    def setUp(self):
+        super(ProblemTemplateCacheTest, self).setUp()
+        PROBLEM_TEMPLATE_CACHE.clear()
+        self.addCleanup(PROBLEM_TEMPLATE_CACHE.clear)
+
+    def test_parsed_once(self):
+        """
+        Verify that the problem is parsed once, and that each instance gets
+        its own copy of the tree.
+        """
+        problem = new_loncapa_problem(self.XML)
+        with patch('capa.capa_problem.etree.XML') as mock_xml:
+            other_problem = new_loncapa_problem(self.XML, seed=1)
+        self.assertFalse(mock_xml.called)
+
+        self.assertEqual(etree.tostring(problem.tree), etree.tostring(other_problem.tree))
+        self.assertEqual(problem.problem_data, other_problem.problem_data)
+        self.assertEqual(problem.tree.xpath('//solution/@id'), ['1_solution_1'])
+        self.assertIsNot(problem.tree, other_problem.tree)
+        self.assertEqual(
+            sorted(responder.id for responder in other_problem.responders.values()), ['1_1']
+        )
+
+    def test_lru_eviction(self):
+        """
+        Verify that the least recently used templates are evicted.
+        """
+        cache = ProblemTemplateCache(2)
+        cache.set('a', 1)
+        cache.set('b', 2)
+        self.assertEqual(cache.get('a'), 1)
+        cache.set('c', 3)
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual(cache.get('a'), 1)
+        self.assertEqual(cache.get('c'), 3)
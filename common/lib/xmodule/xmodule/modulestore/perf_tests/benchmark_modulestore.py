@@ -0,0 +1,254 @@
+"""
+Benchmark of the hot modulestore operations against old Mongo and split.
+
+Generates synthetic courses of the given sizes and shape in each
+modulestore, times each operation on them, and saves the timings in the
+sqlite database read by generate_report.py, under the given run id,
+typically the revision benchmarked.  Compare revisions with:
+
+    python -m xmodule.modulestore.perf_tests.benchmark_modulestore --run_id $(git rev-parse --short HEAD)
+    python -m xmodule.modulestore.perf_tests.generate_report --data_type modulestore report.html
+
+The modulestores are built on the mongod at MONGO_HOST:MONGO_PORT_NUM,
+in databases dropped at the end of the run.
+"""
+import argparse
+from contextlib import contextmanager
+import datetime
+import itertools
+from shutil import rmtree
+import sqlite3
+from tempfile import mkdtemp
+import time
+
+from xmodule.modulestore import ModuleStoreEnum
+from xmodule.modulestore.tests.utils import DRAFT_MODULESTORE_SETUP, SPLIT_MODULESTORE_SETUP
+from xmodule.modulestore.xml_exporter import export_course_to_xml
+from xmodule.modulestore.xml_importer import import_course_from_xml
+from xmodule.modulestore.perf_tests.generate_report import DB_NAME
+
+
+# The modulestores benchmarked, by name.
+MODULESTORE_SETUPS = (
+    ('mongo', DRAFT_MODULESTORE_SETUP),
+    ('split', SPLIT_MODULESTORE_SETUP),
+)
+
+# Default number of chapters of the generated courses, one course per
+# number.
+COURSE_SIZES = (1, 10, 50)
+
+# Default shape of the generated courses below the chapters, as
+# (category, number of children per parent).
+COURSE_SHAPE = (('sequential', 5), ('vertical', 4), ('problem', 3))
+
+# Number of parents looked up by the get_parent_location operation.
+PARENT_LOOKUPS = 100
+
+# Default number of times each operation is timed.
+REPEAT = 3
+
+# Prefix of the descriptions of the timings saved by this benchmark.
+BENCHMARK_NAME = 'ModulestoreBenchmark'
+
+USER_ID = ModuleStoreEnum.UserID.test
+
+
+class TimingRecorder(object):
+    """
+    Saves timings in the block_times table of generate_report.py's sqlite
+    database, as code_block_timer does.
+    """
+    def __init__(self, db_name, run_id):
+        self.run_id = run_id
+        self.conn = sqlite3.connect(db_name)
+        self.conn.execute(
+            'CREATE TABLE IF NOT EXISTS block_times ('
+            'id INTEGER PRIMARY KEY, run_id TEXT, block_desc TEXT, elapsed REAL, timestamp TEXT)'
+        )
+        self.results = []
+
+    @contextmanager
+    def timer(self, block_desc):
+        """
+        Times the code run in the context, saved with the given description.
+        """
+        start = time.time()
+        yield
+        elapsed = (time.time() - start) * 1000
+        self.conn.execute(
+            'INSERT INTO block_times (run_id, block_desc, elapsed, timestamp) VALUES (?, ?, ?, ?)',
+            (self.run_id, block_desc, elapsed, datetime.datetime.utcnow().isoformat()),
+        )
+        self.conn.commit()
+        self.results.append((block_desc, elapsed))
+
+    def close(self):
+        """
+        Closes the database connection.
+        """
+        self.conn.close()
+
+
+def generate_course(store, course_key, num_chapters, shape=COURSE_SHAPE):
+    """
+    Creates a course with the given number of chapters, with the given
+    shape below each chapter, and returns it.
+    """
+    with store.bulk_operations(course_key):
+        course = store.create_course(course_key.org, course_key.course, course_key.run, USER_ID)
+        parents = [course.location]
+        for category, num_children in ((('chapter', num_chapters),) + tuple(shape)):
+            children = []
+            for parent in parents:
+                for _ in range(num_children):
+                    child = store.create_child(
+                        USER_ID, parent, category, block_id='{}_{}'.format(category, len(children))
+                    )
+                    children.append(child.location)
+            parents = children
+    return course
+
+
+def _walk(block):
+    """
+    Loads all the descendants of the block.
+    """
+    for child in block.get_children():
+        _walk(child)
+
+
+class _ThrowawayCache(object):
+    """
+    An in-memory cache with the methods the block structure cache uses, so
+    that each collection of the benchmark starts from an empty cache.
+    """
+    def __init__(self):
+        self.map = {}
+
+    def get(self, key, default=None):
+        return self.map.get(key, default)
+
+    def get_many(self, keys):
+        return {key: self.map[key] for key in keys if key in self.map}
+
+    def set(self, key, value, timeout=None):  # pylint: disable=unused-argument
+        self.map[key] = value
+
+    def set_many(self, data, timeout=None):  # pylint: disable=unused-argument
+        self.map.update(data)
+
+    def delete(self, key):
+        self.map.pop(key, None)
+
+    def delete_many(self, keys):
+        for key in keys:
+            self.delete(key)
+
+
+def benchmark_course(recorder, store, contentstore, course_key, desc, repeat):
+    """
+    Times each operation on the course with the given key.
+    """
+    # Block structures are built from the modulestore by openedx, outside
+    # xmodule, but their collection is one of the hot modulestore reads, so
+    # it's timed here along with the modulestore's own operations.
+    from openedx.core.lib.block_structure.manager import BlockStructureManager
+
+    problem_locations = [
+        problem.location for problem in store.get_items(course_key, qualifiers={'category': 'problem'})
+    ][:PARENT_LOOKUPS]
+
+    for index in range(repeat):
+        with recorder.timer('{}:get_course'.format(desc)):
+            _walk(store.get_course(course_key, depth=None))
+
+        with recorder.timer('{}:get_items'.format(desc)):
+            store.get_items(course_key, qualifiers={'category': 'problem'})
+
+        with recorder.timer('{}:get_parent_location'.format(desc)):
+            for location in problem_locations:
+                store.get_parent_location(location)
+
+        with recorder.timer('{}:publish'.format(desc)):
+            store.publish(store.make_course_usage_key(course_key), USER_ID)
+
+        with recorder.timer('{}:block_structure_collect'.format(desc)):
+            manager = BlockStructureManager(store.make_course_usage_key(course_key), store, _ThrowawayCache())
+            manager.update_collected(force_full=True)
+
+        export_dir = mkdtemp()
+        try:
+            with recorder.timer('{}:export'.format(desc)):
+                export_course_to_xml(store, contentstore, course_key, export_dir, 'course')
+
+            with recorder.timer('{}:import'.format(desc)):
+                import_course_from_xml(
+                    store,
+                    USER_ID,
+                    export_dir,
+                    source_dirs=['course'],
+                    static_content_store=contentstore,
+                    target_id=store.make_course_key(course_key.org, course_key.course, 'import{}'.format(index)),
+                    create_if_not_present=True,
+                    raise_on_failure=True,
+                )
+        finally:
+            rmtree(export_dir, ignore_errors=True)
+
+
+def run(recorder, course_sizes=COURSE_SIZES, shape=COURSE_SHAPE, repeat=REPEAT):
+    """
+    Runs the benchmark for each modulestore and course size.
+    """
+    for (store_name, setup), num_chapters in itertools.product(MODULESTORE_SETUPS, course_sizes):
+        desc = '{}:{}:{}'.format(BENCHMARK_NAME, store_name, num_chapters)
+        with setup.build() as (contentstore, store):
+            course_key = store.make_course_key('Benchmark', 'Course{}'.format(num_chapters), 'run')
+            with recorder.timer('{}:generate'.format(desc)):
+                generate_course(store, course_key, num_chapters, shape)
+            benchmark_course(recorder, store, contentstore, course_key, desc, repeat)
+
+
+def _parse_shape(value):
+    """
+    Parses a course shape given as category:number pairs separated by
+    commas, e.g. sequential:5,vertical:4,problem:3.
+    """
+    shape = []
+    for level in value.split(','):
+        category, num_children = level.split(':')
+        shape.append((category, int(num_children)))
+    return tuple(shape)
+
+
+def main():
+    """
+    Runs the benchmark and prints its results.
+    """
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--run_id', required=True, help='Id of the run, typically the revision benchmarked.')
+    parser.add_argument('--db_name', default=DB_NAME, help='Name of the sqlite database to save the timings in.')
+    parser.add_argument(
+        '--sizes', type=lambda value: [int(size) for size in value.split(',')], default=COURSE_SIZES,
+        help='Numbers of chapters of the generated courses, separated by commas.'
+    )
+    parser.add_argument(
+        '--shape', type=_parse_shape, default=COURSE_SHAPE,
+        help='Shape of the generated courses below the chapters, e.g. sequential:5,vertical:4,problem:3.'
+    )
+    parser.add_argument('--repeat', type=int, default=REPEAT, help='Number of times each operation is timed.')
+    args = parser.parse_args()
+
+    recorder = TimingRecorder(args.db_name, args.run_id)
+    try:
+        run(recorder, args.sizes, args.shape, args.repeat)
+    finally:
+        recorder.close()
+
+    for block_desc, elapsed in recorder.results:
+        print "{:<60}{:>12.1f}".format(block_desc, elapsed)
+
+
+if __name__ == '__main__':
+    main()
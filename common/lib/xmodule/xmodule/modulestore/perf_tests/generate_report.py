@@ -265,11 +265,72 @@ class FindReportGen(ReportGenerator):
         return html
 
 
+class ModulestoreReportGen(ReportGenerator):
+    """
+    Class which generates report for modulestore benchmark data, comparing
+    the runs of benchmark_modulestore.py, typically of different revisions.
+    """
+    def __init__(self, db_name):
+        super(ModulestoreReportGen, self).__init__(db_name)
+        self._read_timing_data()
+
+    def _read_timing_data(self):
+        """
+        Read in the timing data from the sqlite DB and save into a dict.
+        """
+        self.run_data = {}
+
+        # Runs are compared in the order they were made.
+        run_start = {}
+        for row in self.all_rows:
+            run_id, block_desc, time_taken, timestamp = row[1:5]
+
+            # Split apart the description into its parts.
+            desc_parts = block_desc.split(':')
+            if desc_parts[0] != 'ModulestoreBenchmark' or len(desc_parts) != 4:
+                continue
+            modulestore, num_chapters, operation = desc_parts[1:4]
+            run_start[run_id] = min(run_start.get(run_id, timestamp), timestamp)
+
+            # Save the fastest of the timings in a multi-level dict:
+            #   { operation1: { (modulestore1, num_chapters1): { run_id1: duration, ...}, ...}, ...}.
+            runs = self.run_data.setdefault(operation, {}).setdefault((modulestore, int(num_chapters)), {})
+            runs[run_id] = min(runs.get(run_id, time_taken), time_taken)
+
+        self.run_ids = sorted(run_start, key=run_start.get)
+
+    def generate_html(self):
+        """
+        Generate HTML.
+        """
+        html = HTMLDocument("Results")
+
+        # Output each operation to a different table, with a column per run.
+        for operation in sorted(self.run_data.keys()):
+            per_operation = self.run_data[operation]
+            columns = ["Modulestore", "Chapters"]
+            for run_id in self.run_ids:
+                columns.append("Time Taken (ms) ({})".format(run_id))
+            operation_table = HTMLTable(columns)
+            for modulestore, num_chapters in sorted(per_operation.keys()):
+                per_runs = per_operation[(modulestore, num_chapters)]
+                row = [modulestore, "{}".format(num_chapters)]
+                for run_id in self.run_ids:
+                    row.append("{:.1f}".format(per_runs[run_id]) if run_id in per_runs else '')
+                operation_table.add_row(row)
+            html.add_header(2, operation)
+            html.add_to_body(operation_table.table)
+
+        return html
+
+
 if click is not None:
     @click.command()
     @click.argument('outfile', type=click.File('w'), default='-', required=False)
     @click.option('--db_name', help='Name of sqlite database from which to read data.', default=DB_NAME)
-    @click.option('--data_type', help='Data type to process. One of: "imp_exp" or "find"', default="find")
+    @click.option(
+        '--data_type', help='Data type to process. One of: "imp_exp", "find" or "modulestore"', default="find"
+    )
     def cli(outfile, db_name, data_type):
         """
         Generate an HTML report from the sqlite timing data.
@@ -280,6 +341,9 @@ if click is not None:
         elif data_type == 'find':
             f_gen = FindReportGen(db_name)
             html = f_gen.generate_html()
+        elif data_type == 'modulestore':
+            ms_gen = ModulestoreReportGen(db_name)
+            html = ms_gen.generate_html()
         click.echo(html.tostring(), file=outfile)
 
 if __name__ == '__main__':
@@ -8,6 +8,8 @@ import zlib
 import pymongo
 import pytz
 import re
+import threading
+from collections import OrderedDict
 from contextlib import contextmanager
 from time import time
 
@@ -15,6 +17,7 @@ from time import time
 from pymongo.errors import DuplicateKeyError  # pylint: disable=unused-import
 
 try:
+    from django.conf import settings
     from django.core.cache import caches, InvalidCacheBackendError
     DJANGO_AVAILABLE = True
 except ImportError:
@@ -44,6 +47,16 @@ def get_cache(alias):
     return caches[alias]
 
 
+def get_local_cache_size():
+    """
+    Return the maximum size of the in-process structure cache, from the
+    COURSE_STRUCTURE_LOCAL_CACHE_SIZE setting.  0 disables it.
+    """
+    if not DJANGO_AVAILABLE or not settings.configured:
+        return 0
+    return getattr(settings, 'COURSE_STRUCTURE_LOCAL_CACHE_SIZE', 0)
+
+
 def round_power_2(value):
     """
     Return value rounded up to the nearest power of 2.
@@ -225,6 +238,71 @@ def structure_to_mongo(structure, course_context=None):
         return new_structure
 
 
+class LocalStructureCache(object):
+    """
+    A size-bounded, least recently used cache of pickled course structures,
+    shared by all the requests of the process.
+
+    Structures are immutable by id, so cached structures never go stale.
+    Split modulestore modifies the structures it's given in place though,
+    so each get unpickles a new copy of the structure rather than sharing
+    one between requests.  Compared with the django cache, this saves the
+    round trip and the decompression.
+    """
+    def __init__(self):
+        self._structures = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def get(self, key, course_context=None):
+        """Return a copy of the cached structure for key, or None."""
+        with TIMER.timer("LocalStructureCache.get", course_context) as tagger:
+            with self._lock:
+                entry = self._structures.pop(key, None)
+                if entry is not None:
+                    # Move the structure to the most recently used end
+                    self._structures[key] = entry
+            tagger.tag(from_cache=str(entry is not None).lower())
+
+            if entry is None:
+                return None
+            return pickle.loads(entry)
+
+    def set(self, key, pickled_data, max_size, course_context=None):
+        """
+        Cache the pickled structure for key, evicting the least recently used
+        structures until the total size is at most max_size.
+        """
+        size = len(pickled_data)
+        with TIMER.timer("LocalStructureCache.set", course_context) as tagger:
+            tagger.measure('uncompressed_size', size)
+            if size > max_size:
+                tagger.tag(too_large='true')
+                return
+
+            evictions = 0
+            with self._lock:
+                old_entry = self._structures.pop(key, None)
+                if old_entry is not None:
+                    self._size -= len(old_entry)
+                self._structures[key] = pickled_data
+                self._size += size
+                while self._size > max_size:
+                    _, evicted_entry = self._structures.popitem(last=False)
+                    self._size -= len(evicted_entry)
+                    evictions += 1
+            tagger.measure('evictions', evictions)
+
+    def clear(self):
+        """Remove all the cached structures."""
+        with self._lock:
+            self._structures.clear()
+            self._size = 0
+
+
+LOCAL_STRUCTURE_CACHE = LocalStructureCache()
+
+
 class CourseStructureCache(object):
     """
     Wrapper around django cache object to cache course structure objects.
@@ -232,17 +310,28 @@ class CourseStructureCache(object):
 
     If the 'course_structure_cache' doesn't exist, then don't do anything for
     for set and get.
+
+    When COURSE_STRUCTURE_LOCAL_CACHE_SIZE is set, pickled structures are
+    also kept uncompressed in the process's LOCAL_STRUCTURE_CACHE, which is
+    checked before the django cache.
     """
     def __init__(self):
         self.cache = None
+        self.local_cache_size = 0
         if DJANGO_AVAILABLE:
             try:
                 self.cache = get_cache('course_structure_cache')
             except InvalidCacheBackendError:
                 pass
+            self.local_cache_size = get_local_cache_size()
 
     def get(self, key, course_context=None):
         """Pull the compressed, pickled struct data from cache and deserialize."""
+        if self.local_cache_size:
+            structure = LOCAL_STRUCTURE_CACHE.get(key, course_context)
+            if structure is not None:
+                return structure
+
         if self.cache is None:
             return None
 
@@ -260,23 +349,31 @@ class CourseStructureCache(object):
             pickled_data = zlib.decompress(compressed_pickled_data)
             tagger.measure('uncompressed_size', len(pickled_data))
 
-            return pickle.loads(pickled_data)
+            structure = pickle.loads(pickled_data)
+
+        if self.local_cache_size:
+            LOCAL_STRUCTURE_CACHE.set(key, pickled_data, self.local_cache_size, course_context)
+        return structure
 
     def set(self, key, structure, course_context=None):
         """Given a structure, will pickle, compress, and write to cache."""
-        if self.cache is None:
+        if self.cache is None and not self.local_cache_size:
             return None
 
         with TIMER.timer("CourseStructureCache.set", course_context) as tagger:
             pickled_data = pickle.dumps(structure, pickle.HIGHEST_PROTOCOL)
             tagger.measure('uncompressed_size', len(pickled_data))
 
-            # 1 = Fastest (slightly larger results)
-            compressed_pickled_data = zlib.compress(pickled_data, 1)
-            tagger.measure('compressed_size', len(compressed_pickled_data))
+            if self.cache is not None:
+                # 1 = Fastest (slightly larger results)
+                compressed_pickled_data = zlib.compress(pickled_data, 1)
+                tagger.measure('compressed_size', len(compressed_pickled_data))
+
+                # Stuctures are immutable, so we set a timeout of "never"
+                self.cache.set(key, compressed_pickled_data, None)
 
-            # Stuctures are immutable, so we set a timeout of "never"
-            self.cache.set(key, compressed_pickled_data, None)
+        if self.local_cache_size:
+            LOCAL_STRUCTURE_CACHE.set(key, pickled_data, self.local_cache_size, course_context)
 
 
 class MongoConnection(object):
@@ -342,6 +342,9 @@ class SplitBulkWriteMixin(BulkOperationsMixin):
         (no data will be written to the database if a bulk operation is active.)
         """
         self._clear_cache(structure['_id'])
+        # Keep the indexes of the structure if all its changes were applied to them.
+        if not self._pop_structure_indexes_maintained(structure):
+            self._clear_structure_indexes(structure)
         bulk_write_record = self._get_bulk_ops_record(course_key)
         if bulk_write_record.active:
             bulk_write_record.structures[structure['_id']] = structure
@@ -824,6 +827,7 @@ class SplitMongoModuleStore(SplitBulkWriteMixin, ModuleStoreWriteBase):
                 pass
         else:
             self.request_cache.data['course_cache'] = {}
+            self.request_cache.data['structure_index_cache'] = {}
 
     def _lookup_course(self, course_key, head_validation=True):
         """
@@ -1178,35 +1182,43 @@ class SplitMongoModuleStore(SplitBulkWriteMixin, ModuleStoreWriteBase):
             return []
 
         course = self._lookup_course(course_locator)
+        blocks = course.structure['blocks']
         items = []
         qualifiers = qualifiers.copy() if qualifiers else {}  # copy the qualifiers (destructively manipulated here)
 
-        def _block_matches_all(block_data):
+        def _blocks_matching_all(block_keys):
             """
-            Check that the block matches all the criteria
+            Return the given block_keys whose blocks match all the criteria
             """
             # do the checks which don't require loading any additional data
-            if (  # pylint: disable=bad-continuation
-                self._block_matches(block_data, qualifiers) and
-                self._block_matches(block_data.fields, settings)
-            ):
-                if content:
-                    definition_block = self.get_definition(course_locator, block_data.definition)
-                    return self._block_matches(definition_block['fields'], content)
-                else:
-                    return True
+            matching_keys = [
+                block_key for block_key in block_keys
+                if self._block_matches(blocks[block_key], qualifiers) and
+                self._block_matches(blocks[block_key].fields, settings)
+            ]
+            if content and matching_keys:
+                # load the definitions of the remaining blocks all at once
+                definitions = {
+                    definition['_id']: definition
+                    for definition in self.get_definitions(
+                        course_locator, [blocks[block_key].definition for block_key in matching_keys]
+                    )
+                }
+                matching_keys = [
+                    block_key for block_key in matching_keys
+                    if blocks[block_key].definition in definitions and
+                    self._block_matches(definitions[blocks[block_key].definition]['fields'], content)
+                ]
+            return matching_keys
 
         if settings is None:
             settings = {}
         if 'name' in qualifiers:
             # odd case where we don't search just confirm
             block_name = qualifiers.pop('name')
-            block_ids = []
-            for block_id, block in course.structure['blocks'].iteritems():
-                # Do an in comparison on the name qualifier
-                # so that a list can be used to filter on block_id
-                if block_id.id in block_name and _block_matches_all(block):
-                    block_ids.append(block_id)
+            # Do an in comparison on the name qualifier
+            # so that a list can be used to filter on block_id
+            block_ids = _blocks_matching_all([block_id for block_id in blocks if block_id.id in block_name])
 
             return self._load_items(course, block_ids, **kwargs)
 
@@ -1223,24 +1235,55 @@ class SplitMongoModuleStore(SplitBulkWriteMixin, ModuleStoreWriteBase):
 
         if not include_orphans:
             path_cache = {}
-            parents_cache = self.build_block_key_to_parents_mapping(course.structure)
-
-        for block_id, value in course.structure['blocks'].iteritems():
-            if _block_matches_all(value):
-                if not include_orphans:
-                    if (  # pylint: disable=bad-continuation
-                        block_id.type in DETACHED_XBLOCK_TYPES or
-                        self.has_path_to_root(block_id, course, path_cache, parents_cache)
-                    ):
-                        items.append(block_id)
-                else:
+            # Parents are looked up in the parents index of the structure, which is
+            # cached for the request.  Without a request cache, the index would be
+            # rebuilt on each lookup, so it's built once here instead.
+            if self.request_cache is None:
+                parents_cache = self.build_block_key_to_parents_mapping(course.structure)
+
+        block_keys = self._get_block_keys_of_type(course.structure, qualifiers.get('block_type'))
+        for block_id in _blocks_matching_all(block_keys):
+            if not include_orphans:
+                if (  # pylint: disable=bad-continuation
+                    block_id.type in DETACHED_XBLOCK_TYPES or
+                    self.has_path_to_root(block_id, course, path_cache, parents_cache)
+                ):
                     items.append(block_id)
+            else:
+                items.append(block_id)
 
         if len(items) > 0:
             return self._load_items(course, items, depth=0, **kwargs)
         else:
             return []
 
+    def _get_block_keys_of_type(self, structure, block_type):
+        """
+        Return the block_keys in the structure which may match the given block_type
+        qualifier of get_items, using the block type index of the structure when the
+        qualifier is a block type or a {'$in': [block types]} dict.  Otherwise, return
+        all the block_keys in the structure.
+        """
+        if isinstance(block_type, basestring):
+            block_types = [block_type]
+        elif (
+                isinstance(block_type, dict) and block_type.keys() == ['$in'] and
+                all(isinstance(value, basestring) for value in block_type['$in'])
+        ):
+            block_types = set(block_type['$in'])
+        else:
+            return structure['blocks'].keys()
+
+        blocks = structure['blocks']
+        block_type_index = self._get_block_type_index(structure)
+        # Blocks may have been removed from the structure since the index was built.
+        return [
+            block_key
+            for type_name in block_types
+            for block_key in block_type_index.get(type_name, [])
+            if block_key in blocks
+        ]
+
     def build_block_key_to_parents_mapping(self, structure):
         """
         Given a structure, builds block_key to parents mapping for all block keys in structure
@@ -1770,16 +1813,22 @@ class SplitMongoModuleStore(SplitBulkWriteMixin, ModuleStoreWriteBase):
                 raise ItemNotFoundError(parent_usage_key)
 
             parent = new_structure['blocks'][block_id]
+            child_block_key = BlockKey.from_usage_key(xblock.location)
 
             # Originally added to support entrance exams (settings.FEATURES.get('ENTRANCE_EXAMS'))
             if kwargs.get('position') is None:
-                parent.fields.setdefault('children', []).append(BlockKey.from_usage_key(xblock.location))
+                parent.fields.setdefault('children', []).append(child_block_key)
             else:
                 parent.fields.setdefault('children', []).insert(
                     kwargs.get('position'),
-                    BlockKey.from_usage_key(xblock.location)
+                    child_block_key
                 )
 
+            # Keep the cached parents index of the structure up to date.
+            indexes = self._get_maintained_structure_indexes(new_structure)
+            if 'parents' in indexes:
+                indexes['parents'][child_block_key].add(block_id)
+
             if parent.edit_info.update_version != new_structure['_id']:
                 # if the parent hadn't been previously changed in this bulk transaction, indicate that it's
                 # part of the bulk transaction
@@ -2375,6 +2424,9 @@ class SplitMongoModuleStore(SplitBulkWriteMixin, ModuleStoreWriteBase):
                     )
                 )
             # remove any remaining orphans
+            # The destination blocks have changed above, so their parents must be
+            # looked up afresh.
+            self._clear_structure_indexes(destination_structure)
             for orphan in orphans:
                 # orphans will include moved as well as deleted xblocks. Only delete the deleted ones.
                 self._delete_if_true_orphan(orphan, destination_structure)
@@ -3121,11 +3173,117 @@ class SplitMongoModuleStore(SplitBulkWriteMixin, ModuleStoreWriteBase):
         Given a structure, find block_key's parent in that structure. Note returns
         the encoded format for parent
         """
-        return [
-            parent_block_key
-            for parent_block_key, value in structure['blocks'].iteritems()
-            if block_key in value.fields.get('children', [])
-        ]
+        blocks = structure['blocks']
+        parents = []
+        for parent_block_key in self._get_parents_index(structure).get(block_key, []):
+            # Blocks may have been removed from the structure, or children from their
+            # parents, since the index was built.
+            parent_block = blocks.get(parent_block_key)
+            if parent_block is not None and block_key in parent_block.fields.get('children', []):
+                parents.append(parent_block_key)
+        return parents
+
+    def _get_parents_index(self, structure):
+        """
+        Return a mapping of block_keys to the set of their parents in the given
+        structure.
+        """
+        return self._get_structure_index(structure, 'parents', self._build_parents_index)
+
+    def _build_parents_index(self, structure):
+        """
+        Map the block_keys of the structure to the set of their parents, as
+        build_block_key_to_parents_mapping does to lists.
+        """
+        parents_index = defaultdict(set)
+        for parent_key, value in structure['blocks'].iteritems():
+            for child_key in value.fields.get('children', []):
+                parents_index[child_key].add(parent_key)
+        return parents_index
+
+    def _get_block_type_index(self, structure):
+        """
+        Return a mapping of block types to the block_keys of that type in the given
+        structure.
+        """
+        def build_block_type_index(structure):
+            """
+            Group the block_keys of the structure by their type.
+            """
+            block_type_index = defaultdict(set)
+            for block_key in structure['blocks']:
+                block_type_index[block_key.type].add(block_key)
+            return block_type_index
+
+        return self._get_structure_index(structure, 'block_type', build_block_type_index)
+
+    def _get_structure_index(self, structure, index_name, build_index=None):
+        """
+        Return the index called index_name of the given structure, building it with
+        build_index(structure) if it isn't cached yet.  If build_index is None, only
+        a cached index is returned, or None.
+
+        Indexes are cached for the rest of the request.  They are discarded by
+        update_structure when the structure is changed, unless the changes were
+        applied to them, see _get_maintained_structure_indexes.
+        """
+        if self.request_cache is None:
+            return build_index(structure) if build_index is not None else None
+
+        indexes = self._get_structure_index_entry(structure)['indexes']
+        if index_name not in indexes:
+            if build_index is None:
+                return None
+            indexes[index_name] = build_index(structure)
+        return indexes[index_name]
+
+    def _get_structure_index_entry(self, structure):
+        """
+        Return the cache entry of the indexes of the given structure, creating it
+        if needed.  The request cache must be available.
+        """
+        # Keyed by the identity of the blocks, which are what the indexes are built from.
+        blocks = structure['blocks']
+        index_cache = self.request_cache.data.setdefault('structure_index_cache', {})
+        entry = index_cache.get(id(blocks))
+        if entry is None or entry['blocks'] is not blocks:
+            entry = {'blocks': blocks, 'indexes': {}, 'maintained': False}
+            index_cache[id(blocks)] = entry
+        return entry
+
+    def _get_maintained_structure_indexes(self, structure):
+        """
+        Return the dict of the cached indexes of the given structure, for the caller
+        to apply its changes of the structure to, and mark them to be kept by the next
+        update_structure of the structure.  Changes that only remove blocks or
+        children needn't be applied, since lookups skip the removed ones.
+        """
+        if self.request_cache is None:
+            return {}
+        entry = self._get_structure_index_entry(structure)
+        entry['maintained'] = True
+        return entry['indexes']
+
+    def _pop_structure_indexes_maintained(self, structure):
+        """
+        Return whether the cached indexes of the given structure were kept up to date
+        with its changes, and reset that mark.
+        """
+        if self.request_cache is None:
+            return False
+        entry = self.request_cache.data.setdefault('structure_index_cache', {}).get(id(structure['blocks']))
+        if entry is None or entry['blocks'] is not structure['blocks']:
+            return False
+        maintained = entry['maintained']
+        entry['maintained'] = False
+        return maintained
+
+    def _clear_structure_indexes(self, structure):
+        """
+        Discard the cached indexes of the given structure, if any.
+        """
+        if self.request_cache is not None:
+            self.request_cache.data.setdefault('structure_index_cache', {}).pop(id(structure['blocks']), None)
 
     def _sync_children(self, source_parent, destination_parent, new_child):
         """
@@ -3316,6 +3474,15 @@ class SplitMongoModuleStore(SplitBulkWriteMixin, ModuleStoreWriteBase):
         """
         structure['blocks'][block_key] = content
 
+        # Keep the cached indexes of the structure up to date.  Children the block
+        # no longer has are filtered out on lookup of their parents.
+        indexes = self._get_maintained_structure_indexes(structure)
+        if 'block_type' in indexes:
+            indexes['block_type'][block_key.type].add(block_key)
+        if 'parents' in indexes:
+            for child_key in content.fields.get('children', []):
+                indexes['parents'][child_key].add(block_key)
+
     @autoretry_read()
     def find_courses_by_search_target(self, field_name, field_value):
         """
@@ -1,7 +1,8 @@
 """
     Test split modulestore w/o using any django stuff.
 """
-from mock import patch
+from mock import Mock, patch
+import cPickle as pickle
 import datetime
 from importlib import import_module
 from path import Path as path
@@ -14,6 +15,7 @@ import ddt
 from contracts import contract
 from nose.plugins.attrib import attr
 from django.core.cache import caches, InvalidCacheBackendError
+from django.test.utils import override_settings
 
 from openedx.core.lib import tempdir
 from xblock.fields import Reference, ReferenceList, ReferenceValueDict
@@ -29,6 +31,7 @@ from ccx_keys.locator import CCXBlockUsageLocator
 from xmodule.modulestore.inheritance import InheritanceMixin
 from xmodule.x_module import XModuleMixin
 from xmodule.fields import Date, Timedelta
+from xmodule.modulestore.split_mongo.mongo_connection import LOCAL_STRUCTURE_CACHE
 from xmodule.modulestore.split_mongo.split import SplitMongoModuleStore
 from xmodule.modulestore.tests.test_modulestore import check_has_course_method
 from xmodule.modulestore.split_mongo import BlockKey
@@ -939,6 +942,10 @@ class TestCourseStructureCache(SplitModuleTest):
         # ... and after
         self.addCleanup(self.cache.clear)
 
+        # the same goes for the in-process structure cache
+        LOCAL_STRUCTURE_CACHE.clear()
+        self.addCleanup(LOCAL_STRUCTURE_CACHE.clear)
+
         # make a new course:
         self.user = random.getrandbits(32)
         self.new_course = modulestore().create_course(
@@ -990,6 +997,55 @@ class TestCourseStructureCache(SplitModuleTest):
         # now make sure that you get the same structure
         self.assertEqual(cached_structure, not_cached_structure)
 
+    @override_settings(COURSE_STRUCTURE_LOCAL_CACHE_SIZE=10 * 1024 * 1024)
+    def test_local_structure_cache(self):
+        with check_mongo_calls(1):
+            not_cached_structure = self._get_structure(self.new_course)
+
+        # The dummy cache doesn't cache anything, but the structure is
+        # now cached in process
+        with check_mongo_calls(0):
+            cached_structure = self._get_structure(self.new_course)
+
+        # and is the same structure
+        self.assertEqual(cached_structure, not_cached_structure)
+
+    @override_settings(COURSE_STRUCTURE_LOCAL_CACHE_SIZE=10 * 1024 * 1024)
+    def test_local_structure_cache_copies(self):
+        structure = self._get_structure(self.new_course)
+        cached_structure = self._get_structure(self.new_course)
+        self.assertIsNot(cached_structure, structure)
+
+        # changes made to a structure in one request don't leak into the next
+        for block in cached_structure['blocks'].itervalues():
+            block.fields['display_name'] = 'changed'
+            block.definition_loaded = True
+        cached_structure['blocks'].clear()
+        with check_mongo_calls(0):
+            self.assertEqual(self._get_structure(self.new_course), structure)
+
+    def test_local_structure_cache_eviction(self):
+        other_course = modulestore().create_course(
+            'org', 'other_course', 'test_run', self.user, BRANCH_NAME_DRAFT,
+        )
+        # make room in the cache for only one of the two structures
+        cache_size = max(
+            len(pickle.dumps(self._get_structure(course), pickle.HIGHEST_PROTOCOL))
+            for course in (self.new_course, other_course)
+        )
+
+        with override_settings(COURSE_STRUCTURE_LOCAL_CACHE_SIZE=cache_size):
+            with check_mongo_calls(1):
+                self._get_structure(self.new_course)
+            with check_mongo_calls(1):
+                self._get_structure(other_course)
+
+            # the least recently used structure was evicted
+            with check_mongo_calls(1):
+                self._get_structure(self.new_course)
+            with check_mongo_calls(0):
+                self._get_structure(self.new_course)
+
     def _get_structure(self, course):
         """
         Helper function to get a structure from a course.
@@ -1211,6 +1267,42 @@ class SplitModuleItemTests(SplitModuleTest):
         matches = modulestore().get_items(locator, settings={'group_access': {'$exists': False}})
         self.assertEqual(len(matches), 6)
 
+    def test_get_items_indexed(self):
+        """
+        Test get_items when the structure's indexes are cached for the request.
+        """
+        store = modulestore()
+        with patch.object(store, 'request_cache', Mock(data={})):
+            course = store.create_course('testx', 'items_index', 'run', self.user_id, BRANCH_NAME_DRAFT)
+            course_key = course.id.version_agnostic()
+            chapter = store.create_child(self.user_id, course.location, 'chapter', block_id='chapter1')
+            store.create_child(
+                self.user_id, chapter.location.version_agnostic(), 'html', block_id='html1',
+                fields={'data': '<p>hello</p>'}
+            )
+            store.create_child(
+                self.user_id, chapter.location.version_agnostic(), 'html', block_id='html2',
+                fields={'data': '<p>goodbye</p>'}
+            )
+
+            self.assertEqual(len(store.get_items(course_key, qualifiers={'category': 'html'})), 2)
+            self.assertEqual(len(store.get_items(course_key, qualifiers={'category': {'$in': ['html', 'chapter']}})), 3)
+            self.assertEqual(len(store.get_items(course_key, qualifiers={'category': 'garbage'})), 0)
+
+            # Blocks added after the index was built are found.
+            store.create_child(self.user_id, course_key.make_usage_key('chapter', 'chapter1'), 'html', block_id='html3')
+            self.assertEqual(len(store.get_items(course_key, qualifiers={'category': 'html'})), 3)
+
+            # Definitions are loaded all at once for content qualifiers.
+            with patch.object(store, 'get_definition') as mock_get_definition:
+                with patch.object(store, 'get_definitions', wraps=store.get_definitions) as mock_get_definitions:
+                    matches = store.get_items(
+                        course_key, qualifiers={'category': 'html'}, content={'data': re.compile(r'hello')}
+                    )
+            self.assertEqual([match.location.block_id for match in matches], ['html1'])
+            self.assertEqual(mock_get_definitions.call_count, 1)
+            self.assertFalse(mock_get_definition.called)
+
     def test_get_parents(self):
         '''
         get_parent_location(locator): BlockUsageLocator
@@ -1232,6 +1324,67 @@ class SplitModuleItemTests(SplitModuleTest):
         parent = modulestore().get_parent_location(locator)
         self.assertIsNone(parent)
 
+    def test_get_parents_index(self):
+        """
+        Test that parent lookups within a request share an index of the structure,
+        which is rebuilt once the structure changes.
+        """
+        store = modulestore()
+        with patch.object(store, 'request_cache', Mock(data={})):
+            course = store.create_course('testx', 'parents_index', 'run', self.user_id, BRANCH_NAME_DRAFT)
+            course_key = course.id.version_agnostic()
+            chapter1 = store.create_child(self.user_id, course.location, 'chapter', block_id='chapter1')
+            store.create_child(self.user_id, course.location, 'chapter', block_id='chapter2')
+            store.create_child(self.user_id, chapter1.location.version_agnostic(), 'problem', block_id='problem')
+            chapter1_locator = course_key.make_usage_key('chapter', 'chapter1')
+            chapter2_locator = course_key.make_usage_key('chapter', 'chapter2')
+            problem_locator = course_key.make_usage_key('problem', 'problem')
+
+            with patch.object(
+                store, '_build_parents_index', wraps=store._build_parents_index  # pylint: disable=protected-access
+            ) as mock_build_index:
+                self.assertEqual(store.get_parent_location(problem_locator).block_id, 'chapter1')
+                self.assertEqual(store.get_parent_location(chapter1_locator).block_id, course.location.block_id)
+                problems = store.get_items(course_key, qualifiers={'category': 'problem'}, include_orphans=False)
+                self.assertEqual([problem.location.block_id for problem in problems], ['problem'])
+                self.assertEqual(mock_build_index.call_count, 1)
+
+            # Move the problem to the other chapter
+            chapter1 = store.get_item(chapter1_locator)
+            chapter1.children = []
+            store.update_item(chapter1, self.user_id)
+            chapter2 = store.get_item(chapter2_locator)
+            chapter2.children.append(problem_locator)
+            store.update_item(chapter2, self.user_id)
+            self.assertEqual(store.get_parent_location(problem_locator).block_id, 'chapter2')
+
+            # Delete the chapter the problem is in
+            store.delete_item(chapter2_locator, self.user_id)
+            self.assertIsNone(store.get_parent_location(problem_locator))
+
+    def test_parents_index_kept_in_bulk_operation(self):
+        """
+        Test that, within a bulk operation, creating children updates the parents index
+        of the structure rather than discarding it.
+        """
+        store = modulestore()
+        with patch.object(store, 'request_cache', Mock(data={})):
+            course = store.create_course('testx', 'bulk_parents_index', 'run', self.user_id, BRANCH_NAME_DRAFT)
+            course_key = course.id.version_agnostic()
+            with patch.object(
+                store, '_build_parents_index', wraps=store._build_parents_index  # pylint: disable=protected-access
+            ) as mock_build_index:
+                with store.bulk_operations(course_key):
+                    chapter = store.create_child(self.user_id, course.location, 'chapter', block_id='chapter')
+                    chapter_locator = chapter.location.version_agnostic()
+                    self.assertEqual(store.get_parent_location(chapter_locator).block_id, course.location.block_id)
+                    for index in range(3):
+                        store.create_child(self.user_id, chapter_locator, 'problem', block_id='problem{}'.format(index))
+                    for index in range(3):
+                        problem_locator = course_key.make_usage_key('problem', 'problem{}'.format(index))
+                        self.assertEqual(store.get_parent_location(problem_locator).block_id, 'chapter')
+                self.assertEqual(mock_build_index.call_count, 1)
+
     @patch('xmodule.tabs.CourseTab.from_json', side_effect=mock_tab_from_json)
     def test_get_children(self, _from_json):
         """
@@ -28,6 +28,7 @@ import mimetypes
 from path import Path as path
 import json
 import re
+from multiprocessing.pool import ThreadPool
 from lxml import etree
 
 from xmodule.library_tools import LibraryToolsService
@@ -55,10 +56,27 @@ from xmodule.util.misc import escape_invalid_characters
 log = logging.getLogger(__name__)
 
 
+# Number of threads saving static assets to the contentstore in parallel
+# during an import.
+STATIC_CONTENT_IMPORT_WORKERS = 4
+
+# Size, in bytes, of the chunks static assets are read and saved in.
+STATIC_CONTENT_IMPORT_CHUNK_SIZE = 1024 * 1024
+
+
 def import_static_content(
         course_data_path, static_content_store,
-        target_id, subpath='static', verbose=False):
-
+        target_id, subpath='static', verbose=False, num_workers=STATIC_CONTENT_IMPORT_WORKERS):
+    """
+    Imports the static assets in the `subpath` directory of the course into
+    the contentstore, and returns a dict mapping the imported files' paths
+    to their asset keys.
+
+    The assets are saved by a pool of `num_workers` threads, each of which
+    generates the thumbnail of an asset from its file and then streams the
+    file into the contentstore in chunks, so that assets are never read into
+    memory whole.  An asset that fails to save is logged and skipped.
+    """
     remap_dict = {}
 
     # now import all static assets
@@ -77,75 +95,125 @@ def import_static_content(
     mimetypes.add_type('application/octet-stream', '.srt')
     mimetypes_list = mimetypes.types_map.values()
 
-    for dirname, _, filenames in os.walk(static_dir):
-        for filename in filenames:
+    def iter_static_contents():
+        """
+        Yields a (StaticContent, file path) tuple for each asset to import.
+        """
+        for dirname, _, filenames in os.walk(static_dir):
+            for filename in filenames:
 
-            content_path = os.path.join(dirname, filename)
+                content_path = os.path.join(dirname, filename)
 
-            if re.match(ASSET_IGNORE_REGEX, filename):
-                if verbose:
-                    log.debug('skipping static content %s...', content_path)
-                continue
+                if re.match(ASSET_IGNORE_REGEX, filename):
+                    if verbose:
+                        log.debug('skipping static content %s...', content_path)
+                    continue
 
-            if verbose:
-                log.debug('importing static content %s...', content_path)
+                if verbose:
+                    log.debug('importing static content %s...', content_path)
 
-            try:
-                with open(content_path, 'rb') as f:
-                    data = f.read()
-            except IOError:
-                if filename.startswith('._'):
-                    # OS X "companion files". See
-                    # http://www.diigo.com/annotated/0c936fda5da4aa1159c189cea227e174
-                    continue
-                # Not a 'hidden file', then re-raise exception
-                raise
+                try:
+                    # The data is streamed from the file when it's saved.
+                    with open(content_path, 'rb'):
+                        pass
+                except IOError:
+                    if filename.startswith('._'):
+                        # OS X "companion files". See
+                        # http://www.diigo.com/annotated/0c936fda5da4aa1159c189cea227e174
+                        continue
+                    # Not a 'hidden file', then re-raise exception
+                    raise
+
+                # strip away leading path from the name
+                fullname_with_subpath = content_path.replace(static_dir, '')
+                if fullname_with_subpath.startswith('/'):
+                    fullname_with_subpath = fullname_with_subpath[1:]
+                asset_key = StaticContent.compute_location(target_id, fullname_with_subpath)
+
+                policy_ele = policy.get(asset_key.path, {})
+
+                # During export display name is used to create files, strip away slashes from name
+                displayname = escape_invalid_characters(
+                    name=policy_ele.get('displayname', filename),
+                    invalid_char_list=['/', '\\']
+                )
+                locked = policy_ele.get('locked', False)
+                mime_type = policy_ele.get('contentType')
+
+                # Check extracted contentType in list of all valid mimetypes
+                if not mime_type or mime_type not in mimetypes_list:
+                    mime_type = mimetypes.guess_type(filename)[0]   # Assign guessed mimetype
+                content = StaticContent(
+                    asset_key, displayname, mime_type, _StaticFileChunks(content_path),
+                    import_path=fullname_with_subpath, locked=locked
+                )
 
-            # strip away leading path from the name
-            fullname_with_subpath = content_path.replace(static_dir, '')
-            if fullname_with_subpath.startswith('/'):
-                fullname_with_subpath = fullname_with_subpath[1:]
-            asset_key = StaticContent.compute_location(target_id, fullname_with_subpath)
+                # store the remapping information which will be needed
+                # to subsitute in the module data
+                remap_dict[fullname_with_subpath] = asset_key
 
-            policy_ele = policy.get(asset_key.path, {})
+                yield content, content_path
 
-            # During export display name is used to create files, strip away slashes from name
-            displayname = escape_invalid_characters(
-                name=policy_ele.get('displayname', filename),
-                invalid_char_list=['/', '\\']
-            )
-            locked = policy_ele.get('locked', False)
-            mime_type = policy_ele.get('contentType')
-
-            # Check extracted contentType in list of all valid mimetypes
-            if not mime_type or mime_type not in mimetypes_list:
-                mime_type = mimetypes.guess_type(filename)[0]   # Assign guessed mimetype
-            content = StaticContent(
-                asset_key, displayname, mime_type, data,
-                import_path=fullname_with_subpath, locked=locked
-            )
+    def save_static_content(static_content):
+        """
+        Saves the asset and its thumbnail, returning whether it was saved.
+        """
+        content, content_path = static_content
 
-            # first let's save a thumbnail so we can get back a thumbnail location
-            thumbnail_content, thumbnail_location = static_content_store.generate_thumbnail(content)
+        # first let's save a thumbnail so we can get back a thumbnail location
+        thumbnail_content, thumbnail_location = static_content_store.generate_thumbnail(
+            content, tempfile_path=content_path
+        )
 
-            if thumbnail_content is not None:
-                content.thumbnail_location = thumbnail_location
+        if thumbnail_content is not None:
+            content.thumbnail_location = thumbnail_location
 
-            # then commit the content
-            try:
-                static_content_store.save(content)
-            except Exception as err:
-                log.exception(u'Error importing {0}, error={1}'.format(
-                    fullname_with_subpath, err
-                ))
+        # then commit the content
+        try:
+            static_content_store.save(content)
+        except Exception as err:  # pylint: disable=broad-except
+            log.exception(u'Error importing {0}, error={1}'.format(
+                content.import_path, err
+            ))
+            return False
+        return True
+
+    # The assets are all listed before any is saved, as a pool stalls when
+    # the iterable of its tasks raises.  Their data isn't read until saved.
+    static_contents = list(iter_static_contents())
+    if num_workers > 1:
+        pool = ThreadPool(num_workers)
+        try:
+            results = pool.map(save_static_content, static_contents, chunksize=1)
+        finally:
+            pool.terminate()
+            pool.join()
+    else:
+        results = [save_static_content(static_content) for static_content in static_contents]
 
-            # store the remapping information which will be needed
-            # to subsitute in the module data
-            remap_dict[fullname_with_subpath] = asset_key
+    if not all(results):
+        log.warning(
+            u'%d of %d static assets of %s failed to import',
+            results.count(False), len(results), static_dir
+        )
 
     return remap_dict
 
 
+class _StaticFileChunks(object):
+    """
+    The data of a static asset being imported, read from its file in chunks
+    each time it's iterated.
+    """
+    def __init__(self, path):
+        self.path = path
+
+    def __iter__(self):
+        with open(self.path, 'rb') as static_file:
+            for chunk in iter(lambda: static_file.read(STATIC_CONTENT_IMPORT_CHUNK_SIZE), ''):
+                yield chunk
+
+
 class ImportManager(object):
     """
     Import xml-based courselikes from data_dir into modulestore.
@@ -208,6 +208,19 @@ class ContentTest(unittest.TestCase):
 
         self.assertEqual(total_length, last_byte - first_byte + 1)
 
+    def test_static_content_stream_data_in_range(self):
+        """
+        Test StaticContent stream_data_in_range function,
+        asserts that we get exactly the requested bytes from the in-memory data
+        """
+        static_content = StaticContent('loc', 'name', 'type', SAMPLE_STRING, length=len(SAMPLE_STRING))
+
+        first_byte = 100
+        last_byte = 1500
+
+        data = ''.join(static_content.stream_data_in_range(first_byte, last_byte))
+        self.assertEqual(data, SAMPLE_STRING[first_byte:last_byte + 1])
+
     def test_static_content_write_js(self):
         """
         Test that only one filename starts with 000.
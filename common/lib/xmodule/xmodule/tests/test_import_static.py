@@ -2,7 +2,7 @@
 Tests that check that we ignore the appropriate files when importing courses.
 """
 import unittest
-from mock import Mock
+from mock import Mock, patch
 from xmodule.modulestore.xml_importer import import_static_content
 from opaque_keys.edx.locations import SlashSeparatedCourseKey
 from xmodule.tests import DATA_DIR
@@ -17,7 +17,7 @@ class IgnoredFilesTestCase(unittest.TestCase):
         content_store.generate_thumbnail.return_value = ("content", "location")
         import_static_content(course_dir, content_store, course_id)
         saved_static_content = [call[0][0] for call in content_store.save.call_args_list]
-        name_val = {sc.name: sc.data for sc in saved_static_content}
+        name_val = {sc.name: ''.join(sc.data) for sc in saved_static_content}
         self.assertIn("example.txt", name_val)
         self.assertNotIn("example.txt~", name_val)
         self.assertIn("GREEN", name_val["example.txt"])
@@ -32,10 +32,41 @@ class IgnoredFilesTestCase(unittest.TestCase):
         content_store.generate_thumbnail.return_value = ("content", "location")
         import_static_content(course_dir, content_store, course_id)
         saved_static_content = [call[0][0] for call in content_store.save.call_args_list]
-        name_val = {sc.name: sc.data for sc in saved_static_content}
+        name_val = {sc.name: ''.join(sc.data) for sc in saved_static_content}
         self.assertIn("example.txt", name_val)
         self.assertIn(".example.txt", name_val)
         self.assertNotIn("._example.txt", name_val)
         self.assertNotIn(".DS_Store", name_val)
         self.assertIn("GREEN", name_val["example.txt"])
         self.assertIn("BLUE", name_val[".example.txt"])
+
+
+class ImportStaticContentTestCase(unittest.TestCase):
+    "Tests for saving the imported static content"
+    def setUp(self):
+        super(ImportStaticContentTestCase, self).setUp()
+        self.course_dir = DATA_DIR / "tilde"
+        self.course_id = SlashSeparatedCourseKey("edX", "tilde", "Fall_2012")
+        self.content_store = Mock()
+        self.content_store.generate_thumbnail.return_value = (None, "location")
+
+    def test_streamed_data(self):
+        with patch('xmodule.modulestore.xml_importer.STATIC_CONTENT_IMPORT_CHUNK_SIZE', 2):
+            import_static_content(self.course_dir, self.content_store, self.course_id, num_workers=1)
+            saved_content = self.content_store.save.call_args[0][0]
+            chunks = list(saved_content.data)
+        self.assertTrue(all(len(chunk) <= 2 for chunk in chunks))
+        self.assertIn("GREEN", ''.join(chunks))
+
+    def test_thumbnail_from_file(self):
+        import_static_content(self.course_dir, self.content_store, self.course_id)
+        __, kwargs = self.content_store.generate_thumbnail.call_args
+        self.assertEqual(kwargs['tempfile_path'], self.course_dir / "static" / "example.txt")
+
+    def test_save_error(self):
+        self.content_store.save.side_effect = Exception("save failed")
+        with patch('xmodule.modulestore.xml_importer.log') as log:
+            remap_dict = import_static_content(self.course_dir, self.content_store, self.course_id)
+        self.assertIn("example.txt", remap_dict)
+        self.assertEqual(log.exception.call_count, 1)
+        self.assertEqual(log.warning.call_count, 1)
@@ -2,6 +2,9 @@
 Models for bulk email
 """
 import logging
+import re
+import string
+
 import markupsafe
 
 from django.contrib.auth.models import User
@@ -17,7 +20,7 @@ from student.roles import CourseStaffRole, CourseInstructorRole
 
 from xmodule_django.models import CourseKeyField
 
-from util.keyword_substitution import substitute_keywords_with_data
+from util.keyword_substitution import get_keyword_function_map, substitute_keywords_with_data
 from util.query import use_read_replica_if_available
 
 log = logging.getLogger(__name__)
@@ -246,6 +249,15 @@ class Optout(models.Model):
 # the location where the email message body is to be inserted.
 COURSE_EMAIL_MESSAGE_BODY_TAG = '{{message_body}}'
 
+# Keys of the email context whose values differ between the recipients of
+# an email.
+COURSE_EMAIL_RECIPIENT_KEYS = ('name', 'email', 'user_id')
+
+# Matches the %%-encoded keywords substituted in message bodies.
+KEYWORD_REGEX = re.compile(
+    '({})'.format('|'.join(re.escape(keyword) for keyword in get_keyword_function_map(None, {})))
+)
+
 
 class CourseEmailTemplate(models.Model):
     """
@@ -331,6 +343,181 @@ class CourseEmailTemplate(models.Model):
                 context[key] = markupsafe.escape(value)
         return CourseEmailTemplate._render(self.html_template, htmltext, context)
 
+    def compile_plaintext(self, plaintext, context):
+        """
+        Compile plain text message, to be rendered for each recipient.
+
+        Returns a CompiledCourseEmailTemplate of the stored plain template
+        and plain text body (`plaintext`), with the values of the provided
+        `context` dict shared by all recipients.
+        """
+        return CompiledCourseEmailTemplate(self.plain_template, plaintext, context)
+
+    def compile_htmltext(self, htmltext, context):
+        """
+        Compile HTML text message, to be rendered for each recipient.
+
+        Returns a CompiledCourseEmailTemplate of the stored HTML template
+        and HTML text body (`htmltext`), with the values of the provided
+        `context` dict shared by all recipients.  String values of the
+        context, the recipients' included, are HTML-escaped.
+        """
+        return CompiledCourseEmailTemplate(self.html_template, htmltext, context, escape=True)
+
+
+class CompiledCourseEmailTemplate(object):
+    """
+    An email message of a template and message body, rendered once for all
+    the recipients of the email but for the parts depending on the
+    recipient.
+
+    The message is kept as a list of lines.  The lines of the template and
+    body that don't refer to the recipient's context values or to %%-encoded
+    keywords are formatted and wrapped once, when compiled, and `render`
+    only fills in and wraps the other ones.  The result is the same as
+    CourseEmailTemplate._render with the shared context updated with the
+    recipient's.
+    """
+
+    def __init__(self, format_string, message_body, context, escape=False):
+        """
+        Compiles the message of the template (`format_string`) and
+        `message_body` for the `context` shared by all recipients, which
+        values of COURSE_EMAIL_RECIPIENT_KEYS are ignored.  If `escape` is
+        true, string values of the context are HTML-escaped.
+        """
+        self.escape = escape
+        self.context = {
+            key: self._escape_value(value) for key, value in context.iteritems()
+            if key not in COURSE_EMAIL_RECIPIENT_KEYS
+        }
+        self.formatter = string.Formatter()
+
+        # Substitute all %%-encoded keywords in the message body, as long as
+        # the data is there to do so.
+        substitute_keywords = 'course_id' in context and context.get('course_title') is not None
+        body_parts = KEYWORD_REGEX.split(message_body) if substitute_keywords else [message_body]
+        body_parts = [_KeywordSlot(part) if index % 2 else part for index, part in enumerate(body_parts)]
+
+        # Insert the message body in place of the (formatted) body tag.
+        parts = []
+        message_body_tag = COURSE_EMAIL_MESSAGE_BODY_TAG.format()
+        for part in self._compile_format_string(format_string):
+            if body_parts is not None and isinstance(part, basestring) and message_body_tag in part:
+                before, after = part.split(message_body_tag, 1)
+                parts.extend([before] + body_parts + [after])
+                body_parts = None
+            else:
+                parts.append(part)
+
+        # Split the message into lines, and wrap the lines without slots.
+        lines = [[]]
+        for part in parts:
+            if isinstance(part, basestring):
+                part_lines = part.split(u'\n')
+                lines[-1].append(part_lines[0])
+                lines.extend([part_line] for part_line in part_lines[1:])
+            else:
+                lines[-1].append(part)
+        self.lines = [
+            wrap_message(u''.join(line)) if all(isinstance(part, basestring) for part in line) else line
+            for line in lines
+        ]
+
+    def _escape_value(self, value):
+        """
+        Returns the context value, HTML-escaped if required and a string.
+        """
+        if self.escape and isinstance(value, basestring):
+            return markupsafe.escape(value)
+        return value
+
+    def _compile_format_string(self, format_string):
+        """
+        Returns the format string as a list of the unicode strings it's
+        formatted to with the shared context, and of _FieldSlots where it
+        refers to the recipient's context values.
+        """
+        parts = [u'']
+        for literal, field_name, format_spec, conversion in self.formatter.parse(format_string):
+            parts[-1] += literal
+            if field_name is None:
+                continue
+            if re.match(r'[^.[]*', field_name).group() in COURSE_EMAIL_RECIPIENT_KEYS or '{' in format_spec:
+                parts.extend([_FieldSlot(field_name, format_spec, conversion), u''])
+            else:
+                parts[-1] += _FieldSlot(field_name, format_spec, conversion).render(self.formatter, self.context)
+        return parts
+
+    def render(self, recipient_context):
+        """
+        Create the message for the recipient with the given values of
+        COURSE_EMAIL_RECIPIENT_KEYS.
+
+        Output is returned as a unicode string, as by
+        CourseEmailTemplate._render.
+        """
+        context = dict(self.context)
+        for key, value in recipient_context.iteritems():
+            context[key] = self._escape_value(value)
+
+        keyword_values = {}
+        rendered_lines = []
+        for line in self.lines:
+            if isinstance(line, basestring):
+                rendered_lines.append(line)
+                continue
+            rendered_parts = []
+            for part in line:
+                if isinstance(part, _FieldSlot):
+                    rendered_parts.append(part.render(self.formatter, context))
+                elif isinstance(part, _KeywordSlot):
+                    if part.keyword not in keyword_values:
+                        keyword_values[part.keyword] = part.render(context)
+                    rendered_parts.append(keyword_values[part.keyword])
+                else:
+                    rendered_parts.append(part)
+            rendered_lines.append(wrap_message(u''.join(rendered_parts)))
+        return u'\n'.join(rendered_lines)
+
+
+class _FieldSlot(object):
+    """
+    A replacement field of a CompiledCourseEmailTemplate's format string.
+    """
+
+    def __init__(self, field_name, format_spec, conversion):
+        self.field_name = field_name
+        self.format_spec = format_spec
+        self.conversion = conversion
+
+    def render(self, formatter, context):
+        """
+        Returns the field formatted with the given context, as by format().
+        """
+        value = formatter.convert_field(formatter.get_field(self.field_name, (), context)[0], self.conversion)
+        format_spec = formatter.vformat(self.format_spec, (), context)
+        return unicode(formatter.format_field(value, format_spec))
+
+
+class _KeywordSlot(object):
+    """
+    A %%-encoded keyword of a CompiledCourseEmailTemplate's message body.
+    """
+
+    def __init__(self, keyword):
+        self.keyword = keyword
+
+    def render(self, context):
+        """
+        Returns the keyword's replacement for the given context, or the
+        keyword itself if there's no user to substitute it for.
+        """
+        user_id = context.get('user_id')
+        if user_id is None:
+            return self.keyword
+        return get_keyword_function_map(user_id, context)[self.keyword]()
+
 
 class CourseAuthorization(models.Model):
     """
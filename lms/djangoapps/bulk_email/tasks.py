@@ -8,7 +8,7 @@ import json
 import logging
 import random
 import re
-from time import sleep
+from time import sleep, time
 
 import dogstats_wrapper as dog_stats_api
 from smtplib import SMTPServerDisconnected, SMTPDataError, SMTPConnectError, SMTPException
@@ -482,138 +482,197 @@ def _send_course_email(entry_id, email_id, to_list, global_email_context, subtas
 
     # use the CourseEmailTemplate that was associated with the CourseEmail
     course_email_template = course_email.get_template()
+    messages_per_send = max(settings.BULK_EMAIL_MESSAGES_PER_SEND, 1)
+    start_time = time()
+    send_time = 0.0
     try:
         connection = get_connection()
         connection.open()
 
-        # Define context values to use in all course emails:
-        email_context = {'name': '', 'email': ''}
-        email_context.update(global_email_context)
+        # Define context values to use in all course emails, and render the parts of the
+        # messages that don't depend on the recipient once for all recipients:
+        email_context = dict(global_email_context, course_id=course_email.course_id)
+        plaintext_template = course_email_template.compile_plaintext(course_email.text_message, email_context)
+        html_template = course_email_template.compile_htmltext(course_email.html_message, email_context)
 
         while to_list:
-            # Update context with user-specific values from the user at the end of the list.
-            # At the end of processing this user, they will be popped off of the to_list.
-            # That way, the to_list will always contain the recipients remaining to be emailed.
-            # This is convenient for retries, which will need to send to those who haven't
-            # yet been emailed, but not send to those who have already been sent to.
-            recipient_num += 1
-            current_recipient = to_list[-1]
-            email = current_recipient['email']
-            email_context['email'] = email
-            email_context['name'] = current_recipient['profile__name']
-            email_context['user_id'] = current_recipient['pk']
-            email_context['course_id'] = course_email.course_id
-
-            # Construct message content using templates and context:
-            plaintext_msg = course_email_template.render_plaintext(course_email.text_message, email_context)
-            html_msg = course_email_template.render_htmltext(course_email.html_message, email_context)
-
-            # Create email:
-            email_msg = EmailMultiAlternatives(
-                course_email.subject,
-                plaintext_msg,
-                from_addr,
-                [email],
-                connection=connection
-            )
-            email_msg.attach_alternative(html_msg, 'text/html')
+            # Send to the users at the end of the list, in batches of messages_per_send,
+            # last user first.  At the end of processing each user, they will be popped off
+            # of the to_list.  That way, the to_list will always contain the recipients
+            # remaining to be emailed.  This is convenient for retries, which will need to
+            # send to those who haven't yet been emailed, but not send to those who have
+            # already been sent to.
+            batch = []
+            for current_recipient in reversed(to_list[-messages_per_send:]):
+                recipient_num += 1
+                recipient_context = {
+                    'email': current_recipient['email'],
+                    'name': current_recipient['profile__name'],
+                    'user_id': current_recipient['pk'],
+                }
+
+                # Construct message content using the compiled templates and user-specific values:
+                plaintext_msg = plaintext_template.render(recipient_context)
+                html_msg = html_template.render(recipient_context)
+
+                # Create email:
+                email_msg = EmailMultiAlternatives(
+                    course_email.subject,
+                    plaintext_msg,
+                    from_addr,
+                    [current_recipient['email']],
+                    connection=connection
+                )
+                email_msg.attach_alternative(html_msg, 'text/html')
+                batch.append((recipient_num, current_recipient, email_msg))
 
             # Throttle if we have gotten the rate limiter.  This is not very high-tech,
             # but if a task has been retried for rate-limiting reasons, then we sleep
             # for a period of time between all emails within this task.  Choice of
             # the value depends on the number of workers that might be sending email in
             # parallel, and what the SES throttle rate is.
-            if subtask_status.retried_nomax > 0:
-                sleep(settings.BULK_EMAIL_RETRY_DELAY_BETWEEN_SENDS)
-
-            try:
-                log.info(
-                    "BulkEmail ==> Task: %s, SubTask: %s, EmailId: %s, Recipient num: %s/%s, \
-                    Recipient name: %s, Email address: %s",
-                    parent_task_id,
-                    task_id,
-                    email_id,
-                    recipient_num,
-                    total_recipients,
-                    current_recipient['profile__name'],
-                    email
-                )
-                with dog_stats_api.timer('course_email.single_send.time.overall', tags=[_statsd_tag(course_title)]):
-                    connection.send_messages([email_msg])
-
-            except SMTPDataError as exc:
-                # According to SMTP spec, we'll retry error codes in the 4xx range.  5xx range indicates hard failure.
-                total_recipients_failed += 1
-                log.error(
-                    "BulkEmail ==> Status: Failed(SMTPDataError), Task: %s, SubTask: %s, EmailId: %s, \
-                    Recipient num: %s/%s, Email address: %s",
-                    parent_task_id,
-                    task_id,
-                    email_id,
-                    recipient_num,
-                    total_recipients,
-                    email
-                )
-                if exc.smtp_code >= 400 and exc.smtp_code < 500:
-                    # This will cause the outer handler to catch the exception and retry the entire task.
-                    raise exc
+            throttle = subtask_status.retried_nomax > 0
+
+            batch_sent = False
+            if len(batch) > 1:
+                if throttle:
+                    sleep(settings.BULK_EMAIL_RETRY_DELAY_BETWEEN_SENDS * len(batch))
+                for num, current_recipient, _ in batch:
+                    log.info(
+                        "BulkEmail ==> Task: %s, SubTask: %s, EmailId: %s, Recipient num: %s/%s, \
+                        Recipient name: %s, Email address: %s",
+                        parent_task_id,
+                        task_id,
+                        email_id,
+                        num,
+                        total_recipients,
+                        current_recipient['profile__name'],
+                        current_recipient['email']
+                    )
+                send_start_time = time()
+                try:
+                    with dog_stats_api.timer('course_email.batch_send.time.overall', tags=[_statsd_tag(course_title)]):
+                        connection.send_messages([message for _, _, message in batch])
+                except Exception as exc:  # pylint: disable=broad-except
+                    # Connections don't tell which messages of a failed batch were sent,
+                    # so send the batch again one message at a time, to find out which
+                    # recipients fail and count each recipient exactly once.  Recipients
+                    # whose message was sent before the failure may get it twice.
+                    log.warning(
+                        "BulkEmail ==> Task: %s, SubTask: %s, EmailId: %s, Sending batch of %s emails failed, \
+                        resending them one at a time: %s",
+                        parent_task_id,
+                        task_id,
+                        email_id,
+                        len(batch),
+                        exc
+                    )
+                    dog_stats_api.increment('course_email.batch_send.failed', tags=[_statsd_tag(course_title)])
                 else:
+                    batch_sent = True
+                finally:
+                    send_time += time() - send_start_time
+
+            for recipient_num, current_recipient, email_msg in batch:
+                email = current_recipient['email']
+                try:
+                    if not batch_sent:
+                        if throttle:
+                            sleep(settings.BULK_EMAIL_RETRY_DELAY_BETWEEN_SENDS)
+                        log.info(
+                            "BulkEmail ==> Task: %s, SubTask: %s, EmailId: %s, Recipient num: %s/%s, \
+                            Recipient name: %s, Email address: %s",
+                            parent_task_id,
+                            task_id,
+                            email_id,
+                            recipient_num,
+                            total_recipients,
+                            current_recipient['profile__name'],
+                            email
+                        )
+                        send_start_time = time()
+                        try:
+                            with dog_stats_api.timer(
+                                'course_email.single_send.time.overall', tags=[_statsd_tag(course_title)]
+                            ):
+                                connection.send_messages([email_msg])
+                        finally:
+                            send_time += time() - send_start_time
+
+                except SMTPDataError as exc:
+                    # According to SMTP spec, we'll retry error codes in the 4xx range.
+                    # 5xx range indicates hard failure.
+                    total_recipients_failed += 1
+                    log.error(
+                        "BulkEmail ==> Status: Failed(SMTPDataError), Task: %s, SubTask: %s, EmailId: %s, \
+                        Recipient num: %s/%s, Email address: %s",
+                        parent_task_id,
+                        task_id,
+                        email_id,
+                        recipient_num,
+                        total_recipients,
+                        email
+                    )
+                    if exc.smtp_code >= 400 and exc.smtp_code < 500:
+                        # This will cause the outer handler to catch the exception and retry the entire task.
+                        raise
+                    else:
+                        # This will fall through and not retry the message.
+                        log.warning(
+                            'BulkEmail ==> Task: %s, SubTask: %s, EmailId: %s, Recipient num: %s/%s, \
+                            Email not delivered to %s due to error %s',
+                            parent_task_id,
+                            task_id,
+                            email_id,
+                            recipient_num,
+                            total_recipients,
+                            email,
+                            exc.smtp_error
+                        )
+                        dog_stats_api.increment('course_email.error', tags=[_statsd_tag(course_title)])
+                        subtask_status.increment(failed=1)
+
+                except SINGLE_EMAIL_FAILURE_ERRORS as exc:
                     # This will fall through and not retry the message.
-                    log.warning(
-                        'BulkEmail ==> Task: %s, SubTask: %s, EmailId: %s, Recipient num: %s/%s, \
-                        Email not delivered to %s due to error %s',
+                    total_recipients_failed += 1
+                    log.error(
+                        "BulkEmail ==> Status: Failed(SINGLE_EMAIL_FAILURE_ERRORS), Task: %s, SubTask: %s, \
+                        EmailId: %s, Recipient num: %s/%s, Email address: %s, Exception: %s",
                         parent_task_id,
                         task_id,
                         email_id,
                         recipient_num,
                         total_recipients,
                         email,
-                        exc.smtp_error
+                        exc
                     )
                     dog_stats_api.increment('course_email.error', tags=[_statsd_tag(course_title)])
                     subtask_status.increment(failed=1)
 
-            except SINGLE_EMAIL_FAILURE_ERRORS as exc:
-                # This will fall through and not retry the message.
-                total_recipients_failed += 1
-                log.error(
-                    "BulkEmail ==> Status: Failed(SINGLE_EMAIL_FAILURE_ERRORS), Task: %s, SubTask: %s, \
-                    EmailId: %s, Recipient num: %s/%s, Email address: %s, Exception: %s",
-                    parent_task_id,
-                    task_id,
-                    email_id,
-                    recipient_num,
-                    total_recipients,
-                    email,
-                    exc
-                )
-                dog_stats_api.increment('course_email.error', tags=[_statsd_tag(course_title)])
-                subtask_status.increment(failed=1)
-
-            else:
-                total_recipients_successful += 1
-                log.info(
-                    "BulkEmail ==> Status: Success, Task: %s, SubTask: %s, EmailId: %s, \
-                    Recipient num: %s/%s, Email address: %s,",
-                    parent_task_id,
-                    task_id,
-                    email_id,
-                    recipient_num,
-                    total_recipients,
-                    email
-                )
-                dog_stats_api.increment('course_email.sent', tags=[_statsd_tag(course_title)])
-                if settings.BULK_EMAIL_LOG_SENT_EMAILS:
-                    log.info('Email with id %s sent to %s', email_id, email)
                 else:
-                    log.debug('Email with id %s sent to %s', email_id, email)
-                subtask_status.increment(succeeded=1)
-
-            # Pop the user that was emailed off the end of the list only once they have
-            # successfully been processed.  (That way, if there were a failure that
-            # needed to be retried, the user is still on the list.)
-            recipients_info[email] += 1
-            to_list.pop()
+                    total_recipients_successful += 1
+                    log.info(
+                        "BulkEmail ==> Status: Success, Task: %s, SubTask: %s, EmailId: %s, \
+                        Recipient num: %s/%s, Email address: %s,",
+                        parent_task_id,
+                        task_id,
+                        email_id,
+                        recipient_num,
+                        total_recipients,
+                        email
+                    )
+                    dog_stats_api.increment('course_email.sent', tags=[_statsd_tag(course_title)])
+                    if settings.BULK_EMAIL_LOG_SENT_EMAILS:
+                        log.info('Email with id %s sent to %s', email_id, email)
+                    else:
+                        log.debug('Email with id %s sent to %s', email_id, email)
+                    subtask_status.increment(succeeded=1)
+
+                # Pop the user that was emailed off the end of the list only once they have
+                # successfully been processed.  (That way, if there were a failure that
+                # needed to be retried, the user is still on the list.)
+                recipients_info[email] += 1
+                to_list.pop()
 
         log.info(
             "BulkEmail ==> Task: %s, SubTask: %s, EmailId: %s, Total Successful Recipients: %s/%s, \
@@ -695,6 +754,33 @@ def _send_course_email(entry_id, email_id, to_list, global_email_context, subtas
     finally:
         # Clean up at the end.
         connection.close()
+        _record_send_rates(task_id, email_id, course_title, total_recipients_successful, start_time, send_time)
+
+
+def _record_send_rates(task_id, email_id, course_title, num_sent, start_time, send_time):
+    """
+    Logs and reports to datadog the number of emails sent per second by the
+    subtask, overall and while sending, so that BULK_EMAIL_MESSAGES_PER_SEND
+    and the retry delays can be tuned against the rate limits of the email
+    service.
+    """
+    elapsed_time = time() - start_time
+    if not num_sent or elapsed_time <= 0:
+        return
+    overall_rate = num_sent / elapsed_time
+    send_rate = num_sent / send_time if send_time > 0 else overall_rate
+    log.info(
+        "BulkEmail ==> SubTask: %s, EmailId: %s, Sent %s emails at %.1f emails/sec overall, %.1f emails/sec sending",
+        task_id,
+        email_id,
+        num_sent,
+        overall_rate,
+        send_rate
+    )
+    tags = [_statsd_tag(course_title)]
+    dog_stats_api.histogram('course_email.single_task.sent', num_sent, tags=tags)
+    dog_stats_api.histogram('course_email.single_task.rate.overall', overall_rate, tags=tags)
+    dog_stats_api.histogram('course_email.single_task.rate.send', send_rate, tags=tags)
 
 
 def _get_current_task():
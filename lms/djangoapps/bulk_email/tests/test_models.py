@@ -189,6 +189,36 @@ class CourseEmailTemplateTest(TestCase):
         self.assertIn(context['course_title'], message)
         self.assertIn(context['name'], message)
 
+    def test_compile_plain(self):
+        template = CourseEmailTemplate.get_template()
+        plaintext = "Dear %%USER_FULLNAME%%,\n" + "thanks for enrolling in %%COURSE_DISPLAY_NAME%%. " * 50
+        context = self._add_xss_fields(self._get_sample_plain_context())
+        compiled_template = template.compile_plaintext(plaintext, context)
+        for name, email in (("Jane", "jane@test.com"), ("<b>John</b>", "john@test.com")):
+            recipient_context = {'name': name, 'email': email, 'user_id': 12345}
+            self.assertEqual(
+                compiled_template.render(recipient_context),
+                template.render_plaintext(plaintext, dict(context, **recipient_context)),
+            )
+
+    def test_compile_html(self):
+        template = CourseEmailTemplate.get_template()
+        htmltext = "<p>Dear %%USER_FULLNAME%%,</p>\n" + "<p>thanks for enrolling in %%COURSE_DISPLAY_NAME%%.</p>" * 50
+        context = self._add_xss_fields(self._get_sample_html_context())
+        compiled_template = template.compile_htmltext(htmltext, context)
+        for name, email in (("Jane", "jane@test.com"), ("<b>John</b>", "john@test.com")):
+            recipient_context = {'name': name, 'email': email, 'user_id': 12345}
+            message = compiled_template.render(recipient_context)
+            self.assertEqual(message, template.render_htmltext(htmltext, dict(context, **recipient_context)))
+            self.assertNotIn("<script>", message)
+
+    def test_compile_without_context(self):
+        template = CourseEmailTemplate.get_template()
+        context = self._get_sample_plain_context()
+        del context['course_title']
+        with self.assertRaises(KeyError):
+            template.compile_plaintext("My new plain text.", context)
+
 
 @attr(shard=1)
 class CourseAuthorizationTest(TestCase):
@@ -29,6 +29,7 @@ from celery.states import SUCCESS, FAILURE  # pylint: disable=no-name-in-module,
 
 from django.conf import settings
 from django.core.management import call_command
+from django.test.utils import override_settings
 
 from xmodule.modulestore.tests.factories import CourseFactory
 
@@ -282,6 +283,60 @@ class TestBulkEmailInstructorTask(InstructorTaskCourseTestCase):
         # Test that celery handles permanent SMTPDataErrors by failing and not retrying.
         self._test_email_address_failures(SESDomainEndsWithDotError(554, "Email address ends with a dot"))
 
+    def test_one_connection_per_subtask(self):
+        # Test that each message is sent on its own, over the connection opened for the subtask.
+        num_emails = settings.BULK_EMAIL_EMAILS_PER_TASK
+        # We also send email to the instructor:
+        self._create_students(num_emails - 1)
+        with patch('bulk_email.tasks.get_connection', autospec=True) as get_conn:
+            get_conn.return_value.send_messages.side_effect = cycle([None])
+            self._test_run_with_task(send_bulk_course_email, 'emailed', num_emails, num_emails)
+        self.assertEqual(get_conn.call_count, 1)
+        self.assertEqual(get_conn.return_value.send_messages.call_count, num_emails)
+        for send_call in get_conn.return_value.send_messages.call_args_list:
+            self.assertEqual(len(send_call[0][0]), 1)
+
+    @override_settings(BULK_EMAIL_MESSAGES_PER_SEND=4)
+    def test_successful_in_batches(self):
+        # Test that messages are handed to the connection in batches of BULK_EMAIL_MESSAGES_PER_SEND.
+        num_emails = settings.BULK_EMAIL_EMAILS_PER_TASK
+        # We also send email to the instructor:
+        self._create_students(num_emails - 1)
+        with patch('bulk_email.tasks.get_connection', autospec=True) as get_conn:
+            get_conn.return_value.send_messages.side_effect = cycle([None])
+            self._test_run_with_task(send_bulk_course_email, 'emailed', num_emails, num_emails)
+        batch_sizes = [len(send_call[0][0]) for send_call in get_conn.return_value.send_messages.call_args_list]
+        self.assertEqual(sum(batch_sizes), num_emails)
+        self.assertEqual(len(batch_sizes), int((num_emails + 3) / 4))
+
+    @override_settings(BULK_EMAIL_MESSAGES_PER_SEND=4)
+    def test_address_failures_in_batches(self):
+        # Test that a batch failing part way through is sent again one message at a time,
+        # so that each recipient is counted exactly once.
+        num_emails = settings.BULK_EMAIL_EMAILS_PER_TASK
+        # We also send email to the instructor:
+        students = self._create_students(num_emails - 1)
+        blacklisted = set(student.email for student in students[::5])
+        delivered = []
+
+        def send_messages(email_msgs):
+            """Send the messages in order, like the SMTP backend, stopping at a blacklisted address."""
+            for email_msg in email_msgs:
+                if email_msg.to[0] in blacklisted:
+                    raise SMTPDataError(554, "Email address is blacklisted")
+                delivered.append(email_msg.to[0])
+
+        with patch('bulk_email.tasks.get_connection', autospec=True) as get_conn:
+            get_conn.return_value.send_messages.side_effect = send_messages
+            self._test_run_with_task(
+                send_bulk_course_email, 'emailed', num_emails, num_emails - len(blacklisted), failed=len(blacklisted)
+            )
+        self.assertEqual(len(set(delivered)), num_emails - len(blacklisted))
+        self.assertFalse(blacklisted & set(delivered))
+        batch_sizes = [len(send_call[0][0]) for send_call in get_conn.return_value.send_messages.call_args_list]
+        self.assertIn(4, batch_sizes)
+        self.assertIn(1, batch_sizes)
+
     def _test_retry_after_limited_retry_error(self, exception):
         """Test that celery handles connection failures by retrying."""
         # If we want the batch to succeed, we need to send fewer emails
@@ -9,7 +9,7 @@ from django.db import transaction
 
 import request_cache
 
-from courseware.field_overrides import FieldOverrideProvider
+from courseware.field_overrides import FieldOverrideProvider, clear_resolved_overrides
 from opaque_keys.edx.keys import CourseKey, UsageKey
 from ccx_keys.locator import CCXLocator, CCXBlockUsageLocator
 
@@ -177,6 +177,7 @@ def override_field_for_ccx(ccx, block, name, value):
 
     _get_overrides_for_ccx(ccx).setdefault(clean_ccx_key, {})[name] = value_json
     _get_overrides_for_ccx(ccx).setdefault(clean_ccx_key, {})[name + "_instance"] = override
+    clear_resolved_overrides()
 
 
 def clear_override_for_ccx(ccx, block, name):
@@ -210,6 +211,7 @@ def clear_ccx_field_info_from_ccx_map(ccx, block, name):  # pylint: disable=inva
         ccx_override_map.pop(name + "_instance")
     except KeyError:
         pass
+    clear_resolved_overrides()
 
 
 def bulk_delete_ccx_override_fields(ccx, ids):
@@ -220,3 +222,4 @@ def bulk_delete_ccx_override_fields(ccx, ids):
     ids = list(set(ids))
     if ids:
         CcxFieldOverride.objects.filter(ccx=ccx, id__in=ids).delete()
+        clear_resolved_overrides()
@@ -505,29 +505,88 @@ def certificate_status_for_student(student, course_id):
     try:
         generated_certificate = GeneratedCertificate.objects.get(  # pylint: disable=no-member
             user=student, course_id=course_id)
-        cert_status = {
-            'status': generated_certificate.status,
-            'mode': generated_certificate.mode,
-            'uuid': generated_certificate.verify_uuid,
-        }
-        if generated_certificate.grade:
-            cert_status['grade'] = generated_certificate.grade
+    except GeneratedCertificate.DoesNotExist:
+        return _unavailable_certificate_status()
 
-        if generated_certificate.mode == 'audit':
-            course_mode_slugs = [mode.slug for mode in CourseMode.modes_for_course(course_id)]
-            # Short term fix to make sure old audit users with certs still see their certs
-            # only do this if there if no honor mode
-            if 'honor' not in course_mode_slugs:
-                cert_status['status'] = CertificateStatuses.auditing
-                return cert_status
+    course_mode_slugs = None
+    if generated_certificate.mode == 'audit':
+        course_mode_slugs = [mode.slug for mode in CourseMode.modes_for_course(course_id)]
+    return _certificate_status(generated_certificate, course_mode_slugs)
 
-        if generated_certificate.status == CertificateStatuses.downloadable:
-            cert_status['download_url'] = generated_certificate.download_url
 
-        return cert_status
+def certificate_statuses_for_student(student, course_ids):
+    """
+    Returns a dict mapping each of the given course keys to the status of
+    the student's certificate in that course, as certificate_status_for_student
+    returns it.
 
-    except GeneratedCertificate.DoesNotExist:
-        pass
+    The certificates are loaded with a single query, and the course modes
+    of the courses with audit certificates with another one.
+    """
+    # Import here instead of top of file since this module gets imported before
+    # the course_modes app is loaded, resulting in a Django deprecation warning.
+    from course_modes.models import CourseMode
+
+    generated_certificates = {
+        generated_certificate.course_id: generated_certificate
+        for generated_certificate in GeneratedCertificate.objects.filter(  # pylint: disable=no-member
+            user=student, course_id__in=course_ids
+        )
+    }
+    audit_course_ids = [
+        course_id for course_id, generated_certificate in generated_certificates.iteritems()
+        if generated_certificate.mode == 'audit'
+    ]
+    if audit_course_ids:
+        __, unexpired_modes = CourseMode.all_and_unexpired_modes_for_courses(audit_course_ids)
+    else:
+        unexpired_modes = {}
+
+    cert_statuses = {}
+    for course_id in course_ids:
+        generated_certificate = generated_certificates.get(course_id)
+        if generated_certificate is None:
+            cert_statuses[course_id] = _unavailable_certificate_status()
+        else:
+            course_mode_slugs = None
+            if course_id in unexpired_modes:
+                course_mode_slugs = [mode.slug for mode in unexpired_modes[course_id]]
+            cert_statuses[course_id] = _certificate_status(generated_certificate, course_mode_slugs)
+    return cert_statuses
+
+
+def _certificate_status(generated_certificate, course_mode_slugs=None):
+    """
+    Returns the status dict of certificate_status_for_student for the given
+    certificate.  course_mode_slugs are the slugs of the unexpired modes of
+    the certificate's course, needed for audit certificates only.
+    """
+    cert_status = {
+        'status': generated_certificate.status,
+        'mode': generated_certificate.mode,
+        'uuid': generated_certificate.verify_uuid,
+    }
+    if generated_certificate.grade:
+        cert_status['grade'] = generated_certificate.grade
+
+    if generated_certificate.mode == 'audit':
+        # Short term fix to make sure old audit users with certs still see their certs
+        # only do this if there if no honor mode
+        if 'honor' not in course_mode_slugs:
+            cert_status['status'] = CertificateStatuses.auditing
+            return cert_status
+
+    if generated_certificate.status == CertificateStatuses.downloadable:
+        cert_status['download_url'] = generated_certificate.download_url
+
+    return cert_status
+
+
+def _unavailable_certificate_status():
+    """
+    Returns the status dict of certificate_status_for_student for a student
+    without a certificate.
+    """
     return {'status': CertificateStatuses.unavailable, 'mode': GeneratedCertificate.MODES.honor, 'uuid': None}
 
 
@@ -15,6 +15,7 @@ from certificates.models import (
     CertificateStatuses,
     GeneratedCertificate,
     certificate_status_for_student,
+    certificate_statuses_for_student,
     certificate_info_for_user
 )
 from certificates.tests.factories import GeneratedCertificateFactory
@@ -41,6 +42,34 @@ class CertificatesModelTest(ModuleStoreTestCase, MilestonesTestCaseMixin):
         self.assertEqual(certificate_status['status'], CertificateStatuses.unavailable)
         self.assertEqual(certificate_status['mode'], GeneratedCertificate.MODES.honor)
 
+    def test_certificate_statuses_for_student(self):
+        student = UserFactory()
+        courses = [CourseFactory.create(org='edx', number='course{}'.format(index)) for index in range(3)]
+        course_ids = [course.id for course in courses]
+        GeneratedCertificateFactory.create(
+            user=student,
+            course_id=course_ids[0],
+            status=CertificateStatuses.downloadable,
+            download_url='http://www.example.com/certificate.pdf',
+            grade='0.8',
+        )
+        GeneratedCertificateFactory.create(
+            user=student,
+            course_id=course_ids[1],
+            status=CertificateStatuses.audit_passing,
+            mode=GeneratedCertificate.MODES.audit,
+        )
+
+        with self.assertNumQueries(2):
+            certificate_statuses = certificate_statuses_for_student(student, course_ids)
+        self.assertEqual(
+            certificate_statuses,
+            {course_id: certificate_status_for_student(student, course_id) for course_id in course_ids}
+        )
+        self.assertEqual(certificate_statuses[course_ids[0]]['status'], CertificateStatuses.downloadable)
+        self.assertEqual(certificate_statuses[course_ids[1]]['status'], CertificateStatuses.auditing)
+        self.assertEqual(certificate_statuses[course_ids[2]]['status'], CertificateStatuses.unavailable)
+
     @unpack
     @data(
         {'allow_certificate': False, 'whitelisted': False, 'grade': None, 'output': ['N', 'N', 'N/A']},
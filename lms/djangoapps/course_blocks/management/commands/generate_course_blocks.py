@@ -64,7 +64,7 @@ class Command(BaseCommand):
         for course_key in course_keys:
             try:
                 if options.get('force'):
-                    block_structure = update_course_in_cache(course_key)
+                    block_structure = update_course_in_cache(course_key, force_full=True)
                 else:
                     block_structure = get_course_in_cache(course_key)
                 if options.get('dags'):
@@ -28,6 +28,7 @@ from xmodule.modulestore.inheritance import InheritanceMixin
 NOTSET = object()
 ENABLED_OVERRIDE_PROVIDERS_KEY = u'courseware.field_overrides.enabled_providers.{course_id}'
 ENABLED_MODULESTORE_OVERRIDE_PROVIDERS_KEY = u'courseware.modulestore_field_overrides.enabled_providers.{course_id}'
+RESOLVED_OVERRIDES_CACHE_NAME = u'courseware.field_overrides.resolved'
 
 
 def resolve_dotted(name):
@@ -90,6 +91,15 @@ def overrides_disabled():
     return bool(_OVERRIDES_DISABLED.disabled)
 
 
+def clear_resolved_overrides():
+    """
+    Clears the field overrides resolved so far in the current request.
+    Code that changes overrides must call it, so that the new values are
+    used for the rest of the request.
+    """
+    RequestCache.get_request_cache(RESOLVED_OVERRIDES_CACHE_NAME).clear()
+
+
 class FieldOverrideProvider(object):
     """
     Abstract class which defines the interface that a `FieldOverrideProvider`
@@ -198,19 +208,130 @@ class OverrideFieldData(FieldData):
     def __init__(self, user, fallback, providers):
         self.fallback = fallback
         self.providers = tuple(provider(user) for provider in providers)
+        self._resolved_overrides_key = (getattr(user, 'id', None), tuple(providers))
+
+    @property
+    def _resolved_overrides(self):
+        """
+        The overrides resolved so far in the current request for the same
+        user and providers, keyed by (kind, block location, field name),
+        where kind is 'own' for the override of the block itself and
+        'lineage' for the override of the block or, failing that, of its
+        closest ancestor that has one.
+
+        Only the overrides of one user are kept at a time, so that batch
+        jobs going through many users in one request don't accumulate the
+        overrides of all of them.
+        """
+        cache = RequestCache.get_request_cache(RESOLVED_OVERRIDES_CACHE_NAME)
+        if cache.get('key') != self._resolved_overrides_key:
+            cache.clear()
+            cache['key'] = self._resolved_overrides_key
+            cache['resolved'] = {}
+        return cache['resolved']
 
     def get_override(self, block, name):
         """
         Checks for an override for the field identified by `name` in `block`.
         Returns the overridden value or `NOTSET` if no override is found.
         """
-        if not overrides_disabled():
-            for provider in self.providers:
-                value = provider.get(block, name, NOTSET)
-                if value is not NOTSET:
-                    return value
+        if overrides_disabled():
+            return NOTSET
+
+        location = getattr(block, 'location', None)
+        if location is None:
+            return self._get_override_from_providers(block, name)
+
+        resolved = self._resolved_overrides
+        key = ('own', location, name)
+        if key not in resolved:
+            resolved[key] = self._get_override_from_providers(block, name)
+        return resolved[key]
+
+    def _get_override_from_providers(self, block, name):
+        """
+        Returns the override of the first provider that overrides the field
+        identified by `name` in `block`, or `NOTSET`.
+        """
+        for provider in self.providers:
+            value = provider.get(block, name, NOTSET)
+            if value is not NOTSET:
+                return value
         return NOTSET
 
+    def get_inherited_override(self, block, name):
+        """
+        Checks for an override for the field identified by `name` in the
+        ancestors of `block`, starting with its parent.  Returns the
+        overridden value of the closest ancestor or `NOTSET` if no override
+        is found.
+
+        The result is memoized for each ancestor, so that the lineage of
+        sibling blocks is only walked once.
+        """
+        if overrides_disabled():
+            return NOTSET
+
+        resolved = self._resolved_overrides
+        walked = []
+        value = NOTSET
+        for ancestor in _lineage(block):
+            location = getattr(ancestor, 'location', None)
+            key = ('lineage', location, name)
+            if location is not None and key in resolved:
+                value = resolved[key]
+                break
+            walked.append(key)
+            value = self.get_override(ancestor, name)
+            if value is not NOTSET:
+                break
+
+        # The walked ancestors have no override of their own, except for the
+        # last one when an override was found on it, so the lineage of each
+        # of them resolves to the same value.
+        for key in walked:
+            if key[1] is not None:
+                resolved[key] = value
+        return value
+
+    def resolve_overrides(self, block, names):
+        """
+        Resolves the overrides of the fields identified by `names` for
+        `block` and all of its descendants at once, walking the subtree a
+        single time, and memoizes them for the rest of the request.
+
+        Returns a dictionary of block locations to dictionaries of the
+        overridden field values keyed by field name.  Inheritable fields
+        include the overrides inherited from ancestors.
+        """
+        overrides = {}
+        if overrides_disabled():
+            return overrides
+
+        resolved = self._resolved_overrides
+        inheritable = [name for name in names if name in InheritanceMixin.fields]
+        stack = [(block, {name: self.get_inherited_override(block, name) for name in inheritable})]
+        while stack:
+            current, inherited = stack.pop()
+            block_overrides = {}
+            for name in names:
+                value = self.get_override(current, name)
+                if value is not NOTSET:
+                    block_overrides[name] = value
+
+            lineage = {}
+            for name in inheritable:
+                lineage[name] = block_overrides.get(name, inherited[name])
+                resolved[('lineage', current.location, name)] = lineage[name]
+                if lineage[name] is not NOTSET:
+                    block_overrides[name] = lineage[name]
+
+            if block_overrides:
+                overrides[current.location] = block_overrides
+            if current.has_children:
+                stack.extend((child, lineage) for child in current.get_children())
+        return overrides
+
     def get(self, block, name):
         value = self.get_override(block, name)
         if value is not NOTSET:
@@ -232,11 +353,9 @@ class OverrideFieldData(FieldData):
             # If this is an inheritable field and an override is set above,
             # then we want to return False here, so the field_data uses the
             # override and not the original value for this block.
-            inheritable = InheritanceMixin.fields.keys()
-            if name in inheritable:
-                for ancestor in _lineage(block):
-                    if self.get_override(ancestor, name) is not NOTSET:
-                        return False
+            if name in InheritanceMixin.fields:
+                if self.get_inherited_override(block, name) is not NOTSET:
+                    return False
 
         return has is not NOTSET or self.fallback.has(block, name)
 
@@ -246,16 +365,29 @@ class OverrideFieldData(FieldData):
     def default(self, block, name):
         # The `default` method is overloaded by the field storage system to
         # also handle inheritance.
-        if self.providers and not overrides_disabled():
-            inheritable = InheritanceMixin.fields.keys()
-            if name in inheritable:
-                for ancestor in _lineage(block):
-                    value = self.get_override(ancestor, name)
-                    if value is not NOTSET:
-                        return value
+        if self.providers and name in InheritanceMixin.fields:
+            value = self.get_inherited_override(block, name)
+            if value is not NOTSET:
+                return value
         return self.fallback.default(block, name)
 
 
+def resolve_overrides_for_user(user, course, block, names):
+    """
+    Resolves the overrides of the fields identified by `names` for `block`
+    and all of its descendants for the given `user` in `course`, so that the
+    modules later bound for the user find them already memoized.
+
+    Returns a dictionary of block locations to dictionaries of the
+    overridden field values keyed by field name, which is empty if no
+    override providers are enabled for the course.
+    """
+    field_data = OverrideFieldData.wrap(user, course, None)
+    if field_data is None:
+        return {}
+    return field_data.resolve_overrides(block, names)
+
+
 class OverrideModulestoreFieldData(OverrideFieldData):
     """Apply field data overrides at the modulestore level. No student context required."""
 
@@ -988,6 +988,31 @@ class ScoresClient(object):
         client.fetch_scores(scorable_locations)
         return client
 
+    @classmethod
+    def create_for_users(cls, course_id, user_ids, scorable_locations):
+        """
+        Create ScoresClients with pre-fetched data for the given users and
+        locations, using a single query.  Returns a dict of user ids to
+        ScoresClients.
+        """
+        clients = {}
+        for user_id in user_ids:
+            clients[user_id] = cls(course_id, user_id)
+            clients[user_id]._has_fetched = True  # pylint: disable=protected-access
+
+        scores_qset = StudentModule.objects.filter(
+            student_id__in=set(user_ids),
+            course_id=course_id,
+            module_state_key__in=set(scorable_locations),
+        )
+        for user_id, location, correct, total in scores_qset.values_list(
+                'student_id', 'module_state_key', 'grade', 'max_grade'
+        ):
+            clients[user_id]._locations_to_scores[  # pylint: disable=protected-access
+                UsageKey.from_string(location).map_into_course(course_id)
+            ] = cls.Score(correct, total)
+        return clients
+
 
 # @contract(user_id=int, usage_key=UsageKey, score="number|None", max_score="number|None")
 def set_score(user_id, usage_key, score, max_score):
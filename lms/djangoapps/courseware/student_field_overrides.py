@@ -4,10 +4,18 @@ by the individual due dates feature.
 """
 import json
 
-from .field_overrides import FieldOverrideProvider
+from django.db import transaction
+from django.utils.timezone import now
+
+import request_cache
+
+from .field_overrides import FieldOverrideProvider, clear_resolved_overrides
 from .models import StudentFieldOverride
 
 
+OVERRIDES_CACHE_NAME = 'courseware.student_field_overrides'
+
+
 class IndividualStudentOverrideProvider(FieldOverrideProvider):
     """
     A concrete implementation of
@@ -43,19 +51,61 @@ def _get_overrides_for_user(user, block):
     Gets all of the individual student overrides for given user and block.
     Returns a dictionary of field override values keyed by field name.
     """
-    query = StudentFieldOverride.objects.filter(
-        course_id=block.runtime.course_id,
-        location=block.location,
-        student_id=user.id,
-    )
+    course_overrides = _get_overrides_for_user_in_course(user, block.runtime.course_id)
     overrides = {}
-    for override in query:
-        field = block.fields[override.field]
-        value = field.from_json(json.loads(override.value))
-        overrides[override.field] = value
+    for field_name, value in course_overrides.get(_location_key(block.location), {}).iteritems():
+        field = block.fields[field_name]
+        overrides[field_name] = field.from_json(json.loads(value))
     return overrides
 
 
+def _get_overrides_for_user_in_course(user, course_key):
+    """
+    Gets all of the individual student overrides for given user and course,
+    with one query that is cached for the rest of the request.  Returns a
+    dictionary of blocks' location keys to dictionaries of JSON serialized
+    field override values keyed by field name.
+
+    Only the overrides of one user in one course are kept at a time, so
+    that batch jobs going through many users in one request, which handle
+    the users one after the other, don't accumulate the overrides of all
+    of them.
+    """
+    overrides_cache = request_cache.get_cache(OVERRIDES_CACHE_NAME)
+    cache_key = (user.id, course_key)
+    if cache_key not in overrides_cache:
+        overrides = {}
+        query = StudentFieldOverride.objects.filter(
+            course_id=course_key,
+            student_id=user.id,
+        )
+        for override in query:
+            block_overrides = overrides.setdefault(_location_key(override.location), {})
+            block_overrides[override.field] = override.value
+        overrides_cache.clear()
+        overrides_cache[cache_key] = overrides
+    return overrides_cache[cache_key]
+
+
+def _location_key(location):
+    """
+    Returns the given block location as serialized in the database, which
+    strips the branch and version of the location.
+    """
+    return StudentFieldOverride._meta.get_field('location').get_prep_value(location)  # pylint: disable=protected-access
+
+
+def _clear_cached_overrides(user, block):
+    """
+    Clears the individual student overrides of the `user` cached for `block`
+    and its course, and the overrides resolved from them, so that they are
+    read again after being changed.
+    """
+    request_cache.get_cache(OVERRIDES_CACHE_NAME).pop((user.id, block.runtime.course_id), None)
+    getattr(block, '_student_overrides', {}).pop(user.id, None)
+    clear_resolved_overrides()
+
+
 def override_field_for_user(user, block, name, value):
     """
     Overrides a field for the `user`.  `block` and `name` specify the block
@@ -70,6 +120,48 @@ def override_field_for_user(user, block, name, value):
     field = block.fields[name]
     override.value = json.dumps(field.to_json(value))
     override.save()
+    _clear_cached_overrides(user, block)
+
+
+def override_field_for_users(users, block, name, value):
+    """
+    Overrides a field for each of the `users`, with the same `value`, as
+    when extending a due date for many students at once.  `block` and
+    `name` specify the block and the name of the field on that block to
+    override.
+
+    Existing overrides are updated with one query, and the missing ones
+    are created with another.
+    """
+    field = block.fields[name]
+    serialized_value = json.dumps(field.to_json(value))
+    course_key = block.runtime.course_id
+    user_ids = set(user.id for user in users)
+
+    with transaction.atomic():
+        existing = StudentFieldOverride.objects.filter(
+            course_id=course_key,
+            location=block.location,
+            field=name,
+            student_id__in=user_ids,
+        )
+        existing_user_ids = set(existing.values_list('student_id', flat=True))
+        if existing_user_ids:
+            # update() doesn't set TimeStampedModel's modified field by itself
+            existing.update(value=serialized_value, modified=now())
+        StudentFieldOverride.objects.bulk_create([
+            StudentFieldOverride(
+                course_id=course_key,
+                location=block.location,
+                student_id=user_id,
+                field=name,
+                value=serialized_value,
+            )
+            for user_id in user_ids - existing_user_ids
+        ])
+
+    for user in users:
+        _clear_cached_overrides(user, block)
 
 
 def clear_override_for_user(user, block, name):
@@ -87,3 +179,4 @@ def clear_override_for_user(user, block, name):
             field=name).delete()
     except StudentFieldOverride.DoesNotExist:
         pass
+    _clear_cached_overrides(user, block)
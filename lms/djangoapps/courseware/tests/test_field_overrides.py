@@ -2,18 +2,25 @@
 Tests for `field_overrides` module.
 """
 # pylint: disable=missing-docstring
+import datetime
 import unittest
 from nose.plugins.attrib import attr
 
 from django.test.utils import override_settings
+from django.utils.timezone import utc
 from xblock.field_data import DictFieldData
-from xmodule.modulestore.tests.factories import CourseFactory
+from xmodule.modulestore.tests.factories import CourseFactory, ItemFactory
 from xmodule.modulestore.tests.django_utils import SharedModuleStoreTestCase
 
+from student.tests.factories import UserFactory
+
 from ..field_overrides import (
+    clear_resolved_overrides,
     resolve_dotted,
+    resolve_overrides_for_user,
     disable_overrides,
     FieldOverrideProvider,
+    NOTSET,
     OverrideFieldData,
     OverrideModulestoreFieldData,
 )
@@ -45,6 +52,23 @@ class TestOverrideProvider(FieldOverrideProvider):
         return True
 
 
+class TestCountingOverrideProvider(FieldOverrideProvider):
+    """
+    A `FieldOverrideProvider` for testing, which overrides the fields in
+    `overrides`, keyed by (block location, field name), and counts its calls.
+    """
+    overrides = {}
+    calls = 0
+
+    def get(self, block, name, default):
+        TestCountingOverrideProvider.calls += 1
+        return self.overrides.get((block.location, name), default)
+
+    @classmethod
+    def enabled_for(cls, course):
+        return True
+
+
 @attr(shard=1)
 @override_settings(FIELD_OVERRIDE_PROVIDERS=(
     'courseware.tests.test_field_overrides.TestOverrideProvider',))
@@ -142,6 +166,107 @@ class OverrideModulestoreFieldDataTests(FieldOverrideTestMixin, OverrideFieldDat
         self.assertIsInstance(data, DictFieldData)
 
 
+@attr(shard=1)
+@override_settings(FIELD_OVERRIDE_PROVIDERS=(
+    'courseware.tests.test_field_overrides.TestCountingOverrideProvider',))
+class OverrideFieldDataInheritanceTests(SharedModuleStoreTestCase):
+    """
+    Tests for the resolution of inherited overrides by `OverrideFieldData`.
+    """
+    DUE = datetime.datetime(2015, 1, 1, tzinfo=utc)
+
+    @classmethod
+    def setUpClass(cls):
+        super(OverrideFieldDataInheritanceTests, cls).setUpClass()
+        cls.course = CourseFactory.create()
+        cls.chapter = ItemFactory.create(parent=cls.course, category='chapter')
+        cls.sequential = ItemFactory.create(parent=cls.chapter, category='sequential')
+        cls.verticals = [
+            ItemFactory.create(parent=cls.sequential, category='vertical')
+            for _ in range(2)
+        ]
+
+    def setUp(self):
+        super(OverrideFieldDataInheritanceTests, self).setUp()
+        OverrideFieldData.provider_classes = None
+        TestCountingOverrideProvider.overrides = {(self.chapter.location, 'due'): self.DUE}
+        TestCountingOverrideProvider.calls = 0
+        self.data = OverrideFieldData.wrap(TESTUSER, self.course, DictFieldData({}))
+
+    def tearDown(self):
+        super(OverrideFieldDataInheritanceTests, self).tearDown()
+        OverrideFieldData.provider_classes = None
+        TestCountingOverrideProvider.overrides = {}
+
+    def get_verticals(self):
+        return [self.store.get_item(vertical.location) for vertical in self.verticals]
+
+    def test_inherited_override(self):
+        first_vertical, second_vertical = self.get_verticals()
+
+        # the sequential and the chapter are checked
+        self.assertEqual(self.data.default(first_vertical, 'due'), self.DUE)
+        self.assertEqual(TestCountingOverrideProvider.calls, 2)
+
+        # the lineage of a sibling is already resolved
+        self.assertEqual(self.data.default(second_vertical, 'due'), self.DUE)
+        self.assertEqual(TestCountingOverrideProvider.calls, 2)
+
+        # only the vertical itself is checked
+        self.assertFalse(self.data.has(second_vertical, 'due'))
+        self.assertEqual(TestCountingOverrideProvider.calls, 3)
+
+    def test_clear_resolved_overrides(self):
+        vertical = self.get_verticals()[0]
+        self.assertEqual(self.data.get_inherited_override(vertical, 'due'), self.DUE)
+
+        TestCountingOverrideProvider.overrides = {}
+        self.assertEqual(self.data.get_inherited_override(vertical, 'due'), self.DUE)
+        clear_resolved_overrides()
+        self.assertIs(self.data.get_inherited_override(vertical, 'due'), NOTSET)
+
+    def test_resolve_overrides(self):
+        course = self.store.get_course(self.course.id, depth=None)
+        overrides = self.data.resolve_overrides(course, ['due', 'display_name'])
+        self.assertEqual(overrides, {
+            block.location: {'due': self.DUE}
+            for block in [self.chapter, self.sequential] + self.verticals
+        })
+        # each block's fields are resolved once
+        self.assertEqual(TestCountingOverrideProvider.calls, 2 * 5)
+
+        # and are then memoized
+        for vertical in self.get_verticals():
+            self.assertEqual(self.data.default(vertical, 'due'), self.DUE)
+            self.assertFalse(self.data.has(vertical, 'due'))
+        self.assertEqual(TestCountingOverrideProvider.calls, 2 * 5)
+
+    def test_resolve_overrides_for_user(self):
+        course = self.store.get_course(self.course.id, depth=None)
+        overrides = resolve_overrides_for_user(TESTUSER, self.course, course, ['due'])
+        self.assertEqual(overrides, {
+            block.location: {'due': self.DUE}
+            for block in [self.chapter, self.sequential] + self.verticals
+        })
+        self.assertEqual(TestCountingOverrideProvider.calls, 5)
+
+        # the modules bound for the same user find them memoized
+        for vertical in self.get_verticals():
+            self.assertEqual(self.data.default(vertical, 'due'), self.DUE)
+        self.assertEqual(TestCountingOverrideProvider.calls, 5)
+
+    def test_resolved_overrides_of_one_user_at_a_time(self):
+        vertical = self.get_verticals()[0]
+        users = [UserFactory.build(id=user_id) for user_id in (1, 2)]
+        for user in users * 2:
+            data = OverrideFieldData.wrap(user, self.course, DictFieldData({}))
+            self.assertEqual(data.get_inherited_override(vertical, 'due'), self.DUE)
+
+        # the overrides of the previous user are dropped when switching users
+        self.assertEqual(TestCountingOverrideProvider.calls, 2 * 4)
+        self.assertEqual(len(data._resolved_overrides), 4)  # pylint: disable=protected-access
+
+
 @attr(shard=1)
 class ResolveDottedTests(unittest.TestCase):
     """
@@ -2,6 +2,7 @@
 Functionality for course-level grades.
 """
 from collections import namedtuple
+from itertools import islice
 from logging import getLogger
 
 import dogstats_wrapper as dog_stats_api
@@ -16,6 +17,9 @@ log = getLogger(__name__)
 
 GradeResult = namedtuple('GradeResult', ['student', 'gradeset', 'err_msg'])
 
+# Number of students whose scores are loaded together by iterate_grades_for.
+BULK_GRADES_CHUNK_SIZE = 100
+
 
 def iterate_grades_for(course_or_id, students):
     """
@@ -42,28 +46,44 @@ def iterate_grades_for(course_or_id, students):
     else:
         course = course_or_id
 
-    for student in students:
-        with dog_stats_api.timer('lms.grades.iterate_grades_for', tags=[u'action:{}'.format(course.id)]):
-            try:
-                gradeset = summary(student, course)
-                yield GradeResult(student, gradeset, "")
-            except Exception as exc:  # pylint: disable=broad-except
-                # Keep marching on even if this student couldn't be graded for
-                # some reason, but log it for future reference.
-                log.exception(
-                    'Cannot grade student %s (%s) in course %s because of exception: %s',
-                    student.username,
-                    student.id,
-                    course.id,
-                    exc.message
-                )
-                yield GradeResult(student, {}, exc.message)
-
-
-def summary(student, course):
+    students = iter(students)
+    while True:
+        students_chunk = list(islice(students, BULK_GRADES_CHUNK_SIZE))
+        if not students_chunk:
+            break
+        bulk_scores = CourseGradeFactory.bulk_scores_for(course, students_chunk)
+        for student in students_chunk:
+            yield _grade_result(student, course, bulk_scores)
+
+
+def _grade_result(student, course, bulk_scores):
+    """
+    Returns the GradeResult of the student for the given course.
+    """
+    with dog_stats_api.timer('lms.grades.iterate_grades_for', tags=[u'action:{}'.format(course.id)]):
+        try:
+            gradeset = summary(student, course, bulk_scores)
+            return GradeResult(student, gradeset, "")
+        except Exception as exc:  # pylint: disable=broad-except
+            # Keep marching on even if this student couldn't be graded for
+            # some reason, but log it for future reference.
+            log.exception(
+                'Cannot grade student %s (%s) in course %s because of exception: %s',
+                student.username,
+                student.id,
+                course.id,
+                exc.message
+            )
+            return GradeResult(student, {}, exc.message)
+
+
+def summary(student, course, bulk_scores=None):
     """
     Returns the grade summary of the student for the given course.
 
+    If bulk_scores is provided, the student's scores are read from it
+    instead of being queried.
+
     Also sends a signal to update the minimum grade requirement status.
     """
-    return CourseGradeFactory(student).create(course).summary
+    return CourseGradeFactory(student, bulk_scores).create(course).summary
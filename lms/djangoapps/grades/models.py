@@ -292,6 +292,20 @@ class PersistentSubsectionGrade(TimeStampedModel):
             course_id=course_key,
         )
 
+    @classmethod
+    def bulk_read_grades_for_users(cls, user_ids, course_key):
+        """
+        Reads all grades for the given users and course.
+
+        Arguments:
+            user_ids: The users associated with the desired grades
+            course_key: The course identifier for the desired grades
+        """
+        return cls.objects.select_related('visible_blocks').filter(
+            user_id__in=user_ids,
+            course_id=course_key,
+        )
+
     @classmethod
     def update_or_create_grade(cls, **kwargs):
         """
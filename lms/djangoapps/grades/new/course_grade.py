@@ -8,10 +8,11 @@ from lazy import lazy
 from logging import getLogger
 from lms.djangoapps.course_blocks.api import get_course_blocks
 from lms.djangoapps.grades.config.models import PersistentGradesEnabledFlag
+from openedx.core.djangoapps.content.block_structure.api import get_block_structure_manager
 from openedx.core.djangoapps.signals.signals import GRADES_UPDATED
 from xmodule import block_metadata_utils
 
-from .subsection_grade import SubsectionGradeFactory
+from .subsection_grade import BulkScores, SubsectionGradeFactory
 
 
 log = getLogger(__name__)
@@ -117,13 +118,18 @@ class CourseGrade(object):
 
         return grade_summary
 
-    def compute_and_update(self, read_only=False):
+    def compute_and_update(self, read_only=False, bulk_scores=None):
         """
         Computes the grade for the given student and course.
 
         If read_only is True, doesn't save any updates to the grades.
+
+        If bulk_scores is provided, the student's scores are read from it
+        instead of being queried.
         """
-        subsection_grade_factory = SubsectionGradeFactory(self.student, self.course, self.course_structure)
+        subsection_grade_factory = SubsectionGradeFactory(
+            self.student, self.course, self.course_structure, bulk_scores
+        )
         for chapter_key in self.course_structure.get_children(self.course.location):
             chapter = self.course_structure[chapter_key]
             chapter_subsection_grades = []
@@ -240,8 +246,9 @@ class CourseGradeFactory(object):
     """
     Factory class to create Course Grade objects
     """
-    def __init__(self, student):
+    def __init__(self, student, bulk_scores=None):
         self.student = student
+        self.bulk_scores = bulk_scores
 
     def create(self, course, read_only=False):
         """
@@ -249,12 +256,43 @@ class CourseGradeFactory(object):
 
         If read_only is True, doesn't save any updates to the grades.
         """
-        course_structure = get_course_blocks(self.student, course.location)
+        collected_block_structure = self.bulk_scores.collected_block_structure if self.bulk_scores else None
+        course_structure = get_course_blocks(
+            self.student, course.location, collected_block_structure=collected_block_structure
+        )
         return (
             self._get_saved_grade(course, course_structure) or
             self._compute_and_update_grade(course, course_structure, read_only)
         )
 
+    @classmethod
+    def bulk_scores_for(cls, course, students):
+        """
+        Returns the BulkScores of the given students for the course, to be
+        shared by the CourseGradeFactory objects of those students.
+
+        The course's collected block structure is loaded once, and the
+        students' scores and saved subsection grades are loaded with
+        set-based queries.
+        """
+        collected_block_structure = get_block_structure_manager(course.id).get_collected()
+        return BulkScores(course, students, collected_block_structure)
+
+    @classmethod
+    def bulk_create(cls, course, students, read_only=False):
+        """
+        Yields the CourseGrade objects of the given students for the course,
+        in the order of students.
+
+        If read_only is True, doesn't save any updates to the grades.
+        """
+        students = list(students)
+        if not students:
+            return
+        bulk_scores = cls.bulk_scores_for(course, students)
+        for student in students:
+            yield cls(student, bulk_scores).create(course, read_only)
+
     def _compute_and_update_grade(self, course, course_structure, read_only):
         """
         Freshly computes and updates the grade for the student and course.
@@ -262,7 +300,7 @@ class CourseGradeFactory(object):
         If read_only is True, doesn't save any updates to the grades.
         """
         course_grade = CourseGrade(self.student, course, course_structure)
-        course_grade.compute_and_update(read_only)
+        course_grade.compute_and_update(read_only, self.bulk_scores)
         return course_grade
 
     def _get_saved_grade(self, course, course_structure):  # pylint: disable=unused-argument
@@ -1,7 +1,7 @@
 """
 SubsectionGrade Class
 """
-from collections import OrderedDict
+from collections import defaultdict, OrderedDict
 from contextlib import contextmanager
 from django.db import transaction
 from django.db.utils import DatabaseError
@@ -14,6 +14,7 @@ from lms.djangoapps.grades.config.models import PersistentGradesEnabledFlag
 from lms.djangoapps.grades.transformer import GradesTransformer
 from student.models import anonymous_id_for_user, User
 from submissions import api as submissions_api
+from submissions.models import ScoreSummary
 from traceback import format_exc
 from xmodule import block_metadata_utils, graders
 from xmodule.graders import Score
@@ -253,11 +254,87 @@ class SubsectionGrade(object):
         )
 
 
+class BulkScores(object):
+    """
+    The scores of a batch of students in a course, loaded with a few
+    set-based queries instead of several queries per student.
+
+    Holds the courseware (CSM) scores, the Submissions API scores and,
+    when persistent grades are enabled, the saved subsection grades of
+    the given students for the scorable blocks of the course's collected
+    block structure.
+    """
+    def __init__(self, course, students, collected_block_structure):
+        self.course = course
+        self.collected_block_structure = collected_block_structure
+
+        user_ids = [student.id for student in students]
+        scorable_locations = [
+            block_key for block_key in collected_block_structure if possibly_scored(block_key)
+        ]
+        self._scores_clients = ScoresClient.create_for_users(course.id, user_ids, scorable_locations)
+        self._submissions_scores = self._read_submissions_scores(course.id, students)
+
+        self._saved_subsection_grades = None
+        if PersistentGradesEnabledFlag.feature_enabled(course.id):
+            self._saved_subsection_grades = defaultdict(dict)
+            for record in PersistentSubsectionGrade.bulk_read_grades_for_users(user_ids, course.id):
+                self._saved_subsection_grades[record.user_id][record.full_usage_key] = record
+
+    def scores_client(self, student):
+        """
+        Returns the prefetched ScoresClient of the given student.
+        """
+        return self._scores_clients[student.id]
+
+    def submissions_scores(self, student):
+        """
+        Returns the prefetched Submissions API scores of the given student.
+        """
+        return self._submissions_scores.get(student.id, {})
+
+    def saved_subsection_grades(self, student):
+        """
+        Returns a dict of subsection usage keys to the saved subsection
+        grades of the given student, or None if they weren't prefetched.
+        """
+        if self._saved_subsection_grades is None:
+            return None
+        return dict(self._saved_subsection_grades[student.id])
+
+    @staticmethod
+    def _read_submissions_scores(course_key, students):
+        """
+        Returns a dict of user ids to the scores stored by the Submissions
+        API, in the format returned by submissions_api.get_scores.
+
+        The Submissions API only reads the scores of one student at a time,
+        so its models are queried directly, with the same filtering of
+        hidden scores.
+        """
+        user_ids_by_anonymous_id = {
+            anonymous_id_for_user(student, course_key, save=False): student.id for student in students
+        }
+        score_summaries = ScoreSummary.objects.filter(
+            student_item__course_id=unicode(course_key),
+            student_item__student_id__in=user_ids_by_anonymous_id.keys(),
+        ).select_related('latest', 'student_item')
+
+        scores = defaultdict(dict)
+        for summary in score_summaries:
+            if not summary.latest.is_hidden():
+                user_id = user_ids_by_anonymous_id[summary.student_item.student_id]
+                scores[user_id][summary.student_item.item_id] = (
+                    summary.latest.points_earned, summary.latest.points_possible
+                )
+        return scores
+
+
 class SubsectionGradeFactory(object):
     """
     Factory for Subsection Grades.
     """
-    def __init__(self, student, course, course_structure):
+    def __init__(self, student, course, course_structure, bulk_scores=None):
         self.student = student
         self.course = course
         self.course_structure = course_structure
@@ -265,6 +342,13 @@ class SubsectionGradeFactory(object):
         self._cached_subsection_grades = None
         self._unsaved_subsection_grades = []
 
+        if bulk_scores is not None:
+            # Populate the lazy attributes from the scores prefetched for
+            # a batch of students.
+            self._scores_client = bulk_scores.scores_client(student)
+            self._submissions_scores = bulk_scores.submissions_scores(student)
+            self._cached_subsection_grades = bulk_scores.saved_subsection_grades(student)
+
     def create(self, subsection, block_structure=None, read_only=False):
         """
         Returns the SubsectionGrade object for the student and subsection.
@@ -19,7 +19,7 @@ from ..course_grades import summary as grades_summary
 from ..new.course_grade import CourseGradeFactory
 
 
-def _grade_with_errors(student, course):
+def _grade_with_errors(student, course, bulk_scores=None):
     """This fake grade method will throw exceptions for student3 and
     student4, but allow any other students to go through normal grading.
 
@@ -30,7 +30,7 @@ def _grade_with_errors(student, course):
     if student.username in ['student3', 'student4']:
         raise Exception("I don't like {}".format(student.username))
 
-    return grades_summary(student, course)
+    return grades_summary(student, course, bulk_scores)
 
 
 @attr(shard=1)
@@ -19,7 +19,7 @@ from xmodule.modulestore.tests.factories import CourseFactory, ItemFactory
 from ..models import PersistentSubsectionGrade
 from ..new.course_grade import CourseGradeFactory
 from ..new.subsection_grade import SubsectionGrade, SubsectionGradeFactory
-from lms.djangoapps.grades.tests.utils import mock_get_score
+from lms.djangoapps.grades.tests.utils import answer_problem, mock_get_score
 
 
 class GradeTestBase(SharedModuleStoreTestCase):
@@ -95,6 +95,31 @@ class TestCourseGradeFactory(GradeTestBase):
                 grade_factory.create(self.course)
         self.assertEqual(mock_save_grades.called, feature_flag and course_setting)
 
+    def test_bulk_create(self):
+        other_students = [UserFactory(), UserFactory()]
+        for student in other_students:
+            CourseEnrollment.enroll(student, self.course.id)
+        students = [self.request.user] + other_students
+        answer_problem(self.course, self.request, self.problem)
+
+        with patch('lms.djangoapps.grades.new.subsection_grade.ScoresClient.create_for_locations') as mock_scores:
+            with patch('lms.djangoapps.grades.new.subsection_grade.submissions_api.get_scores') as mock_submissions:
+                course_grades = list(CourseGradeFactory.bulk_create(self.course, students, read_only=True))
+        self.assertFalse(mock_scores.called)
+        self.assertFalse(mock_submissions.called)
+
+        self.assertEqual([course_grade.student for course_grade in course_grades], students)
+        self.assertEqual(course_grades[0].score_for_module(self.problem.location), (1.0, 1.0))
+        for student, course_grade in zip(students, course_grades):
+            single_grade = CourseGradeFactory(student).create(self.course, read_only=True)
+            self.assertEqual(
+                course_grade.score_for_module(self.course.location),
+                single_grade.score_for_module(self.course.location),
+            )
+
+    def test_bulk_create_no_students(self):
+        self.assertEqual(list(CourseGradeFactory.bulk_create(self.course, [])), [])
+
 
 @ddt.ddt
 class SubsectionGradeFactoryTest(GradeTestBase):
@@ -7,6 +7,7 @@ import pytz
 import random
 
 import ddt
+from mock import patch
 
 from student.tests.factories import UserFactory
 from xmodule.modulestore import ModuleStoreEnum
@@ -15,7 +16,11 @@ from xmodule.modulestore.tests.factories import check_mongo_calls
 
 from lms.djangoapps.course_blocks.api import get_course_blocks
 from lms.djangoapps.course_blocks.transformers.tests.helpers import CourseStructureTestCase
-from openedx.core.djangoapps.content.block_structure.api import get_cache
+from openedx.core.djangoapps.content.block_structure.api import (
+    clear_course_from_cache,
+    get_cache,
+    update_course_in_cache,
+)
 from ..transformer import GradesTransformer
 
 
@@ -319,6 +324,46 @@ class GradesTransformerTestCase(CourseStructureTestCase):
             max_score=2,
         )
 
+    def test_max_score_recollected_incrementally(self):
+        blocks = self.build_course_with_problems(u'''
+            <problem>
+                <numericalresponse answer="27">
+                    <textline label="3^3" />
+                </numericalresponse>
+            </problem>
+        ''')
+        course_key = blocks[u'course'].location.course_key
+        get_course_blocks(self.student, blocks[u'course'].location, self.transformers)
+
+        problem = self.store.get_item(blocks[u'problem'].location)
+        problem.data = u'''
+            <problem>
+                <numericalresponse answer="27">
+                    <textline label="3^3" />
+                </numericalresponse>
+                <numericalresponse answer="13.5">
+                    <textline label="and then half of that?" />
+                </numericalresponse>
+            </problem>
+        '''
+        self.store.update_item(problem, self.user.id)
+        self.store.publish(problem.location, self.user.id)
+
+        clear_course_from_cache(course_key, keep_previous=True)
+        with patch.object(
+            GradesTransformer, 'collect_incremental', wraps=GradesTransformer.collect_incremental
+        ) as mock_collect_incremental:
+            update_course_in_cache(course_key)
+        self.assertTrue(mock_collect_incremental.called)
+
+        block_structure = get_course_blocks(self.student, blocks[u'course'].location, self.transformers)
+        self.assert_collected_transformer_block_fields(
+            block_structure,
+            blocks[u'problem'].location,
+            self.TRANSFORMER_CLASS_TO_TEST,
+            max_score=2,
+        )
+
     def test_course_version_not_collected_in_old_mongo(self):
         blocks = self.build_course_with_problems()
         block_structure = get_course_blocks(self.student, blocks[u'course'].location, self.transformers)
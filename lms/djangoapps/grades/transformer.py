@@ -4,11 +4,13 @@ Grades Transformer
 from django.test.client import RequestFactory
 from functools import reduce as functools_reduce
 
+from courseware.field_overrides import resolve_overrides_for_user
 from courseware.model_data import FieldDataCache
 from courseware.module_render import get_module_for_descriptor
 from lms.djangoapps.course_blocks.transformers.utils import collect_unioned_set_field, get_field_on_block
 from openedx.core.lib.block_structure.transformer import BlockStructureTransformer
 from openedx.core.djangoapps.util.user_utils import SystemUser
+from xmodule.modulestore.inheritance import InheritanceMixin
 
 
 class GradesTransformer(BlockStructureTransformer):
@@ -33,6 +35,7 @@ class GradesTransformer(BlockStructureTransformer):
         max_score: (numeric)
     """
     VERSION = 4
+    SUPPORTS_INCREMENTAL_COLLECT = True
     FIELDS_TO_COLLECT = [u'due', u'format', u'graded', u'has_score', u'weight', u'course_version', u'subtree_edited_on']
 
     EXPLICIT_GRADED_FIELD_NAME = 'explicit_graded'
@@ -61,6 +64,24 @@ class GradesTransformer(BlockStructureTransformer):
         )
         cls._collect_explicit_graded(block_structure)
 
+    @classmethod
+    def collect_incremental(cls, block_structure, block_keys):
+        """
+        Collects the same information as collect, but only recomputes the
+        max scores of the given blocks.  A block's max score depends only
+        on the block itself, while the remaining fields depend on other
+        blocks and are inexpensive to collect for all blocks.
+        """
+        block_structure.request_xblock_fields(*cls.FIELDS_TO_COLLECT)
+        cls._collect_max_scores(block_structure, block_keys)
+        collect_unioned_set_field(
+            block_structure=block_structure,
+            transformer=cls,
+            merged_field_name='subsections',
+            filter_by=lambda block_key: block_key.block_type == 'sequential',
+        )
+        cls._collect_explicit_graded(block_structure)
+
     def transform(self, block_structure, usage_context):
         """
         Perform no transformations.
@@ -106,11 +127,12 @@ class GradesTransformer(BlockStructureTransformer):
                     _set_field(block_key, explicit_from_parents)
 
     @classmethod
-    def _collect_max_scores(cls, block_structure):
+    def _collect_max_scores(cls, block_structure, block_keys=None):
         """
-        Collect the `max_score` for every block in the provided `block_structure`.
+        Collect the `max_score` for every block in the provided `block_structure`,
+        or only for the blocks in `block_keys` if provided.
         """
-        for module in cls._iter_scorable_xmodules(block_structure):
+        for module in cls._iter_scorable_xmodules(block_structure, block_keys):
             cls._collect_max_score(block_structure, module)
 
     @classmethod
@@ -123,10 +145,11 @@ class GradesTransformer(BlockStructureTransformer):
         block_structure.set_transformer_block_field(module.location, cls, 'max_score', score)
 
     @staticmethod
-    def _iter_scorable_xmodules(block_structure):
+    def _iter_scorable_xmodules(block_structure, block_keys=None):
         """
-        Loop through all the blocks locators in the block structure, and
-        retrieve the module (XModule or XBlock) associated with that locator.
+        Loop through all the blocks locators in the block structure, or only
+        those in `block_keys` if provided, and retrieve the module (XModule
+        or XBlock) associated with that locator.
 
         For implementation reasons, we need to pull the max_score from the
         XModule, even though the data is not user specific.  Here we bind the
@@ -136,15 +159,30 @@ class GradesTransformer(BlockStructureTransformer):
         user = SystemUser()
         request.user = user
         request.session = {}
-        root_block = block_structure.get_xblock(block_structure.root_block_usage_key)
         course_key = block_structure.root_block_usage_key.course_key
-        cache = FieldDataCache.cache_for_descriptor_descendents(
-            course_id=course_key,
-            user=request.user,
-            descriptor=root_block,
-            descriptor_filter=lambda descriptor: descriptor.has_score,
-        )
+        if block_keys is None:
+            root_block = block_structure.get_xblock(block_structure.root_block_usage_key)
+            cache = FieldDataCache.cache_for_descriptor_descendents(
+                course_id=course_key,
+                user=request.user,
+                descriptor=root_block,
+                descriptor_filter=lambda descriptor: descriptor.has_score,
+            )
+            # Resolve the inherited overrides of the whole course in one
+            # walk, rather than walking the lineage of each bound module.
+            resolve_overrides_for_user(user, None, root_block, list(InheritanceMixin.fields))
+        else:
+            cache = FieldDataCache(
+                [
+                    block_structure.get_xblock(block_key) for block_key in block_keys
+                    if getattr(block_structure.get_xblock(block_key), 'has_score', False)
+                ],
+                course_key,
+                request.user,
+            )
         for block_locator in block_structure.post_order_traversal():
+            if block_keys is not None and block_locator not in block_keys:
+                continue
             block = block_structure.get_xblock(block_locator)
             if getattr(block, 'has_score', False):
                 module = get_module_for_descriptor(user, request, block, cache, course_key)
@@ -4092,6 +4092,28 @@ class TestDueDateExtensions(SharedModuleStoreTestCase, LoginEnrollmentTestCase):
         self.assertEqual(datetime.datetime(2013, 12, 30, 0, 0, tzinfo=utc),
                          get_extended_due(self.course, self.week1, self.user1))
 
+    def test_change_due_date_for_several_students(self):
+        url = reverse('change_due_date', kwargs={'course_id': self.course.id.to_deprecated_string()})
+        response = self.client.post(url, {
+            'student': u'{}, {}'.format(self.user1.username, self.user2.email),
+            'url': self.week1.location.to_deprecated_string(),
+            'due_datetime': '12/30/2013 00:00'
+        })
+        self.assertEqual(response.status_code, 200, response.content)
+        for user in (self.user1, self.user2):
+            self.assertEqual(datetime.datetime(2013, 12, 30, 0, 0, tzinfo=utc),
+                             get_extended_due(self.course, self.week1, user))
+
+    def test_change_due_date_for_unknown_student(self):
+        url = reverse('change_due_date', kwargs={'course_id': self.course.id.to_deprecated_string()})
+        response = self.client.post(url, {
+            'student': u'{}, nosuchstudent'.format(self.user1.username),
+            'url': self.week1.location.to_deprecated_string(),
+            'due_datetime': '12/30/2013 00:00'
+        })
+        self.assertEqual(response.status_code, 400, response.content)
+        self.assertIsNone(get_extended_due(self.course, self.week1, self.user1))
+
     def test_change_to_invalid_due_date(self):
         url = reverse('change_due_date', kwargs={'course_id': self.course.id.to_deprecated_string()})
         response = self.client.post(url, {
@@ -12,7 +12,9 @@ from django.test.utils import override_settings
 from nose.plugins.attrib import attr
 
 from courseware.field_overrides import OverrideFieldData
+from courseware.student_field_overrides import OVERRIDES_CACHE_NAME, get_override_for_user
 from lms.djangoapps.ccx.tests.test_overrides import inject_field_overrides
+import request_cache
 from student.tests.factories import UserFactory
 from xmodule.fields import Date
 from xmodule.modulestore.tests.django_utils import ModuleStoreTestCase, SharedModuleStoreTestCase
@@ -246,6 +248,45 @@ class TestSetDueDateExtension(ModuleStoreTestCase):
             tools.set_due_date_extension(self.course, self.week1, self.user, extended)
             self._clear_field_data_cache()
 
+    def test_set_due_date_extensions(self):
+        extended = datetime.datetime(2013, 12, 25, 0, 0, tzinfo=utc)
+        users = [self.user] + UserFactory.create_batch(2)
+        # an existing extension is updated
+        tools.set_due_date_extension(self.course, self.week1, users[1], datetime.datetime(2011, 1, 1, tzinfo=utc))
+
+        # savepoint, select of the existing extensions, update, insert, release
+        with self.assertNumQueries(5):
+            tools.set_due_date_extensions(self.week1, users, extended)
+
+        for user in users:
+            self.assertEqual(get_override_for_user(user, self.week1, 'due'), extended)
+
+    def test_set_due_date_extensions_invalid_date(self):
+        extended = datetime.datetime(2009, 1, 1, 0, 0, tzinfo=utc)
+        with self.assertRaises(tools.DashboardError):
+            tools.set_due_date_extensions(self.week1, [self.user], extended)
+
+    def test_get_overrides_num_queries(self):
+        extended = datetime.datetime(2013, 12, 25, 0, 0, tzinfo=utc)
+        tools.set_due_date_extension(self.course, self.week1, self.user, extended)
+        tools.set_due_date_extension(self.course, self.week2, self.user, extended)
+
+        # the overrides of all the blocks are read at once
+        with self.assertNumQueries(1):
+            for block in (self.week1, self.week2, self.week3, self.homework):
+                get_override_for_user(self.user, block, 'due')
+
+    def test_get_overrides_of_one_user_at_a_time(self):
+        extended = datetime.datetime(2013, 12, 25, 0, 0, tzinfo=utc)
+        users = [self.user] + UserFactory.create_batch(2)
+        tools.set_due_date_extensions(self.week1, users, extended)
+
+        for user in users:
+            self.assertEqual(get_override_for_user(user, self.week2, 'due'), None)
+            self.assertEqual(get_override_for_user(user, self.week1, 'due'), extended)
+            # only the overrides of the last user are kept in the request cache
+            self.assertEqual(request_cache.get_cache(OVERRIDES_CACHE_NAME).keys(), [(user.id, self.course.id)])
+
     def test_set_due_date_extension_invalid_date(self):
         extended = datetime.datetime(2009, 1, 1, 0, 0, tzinfo=utc)
         with self.assertRaises(tools.DashboardError):
@@ -103,6 +103,7 @@ from .tools import (
     handle_dashboard_error,
     parse_datetime,
     set_due_date_extension,
+    set_due_date_extensions,
     strip_if_string,
 )
 from opaque_keys.edx.keys import CourseKey, UsageKey
@@ -2620,17 +2621,30 @@ def _display_unit(unit):
 @require_post_params('student', 'url', 'due_datetime')
 def change_due_date(request, course_id):
     """
-    Grants a due date extension to a student for a particular unit.
+    Grants a due date extension to one or more students for a particular unit.
+
+    The `student` param is the username or email of a student, or several of
+    them separated by commas or whitespace.
     """
     course = get_course_by_id(SlashSeparatedCourseKey.from_deprecated_string(course_id))
-    student = require_student_from_identifier(request.POST.get('student'))
+    identifiers = _split_input_list(request.POST.get('student')) or [request.POST.get('student')]
+    # A student may be given by both their username and their email.
+    students = {
+        student.id: student
+        for student in (require_student_from_identifier(identifier) for identifier in identifiers)
+    }.values()
     unit = find_unit(course, request.POST.get('url'))
     due_date = parse_datetime(request.POST.get('due_datetime'))
-    set_due_date_extension(course, unit, student, due_date)
+    set_due_date_extensions(unit, students, due_date)
 
+    if len(students) == 1:
+        return JsonResponse(_(
+            'Successfully changed due date for student {0} for {1} '
+            'to {2}').format(students[0].profile.name, _display_unit(unit),
+                             due_date.strftime('%Y-%m-%d %H:%M')))
     return JsonResponse(_(
-        'Successfully changed due date for student {0} for {1} '
-        'to {2}').format(student.profile.name, _display_unit(unit),
+        'Successfully changed due date for {0} students for {1} '
+        'to {2}').format(len(students), _display_unit(unit),
                          due_date.strftime('%Y-%m-%d %H:%M')))
 
 
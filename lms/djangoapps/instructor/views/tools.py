@@ -15,6 +15,7 @@ from courseware.student_field_overrides import (
     clear_override_for_user,
     get_override_for_user,
     override_field_for_user,
+    override_field_for_users,
 )
 from xmodule.fields import Date
 from opaque_keys.edx.keys import UsageKey
@@ -164,15 +165,7 @@ def set_due_date_extension(course, unit, student, due_date):
     due date is invalid.
     """
     if due_date:
-        # Check that the new due date is valid:
-        with disable_overrides():
-            original_due_date = getattr(unit, 'due', None)
-
-        if not original_due_date:
-            raise DashboardError(_("Unit {0} has no due date to extend.").format(unit.location))
-        if due_date < original_due_date:
-            raise DashboardError(_("An extended due date must be later than the original due date."))
-
+        _validate_due_date_extension(unit, due_date)
         override_field_for_user(student, unit, 'due', due_date)
 
     else:
@@ -183,6 +176,30 @@ def set_due_date_extension(course, unit, student, due_date):
         clear_override_for_user(student, unit, 'due')
 
 
+def set_due_date_extensions(unit, students, due_date):
+    """
+    Sets the same due date extension for each of the students, with a
+    constant number of queries. Raises DashboardError if the unit or
+    extended due date is invalid.
+    """
+    _validate_due_date_extension(unit, due_date)
+    override_field_for_users(students, unit, 'due', due_date)
+
+
+def _validate_due_date_extension(unit, due_date):
+    """
+    Raises DashboardError if the unit has no due date, or if the extended
+    due date is earlier than the unit's original due date.
+    """
+    with disable_overrides():
+        original_due_date = getattr(unit, 'due', None)
+
+    if not original_due_date:
+        raise DashboardError(_("Unit {0} has no due date to extend.").format(unit.location))
+    if due_date < original_due_date:
+        raise DashboardError(_("An extended due date must be later than the original due date."))
+
+
 def dump_module_extensions(course, unit):
     """
     Dumps data about students with due date extensions for a particular module,
@@ -17,10 +17,11 @@ import csv
 import json
 import hashlib
 import os.path
+import tempfile
 
 from django.conf import settings
 from django.contrib.auth.models import User
-from django.core.files.base import ContentFile
+from django.core.files.base import File
 from django.db import models, transaction
 
 from openedx.core.storage import get_storage
@@ -31,6 +32,13 @@ from xmodule_django.models import CourseKeyField
 QUEUING = 'QUEUING'
 PROGRESS = 'PROGRESS'
 
+# Reports are spooled to disk once they grow beyond this many bytes.
+REPORT_SPOOL_MAX_SIZE = 5 * 1024 * 1024
+
+# Directory (relative to a course's report directory) holding the partial
+# files of reports that are still being generated.
+PARTIAL_REPORTS_DIRECTORY = '.partial'
+
 
 class InstructorTask(models.Model):
     """
@@ -264,12 +272,82 @@ class DjangoStorageReportStore(ReportStore):
         """
         Given a course_id, filename, and rows (each row is an iterable of
         strings), write the rows to the storage backend in csv format.
+
+        `rows` may be any iterable, including a generator; rows are written
+        to a temporary file as they are produced, so large reports are
+        spooled to disk rather than held in memory.
+        """
+        with tempfile.SpooledTemporaryFile(max_size=REPORT_SPOOL_MAX_SIZE) as output_buffer:
+            csvwriter = csv.writer(output_buffer)
+            csvwriter.writerows(self._get_utf8_encoded_rows(rows))
+            output_buffer.seek(0)
+            self.store(course_id, filename, File(output_buffer))
+
+    def store_partial_rows(self, course_id, filename, part, rows):
+        """
+        Store `rows` as part number `part` of the report `filename`.
+
+        Partial files are not visible through `links_for`; once all parts
+        have been written, `assemble_partials` combines them into the final
+        report.  Storing a part that already exists replaces it, so parts can
+        safely be rewritten when a task is retried.
+        """
+        path = self._partial_path(course_id, filename, part)
+        if self.storage.exists(path):
+            self.storage.delete(path)
+        with tempfile.SpooledTemporaryFile(max_size=REPORT_SPOOL_MAX_SIZE) as output_buffer:
+            csvwriter = csv.writer(output_buffer)
+            csvwriter.writerows(self._get_utf8_encoded_rows(rows))
+            output_buffer.seek(0)
+            self.storage.save(path, File(output_buffer))
+
+    def partial_rows(self, course_id, filename, part):
+        """
+        Return the rows stored as part number `part` of the report `filename`,
+        or None if that part has not been stored.
         """
-        output_buffer = ContentFile('')
-        csvwriter = csv.writer(output_buffer)
-        csvwriter.writerows(self._get_utf8_encoded_rows(rows))
-        output_buffer.seek(0)
-        self.store(course_id, filename, output_buffer)
+        path = self._partial_path(course_id, filename, part)
+        if not self.storage.exists(path):
+            return None
+        with self.storage.open(path) as partial_file:
+            return [[item.decode('utf-8') for item in row] for row in csv.reader(partial_file)]
+
+    def assemble_partials(self, course_id, filename, num_parts):
+        """
+        Concatenate parts 0 through `num_parts` - 1 of the report `filename`
+        into the final report, then delete the partial files.  Parts that
+        were never stored are skipped.
+        """
+        paths = [self._partial_path(course_id, filename, part) for part in range(num_parts)]
+        paths = [path for path in paths if self.storage.exists(path)]
+        with tempfile.SpooledTemporaryFile(max_size=REPORT_SPOOL_MAX_SIZE) as output_buffer:
+            for path in paths:
+                with self.storage.open(path) as partial_file:
+                    for chunk in iter(lambda: partial_file.read(64 * 1024), ''):
+                        output_buffer.write(chunk)
+            output_buffer.seek(0)
+            self.store(course_id, filename, File(output_buffer))
+        for path in paths:
+            self.storage.delete(path)
+
+    def delete_partials(self, course_id, filename, num_parts):
+        """
+        Delete parts 0 through `num_parts` - 1 of the report `filename`
+        without assembling them.
+        """
+        for part in range(num_parts):
+            path = self._partial_path(course_id, filename, part)
+            if self.storage.exists(path):
+                self.storage.delete(path)
+
+    def _partial_path(self, course_id, filename, part):
+        """
+        Return the path of part number `part` of the report `filename`.
+        """
+        return self.path_to(
+            course_id,
+            os.path.join(PARTIAL_REPORTS_DIRECTORY, filename, u'{:06d}.csv'.format(part))
+        )
 
     def links_for(self, course_id):
         """
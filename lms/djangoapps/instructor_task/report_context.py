@@ -0,0 +1,196 @@
+"""
+Batched loading of the per-student columns of grade reports.
+
+Building a grade report row needs a student's cohort, experiment groups, team,
+enrollment mode, verification status and certificate information.  Looking
+these up one student at a time costs several queries per row, so
+`GradeReportContext` prefetches them for a whole chunk of students in a
+handful of set-based queries and serves the row builder from dicts.
+"""
+from certificates.models import CertificateStatuses, CertificateWhitelist, GeneratedCertificate
+from course_modes.models import CourseMode
+from lms.djangoapps.lms_xblock.runtime import LmsPartitionService
+from lms.djangoapps.teams.models import CourseTeamMembership
+from lms.djangoapps.verify_student.models import SoftwareSecurePhotoVerification
+from openedx.core.djangoapps.course_groups.cohorts import is_course_cohorted
+from openedx.core.djangoapps.course_groups.models import CohortMembership
+from openedx.core.djangoapps.user_api.models import UserCourseTag
+from student.models import CourseEnrollment, UserProfile
+from xmodule.partitions.partitions import NoSuchUserPartitionGroupError
+from xmodule.split_test_module import get_split_user_partitions
+
+
+class GradeReportContext(object):
+    """
+    Provides the per-student, non-grade columns of a course's grade report.
+
+    Course-wide information is loaded once, when the context is created.
+    Per-student information is loaded by `prefetch` for a chunk of students,
+    after which `columns_for` can be called for any student of that chunk
+    without issuing further queries.
+    """
+    def __init__(self, course):
+        self.course_id = course.id
+        self.course_is_cohorted = is_course_cohorted(course.id)
+        self.teams_enabled = course.teams_enabled
+        self.experiment_partitions = get_split_user_partitions(course.user_partitions)
+        self.whitelisted_user_ids = set(
+            CertificateWhitelist.objects.filter(
+                course_id=course.id, whitelist=True
+            ).values_list('user_id', flat=True)
+        )
+        self.course_mode_slugs = [mode.slug for mode in CourseMode.modes_for_course(course.id)]
+        self._reset()
+
+    def _reset(self):
+        """
+        Forget any previously prefetched per-student information.
+        """
+        self._cohort_names = {}
+        self._experiment_group_ids = {}
+        self._team_names = {}
+        self._enrollment_modes = {}
+        self._verified_user_ids = set()
+        self._certificates = {}
+        self._allow_certificate = {}
+
+    @property
+    def header(self):
+        """
+        The header of the columns returned by `columns_for`.
+        """
+        cohorts_header = ['Cohort Name'] if self.course_is_cohorted else []
+        group_configs_header = [
+            u'Experiment Group ({})'.format(partition.name) for partition in self.experiment_partitions
+        ]
+        teams_header = ['Team Name'] if self.teams_enabled else []
+        return (
+            cohorts_header + group_configs_header + teams_header +
+            ['Enrollment Track', 'Verification Status'] +
+            ['Certificate Eligible', 'Certificate Delivered', 'Certificate Type']
+        )
+
+    def prefetch(self, students):
+        """
+        Load the per-student information for `students`, replacing the
+        information loaded for any previous chunk.
+        """
+        self._reset()
+        user_ids = [student.id for student in students]
+        if not user_ids:
+            return
+
+        if self.course_is_cohorted:
+            memberships = CohortMembership.objects.filter(
+                course_id=self.course_id, user_id__in=user_ids
+            ).select_related('course_user_group')
+            self._cohort_names = {
+                membership.user_id: membership.course_user_group.name for membership in memberships
+            }
+
+        partition_keys = {
+            partition.scheme.key_for_partition(partition): partition.id
+            for partition in self.experiment_partitions
+            if hasattr(partition.scheme, 'key_for_partition')
+        }
+        if partition_keys:
+            tags = UserCourseTag.objects.filter(
+                course_id=self.course_id, user_id__in=user_ids, key__in=partition_keys.keys()
+            ).values_list('user_id', 'key', 'value')
+            for user_id, key, value in tags:
+                self._experiment_group_ids[(user_id, partition_keys[key])] = value
+
+        if self.teams_enabled:
+            memberships = CourseTeamMembership.objects.filter(
+                user_id__in=user_ids, team__course_id=self.course_id
+            ).select_related('team')
+            self._team_names = {membership.user_id: membership.team.name for membership in memberships}
+
+        self._enrollment_modes = dict(
+            CourseEnrollment.objects.filter(
+                course_id=self.course_id, user_id__in=user_ids
+            ).values_list('user_id', 'mode')
+        )
+
+        verified_mode_user_ids = [
+            user_id for user_id, mode in self._enrollment_modes.iteritems() if mode in CourseMode.VERIFIED_MODES
+        ]
+        if verified_mode_user_ids:
+            self._verified_user_ids = SoftwareSecurePhotoVerification.verified_user_ids(verified_mode_user_ids)
+
+        self._certificates = {
+            certificate.user_id: certificate
+            for certificate in GeneratedCertificate.objects.filter(  # pylint: disable=no-member
+                course_id=self.course_id, user_id__in=user_ids
+            )
+        }
+        self._allow_certificate = dict(
+            UserProfile.objects.filter(user_id__in=user_ids).values_list('user_id', 'allow_certificate')
+        )
+
+    def columns_for(self, student, grade):
+        """
+        Return the non-grade columns of `student`'s row, in the order of
+        `header`.  `grade` is the student's letter grade, or None if they
+        are not passing.
+        """
+        columns = []
+        if self.course_is_cohorted:
+            columns.append(self._cohort_names.get(student.id, ''))
+        for partition in self.experiment_partitions:
+            group = self._experiment_group(student, partition)
+            columns.append(group.name if group else '')
+        if self.teams_enabled:
+            columns.append(self._team_names.get(student.id, ''))
+
+        enrollment_mode = self._enrollment_modes.get(student.id)
+        columns.append(enrollment_mode)
+        columns.append(self._verification_status(student, enrollment_mode))
+        columns.extend(self._certificate_info(student, grade))
+        return columns
+
+    def _experiment_group(self, student, partition):
+        """
+        Return the group of `partition` that `student` is assigned to, or
+        None.  Students are never assigned to a group here.
+        """
+        if not hasattr(partition.scheme, 'key_for_partition'):
+            return LmsPartitionService(student, self.course_id).get_group(partition, assign=False)
+
+        group_id = self._experiment_group_ids.get((student.id, partition.id))
+        if group_id is None:
+            return None
+        try:
+            return partition.get_group(int(group_id))
+        except NoSuchUserPartitionGroupError:
+            return None
+
+    def _verification_status(self, student, enrollment_mode):
+        """
+        Return the verification status column, matching
+        `SoftwareSecurePhotoVerification.verification_status_for_user`.
+        """
+        if enrollment_mode not in CourseMode.VERIFIED_MODES:
+            return 'N/A'
+        return 'ID Verified' if student.id in self._verified_user_ids else 'Not ID Verified'
+
+    def _certificate_info(self, student, grade):
+        """
+        Return the certificate columns, matching `certificate_info_for_user`.
+        """
+        user_is_whitelisted = student.id in self.whitelisted_user_ids
+        allow_certificate = self._allow_certificate.get(student.id, False)
+        eligible_for_certificate = 'Y' if (user_is_whitelisted or grade is not None) and allow_certificate else 'N'
+
+        certificate_is_delivered = 'N'
+        certificate_type = 'N/A'
+        certificate = self._certificates.get(student.id)
+        if certificate is not None and certificate.status == CertificateStatuses.downloadable:
+            # Old audit certificates are reported as "auditing" by
+            # `certificate_status_for_student` unless the course has an
+            # honor mode.
+            if certificate.mode != 'audit' or 'honor' in self.course_mode_slugs:
+                certificate_is_delivered = 'Y'
+                certificate_type = certificate.mode
+
+        return [eligible_for_certificate, certificate_is_delivered, certificate_type]
@@ -354,7 +354,7 @@ def queue_subtasks_for_query(
     return progress
 
 
-def _acquire_subtask_lock(task_id):
+def _acquire_subtask_lock(task_id, overwrite=False):
     """
     Mark the specified task_id as being in progress.
 
@@ -363,10 +363,17 @@ def _acquire_subtask_lock(task_id):
     loss of connection to the task broker.  Most of the time, such duplicate tasks are
     run sequentially, but they can overlap in processing as well.
 
+    If `overwrite` is true, an existing lock is taken over instead of being respected.
+
     Returns true if the task_id was not already locked; false if it was.
     """
-    # cache.add fails if the key already exists
     key = "subtask-{}".format(task_id)
+    if overwrite:
+        if cache.get(key) is not None:
+            TASK_LOG.warning("task_id '%s': taking over existing lock", task_id)
+        cache.set(key, 'true', SUBTASK_LOCK_EXPIRE)
+        return True
+    # cache.add fails if the key already exists
     succeeded = cache.add(key, 'true', SUBTASK_LOCK_EXPIRE)
     if not succeeded:
         TASK_LOG.warning("task_id '%s': already locked.  Contains value '%s'", task_id, cache.get(key))
@@ -385,7 +392,7 @@ def _release_subtask_lock(task_id):
     cache.delete(key)
 
 
-def check_subtask_is_valid(entry_id, current_task_id, new_subtask_status):
+def check_subtask_is_valid(entry_id, current_task_id, new_subtask_status, reclaim_queued_lock=False):
     """
     Confirms that the current subtask is known to the InstructorTask and hasn't already been completed.
 
@@ -403,6 +410,12 @@ def check_subtask_is_valid(entry_id, current_task_id, new_subtask_status):
     so that we can detect if another worker has started work but has not yet completed that work.
     The other worker is allowed to finish, and this raises an exception.
 
+    A subtask run with acks_late is re-delivered when its worker dies before finishing, and
+    the lock of the dead worker would then reject it until the lock expires, leaving the
+    InstructorTask in progress for good.  Subtasks that can safely be run twice therefore
+    pass `reclaim_queued_lock`, which takes over the lock as long as the subtask's recorded
+    state is still QUEUING, i.e. no run of it has reported its status yet.
+
     Raises a DuplicateTaskException exception if it's not a task that should be run.
 
     If this succeeds, it requires that update_subtask_status() is called to release the lock on the
@@ -455,7 +468,8 @@ def check_subtask_is_valid(entry_id, current_task_id, new_subtask_status):
     # Now we are ready to start working on this.  Try to lock it.
     # If it fails, then it means that another worker is already in the
     # middle of working on this.
-    if not _acquire_subtask_lock(current_task_id):
+    overwrite_lock = reclaim_queued_lock and subtask_state == QUEUING
+    if not _acquire_subtask_lock(current_task_id, overwrite=overwrite_lock):
         format_str = "Unexpected task_id '{}': already being executed - for subtask of instructor task '{}'"
         msg = format_str.format(current_task_id, entry)
         TASK_LOG.warning(msg)
@@ -474,9 +488,12 @@ def update_subtask_status(entry_id, current_task_id, new_subtask_status, retry_c
 
     The subtask lock acquired in the call to check_subtask_is_valid() is released here, only when
     the attempting of retries has concluded.
+
+    Returns True if this update completed the last outstanding subtask of the InstructorTask,
+    so that exactly one subtask can perform any work that must wait for all of them.
     """
     try:
-        _update_subtask_status(entry_id, current_task_id, new_subtask_status)
+        return _update_subtask_status(entry_id, current_task_id, new_subtask_status)
     except DatabaseError:
         # If we fail, try again recursively.
         retry_count += 1
@@ -484,7 +501,7 @@ def update_subtask_status(entry_id, current_task_id, new_subtask_status, retry_c
             TASK_LOG.info("Retrying to update status for subtask %s of instructor task %d with status %s:  retry %d",
                           current_task_id, entry_id, new_subtask_status, retry_count)
             dog_stats_api.increment('instructor_task.subtask.retry_after_failed_update')
-            update_subtask_status(entry_id, current_task_id, new_subtask_status, retry_count)
+            return update_subtask_status(entry_id, current_task_id, new_subtask_status, retry_count)
         else:
             TASK_LOG.info("Failed to update status after %d retries for subtask %s of instructor task %d with status %s",
                           retry_count, current_task_id, entry_id, new_subtask_status)
@@ -524,6 +541,8 @@ def _update_subtask_status(entry_id, current_task_id, new_subtask_status):
     information for each subtask.  At the moment, the value for each subtask (keyed by its task_id)
     is the value of the SubtaskStatus.to_dict(), but could be expanded in future to store information
     about failure messages, progress made, etc.
+
+    Returns True if the InstructorTask's state was changed to SUCCESS by this update.
     """
     TASK_LOG.info("Preparing to update status for subtask %s for instructor task %d with status %s",
                   current_task_id, entry_id, new_subtask_status)
@@ -574,6 +593,7 @@ def _update_subtask_status(entry_id, current_task_id, new_subtask_status):
         # At present, we mark the task as having succeeded.  In future, we should see
         # if there was a catastrophic failure that occurred, and figure out how to
         # report that here.
+        completed = num_remaining <= 0 and entry.task_state != SUCCESS
         if num_remaining <= 0:
             entry.task_state = SUCCESS
         entry.subtasks = json.dumps(subtask_dict)
@@ -583,6 +603,7 @@ def _update_subtask_status(entry_id, current_task_id, new_subtask_status):
         entry.save()
         TASK_LOG.info("Task output updated to %s for subtask %s of instructor task %d",
                       entry.task_output, current_task_id, entry_id)
+        return completed
     except Exception:
         TASK_LOG.exception("Unexpected error while updating InstructorTask.")
         dog_stats_api.increment('instructor_task.subtask.update_exception')
@@ -31,11 +31,13 @@ from instructor_task.tasks_helper import (
     run_main_task,
     BaseInstructorTask,
     perform_module_state_update,
-    rescore_problem_module_state,
+    perform_problem_rescore,
+    perform_rescore_problem_subtask,
     reset_attempts_module_state,
     delete_problem_module_state,
     upload_problem_responses_csv,
     upload_grades_csv,
+    perform_grade_report_subtask,
     upload_problem_grade_report,
     upload_students_csv,
     cohort_students_and_upload,
@@ -70,19 +72,32 @@ def rescore_problem(entry_id, xmodule_instance_args):
 
     `xmodule_instance_args` provides information needed by _get_module_instance_for_task()
     to instantiate an xmodule instance.
+
+    Submissions are rescored in chunks, and by subtasks when there are many
+    of them; see perform_problem_rescore().
     """
     # Translators: This is a past-tense verb that is inserted into task progress messages as {action}.
     action_name = ugettext_noop('rescored')
-    update_fcn = partial(rescore_problem_module_state, xmodule_instance_args)
 
     def filter_fcn(modules_to_update):
         """Filter that matches problems which are marked as being done"""
         return modules_to_update.filter(state__contains='"done": true')
 
-    visit_fcn = partial(perform_module_state_update, update_fcn, filter_fcn)
+    visit_fcn = partial(perform_problem_rescore, xmodule_instance_args, filter_fcn)
     return run_main_task(entry_id, visit_fcn, action_name)
 
 
+# Acknowledge late, so that the subtask is re-delivered if its worker dies
+# while rescoring; the re-delivered subtask takes over the subtask lock.
+@task(acks_late=True)  # pylint: disable=not-callable
+def rescore_problem_subtask(entry_id, student_module_ids, xmodule_instance_args, subtask_status_dict):
+    """
+    Rescores a batch of submissions for a `rescore_problem` task that was
+    split into subtasks; see perform_rescore_problem_subtask().
+    """
+    return perform_rescore_problem_subtask(entry_id, student_module_ids, xmodule_instance_args, subtask_status_dict)
+
+
 @task(base=BaseInstructorTask)  # pylint: disable=not-callable
 def reset_problem_attempts(entry_id, xmodule_instance_args):
     """Resets problem attempts to zero for a particular problem for all students in a course.
@@ -160,7 +175,10 @@ def calculate_problem_responses_csv(entry_id, xmodule_instance_args):
     return run_main_task(entry_id, task_fn, action_name)
 
 
-@task(base=BaseInstructorTask, routing_key=settings.GRADES_DOWNLOAD_ROUTING_KEY)  # pylint: disable=not-callable
+# Acknowledge late, so that the task is re-delivered if its worker dies while
+# grading. upload_grades_csv checkpoints its progress and resumes from the last
+# completed chunk of students.
+@task(base=BaseInstructorTask, routing_key=settings.GRADES_DOWNLOAD_ROUTING_KEY, acks_late=True)  # pylint: disable=not-callable
 def calculate_grades_csv(entry_id, xmodule_instance_args):
     """
     Grade a course and push the results to an S3 bucket for download.
@@ -176,6 +194,17 @@ def calculate_grades_csv(entry_id, xmodule_instance_args):
     return run_main_task(entry_id, task_fn, action_name)
 
 
+# Acknowledge late, so that the subtask is re-delivered if its worker dies
+# while grading; the re-delivered subtask takes over the subtask lock.
+@task(routing_key=settings.GRADES_DOWNLOAD_ROUTING_KEY, acks_late=True)  # pylint: disable=not-callable
+def grade_report_subtask(entry_id, student_ids, part, report_info, subtask_status_dict):
+    """
+    Grades a batch of students for a `calculate_grades_csv` task that was
+    split into subtasks; see perform_grade_report_subtask().
+    """
+    return perform_grade_report_subtask(entry_id, student_ids, part, report_info, subtask_status_dict)
+
+
 @task(base=BaseInstructorTask, routing_key=settings.GRADES_DOWNLOAD_ROUTING_KEY)  # pylint: disable=not-callable
 def calculate_problem_grade_report(entry_id, xmodule_instance_args):
     """
@@ -4,12 +4,14 @@ running state of a course.
 
 """
 import json
+import math
 import re
 from collections import OrderedDict
 from datetime import datetime
 from django.conf import settings
 from eventtracking import tracker
-from itertools import chain
+from functools import partial
+from itertools import chain, count
 from time import time
 import unicodecsv
 import logging
@@ -36,11 +38,8 @@ from util.db import outer_atomic
 from util.file import course_filename_prefix_generator, UniversalNewlineIterator
 from xblock.runtime import KvsFieldData
 from xmodule.modulestore.django import modulestore
-from xmodule.split_test_module import get_split_user_partitions
 from django.utils.translation import ugettext as _
 from certificates.models import (
-    CertificateWhitelist,
-    certificate_info_for_user,
     CertificateStatuses,
     GeneratedCertificate
 )
@@ -59,15 +58,18 @@ from instructor_analytics.basic import (
 from instructor_analytics.csvs import format_dictlist
 from openassessment.data import OraAggregateData
 from instructor_task.models import ReportStore, InstructorTask, PROGRESS
-from lms.djangoapps.lms_xblock.runtime import LmsPartitionService
-from openedx.core.djangoapps.course_groups.cohorts import get_cohort
+from instructor_task.report_context import GradeReportContext
+from instructor_task.subtasks import (
+    SubtaskStatus,
+    check_subtask_is_valid,
+    queue_subtasks_for_query,
+    update_subtask_status,
+)
 from openedx.core.djangoapps.course_groups.models import CourseUserGroup
 from openedx.core.djangoapps.content.course_structures.models import CourseStructure
 from opaque_keys.edx.keys import UsageKey
-from openedx.core.djangoapps.course_groups.cohorts import add_user_to_cohort, is_course_cohorted
+from openedx.core.djangoapps.course_groups.cohorts import add_user_to_cohort
 from student.models import CourseEnrollment, CourseAccessRole
-from lms.djangoapps.teams.models import CourseTeamMembership
-from lms.djangoapps.verify_student.models import SoftwareSecurePhotoVerification
 
 # define different loggers for use within tasks and on client side
 TASK_LOG = logging.getLogger('edx.celery.task')
@@ -83,6 +85,12 @@ UPDATE_STATUS_SKIPPED = 'skipped'
 # The setting name used for events when "settings" (account settings, preferences, profile information) change.
 REPORT_REQUESTED_EVENT_NAME = u'edx.instructor.report.requested'
 
+# Format of the timestamp included in report file names.
+REPORT_TIMESTAMP_FORMAT = "%Y-%m-%d-%H%M"
+
+# Header row of the report listing students who could not be graded.
+GRADE_REPORT_ERROR_HEADER = ["id", "username", "error_msg"]
+
 
 class BaseInstructorTask(Task):
     """
@@ -234,6 +242,53 @@ class TaskProgress(object):
         _get_current_task().update_state(state=PROGRESS, meta=progress_dict)
         return progress_dict
 
+    def save_checkpoint(self, entry_id, checkpoint, extra_meta=None):
+        """
+        Update the current celery task's state as `update_task_state`
+        does, and also record the progress together with `checkpoint`
+        in the task_output of the InstructorTask entry `entry_id`.
+
+        A task that is re-delivered after its worker dies can pass the
+        result of `load_checkpoint` to `restore` to continue from where
+        the previous attempt stopped.
+
+        Arguments:
+            entry_id (int): primary key of the task's InstructorTask entry
+            checkpoint (dict): small, JSON-serializable description of the
+                work completed so far
+            extra_meta (dict): Extra metadata to pass to `update_state`
+
+        Returns:
+            dict: The current task's progress dict
+        """
+        progress_dict = self.update_task_state(extra_meta=extra_meta)
+        entry = InstructorTask.objects.get(pk=entry_id)
+        entry.task_output = InstructorTask.create_output_for_success(dict(progress_dict, checkpoint=checkpoint))
+        entry.save_now()
+        return progress_dict
+
+    @staticmethod
+    def load_checkpoint(entry_id):
+        """
+        Return the progress dict last recorded by `save_checkpoint` for the
+        InstructorTask entry `entry_id`, or None if no checkpoint exists.
+        """
+        entry = InstructorTask.objects.get(pk=entry_id)
+        if entry.task_state != PROGRESS or not entry.task_output:
+            return None
+        progress_dict = json.loads(entry.task_output)
+        return progress_dict if 'checkpoint' in progress_dict else None
+
+    def restore(self, progress_dict):
+        """
+        Restore the 'attempted', 'succeeded', 'skipped' and 'failed'
+        counts from a progress dict returned by `load_checkpoint`.
+        """
+        self.attempted = progress_dict['attempted']
+        self.succeeded = progress_dict['succeeded']
+        self.skipped = progress_dict['skipped']
+        self.failed = progress_dict['failed']
+
 
 def run_main_task(entry_id, task_fcn, action_name):
     """
@@ -333,6 +388,32 @@ def perform_module_state_update(update_fcn, filter_fcn, _entry_id, course_id, ta
 
     """
     start_time = time()
+    problems, modules_to_update = _get_modules_to_update(course_id, task_input, filter_fcn)
+
+    task_progress = TaskProgress(action_name, modules_to_update.count(), start_time)
+    task_progress.update_task_state()
+
+    for module_to_update in modules_to_update:
+        task_progress.attempted += 1
+        module_descriptor = problems[unicode(module_to_update.module_state_key)]
+        # There is no try here:  if there's an error, we let it throw, and the task will
+        # be marked as FAILED, with a stack trace.
+        with dog_stats_api.timer('instructor_tasks.module.time.step', tags=[u'action:{name}'.format(name=action_name)]):
+            update_status = update_fcn(module_descriptor, module_to_update)
+            _record_update_status(task_progress, update_status)
+
+    return task_progress.update_task_state()
+
+
+def _get_modules_to_update(course_id, task_input, filter_fcn=None):
+    """
+    Returns a tuple (problems, modules_to_update) for the update described by
+    `task_input`, as done by `perform_module_state_update`.
+
+    `problems` maps the usage key of each problem to update, as unicode, to
+    its descriptor, and `modules_to_update` is the query of the StudentModule
+    instances to update.
+    """
     usage_keys = []
     problem_url = task_input.get('problem_url')
     entrance_exam_url = task_input.get('entrance_exam_url')
@@ -373,28 +454,189 @@ def perform_module_state_update(update_fcn, filter_fcn, _entry_id, course_id, ta
     if filter_fcn is not None:
         modules_to_update = filter_fcn(modules_to_update)
 
-    task_progress = TaskProgress(action_name, modules_to_update.count(), start_time)
-    task_progress.update_task_state()
+    return problems, modules_to_update
 
-    for module_to_update in modules_to_update:
-        task_progress.attempted += 1
-        module_descriptor = problems[unicode(module_to_update.module_state_key)]
-        # There is no try here:  if there's an error, we let it throw, and the task will
-        # be marked as FAILED, with a stack trace.
-        with dog_stats_api.timer('instructor_tasks.module.time.step', tags=[u'action:{name}'.format(name=action_name)]):
-            update_status = update_fcn(module_descriptor, module_to_update)
-            if update_status == UPDATE_STATUS_SUCCEEDED:
-                # If the update_fcn returns true, then it performed some kind of work.
-                # Logging of failures is left to the update_fcn itself.
-                task_progress.succeeded += 1
-            elif update_status == UPDATE_STATUS_FAILED:
-                task_progress.failed += 1
-            elif update_status == UPDATE_STATUS_SKIPPED:
-                task_progress.skipped += 1
-            else:
-                raise UpdateProblemModuleStateError("Unexpected update_status returned: {}".format(update_status))
 
-    return task_progress.update_task_state()
+def _record_update_status(task_progress, update_status):
+    """
+    Counts the `update_status` returned by an update function in `task_progress`.
+    """
+    if update_status == UPDATE_STATUS_SUCCEEDED:
+        # If the update_fcn returns true, then it performed some kind of work.
+        # Logging of failures is left to the update_fcn itself.
+        task_progress.succeeded += 1
+    elif update_status == UPDATE_STATUS_FAILED:
+        task_progress.failed += 1
+    elif update_status == UPDATE_STATUS_SKIPPED:
+        task_progress.skipped += 1
+    else:
+        raise UpdateProblemModuleStateError("Unexpected update_status returned: {}".format(update_status))
+
+
+def _update_module_state_chunks(update_chunk_fcn, problems, modules_to_update, chunk_size, action_name):
+    """
+    Hands the StudentModule instances of `modules_to_update` to
+    `update_chunk_fcn` in chunks of at most `chunk_size`, and yields the
+    list of update statuses it returns for each chunk.
+
+    `update_chunk_fcn` is called with the descriptor of a problem and the
+    list of the chunk's StudentModule instances for that problem, and
+    returns the update status of each of them, in order.  The instances
+    are read in order of id, a chunk at a time, so updates that change
+    whether a StudentModule matches the query don't affect the chunks.
+    """
+    modules_to_update = modules_to_update.select_related('student').order_by('id')
+    last_module_id = 0
+    while True:
+        chunk = list(modules_to_update.filter(id__gt=last_module_id)[:chunk_size])
+        if not chunk:
+            return
+        last_module_id = chunk[-1].id
+
+        modules_by_problem = OrderedDict()
+        for student_module in chunk:
+            modules_by_problem.setdefault(unicode(student_module.module_state_key), []).append(student_module)
+
+        update_statuses = []
+        with dog_stats_api.timer(
+            'instructor_tasks.module.time.chunk',
+            tags=[u'action:{name}'.format(name=action_name)],
+        ):
+            for usage_key, student_modules in modules_by_problem.iteritems():
+                update_statuses.extend(update_chunk_fcn(problems[usage_key], student_modules))
+        yield update_statuses
+
+
+def perform_problem_rescore(xmodule_instance_args, filter_fcn, entry_id, course_id, task_input, action_name):
+    """
+    Rescores the StudentModule instances selected as by
+    `perform_module_state_update`, in chunks.
+
+    The submissions are rescored in chunks of `settings.RESCORE_CHUNK_SIZE`,
+    each in a single transaction and with the course loaded once, see
+    `rescore_problem_module_states`, and the task's progress is updated
+    after each chunk, with the number of chunks completed.
+
+    When more than `settings.RESCORE_SUBTASK_THRESHOLD` submissions are
+    selected, they are instead rescored in parallel by subtasks, each
+    rescoring `settings.RESCORE_MODULES_PER_SUBTASK` of them; see
+    `perform_rescore_problem_subtask`.
+
+    Returns the task's progress dict, as `perform_module_state_update`.
+    """
+    start_time = time()
+    problems, modules_to_update = _get_modules_to_update(course_id, task_input, filter_fcn)
+    total = modules_to_update.count()
+
+    subtask_threshold = settings.RESCORE_SUBTASK_THRESHOLD
+    if entry_id is not None and subtask_threshold is not None and total > subtask_threshold:
+        return _delegate_rescore_subtasks(entry_id, action_name, modules_to_update, total, xmodule_instance_args)
+
+    task_progress = TaskProgress(action_name, total, start_time)
+    chunk_size = settings.RESCORE_CHUNK_SIZE
+    chunk_progress = {'chunks': 0, 'total_chunks': int(math.ceil(float(total) / chunk_size))}
+    task_progress.update_task_state(extra_meta=chunk_progress)
+
+    update_chunk_fcn = partial(rescore_problem_module_states, xmodule_instance_args)
+    for update_statuses in _update_module_state_chunks(
+            update_chunk_fcn, problems, modules_to_update, chunk_size, action_name
+    ):
+        for update_status in update_statuses:
+            task_progress.attempted += 1
+            _record_update_status(task_progress, update_status)
+        chunk_progress['chunks'] += 1
+        task_progress.update_task_state(extra_meta=chunk_progress)
+
+    return task_progress.update_task_state(extra_meta=chunk_progress)
+
+
+def _delegate_rescore_subtasks(entry_id, action_name, modules_to_update, total, xmodule_instance_args):
+    """
+    Rescores `modules_to_update` by splitting them into batches of no more
+    than `settings.RESCORE_MODULES_PER_SUBTASK` and queueing a
+    `rescore_problem_subtask` to rescore each batch in parallel.
+
+    Progress of all subtasks is aggregated on the InstructorTask entry.
+    """
+    entry = InstructorTask.objects.get(pk=entry_id)
+
+    # As for bulk email, if subtasks have already been defined then this task
+    # has been re-delivered after queueing them, and there is nothing left to do.
+    if len(entry.subtasks) > 0 and entry.task_output:
+        TASK_LOG.warning(u"Task %s has already queued rescore subtasks", entry.task_id)
+        return json.loads(entry.task_output)
+
+    # Imported here to avoid a circular import, since the tasks module
+    # imports this one.
+    from instructor_task.tasks import rescore_problem_subtask
+
+    def _create_rescore_subtask(module_list, initial_subtask_status):
+        """Creates a subtask to rescore the StudentModules in `module_list`."""
+        return rescore_problem_subtask.subtask(
+            (
+                entry_id,
+                [student_module['pk'] for student_module in module_list],
+                xmodule_instance_args,
+                initial_subtask_status.to_dict(),
+            ),
+            task_id=initial_subtask_status.task_id,
+        )
+
+    return queue_subtasks_for_query(
+        entry,
+        action_name,
+        _create_rescore_subtask,
+        [modules_to_update.order_by('id')],
+        [],
+        settings.RESCORE_MODULES_PER_SUBTASK,
+        total,
+    )
+
+
+def perform_rescore_problem_subtask(entry_id, student_module_ids, xmodule_instance_args, subtask_status_dict):
+    """
+    Rescores the StudentModules in `student_module_ids` for a rescore task
+    delegated by `perform_problem_rescore`, in chunks of
+    `settings.RESCORE_CHUNK_SIZE`.
+
+    Updates the parent InstructorTask with the number of submissions
+    rescored.  Since an error while rescoring stops the rescoring of the
+    remaining submissions, those are then counted as failed.
+
+    Rescoring a submission twice is harmless, so a subtask re-delivered
+    before it reported its status takes over the lock of the earlier run;
+    see `check_subtask_is_valid`.
+    """
+    subtask_status = SubtaskStatus.from_dict(subtask_status_dict)
+    current_task_id = subtask_status.task_id
+    check_subtask_is_valid(entry_id, current_task_id, subtask_status, reclaim_queued_lock=True)
+
+    entry = InstructorTask.objects.get(pk=entry_id)
+    task_input = json.loads(entry.task_input)
+    num_remaining = len(student_module_ids)
+    try:
+        problems, _ = _get_modules_to_update(entry.course_id, task_input)
+        update_chunk_fcn = partial(rescore_problem_module_states, xmodule_instance_args)
+        for update_statuses in _update_module_state_chunks(
+                update_chunk_fcn,
+                problems,
+                StudentModule.objects.filter(id__in=student_module_ids),
+                settings.RESCORE_CHUNK_SIZE,
+                json.loads(entry.task_output)['action_name'],
+        ):
+            subtask_status.increment(
+                succeeded=update_statuses.count(UPDATE_STATUS_SUCCEEDED),
+                failed=update_statuses.count(UPDATE_STATUS_FAILED),
+                skipped=update_statuses.count(UPDATE_STATUS_SKIPPED),
+            )
+            num_remaining -= len(update_statuses)
+        subtask_status.increment(state=SUCCESS)
+    except Exception:  # pylint: disable=broad-except
+        TASK_LOG.exception(u"Rescore subtask %s failed unexpectedly", current_task_id)
+        subtask_status.increment(failed=num_remaining, state=FAILURE)
+
+    update_subtask_status(entry_id, current_task_id, subtask_status)
+    return subtask_status.to_dict()
 
 
 def _get_task_id_from_xmodule_args(xmodule_instance_args):
@@ -482,80 +724,114 @@ def rescore_problem_module_state(xmodule_instance_args, module_descriptor, stude
     Returns True if problem was successfully rescored for the given student, and False
     if problem encountered some kind of error in rescoring.
     '''
+    return _rescore_problem_module_states(xmodule_instance_args, module_descriptor, [student_module])[0]
+
+
+@outer_atomic
+def rescore_problem_module_states(xmodule_instance_args, module_descriptor, student_modules):
+    '''
+    Performs rescoring, as `rescore_problem_module_state` does, on the
+    submissions of the StudentModule objects `student_modules` to the problem
+    of the XModule descriptor `module_descriptor`, and returns the list of
+    their update statuses.
+
+    The course is loaded once for all the submissions, and their updated
+    state and scores are written in a single transaction.
+    '''
+    return _rescore_problem_module_states(xmodule_instance_args, module_descriptor, student_modules)
+
+
+def _rescore_problem_module_states(xmodule_instance_args, module_descriptor, student_modules):
+    '''
+    Rescores the submissions of `student_modules` to the problem of
+    `module_descriptor`, and returns the list of their update statuses.
+    '''
+    if not student_modules:
+        return []
+    course_id = student_modules[0].course_id
+
+    with modulestore().bulk_operations(course_id):
+        course = get_course_by_id(course_id)
+        return [
+            _rescore_problem_module_state(xmodule_instance_args, module_descriptor, student_module, course)
+            for student_module in student_modules
+        ]
+
+
+def _rescore_problem_module_state(xmodule_instance_args, module_descriptor, student_module, course):
+    '''
+    Rescores the submission of `student_module` in `course`, and returns
+    its update status.
+    '''
     # unpack the StudentModule:
     course_id = student_module.course_id
     student = student_module.student
     usage_key = student_module.module_state_key
 
-    with modulestore().bulk_operations(course_id):
-        course = get_course_by_id(course_id)
-        # TODO: Here is a call site where we could pass in a loaded course.  I
-        # think we certainly need it since grading is happening here, and field
-        # overrides would be important in handling that correctly
-        instance = _get_module_instance_for_task(
-            course_id,
-            student,
-            module_descriptor,
-            xmodule_instance_args,
-            grade_bucket_type='rescore',
-            course=course
-        )
+    instance = _get_module_instance_for_task(
+        course_id,
+        student,
+        module_descriptor,
+        xmodule_instance_args,
+        grade_bucket_type='rescore',
+        course=course
+    )
 
-        if instance is None:
-            # Either permissions just changed, or someone is trying to be clever
-            # and load something they shouldn't have access to.
-            msg = "No module {loc} for student {student}--access denied?".format(
+    if instance is None:
+        # Either permissions just changed, or someone is trying to be clever
+        # and load something they shouldn't have access to.
+        msg = "No module {loc} for student {student}--access denied?".format(
+            loc=usage_key,
+            student=student
+        )
+        TASK_LOG.debug(msg)
+        raise UpdateProblemModuleStateError(msg)
+
+    if not hasattr(instance, 'rescore_problem'):
+        # This should also not happen, since it should be already checked in the caller,
+        # but check here to be sure.
+        msg = "Specified problem does not support rescoring."
+        raise UpdateProblemModuleStateError(msg)
+
+    result = instance.rescore_problem()
+    instance.save()
+    if 'success' not in result:
+        # don't consider these fatal, but false means that the individual call didn't complete:
+        TASK_LOG.warning(
+            u"error processing rescore call for course %(course)s, problem %(loc)s "
+            u"and student %(student)s: unexpected response %(msg)s",
+            dict(
+                msg=result,
+                course=course_id,
                 loc=usage_key,
                 student=student
             )
-            TASK_LOG.debug(msg)
-            raise UpdateProblemModuleStateError(msg)
-
-        if not hasattr(instance, 'rescore_problem'):
-            # This should also not happen, since it should be already checked in the caller,
-            # but check here to be sure.
-            msg = "Specified problem does not support rescoring."
-            raise UpdateProblemModuleStateError(msg)
-
-        result = instance.rescore_problem()
-        instance.save()
-        if 'success' not in result:
-            # don't consider these fatal, but false means that the individual call didn't complete:
-            TASK_LOG.warning(
-                u"error processing rescore call for course %(course)s, problem %(loc)s "
-                u"and student %(student)s: unexpected response %(msg)s",
-                dict(
-                    msg=result,
-                    course=course_id,
-                    loc=usage_key,
-                    student=student
-                )
-            )
-            return UPDATE_STATUS_FAILED
-        elif result['success'] not in ['correct', 'incorrect']:
-            TASK_LOG.warning(
-                u"error processing rescore call for course %(course)s, problem %(loc)s "
-                u"and student %(student)s: %(msg)s",
-                dict(
-                    msg=result['success'],
-                    course=course_id,
-                    loc=usage_key,
-                    student=student
-                )
+        )
+        return UPDATE_STATUS_FAILED
+    elif result['success'] not in ['correct', 'incorrect']:
+        TASK_LOG.warning(
+            u"error processing rescore call for course %(course)s, problem %(loc)s "
+            u"and student %(student)s: %(msg)s",
+            dict(
+                msg=result['success'],
+                course=course_id,
+                loc=usage_key,
+                student=student
             )
-            return UPDATE_STATUS_FAILED
-        else:
-            TASK_LOG.debug(
-                u"successfully processed rescore call for course %(course)s, problem %(loc)s "
-                u"and student %(student)s: %(msg)s",
-                dict(
-                    msg=result['success'],
-                    course=course_id,
-                    loc=usage_key,
-                    student=student
-                )
+        )
+        return UPDATE_STATUS_FAILED
+    else:
+        TASK_LOG.debug(
+            u"successfully processed rescore call for course %(course)s, problem %(loc)s "
+            u"and student %(student)s: %(msg)s",
+            dict(
+                msg=result['success'],
+                course=course_id,
+                loc=usage_key,
+                student=student
             )
-            return UPDATE_STATUS_SUCCEEDED
+        )
+        return UPDATE_STATUS_SUCCEEDED
 
 
 @outer_atomic
@@ -615,18 +891,21 @@ def upload_csv_to_report_store(rows, csv_name, course_id, timestamp, config_name
         course_id: ID of the course
     """
     report_store = ReportStore.from_config(config_name)
-    report_store.store_rows(
-        course_id,
-        u"{course_prefix}_{csv_name}_{timestamp_str}.csv".format(
-            course_prefix=course_filename_prefix_generator(course_id),
-            csv_name=csv_name,
-            timestamp_str=timestamp.strftime("%Y-%m-%d-%H%M")
-        ),
-        rows
-    )
+    report_store.store_rows(course_id, _report_csv_filename(csv_name, course_id, timestamp), rows)
     tracker.emit(REPORT_REQUESTED_EVENT_NAME, {"report_type": csv_name, })
 
 
+def _report_csv_filename(csv_name, course_id, timestamp):
+    """
+    Return the name of the CSV file for the report `csv_name` generated at `timestamp`.
+    """
+    return u"{course_prefix}_{csv_name}_{timestamp_str}.csv".format(
+        course_prefix=course_filename_prefix_generator(course_id),
+        csv_name=csv_name,
+        timestamp_str=timestamp.strftime(REPORT_TIMESTAMP_FORMAT)
+    )
+
+
 def upload_exec_summary_to_store(data_dict, report_name, course_id, generated_at, config_name='FINANCIAL_REPORTS'):
     """
     Upload Executive Summary Html file using ReportStore.
@@ -646,21 +925,32 @@ def upload_exec_summary_to_store(data_dict, report_name, course_id, generated_at
         u"{course_prefix}_{report_name}_{timestamp_str}.html".format(
             course_prefix=course_filename_prefix_generator(course_id),
             report_name=report_name,
-            timestamp_str=generated_at.strftime("%Y-%m-%d-%H%M")
+            timestamp_str=generated_at.strftime(REPORT_TIMESTAMP_FORMAT)
         ),
         output_buffer,
     )
     tracker.emit(REPORT_REQUESTED_EVENT_NAME, {"report_type": report_name})
 
 
-def upload_grades_csv(_xmodule_instance_args, _entry_id, course_id, _task_input, action_name):  # pylint: disable=too-many-statements
+def upload_grades_csv(_xmodule_instance_args, entry_id, course_id, _task_input, action_name):  # pylint: disable=too-many-statements
     """
     For a given `course_id`, generate a grades CSV file for all students that
     are enrolled, and store using a `ReportStore`. Once created, the files can
     be accessed by instantiating another `ReportStore` (via
-    `ReportStore.from_config()`) and calling `link_for()` on it. Writes are
-    buffered, so we'll never write part of a CSV file to S3 -- i.e. any files
-    that are visible in ReportStore will be complete ones.
+    `ReportStore.from_config()`) and calling `link_for()` on it.
+
+    Students are graded in chunks of `settings.GRADE_REPORT_CHUNK_SIZE`.  The
+    rows of each completed chunk are written to the `ReportStore` as a
+    partial file and the task's progress is checkpointed on its
+    InstructorTask entry, so a task that is re-delivered after its worker
+    died resumes from the last completed chunk.  The partial files are only
+    assembled into the final CSV once every chunk is done, so we'll never
+    write part of a CSV file to S3 -- i.e. any files that are visible in
+    ReportStore will be complete ones.
+
+    Courses with more than `settings.GRADE_REPORT_SUBTASK_THRESHOLD` enrolled
+    students are instead graded in parallel by subtasks; see
+    `_delegate_grade_report_subtasks`.
 
     As we start to add more CSV downloads, it will probably be worthwhile to
     make a more general CSVDoc class instead of building out the rows like we
@@ -668,76 +958,140 @@ def upload_grades_csv(_xmodule_instance_args, _entry_id, course_id, _task_input,
     """
     start_time = time()
     start_date = datetime.now(UTC)
-    status_interval = 100
-    enrolled_students = CourseEnrollment.objects.users_enrolled_in(course_id)
+    chunk_size = settings.GRADE_REPORT_CHUNK_SIZE
+    enrolled_students = CourseEnrollment.objects.users_enrolled_in(course_id).order_by('id')
     task_progress = TaskProgress(action_name, enrolled_students.count(), start_time)
 
     fmt = u'Task: {task_id}, InstructorTask ID: {entry_id}, Course: {course_id}, Input: {task_input}'
     task_info_string = fmt.format(
         task_id=_xmodule_instance_args.get('task_id') if _xmodule_instance_args is not None else None,
-        entry_id=_entry_id,
+        entry_id=entry_id,
         course_id=course_id,
         task_input=_task_input
     )
     TASK_LOG.info(u'%s, Task type: %s, Starting task execution', task_info_string, action_name)
 
-    course = get_course_by_id(course_id)
-    course_is_cohorted = is_course_cohorted(course.id)
-    teams_enabled = course.teams_enabled
-    cohorts_header = ['Cohort Name'] if course_is_cohorted else []
-    teams_header = ['Team Name'] if teams_enabled else []
+    subtask_threshold = settings.GRADE_REPORT_SUBTASK_THRESHOLD
+    if entry_id is not None and subtask_threshold is not None and task_progress.total > subtask_threshold:
+        TASK_LOG.info(u'%s, Task type: %s, Delegating grading to subtasks', task_info_string, action_name)
+        return _delegate_grade_report_subtasks(entry_id, course_id, action_name, enrolled_students, start_date)
 
-    experiment_partitions = get_split_user_partitions(course.user_partitions)
-    group_configs_header = [u'Experiment Group ({})'.format(partition.name) for partition in experiment_partitions]
-
-    certificate_info_header = ['Certificate Eligible', 'Certificate Delivered', 'Certificate Type']
-    certificate_whitelist = CertificateWhitelist.objects.filter(course_id=course_id, whitelist=True)
-    whitelisted_user_ids = [entry.user_id for entry in certificate_whitelist]
-
-    # Loop over all our students and build our CSV lists in memory
+    course = get_course_by_id(course_id)
+    report_context = GradeReportContext(course)
+
+    # Resume from the last completed chunk if this task has already been
+    # partially run, e.g. because its worker died and the task was re-delivered.
+    checkpoint = {'report': 'grade_report', 'chunks': 0, 'last_user_id': 0}
+    saved_progress = TaskProgress.load_checkpoint(entry_id) if entry_id is not None else None
+    if saved_progress is not None and saved_progress['checkpoint'].get('report') == 'grade_report':
+        checkpoint = saved_progress['checkpoint']
+        task_progress.restore(saved_progress)
+        start_date = datetime.strptime(checkpoint['timestamp'], REPORT_TIMESTAMP_FORMAT).replace(tzinfo=UTC)
+    checkpoint['timestamp'] = start_date.strftime(REPORT_TIMESTAMP_FORMAT)
+
+    report_store = ReportStore.from_config('GRADES_DOWNLOAD')
+    report_filename = _report_csv_filename('grade_report', course_id, start_date)
+    err_report_filename = _report_csv_filename('grade_report_err', course_id, start_date)
+
+    # Part 0 of each report holds its header row, and part N holds the rows
+    # of chunk N.  The grade header depends on the course's graded sections,
+    # so it is only known once the first student has been graded.
     header = None
-    rows = []
-    err_rows = [["id", "username", "error_msg"]]
+    header_row = report_store.partial_rows(course_id, report_filename, 0)
+    if header_row:
+        header = header_row[0][4:len(header_row[0]) - len(report_context.header)]
+    report_store.store_partial_rows(course_id, err_report_filename, 0, [GRADE_REPORT_ERROR_HEADER])
     current_step = {'step': 'Calculating Grades'}
 
-    total_enrolled_students = enrolled_students.count()
-    student_counter = 0
+    total_enrolled_students = task_progress.total
     TASK_LOG.info(
-        u'%s, Task type: %s, Current step: %s, Starting grade calculation for total students: %s',
+        u'%s, Task type: %s, Current step: %s, Starting grade calculation for total students: %s, '
+        u'resuming after chunk: %s',
         task_info_string,
         action_name,
         current_step,
-
-        total_enrolled_students
+        total_enrolled_students,
+        checkpoint['chunks'],
     )
-    for student, gradeset, err_msg in iterate_grades_for(course_id, enrolled_students):
-        # Periodically update task status (this is a cache write)
-        if task_progress.attempted % status_interval == 0:
+    while True:
+        chunk_students = list(enrolled_students.filter(id__gt=checkpoint['last_user_id'])[:chunk_size])
+        if not chunk_students:
+            break
+
+        chunk_header, rows, err_rows = _grade_report_rows(course, report_context, chunk_students, header)
+        if header is None and chunk_header is not None:
+            header = chunk_header
+            report_store.store_partial_rows(
+                course_id, report_filename, 0, [_grade_report_header(header, report_context)]
+            )
+        task_progress.attempted += len(rows) + len(err_rows)
+        task_progress.succeeded += len(rows)
+        task_progress.failed += len(err_rows)
+
+        # Write out the chunk before recording it as complete, so that a
+        # retried task never skips rows that were not stored.
+        checkpoint['chunks'] += 1
+        checkpoint['last_user_id'] = chunk_students[-1].id
+        if rows:
+            report_store.store_partial_rows(course_id, report_filename, checkpoint['chunks'], rows)
+        if err_rows:
+            report_store.store_partial_rows(course_id, err_report_filename, checkpoint['chunks'], err_rows)
+        if entry_id is not None:
+            task_progress.save_checkpoint(entry_id, checkpoint, extra_meta=current_step)
+        else:
             task_progress.update_task_state(extra_meta=current_step)
-        task_progress.attempted += 1
 
-        # Now add a log entry after each student is graded to get a sense
-        # of the task's progress
-        student_counter += 1
         TASK_LOG.info(
             u'%s, Task type: %s, Current step: %s, Grade calculation in-progress for students: %s/%s',
             task_info_string,
             action_name,
             current_step,
-            student_counter,
+            task_progress.attempted,
             total_enrolled_students
         )
 
+    TASK_LOG.info(
+        u'%s, Task type: %s, Current step: %s, Grade calculation completed for students: %s/%s',
+        task_info_string,
+        action_name,
+        current_step,
+        task_progress.attempted,
+        total_enrolled_students
+    )
+
+    # By this point, every chunk has been written out as a partial file.
+    current_step = {'step': 'Uploading CSVs'}
+    task_progress.update_task_state(extra_meta=current_step)
+    TASK_LOG.info(u'%s, Task type: %s, Current step: %s', task_info_string, action_name, current_step)
+
+    # Perform the actual upload
+    _assemble_grade_report(
+        report_store, course_id, report_filename, err_report_filename, checkpoint['chunks'] + 1, task_progress.failed
+    )
+
+    # One last update before we close out...
+    TASK_LOG.info(u'%s, Task type: %s, Finalizing grade task', task_info_string, action_name)
+    return task_progress.update_task_state(extra_meta=current_step)
+
+
+def _grade_report_rows(course, report_context, students, header):
+    """
+    Grade `students` and build their rows of the grade report.
+
+    `header` is the list of graded section labels used for the report's
+    grade columns, or None if it is not known yet, in which case it is taken
+    from the first student graded successfully.
+
+    Returns a tuple (header, rows, err_rows).
+    """
+    report_context.prefetch(students)
+    rows = []
+    err_rows = []
+    for student, gradeset, err_msg in iterate_grades_for(course, students):
         if gradeset:
             # We were able to successfully grade this student for this course.
-            task_progress.succeeded += 1
-            if not header:
+            if header is None:
                 header = [section['label'] for section in gradeset[u'section_breakdown']]
-                rows.append(
-                    ["id", "email", "username", "grade"] + header + cohorts_header +
-                    group_configs_header + teams_header +
-                    ['Enrollment Track', 'Verification Status'] + certificate_info_header
-                )
 
             percents = {
                 section['label']: section.get('percent', 0.0)
@@ -745,37 +1099,6 @@ def upload_grades_csv(_xmodule_instance_args, _entry_id, course_id, _task_input,
                 if 'label' in section
             }
 
-            cohorts_group_name = []
-            if course_is_cohorted:
-                group = get_cohort(student, course_id, assign=False)
-                cohorts_group_name.append(group.name if group else '')
-
-            group_configs_group_names = []
-            for partition in experiment_partitions:
-                group = LmsPartitionService(student, course_id).get_group(partition, assign=False)
-                group_configs_group_names.append(group.name if group else '')
-
-            team_name = []
-            if teams_enabled:
-                try:
-                    membership = CourseTeamMembership.objects.get(user=student, team__course_id=course_id)
-                    team_name.append(membership.team.name)
-                except CourseTeamMembership.DoesNotExist:
-                    team_name.append('')
-
-            enrollment_mode = CourseEnrollment.enrollment_mode_for_user(student, course_id)[0]
-            verification_status = SoftwareSecurePhotoVerification.verification_status_for_user(
-                student,
-                course_id,
-                enrollment_mode
-            )
-            certificate_info = certificate_info_for_user(
-                student,
-                course_id,
-                gradeset['grade'],
-                student.id in whitelisted_user_ids
-            )
-
             # Not everybody has the same gradable items. If the item is not
             # found in the user's gradeset, just assume it's a 0. The aggregated
             # grades for their sections and overall course will be calculated
@@ -785,38 +1108,169 @@ def upload_grades_csv(_xmodule_instance_args, _entry_id, course_id, _task_input,
             row_percents = [percents.get(label, 0.0) for label in header]
             rows.append(
                 [student.id, student.email, student.username, gradeset['percent']] +
-                row_percents + cohorts_group_name + group_configs_group_names + team_name +
-                [enrollment_mode] + [verification_status] + certificate_info
+                row_percents + report_context.columns_for(student, gradeset['grade'])
             )
         else:
             # An empty gradeset means we failed to grade a student.
-            task_progress.failed += 1
             err_rows.append([student.id, student.username, err_msg])
+    return header, rows, err_rows
 
-    TASK_LOG.info(
-        u'%s, Task type: %s, Current step: %s, Grade calculation completed for students: %s/%s',
-        task_info_string,
+
+def _grade_report_header(header, report_context):
+    """
+    Return the header row of a grade report whose grade columns are `header`.
+    """
+    return ["id", "email", "username", "grade"] + header + report_context.header
+
+
+def _assemble_grade_report(report_store, course_id, report_filename, err_report_filename, num_parts, num_failed):
+    """
+    Assemble the partial files of a grade report, and of its error report
+    if any students could not be graded, into the final CSV files.
+    """
+    report_store.assemble_partials(course_id, report_filename, num_parts)
+    tracker.emit(REPORT_REQUESTED_EVENT_NAME, {"report_type": 'grade_report', })
+
+    # If there are any error rows (don't count the header), write them out as well
+    if num_failed:
+        report_store.assemble_partials(course_id, err_report_filename, num_parts)
+        tracker.emit(REPORT_REQUESTED_EVENT_NAME, {"report_type": 'grade_report_err', })
+    else:
+        report_store.delete_partials(course_id, err_report_filename, num_parts)
+
+
+def _delegate_grade_report_subtasks(entry_id, course_id, action_name, enrolled_students, start_date):
+    """
+    Generate a grade report by splitting `enrolled_students` into batches of
+    no more than `settings.GRADE_REPORT_STUDENTS_PER_SUBTASK` and queueing a
+    `grade_report_subtask` to grade each batch in parallel; see
+    `perform_grade_report_subtask`.
+
+    Subtask N stores its rows as part N of the report's partial files, and
+    the subtask that completes last assembles them into the final report.
+    Progress of all subtasks is aggregated on the InstructorTask entry.
+    """
+    entry = InstructorTask.objects.get(pk=entry_id)
+
+    # As for bulk email, if subtasks have already been defined then this task
+    # has been re-delivered after queueing them, and there is nothing left to do.
+    if len(entry.subtasks) > 0 and entry.task_output:
+        TASK_LOG.warning(u"Task %s has already queued grade report subtasks", entry.task_id)
+        return json.loads(entry.task_output)
+
+    report_info = {
+        'filename': _report_csv_filename('grade_report', course_id, start_date),
+        'err_filename': _report_csv_filename('grade_report_err', course_id, start_date),
+    }
+    report_store = ReportStore.from_config('GRADES_DOWNLOAD')
+    report_store.store_partial_rows(course_id, report_info['err_filename'], 0, [GRADE_REPORT_ERROR_HEADER])
+
+    subtask_parts = count(1)
+
+    # Imported here to avoid a circular import, since the tasks module
+    # imports this one.
+    from instructor_task.tasks import grade_report_subtask
+
+    def _create_grade_report_subtask(student_list, initial_subtask_status):
+        """Creates a subtask to grade the students in `student_list`."""
+        return grade_report_subtask.subtask(
+            (
+                entry_id,
+                [student['pk'] for student in student_list],
+                next(subtask_parts),
+                report_info,
+                initial_subtask_status.to_dict(),
+            ),
+            task_id=initial_subtask_status.task_id,
+            routing_key=settings.GRADES_DOWNLOAD_ROUTING_KEY,
+        )
+
+    return queue_subtasks_for_query(
+        entry,
         action_name,
-        current_step,
-        student_counter,
-        total_enrolled_students
+        _create_grade_report_subtask,
+        [enrolled_students],
+        [],
+        settings.GRADE_REPORT_STUDENTS_PER_SUBTASK,
+        enrolled_students.count(),
     )
 
-    # By this point, we've got the rows we're going to stuff into our CSV files.
-    current_step = {'step': 'Uploading CSVs'}
-    task_progress.update_task_state(extra_meta=current_step)
-    TASK_LOG.info(u'%s, Task type: %s, Current step: %s', task_info_string, action_name, current_step)
 
-    # Perform the actual upload
-    upload_csv_to_report_store(rows, 'grade_report', course_id, start_date)
+def perform_grade_report_subtask(entry_id, student_ids, part, report_info, subtask_status_dict):
+    """
+    Grades the students in `student_ids` for a grade report generated by
+    `_delegate_grade_report_subtasks`, and stores their rows as part number
+    `part` of the report.
 
-    # If there are any error rows (don't count the header), write them out as well
-    if len(err_rows) > 1:
-        upload_csv_to_report_store(err_rows, 'grade_report_err', course_id, start_date)
+    Updates the parent InstructorTask with the number of students graded,
+    and assembles the final report if this is the last subtask to complete.
 
-    # One last update before we close out...
-    TASK_LOG.info(u'%s, Task type: %s, Finalizing grade task', task_info_string, action_name)
-    return task_progress.update_task_state(extra_meta=current_step)
+    Storing the rows of a part again replaces them, so a subtask re-delivered
+    before it reported its status takes over the lock of the earlier run;
+    see `check_subtask_is_valid`.
+    """
+    subtask_status = SubtaskStatus.from_dict(subtask_status_dict)
+    current_task_id = subtask_status.task_id
+    check_subtask_is_valid(entry_id, current_task_id, subtask_status, reclaim_queued_lock=True)
+
+    entry = InstructorTask.objects.get(pk=entry_id)
+    course_id = entry.course_id
+    report_store = ReportStore.from_config('GRADES_DOWNLOAD')
+    students = list(User.objects.filter(id__in=student_ids).order_by('id'))
+    try:
+        course = get_course_by_id(course_id)
+        report_context = GradeReportContext(course)
+        header, rows, err_rows = _grade_report_rows(course, report_context, students, None)
+        if header is not None:
+            report_store.store_partial_rows(
+                course_id,
+                _grade_report_header_filename(report_info['filename']),
+                part,
+                [_grade_report_header(header, report_context)]
+            )
+        subtask_status.increment(succeeded=len(rows), failed=len(err_rows), state=SUCCESS)
+    except Exception as exc:  # pylint: disable=broad-except
+        # Report every student of this subtask as failed, so that the final
+        # report can still be assembled from the other subtasks.
+        TASK_LOG.exception(u"Grade report subtask %s failed unexpectedly", current_task_id)
+        rows = []
+        err_rows = [[student.id, student.username, exc.message] for student in students]
+        subtask_status.increment(failed=len(err_rows), state=FAILURE)
+
+    if rows:
+        report_store.store_partial_rows(course_id, report_info['filename'], part, rows)
+    if err_rows:
+        report_store.store_partial_rows(course_id, report_info['err_filename'], part, err_rows)
+
+    if update_subtask_status(entry_id, current_task_id, subtask_status):
+        # This was the last subtask to complete, so assemble the report.
+        entry = InstructorTask.objects.get(pk=entry_id)
+        num_parts = json.loads(entry.subtasks)['total'] + 1
+        header_filename = _grade_report_header_filename(report_info['filename'])
+        for header_part in range(1, num_parts):
+            header_rows = report_store.partial_rows(course_id, header_filename, header_part)
+            if header_rows:
+                report_store.store_partial_rows(course_id, report_info['filename'], 0, header_rows)
+                break
+        report_store.delete_partials(course_id, header_filename, num_parts)
+        task_progress = json.loads(entry.task_output)
+        _assemble_grade_report(
+            report_store,
+            course_id,
+            report_info['filename'],
+            report_info['err_filename'],
+            num_parts,
+            task_progress['failed'],
+        )
+    return subtask_status.to_dict()
+
+
+def _grade_report_header_filename(report_filename):
+    """
+    Return the name under which subtasks store the header row they computed
+    for the grade report `report_filename`.
+    """
+    return u'{}.header'.format(report_filename)
 
 
 def _order_problems(blocks):
@@ -49,6 +49,24 @@ class ReportStoreTestMixin(object):
             ['new_file', 'middle_file', 'old_file']
         )
 
+    def test_assemble_partials(self):
+        """
+        Test that partial files are hidden from ReportStore.links_for() until
+        they are assembled, in order, into the final report.
+        """
+        report_store = self.create_report_store()
+        report_store.store_partial_rows(self.course_id, 'report.csv', 0, [['header']])
+        report_store.store_partial_rows(self.course_id, 'report.csv', 2, [['second'], ['third']])
+        report_store.store_partial_rows(self.course_id, 'report.csv', 1, [[u'fi\xf1rst']])
+        self.assertEqual(report_store.links_for(self.course_id), [])
+        self.assertEqual(report_store.partial_rows(self.course_id, 'report.csv', 1), [[u'fi\xf1rst']])
+
+        report_store.assemble_partials(self.course_id, 'report.csv', 4)
+        self.assertEqual([link[0] for link in report_store.links_for(self.course_id)], ['report.csv'])
+        self.assertIsNone(report_store.partial_rows(self.course_id, 'report.csv', 0))
+        with report_store.storage.open(report_store.path_to(self.course_id, 'report.csv')) as report_file:
+            self.assertEqual(report_file.read(), 'header\r\nfi\xc3\xb1rst\r\nsecond\r\nthird\r\n')
+
 
 class LocalFSReportStoreTestCase(ReportStoreTestMixin, TestReportMixin, SimpleTestCase):
     """
@@ -0,0 +1,70 @@
+# -*- coding: utf-8 -*-
+"""
+Tests for instructor_task/report_context.py.
+"""
+import ddt
+
+from certificates.models import CertificateStatuses
+from certificates.tests.factories import CertificateWhitelistFactory, GeneratedCertificateFactory
+from instructor_task.report_context import GradeReportContext
+from instructor_task.tests.test_base import InstructorTaskCourseTestCase
+from lms.djangoapps.verify_student.tests.factories import SoftwareSecurePhotoVerificationFactory
+from openedx.core.djangoapps.course_groups.cohorts import add_user_to_cohort
+from openedx.core.djangoapps.course_groups.tests.helpers import CohortFactory
+from teams.tests.factories import CourseTeamFactory, CourseTeamMembershipFactory
+from xmodule.modulestore.tests.factories import CourseFactory
+
+
+@ddt.ddt
+class TestGradeReportContext(InstructorTaskCourseTestCase):
+    """
+    Tests that GradeReportContext returns the same columns as the
+    per-student lookups, without per-student queries.
+    """
+    def setUp(self):
+        super(TestGradeReportContext, self).setUp()
+        self.course = CourseFactory.create(
+            cohort_config={'cohorted': True},
+            teams_configuration={'max_size': 2, 'topics': [{'topic-id': 'topic', 'name': 'Topic', 'description': ''}]},
+        )
+        self.cohort = CohortFactory.create(course_id=self.course.id, name=u'Cohort é')
+        self.team = CourseTeamFactory.create(course_id=self.course.id, name=u'Team')
+
+    def test_columns(self):
+        verified = self.create_student(u'verified', mode='verified')
+        SoftwareSecurePhotoVerificationFactory.create(user=verified, status='approved')
+        add_user_to_cohort(self.cohort, verified.username)
+        CourseTeamMembershipFactory.create(team=self.team, user=verified)
+        GeneratedCertificateFactory.create(
+            user=verified, course_id=self.course.id, status=CertificateStatuses.downloadable, mode='verified'
+        )
+        unverified = self.create_student(u'unverified', mode='verified')
+        whitelisted = self.create_student(u'whitelisted')
+        CertificateWhitelistFactory.create(user=whitelisted, course_id=self.course.id)
+
+        context = GradeReportContext(self.course)
+        self.assertEqual(context.header, [
+            'Cohort Name', 'Team Name', 'Enrollment Track', 'Verification Status',
+            'Certificate Eligible', 'Certificate Delivered', 'Certificate Type',
+        ])
+        context.prefetch([verified, unverified, whitelisted])
+        with self.assertNumQueries(0):
+            self.assertEqual(
+                context.columns_for(verified, 'Pass'),
+                [u'Cohort é', u'Team', 'verified', 'ID Verified', 'Y', 'Y', 'verified']
+            )
+            self.assertEqual(
+                context.columns_for(unverified, None),
+                ['', '', 'verified', 'Not ID Verified', 'N', 'N', 'N/A']
+            )
+            self.assertEqual(
+                context.columns_for(whitelisted, None),
+                ['', '', 'honor', 'N/A', 'Y', 'N', 'N/A']
+            )
+
+    @ddt.data(1, 10)
+    def test_prefetch_queries_do_not_scale_with_students(self, num_students):
+        students = [self.create_student(u'student{}'.format(index)) for index in range(num_students)]
+        context = GradeReportContext(self.course)
+        with self.assertNumQueries(5):
+            context.prefetch(students)
@@ -3,11 +3,20 @@ Unit tests for instructor_task subtasks.
 """
 from uuid import uuid4
 
+from celery.states import SUCCESS
 from mock import Mock, patch
 
 from student.models import CourseEnrollment
 
-from instructor_task.subtasks import queue_subtasks_for_query
+from instructor_task.subtasks import (
+    DuplicateTaskException,
+    SubtaskStatus,
+    _acquire_subtask_lock,
+    check_subtask_is_valid,
+    initialize_subtask_info,
+    queue_subtasks_for_query,
+    update_subtask_status,
+)
 from instructor_task.tests.factories import InstructorTaskFactory
 from instructor_task.tests.test_base import InstructorTaskCourseTestCase
 
@@ -80,3 +89,41 @@ class TestSubtasks(InstructorTaskCourseTestCase):
         self.assertEqual(len(mock_create_subtask_fcn_args[0][0][0]), 3)
         self.assertEqual(len(mock_create_subtask_fcn_args[1][0][0]), 3)
         self.assertEqual(len(mock_create_subtask_fcn_args[2][0][0]), 5)
+
+
+class TestSubtaskLock(InstructorTaskCourseTestCase):
+    """Tests for the lock taken by check_subtask_is_valid()."""
+
+    def setUp(self):
+        super(TestSubtaskLock, self).setUp()
+        self.initialize_course()
+        self.entry = InstructorTaskFactory.create(course_id=self.course.id, task_id=str(uuid4()))
+        self.subtask_id = str(uuid4())
+        initialize_subtask_info(self.entry, 'action_name', 1, [self.subtask_id])
+        self.subtask_status = SubtaskStatus.create(self.subtask_id)
+
+    def _redeliver_after_worker_died(self, **kwargs):
+        """
+        Checks the subtask again while the lock of an earlier run, whose
+        worker died before it reported its status, is still held.
+        """
+        self.assertTrue(_acquire_subtask_lock(self.subtask_id))
+        check_subtask_is_valid(self.entry.id, self.subtask_id, self.subtask_status, **kwargs)
+
+    def test_locked_subtask_is_rejected(self):
+        with self.assertRaises(DuplicateTaskException):
+            self._redeliver_after_worker_died()
+
+    def test_locked_subtask_is_reclaimed(self):
+        self._redeliver_after_worker_died(reclaim_queued_lock=True)
+
+        # The re-delivered subtask completes the parent task and releases the lock.
+        self.subtask_status.increment(succeeded=1, state=SUCCESS)
+        self.assertTrue(update_subtask_status(self.entry.id, self.subtask_id, self.subtask_status))
+        self.assertTrue(_acquire_subtask_lock(self.subtask_id))
+
+    def test_completed_subtask_is_not_reclaimed(self):
+        self.subtask_status.increment(succeeded=1, state=SUCCESS)
+        update_subtask_status(self.entry.id, self.subtask_id, self.subtask_status)
+        with self.assertRaises(DuplicateTaskException):
+            self._redeliver_after_worker_died(reclaim_queued_lock=True)
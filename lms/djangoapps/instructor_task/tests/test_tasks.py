@@ -12,6 +12,7 @@ from mock import Mock, MagicMock, patch
 from nose.plugins.attrib import attr
 
 from celery.states import SUCCESS, FAILURE
+from django.test.utils import override_settings
 from django.utils.translation import ugettext_noop
 from functools import partial
 
@@ -32,6 +33,7 @@ from instructor_task.tasks import (
     generate_certificates,
     export_ora2_data,
 )
+from instructor_task import tasks_helper
 from instructor_task.tasks_helper import (
     UpdateProblemModuleStateError,
     upload_ora2_data,
@@ -316,6 +318,76 @@ class TestRescoreInstructorTask(TestInstructorTasks):
         self.assertEquals(output.get('action_name'), 'rescored')
         self.assertGreater(output.get('duration_ms'), 0)
 
+    @override_settings(RESCORE_CHUNK_SIZE=3)
+    def test_rescoring_in_chunks(self):
+        # Confirm that the course is loaded once per chunk, and progress reported per chunk.
+        input_state = json.dumps({'done': True})
+        num_students = 10
+        self._create_students_with_state(num_students, input_state)
+        task_entry = self._create_input_entry()
+        mock_instance = Mock()
+        mock_instance.rescore_problem = Mock(return_value={'success': 'correct'})
+        with patch('instructor_task.tasks_helper.get_module_for_descriptor_internal') as mock_get_module:
+            mock_get_module.return_value = mock_instance
+            with patch(
+                'instructor_task.tasks_helper.get_course_by_id', wraps=tasks_helper.get_course_by_id
+            ) as mock_get_course:
+                self._run_task_with_mock_celery(rescore_problem, task_entry.id, task_entry.task_id)
+        self.assertEquals(mock_get_course.call_count, 4)
+        self.assertEquals(mock_instance.rescore_problem.call_count, num_students)
+        # check return value
+        entry = InstructorTask.objects.get(id=task_entry.id)
+        output = json.loads(entry.task_output)
+        self.assertEquals(output.get('attempted'), num_students)
+        self.assertEquals(output.get('succeeded'), num_students)
+        self.assertEquals(output.get('chunks'), 4)
+        self.assertEquals(output.get('total_chunks'), 4)
+        progress_chunks = [
+            call[1]['meta']['chunks'] for call in self.current_task.update_state.call_args_list
+        ]
+        self.assertEquals(progress_chunks, [0, 1, 2, 3, 4, 4])
+
+    @override_settings(RESCORE_CHUNK_SIZE=2, RESCORE_SUBTASK_THRESHOLD=5, RESCORE_MODULES_PER_SUBTASK=4)
+    def test_rescoring_in_subtasks(self):
+        # Confirm that subtasks rescore all submissions, with progress aggregated on the entry.
+        input_state = json.dumps({'done': True})
+        num_students = 10
+        self._create_students_with_state(num_students, input_state)
+        task_entry = self._create_input_entry()
+        mock_instance = Mock()
+        mock_instance.rescore_problem = Mock(return_value={'success': 'correct'})
+        with patch('instructor_task.tasks_helper.get_module_for_descriptor_internal') as mock_get_module:
+            mock_get_module.return_value = mock_instance
+            self._run_task_with_mock_celery(rescore_problem, task_entry.id, task_entry.task_id)
+        self.assertEquals(mock_instance.rescore_problem.call_count, num_students)
+        entry = InstructorTask.objects.get(id=task_entry.id)
+        self.assertEquals(entry.task_state, SUCCESS)
+        self.assertEquals(json.loads(entry.subtasks)['total'], 3)
+        output = json.loads(entry.task_output)
+        self.assertEquals(output.get('attempted'), num_students)
+        self.assertEquals(output.get('succeeded'), num_students)
+        self.assertEquals(output.get('total'), num_students)
+        self.assertEquals(output.get('action_name'), 'rescored')
+
+    @override_settings(RESCORE_CHUNK_SIZE=2, RESCORE_SUBTASK_THRESHOLD=5, RESCORE_MODULES_PER_SUBTASK=4)
+    def test_rescoring_subtasks_redelivered_after_worker_died(self):
+        # Confirm that subtasks re-delivered while an earlier run still holds
+        # their lock take it over, so that the task still completes.
+        input_state = json.dumps({'done': True})
+        num_students = 10
+        self._create_students_with_state(num_students, input_state)
+        task_entry = self._create_input_entry()
+        mock_instance = Mock()
+        mock_instance.rescore_problem = Mock(return_value={'success': 'correct'})
+        with patch('instructor_task.tasks_helper.get_module_for_descriptor_internal') as mock_get_module:
+            mock_get_module.return_value = mock_instance
+            with patch('instructor_task.subtasks.cache.add', return_value=False):
+                self._run_task_with_mock_celery(rescore_problem, task_entry.id, task_entry.task_id)
+        self.assertEquals(mock_instance.rescore_problem.call_count, num_students)
+        entry = InstructorTask.objects.get(id=task_entry.id)
+        self.assertEquals(entry.task_state, SUCCESS)
+        self.assertEquals(json.loads(entry.task_output).get('succeeded'), num_students)
+
 
 @attr(shard=3)
 class TestResetAttemptsInstructorTask(TestInstructorTasks):
@@ -8,12 +8,14 @@ Unit tests for LMS instructor-initiated background tasks helper functions.
 
 """
 
+import json
 import os
 import shutil
 from datetime import datetime
 import urllib
 
 import ddt
+from celery.states import SUCCESS
 from freezegun import freeze_time
 from mock import Mock, patch
 from nose.plugins.attrib import attr
@@ -44,7 +46,8 @@ from student.models import CourseEnrollment, CourseEnrollmentAllowed, ManualEnro
 from lms.djangoapps.verify_student.tests.factories import SoftwareSecurePhotoVerificationFactory
 from xmodule.modulestore.tests.factories import CourseFactory, ItemFactory
 from xmodule.partitions.partitions import Group, UserPartition
-from instructor_task.models import ReportStore
+from instructor_task.models import InstructorTask, ReportStore, PROGRESS
+from instructor_task.tests.factories import InstructorTaskFactory
 from survey.models import SurveyForm, SurveyAnswer
 from instructor_task.tasks_helper import (
     cohort_students_and_upload,
@@ -60,7 +63,9 @@ from instructor_task.tasks_helper import (
     upload_ora2_data,
     UPDATE_STATUS_FAILED,
     UPDATE_STATUS_SUCCEEDED,
+    _report_csv_filename,
 )
+from lms.djangoapps.grades.course_grades import iterate_grades_for
 from instructor_analytics.basic import UNAVAILABLE
 from openedx.core.djangoapps.util.testing import ContentGroupTestCase, TestConditionalContent
 from teams.tests.factories import CourseTeamFactory, CourseTeamMembershipFactory
@@ -127,6 +132,89 @@ class TestInstructorGradeReport(InstructorGradeReportTestCase):
         report_store = ReportStore.from_config(config_name='GRADES_DOWNLOAD')
         self.assertTrue(any('grade_report_err' in item[0] for item in report_store.links_for(self.course.id)))
 
+    @override_settings(GRADE_REPORT_CHUNK_SIZE=1)
+    def test_grading_in_chunks(self):
+        """
+        Test that a report graded in several chunks contains every student,
+        and that no partial files are left behind.
+        """
+        students = [self.create_student(u'student{}'.format(i), u'student{}@example.com'.format(i)) for i in range(3)]
+        with patch('instructor_task.tasks_helper._get_current_task'):
+            result = upload_grades_csv(None, None, self.course.id, None, 'graded')
+        self.assertDictContainsSubset({'attempted': 3, 'succeeded': 3, 'failed': 0}, result)
+        self.verify_rows_in_csv(
+            [{u'username': student.username} for student in students],
+            ignore_other_columns=True
+        )
+        report_store = ReportStore.from_config(config_name='GRADES_DOWNLOAD')
+        self.assertEqual(len(report_store.links_for(self.course.id)), 1)
+
+    @override_settings(GRADE_REPORT_CHUNK_SIZE=1)
+    def test_resume_from_checkpoint(self):
+        """
+        Test that a task which has already checkpointed some chunks only
+        grades the remaining students, and keeps the rows already stored.
+        """
+        students = [self.create_student(u'student{}'.format(i), u'student{}@example.com'.format(i)) for i in range(2)]
+        entry = InstructorTaskFactory.create(course_id=self.course.id, task_state=PROGRESS, task_output=json.dumps({
+            'action_name': 'graded', 'attempted': 1, 'succeeded': 1, 'skipped': 0, 'failed': 0,
+            'total': 2, 'duration_ms': 0,
+            'checkpoint': {
+                'report': 'grade_report', 'chunks': 1, 'last_user_id': students[0].id, 'timestamp': '2016-01-01-0000',
+            },
+        }))
+        header = [
+            'id', 'email', 'username', 'grade', 'Enrollment Track', 'Verification Status',
+            'Certificate Eligible', 'Certificate Delivered', 'Certificate Type',
+        ]
+        report_filename = _report_csv_filename('grade_report', self.course.id, datetime(2016, 1, 1, tzinfo=UTC))
+        report_store = ReportStore.from_config(config_name='GRADES_DOWNLOAD')
+        report_store.store_partial_rows(self.course.id, report_filename, 0, [header])
+        report_store.store_partial_rows(self.course.id, report_filename, 1, [
+            [students[0].id, students[0].email, students[0].username, 0.0, 'honor', 'N/A', 'N', 'N', 'N/A'],
+        ])
+
+        with patch('instructor_task.tasks_helper._get_current_task'):
+            with patch(
+                'instructor_task.tasks_helper.iterate_grades_for', wraps=iterate_grades_for
+            ) as mock_iterate_grades_for:
+                result = upload_grades_csv(None, entry.id, self.course.id, None, 'graded')
+
+        self.assertDictContainsSubset({'attempted': 2, 'succeeded': 2, 'failed': 0}, result)
+        graded_students = [student for call in mock_iterate_grades_for.call_args_list for student in call[0][1]]
+        self.assertEqual(graded_students, [students[1]])
+        self.assertEqual(report_store.links_for(self.course.id)[0][0], report_filename)
+        self.verify_rows_in_csv(
+            [{u'username': student.username} for student in students],
+            ignore_other_columns=True
+        )
+
+    @override_settings(GRADE_REPORT_SUBTASK_THRESHOLD=2, GRADE_REPORT_STUDENTS_PER_SUBTASK=2)
+    def test_grading_in_subtasks(self):
+        """
+        Test that a report graded by subtasks is assembled into a single
+        report, with progress aggregated on the InstructorTask entry.
+        """
+        students = [self.create_student(u'student{}'.format(i), u'student{}@example.com'.format(i)) for i in range(5)]
+        entry = InstructorTaskFactory.create(
+            course_id=self.course.id, task_type='grade_course', task_id='task-id', task_state=PROGRESS
+        )
+        with patch('instructor_task.tasks_helper._get_current_task'):
+            upload_grades_csv(None, entry.id, self.course.id, None, 'graded')
+
+        entry = InstructorTask.objects.get(pk=entry.id)
+        self.assertEqual(entry.task_state, SUCCESS)
+        self.assertEqual(json.loads(entry.subtasks)['total'], 3)
+        self.assertDictContainsSubset(
+            {'attempted': 5, 'succeeded': 5, 'failed': 0, 'total': 5}, json.loads(entry.task_output)
+        )
+        self.verify_rows_in_csv(
+            [{u'username': student.username} for student in students],
+            ignore_other_columns=True
+        )
+        report_store = ReportStore.from_config(config_name='GRADES_DOWNLOAD')
+        self.assertEqual(len(report_store.links_for(self.course.id)), 1)
+
     def test_cohort_data_in_grading(self):
         """
         Test that cohort data is included in grades csv if cohort configuration is enabled for course.
@@ -37,7 +37,7 @@ from courseware.courses import get_course_by_id
 from config_models.models import ConfigurationModel
 from course_modes.models import CourseMode
 from edxmako.shortcuts import render_to_string
-from student.models import CourseEnrollment, UNENROLL_DONE, EnrollStatusChange
+from student.models import CourseEnrollment, UNENROLL_DONE, EnrollStatusChange, invalidate_dashboard_data
 from util.query import use_read_replica_if_available
 from xmodule_django.models import CourseKeyField
 from .exceptions import (
@@ -1311,6 +1311,27 @@ class RegistrationCodeRedemption(models.Model):
         return code_redemption
 
 
+@receiver(post_save, sender=RegistrationCodeRedemption)
+@receiver(post_delete, sender=RegistrationCodeRedemption)
+def invalidate_dashboard_data_cache(sender, instance, **kwargs):  # pylint: disable=unused-argument
+    """Invalidate the cached dashboard data of the user who redeemed the registration code. """
+    invalidate_dashboard_data(instance.redeemed_by_id)
+
+
+@receiver(post_save, sender=Invoice)
+def invalidate_invoice_dashboard_data_cache(sender, instance, **kwargs):  # pylint: disable=unused-argument, invalid-name
+    """
+    Invalidate the cached dashboard data of the users who redeemed a
+    registration code generated for the invoice, which shows whether it's
+    valid.
+    """
+    user_ids = RegistrationCodeRedemption.objects.filter(
+        registration_code__invoice_item__invoice=instance
+    ).values_list('redeemed_by_id', flat=True)
+    for user_id in set(user_ids):
+        invalidate_dashboard_data(user_id)
+
+
 class SoftDeleteCouponManager(models.Manager):
     """ Use this manager to get objects that have a is_active=True """
     def get_active_coupons_queryset(self):
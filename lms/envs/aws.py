@@ -230,6 +230,14 @@ if 'loc_cache' not in CACHES:
         'LOCATION': 'edx_location_mem_cache',
     }
 
+CONFIGURATION_MODEL_SNAPSHOT_TIMEOUT = ENV_TOKENS.get(
+    'CONFIGURATION_MODEL_SNAPSHOT_TIMEOUT', CONFIGURATION_MODEL_SNAPSHOT_TIMEOUT
+)
+COURSE_STRUCTURE_LOCAL_CACHE_SIZE = ENV_TOKENS.get(
+    'COURSE_STRUCTURE_LOCAL_CACHE_SIZE', COURSE_STRUCTURE_LOCAL_CACHE_SIZE
+)
+DASHBOARD_DATA_CACHE_TIMEOUT = ENV_TOKENS.get('DASHBOARD_DATA_CACHE_TIMEOUT', DASHBOARD_DATA_CACHE_TIMEOUT)
+
 # Email overrides
 DEFAULT_FROM_EMAIL = ENV_TOKENS.get('DEFAULT_FROM_EMAIL', DEFAULT_FROM_EMAIL)
 DEFAULT_FEEDBACK_EMAIL = ENV_TOKENS.get('DEFAULT_FEEDBACK_EMAIL', DEFAULT_FEEDBACK_EMAIL)
@@ -260,6 +268,7 @@ BULK_EMAIL_MAX_RETRIES = ENV_TOKENS.get('BULK_EMAIL_MAX_RETRIES', BULK_EMAIL_MAX
 BULK_EMAIL_INFINITE_RETRY_CAP = ENV_TOKENS.get('BULK_EMAIL_INFINITE_RETRY_CAP', BULK_EMAIL_INFINITE_RETRY_CAP)
 BULK_EMAIL_LOG_SENT_EMAILS = ENV_TOKENS.get('BULK_EMAIL_LOG_SENT_EMAILS', BULK_EMAIL_LOG_SENT_EMAILS)
 BULK_EMAIL_RETRY_DELAY_BETWEEN_SENDS = ENV_TOKENS.get('BULK_EMAIL_RETRY_DELAY_BETWEEN_SENDS', BULK_EMAIL_RETRY_DELAY_BETWEEN_SENDS)
+BULK_EMAIL_MESSAGES_PER_SEND = ENV_TOKENS.get('BULK_EMAIL_MESSAGES_PER_SEND', BULK_EMAIL_MESSAGES_PER_SEND)
 # We want Bulk Email running on the high-priority queue, so we define the
 # routing key that points to it. At the moment, the name is the same.
 # We have to reset the value here, since we have changed the value of the queue name.
@@ -602,6 +611,14 @@ VERIFY_STUDENT = AUTH_TOKENS.get("VERIFY_STUDENT", VERIFY_STUDENT)
 GRADES_DOWNLOAD_ROUTING_KEY = HIGH_MEM_QUEUE
 
 GRADES_DOWNLOAD = ENV_TOKENS.get("GRADES_DOWNLOAD", GRADES_DOWNLOAD)
+GRADE_REPORT_CHUNK_SIZE = ENV_TOKENS.get("GRADE_REPORT_CHUNK_SIZE", GRADE_REPORT_CHUNK_SIZE)
+GRADE_REPORT_SUBTASK_THRESHOLD = ENV_TOKENS.get("GRADE_REPORT_SUBTASK_THRESHOLD", GRADE_REPORT_SUBTASK_THRESHOLD)
+GRADE_REPORT_STUDENTS_PER_SUBTASK = ENV_TOKENS.get(
+    "GRADE_REPORT_STUDENTS_PER_SUBTASK", GRADE_REPORT_STUDENTS_PER_SUBTASK
+)
+RESCORE_CHUNK_SIZE = ENV_TOKENS.get("RESCORE_CHUNK_SIZE", RESCORE_CHUNK_SIZE)
+RESCORE_SUBTASK_THRESHOLD = ENV_TOKENS.get("RESCORE_SUBTASK_THRESHOLD", RESCORE_SUBTASK_THRESHOLD)
+RESCORE_MODULES_PER_SUBTASK = ENV_TOKENS.get("RESCORE_MODULES_PER_SUBTASK", RESCORE_MODULES_PER_SUBTASK)
 
 # financial reports
 FINANCIAL_REPORTS = ENV_TOKENS.get("FINANCIAL_REPORTS", FINANCIAL_REPORTS)
@@ -821,6 +838,9 @@ LTI_AGGREGATE_SCORE_PASSBACK_DELAY = ENV_TOKENS.get(
 ##################### Credit Provider help link ####################
 CREDIT_HELP_LINK_URL = ENV_TOKENS.get('CREDIT_HELP_LINK_URL', CREDIT_HELP_LINK_URL)
 
+##### BLOCK STRUCTURES #####
+BLOCK_STRUCTURES_SETTINGS.update(ENV_TOKENS.get('BLOCK_STRUCTURES_SETTINGS', {}))
+
 #### JWT configuration ####
 JWT_AUTH.update(ENV_TOKENS.get('JWT_AUTH', {}))
 PUBLIC_RSA_KEY = ENV_TOKENS.get('PUBLIC_RSA_KEY', PUBLIC_RSA_KEY)
@@ -751,6 +751,10 @@ CODE_JAIL = {
         # How many CPU seconds can jailed code use?
         'CPU': 1,
     },
+
+    # How many sandboxes each process keeps started and waiting to run
+    # Python code for capa problems.  Zero starts a sandbox for each run.
+    'warm_sandboxes': 0,
 }
 
 # Some courses are allowed to run unsafe code. This is a list of regexes, one
@@ -1792,6 +1796,12 @@ BLOCK_STRUCTURES_SETTINGS = dict(
 
     # Maximum number of retries per task.
     BLOCK_STRUCTURES_TASK_MAX_RETRIES=5,
+
+    # Maximum size, in bytes, of the in-process cache of block structures
+    # kept in front of the django cache.  Entries are only used while the
+    # django cache holds the same version of the block structure.  Set to
+    # 0 to disable the in-process cache.
+    BLOCK_STRUCTURES_LOCAL_CACHE_MAX_BYTES=0,
 )
 
 ################################ Bulk Email ###################################
@@ -1838,6 +1848,11 @@ BULK_EMAIL_LOG_SENT_EMAILS = False
 # parallel, and what the SES rate is.
 BULK_EMAIL_RETRY_DELAY_BETWEEN_SENDS = 0.02
 
+# Number of bulk email messages handed to the mail connection at once.  When
+# sending a batch fails, its messages are sent again one at a time, so that
+# each recipient is counted as sent or failed exactly once.
+BULK_EMAIL_MESSAGES_PER_SEND = 1
+
 ############################# Email Opt In ####################################
 
 # Minimum age for organization-wide email opt in
@@ -2382,6 +2397,24 @@ GRADES_DOWNLOAD = {
     'ROOT_PATH': '/tmp/edx-s3/grades',
 }
 
+# Number of learners graded between checkpoints when generating a grade
+# report.  Each chunk is written to the report store as it completes.
+GRADE_REPORT_CHUNK_SIZE = 1000
+
+# Grade reports for courses with more enrolled learners than this are graded
+# in parallel by subtasks, each grading GRADE_REPORT_STUDENTS_PER_SUBTASK
+# learners.  Set to None to always grade in a single task.
+GRADE_REPORT_SUBTASK_THRESHOLD = None
+GRADE_REPORT_STUDENTS_PER_SUBTASK = 5000
+
+# Number of submissions rescored in each transaction by the rescore problem
+# task.  Problems with more submissions than RESCORE_SUBTASK_THRESHOLD are
+# rescored in parallel by subtasks, each rescoring RESCORE_MODULES_PER_SUBTASK
+# submissions.  Set to None to always rescore in a single task.
+RESCORE_CHUNK_SIZE = 100
+RESCORE_SUBTASK_THRESHOLD = None
+RESCORE_MODULES_PER_SUBTASK = 5000
+
 FINANCIAL_REPORTS = {
     'STORAGE_TYPE': 'localfs',
     'BUCKET': 'edx-financial-reports',
@@ -2982,6 +3015,24 @@ AUTH_DOCUMENTATION_URL = 'http://course-catalog-api-guide.readthedocs.io/en/late
 # Affiliate cookie tracking
 AFFILIATE_COOKIE_NAME = 'affiliate_id'
 
+############## Settings for ConfigurationModel ###############
+
+# The number of seconds each process reuses its own snapshot of a current
+# ConfigurationModel entry before checking the cache for changes to the
+# model.  Set to 0 to always read the current entry from the cache.
+CONFIGURATION_MODEL_SNAPSHOT_TIMEOUT = 0
+
+############## Settings for the split modulestore ###############
+
+# The maximum total size, in bytes of pickled data, of the course structures
+# each process keeps deserialized in memory, in front of the
+# 'course_structure_cache' cache.  Set to 0 to disable the in-process cache.
+COURSE_STRUCTURE_LOCAL_CACHE_SIZE = 0
+
+# Number of seconds the per-enrollment data of a user's learner dashboard is
+# cached for, see student.dashboard_data.  Set to 0 to disable the cache.
+DASHBOARD_DATA_CACHE_TIMEOUT = 0
+
 ############## Settings for RedirectMiddleware ###############
 
 # Setting this to None causes Redirect data to never expire
@@ -19,6 +19,7 @@ from monkey_patch import (
 
 import xmodule.x_module
 import lms_xblock.runtime
+from capa.safe_exec.sandbox_pool import SANDBOX_POOL
 
 from startup_configurations.validate_config import validate_lms_config
 from openedx.core.djangoapps.theming.core import enable_theming
@@ -56,6 +57,9 @@ def run():
 
     add_mimetypes()
 
+    # Keep sandboxes waiting to run the Python code of capa problems.
+    SANDBOX_POOL.configure(settings.CODE_JAIL.get('warm_sandboxes', 0))
+
     # Mako requires the directories to be added after the django setup.
     microsite.enable_microsites(log)
 
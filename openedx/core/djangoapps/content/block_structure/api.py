@@ -1,11 +1,17 @@
 """
 Higher order functions built on the BlockStructureManager to interact with a django cache.
 """
+from django.conf import settings
 from django.core.cache import cache
+from openedx.core.lib.block_structure.cache import BlockStructureLocalCache
 from openedx.core.lib.block_structure.manager import BlockStructureManager
 from xmodule.modulestore.django import modulestore
 
 
+# The process-wide local cache of block structures, created on first use.
+_local_cache = None  # pylint: disable=invalid-name
+
+
 def get_course_in_cache(course_key):
     """
     A higher order function implemented on top of the
@@ -19,27 +25,33 @@ def get_course_in_cache(course_key):
     return get_block_structure_manager(course_key).get_collected()
 
 
-def update_course_in_cache(course_key):
+def update_course_in_cache(course_key, force_full=False):
     """
     A higher order function implemented on top of the
     block_structure.updated_collected function that updates the block
     structure in the cache for the given course_key.
+
+    If force_full is True, the block structure is collected in full,
+    rather than incrementally from the previously collected one.
     """
-    return get_block_structure_manager(course_key).update_collected()
+    return get_block_structure_manager(course_key).update_collected(force_full)
 
 
-def clear_course_from_cache(course_key):
+def clear_course_from_cache(course_key, keep_previous=False):
     """
     A higher order function implemented on top of the
     block_structure.clear_block_cache function that clears the block
     structure from the cache for the given course_key.
 
+    If keep_previous is True, the cleared block structure is kept for
+    incrementally recollecting the course's block structure.
+
     Note: See Note in get_course_blocks. Even after MA-1604 is
     implemented, this implementation should still be valid since the
     entire block structure of the course is cached, even though
     arbitrary access to an intermediate block will be supported.
     """
-    get_block_structure_manager(course_key).clear()
+    get_block_structure_manager(course_key).clear(keep_previous)
 
 
 def get_block_structure_manager(course_key):
@@ -48,7 +60,7 @@ def get_block_structure_manager(course_key):
     """
     store = modulestore()
     course_usage_key = store.make_course_usage_key(course_key)
-    return BlockStructureManager(course_usage_key, store, get_cache())
+    return BlockStructureManager(course_usage_key, store, get_cache(), get_local_cache())
 
 
 def get_cache():
@@ -56,3 +68,17 @@ def get_cache():
     Returns the storage for caching Block Structures.
     """
     return cache
+
+
+def get_local_cache():
+    """
+    Returns the in-process cache to use in front of the storage for caching
+    Block Structures, or None if it's disabled.
+    """
+    global _local_cache  # pylint: disable=global-statement, invalid-name
+    max_bytes = settings.BLOCK_STRUCTURES_SETTINGS.get('BLOCK_STRUCTURES_LOCAL_CACHE_MAX_BYTES')
+    if not max_bytes:
+        return None
+    if _local_cache is None or _local_cache.max_bytes != max_bytes:
+        _local_cache = BlockStructureLocalCache(max_bytes)
+    return _local_cache
@@ -15,8 +15,11 @@ def _listen_for_course_publish(sender, course_key, **kwargs):  # pylint: disable
     """
     Catches the signal that a course has been published in the module
     store and creates/updates the corresponding cache entry.
+
+    The previous cache entry is kept so that the update only recollects
+    data for the blocks that changed.
     """
-    clear_course_from_cache(course_key)
+    clear_course_from_cache(course_key, keep_previous=True)
 
     # The countdown=0 kwarg ensures the call occurs after the signal emitter
     # has finished all operations.
@@ -23,6 +23,10 @@ logger = getLogger(__name__)  # pylint: disable=invalid-name
 # A dictionary key value for storing a transformer's version number.
 TRANSFORMER_VERSION_KEY = '_version'
 
+# The xBlock field that is collected for every block in order to detect
+# which blocks changed between two collections of a block structure.
+EDITED_ON_FIELD_NAME = 'edited_on'
+
 
 class _BlockRelations(object):
     """
@@ -814,6 +818,57 @@ class BlockStructureModulestoreData(BlockStructureBlockData):
         """
         self._xblock_map[usage_key] = xblock
 
+    def _get_blocks_to_recollect(self, previous_block_structure):
+        """
+        Returns the set of usage keys of the blocks whose collected data
+        may differ from that in previous_block_structure: the blocks that
+        were added or edited since it was collected, or whose children
+        changed, along with all of their ancestors.  Blocks without a
+        known edit time are considered changed.
+
+        Arguments:
+            previous_block_structure (BlockStructureBlockData) - A
+                previously collected block structure for the same root.
+        """
+        changed_block_keys = set()
+        for usage_key, xblock in self._xblock_map.iteritems():
+            edited_on = getattr(xblock, EDITED_ON_FIELD_NAME, None)
+            if (
+                    usage_key not in previous_block_structure or
+                    edited_on is None or
+                    edited_on != previous_block_structure.get_xblock_field(usage_key, EDITED_ON_FIELD_NAME) or
+                    self.get_children(usage_key) != previous_block_structure.get_children(usage_key)
+            ):
+                changed_block_keys.add(usage_key)
+
+        block_keys = set()
+        block_keys_to_visit = list(changed_block_keys)
+        while block_keys_to_visit:
+            usage_key = block_keys_to_visit.pop()
+            if usage_key not in block_keys:
+                block_keys.add(usage_key)
+                block_keys_to_visit.extend(self.get_parents(usage_key))
+        return block_keys
+
+    def _copy_transformer_data(self, previous_block_structure, transformer, excluded_block_keys):
+        """
+        Copies the given transformer's data from previous_block_structure:
+        its non-block-specific data, and its block-specific data for all
+        blocks of this block structure except those in excluded_block_keys.
+        """
+        transformer_name = transformer.name()
+        if transformer_name in previous_block_structure.transformer_data:
+            self.transformer_data[transformer] = previous_block_structure.transformer_data[transformer]
+
+        for usage_key in self:
+            if usage_key in excluded_block_keys:
+                continue
+            previous_block_data = previous_block_structure._block_data_map.get(usage_key)  # pylint: disable=protected-access
+            if previous_block_data and transformer_name in previous_block_data.transformer_data:
+                self._get_or_create_block(usage_key).transformer_data[transformer] = (
+                    previous_block_data.transformer_data[transformer]
+                )
+
     def _collect_requested_xblock_fields(self):
         """
         Iterates through all instantiated xBlocks that were added and
@@ -1,59 +1,180 @@
 """
 Module for the Cache class for BlockStructure objects.
 """
-# pylint: disable=protected-access
+import hashlib
+from collections import OrderedDict
 from logging import getLogger
+from threading import Lock
+import zlib
 
-from openedx.core.lib.cache_utils import zpickle, zunpickle
+import dogstats_wrapper as dog_stats_api
 
+from . import serializer
 from .block_structure import BlockStructureBlockData
-from .factory import BlockStructureFactory
+from .exceptions import BlockStructureSerializationError
 
 
 logger = getLogger(__name__)  # pylint: disable=C0103
 
 
+class BlockStructureLocalCache(object):
+    """
+    A size-bounded, in-process LRU cache of serialized block structures.
+
+    Entries are keyed by root_block_usage_key and hold the version of the
+    structure along with its uncompressed serialization, so a hit saves the
+    network transfer and decompression of the shared cache's data.  Readers
+    must only use an entry whose version matches the version currently in
+    the shared cache.
+    """
+    def __init__(self, max_bytes):
+        """
+        Arguments:
+            max_bytes (int) - The maximum total size of the serialized
+                data held by the cache.  Least recently used entries are
+                evicted to stay within it.
+        """
+        self.max_bytes = max_bytes
+        self.size_in_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._lock = Lock()
+
+    def get(self, root_block_usage_key, version):
+        """
+        Returns the serialized block structure for the given
+        root_block_usage_key if it's cached with the given version,
+        otherwise returns None.
+        """
+        with self._lock:
+            entry = self._entries.pop(root_block_usage_key, None)
+            if entry is not None and entry[0] == version:
+                self._entries[root_block_usage_key] = entry
+                self.hits += 1
+                serialized_data = entry[1]
+            else:
+                if entry is not None:
+                    # The shared cache has moved on to another version.
+                    self.size_in_bytes -= len(entry[1])
+                self.misses += 1
+                serialized_data = None
+
+        dog_stats_api.increment(
+            'block_structure.local_cache',
+            tags=[u'result:{}'.format('hit' if serialized_data is not None else 'miss')],
+        )
+        return serialized_data
+
+    def set(self, root_block_usage_key, version, serialized_data):
+        """
+        Caches the serialized block structure of the given version for the
+        given root_block_usage_key, evicting least recently used entries as
+        needed.  Data larger than max_bytes is not cached.
+        """
+        size = len(serialized_data)
+        evicted = 0
+        with self._lock:
+            self._remove(root_block_usage_key)
+            if size > self.max_bytes:
+                return
+            while self._entries and self.size_in_bytes + size > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+                evicted += 1
+            self._entries[root_block_usage_key] = (version, serialized_data)
+            self.size_in_bytes += size
+            self.evictions += evicted
+            total_size = self.size_in_bytes
+
+        if evicted:
+            dog_stats_api.increment('block_structure.local_cache.evictions', evicted)
+        dog_stats_api.histogram('block_structure.local_cache.bytes', total_size)
+
+    def delete(self, root_block_usage_key):
+        """
+        Removes the entry for the given root_block_usage_key, if any.
+        """
+        with self._lock:
+            self._remove(root_block_usage_key)
+
+    def clear(self):
+        """
+        Removes all entries.
+        """
+        with self._lock:
+            self._entries.clear()
+            self.size_in_bytes = 0
+
+    def _remove(self, root_block_usage_key):
+        """
+        Removes the entry for the given root_block_usage_key, if any.
+        Must be called with the lock held.
+        """
+        entry = self._entries.pop(root_block_usage_key, None)
+        if entry is not None:
+            self.size_in_bytes -= len(entry[1])
+
+
 class BlockStructureCache(object):
     """
     Cache for BlockStructure objects.
+
+    Block structures are stored in a shared cache, optionally fronted by
+    a BlockStructureLocalCache.  Along with each structure, a version
+    (the digest of its serialization) is stored in the shared cache, so
+    that a process only uses its local copy while the shared cache holds
+    the same version.
+
+    A block structure is only valid while its version is in the shared
+    cache.  Deleting a block structure with keep_previous=True only
+    removes its version, leaving its data available to get_previous for
+    incremental recollection.
     """
-    def __init__(self, cache):
+    def __init__(self, cache, local_cache=None):
         """
         Arguments:
             cache (django.core.cache.backends.base.BaseCache) - The
                 cache into which cacheable data of the block structure
                 is to be serialized.
+
+            local_cache (BlockStructureLocalCache) - An optional
+                in-process cache to check before reading the
+                serialized data from cache.
         """
         self._cache = cache
+        self._local_cache = local_cache
 
     def add(self, block_structure):
         """
-        Store a compressed and pickled serialization of the given
+        Store a compressed serialization of the given
         block structure into the given cache.
 
         The key in the cache is 'root.key.<root_block_usage_key>'.
-        The data stored in the cache includes the structure's
-        block relations, transformer data, and block data.
+        The data stored in the cache is the structure's serialization
+        by serializer.serialize, which includes its block relations,
+        transformer data, and block data.
 
         Arguments:
             block_structure (BlockStructure) - The block structure
                 that is to be serialized to the given cache.
         """
-        data_to_cache = (
-            block_structure._block_relations,
-            block_structure.transformer_data,
-            block_structure._block_data_map,
-        )
-        zp_data_to_cache = zpickle(data_to_cache)
+        serialized_data = serializer.serialize(block_structure)
+        zp_data_to_cache = zlib.compress(serialized_data)
+        version = hashlib.md5(serialized_data).hexdigest()
 
         # Set the timeout value for the cache to 1 day as a fail-safe
         # in case the signal to invalidate the cache doesn't come through.
         timeout_in_seconds = 60 * 60 * 24
-        self._cache.set(
-            self._encode_root_cache_key(block_structure.root_block_usage_key),
-            zp_data_to_cache,
+        self._cache.set_many(
+            {
+                self._encode_root_cache_key(block_structure.root_block_usage_key): zp_data_to_cache,
+                self._encode_version_cache_key(block_structure.root_block_usage_key): version,
+            },
             timeout=timeout_in_seconds,
         )
+        if self._local_cache is not None:
+            self._local_cache.set(block_structure.root_block_usage_key, version, serialized_data)
 
         logger.info(
             "Wrote BlockStructure %s to cache, size: %s",
@@ -80,32 +201,37 @@ class BlockStructureCache(object):
 
             NoneType - If the root_block_usage_key is not found in the cache.
         """
+        if self._local_cache is not None:
+            serialized_data = self._get_from_local_cache(root_block_usage_key)
+        else:
+            serialized_data = self._get_from_cache(root_block_usage_key)
+        return self._deserialize(root_block_usage_key, serialized_data)
+
+    def get_previous(self, root_block_usage_key):
+        """
+        Deserializes and returns the block structure starting at
+        root_block_usage_key from the given cache, even if it was deleted
+        with keep_previous=True.  Such a block structure may be outdated,
+        so it must only be used as a basis for recollecting the block
+        structure.
 
-        # Find root_block_usage_key in the cache.
+        Arguments:
+            root_block_usage_key (UsageKey) - The usage_key for the root
+                of the block structure that is to be deserialized from
+                the given cache.
+
+        Returns:
+            BlockStructure - The deserialized block structure starting
+            at root_block_usage_key, if found in the cache.
+
+            NoneType - If the root_block_usage_key is not found in the cache.
+        """
         zp_data_from_cache = self._cache.get(self._encode_root_cache_key(root_block_usage_key))
         if not zp_data_from_cache:
-            logger.info(
-                "Did not find BlockStructure %r in the cache.",
-                root_block_usage_key,
-            )
             return None
-        else:
-            logger.info(
-                "Read BlockStructure %r from cache, size: %s",
-                root_block_usage_key,
-                len(zp_data_from_cache),
-            )
-
-        # Deserialize and construct the block structure.
-        block_relations, transformer_data, block_data_map = zunpickle(zp_data_from_cache)
-        return BlockStructureFactory.create_new(
-            root_block_usage_key,
-            block_relations,
-            transformer_data,
-            block_data_map,
-        )
+        return self._deserialize(root_block_usage_key, zlib.decompress(zp_data_from_cache))
 
-    def delete(self, root_block_usage_key):
+    def delete(self, root_block_usage_key, keep_previous=False):
         """
         Deletes the block structure for the given root_block_usage_key
         from the given cache.
@@ -114,20 +240,116 @@ class BlockStructureCache(object):
             root_block_usage_key (UsageKey) - The usage_key for the root
                 of the block structure that is to be removed from
                 the cache.
+
+            keep_previous (bool) - Whether to keep the block structure's
+                data available to get_previous.
         """
-        self._cache.delete(self._encode_root_cache_key(root_block_usage_key))
+        keys_to_delete = [self._encode_version_cache_key(root_block_usage_key)]
+        if not keep_previous:
+            keys_to_delete.append(self._encode_root_cache_key(root_block_usage_key))
+        self._cache.delete_many(keys_to_delete)
+        if self._local_cache is not None:
+            self._local_cache.delete(root_block_usage_key)
         logger.info(
             "Deleted BlockStructure %r from the cache.",
             root_block_usage_key,
         )
 
+    @staticmethod
+    def _deserialize(root_block_usage_key, serialized_data):
+        """
+        Deserializes and returns the block structure for the given
+        root_block_usage_key, or None if the data can't be deserialized.
+        """
+        try:
+            return serializer.deserialize(root_block_usage_key, serialized_data)
+        except BlockStructureSerializationError:
+            logger.exception(
+                "Could not deserialize BlockStructure %r from the cache.",
+                root_block_usage_key,
+            )
+            return None
+
+    def _get_from_cache(self, root_block_usage_key):
+        """
+        Returns the uncompressed serialization of the block structure for
+        the given root_block_usage_key from the shared cache, or None if
+        it or its version isn't found.
+        """
+        data_key = self._encode_root_cache_key(root_block_usage_key)
+        version_key = self._encode_version_cache_key(root_block_usage_key)
+        cached_values = self._cache.get_many([data_key, version_key])
+        zp_data_from_cache = cached_values.get(data_key) if version_key in cached_values else None
+        if not self._log_cache_read(root_block_usage_key, zp_data_from_cache):
+            return None
+        return zlib.decompress(zp_data_from_cache)
+
+    def _get_from_local_cache(self, root_block_usage_key):
+        """
+        Returns the uncompressed serialization of the block structure for
+        the given root_block_usage_key from the local cache if it holds the
+        version found in the shared cache.  Otherwise, reads it from the
+        shared cache and stores it in the local cache.  Returns None if the
+        block structure or its version isn't in the shared cache.
+        """
+        version_key = self._encode_version_cache_key(root_block_usage_key)
+        version = self._cache.get(version_key)
+        if version is None:
+            self._log_cache_read(root_block_usage_key, None)
+            return None
+        serialized_data = self._local_cache.get(root_block_usage_key, version)
+        if serialized_data is not None:
+            return serialized_data
+
+        data_key = self._encode_root_cache_key(root_block_usage_key)
+        cached_values = self._cache.get_many([data_key, version_key])
+        zp_data_from_cache = cached_values.get(data_key) if version_key in cached_values else None
+        if not self._log_cache_read(root_block_usage_key, zp_data_from_cache):
+            return None
+
+        serialized_data = zlib.decompress(zp_data_from_cache)
+        self._local_cache.set(root_block_usage_key, cached_values[version_key], serialized_data)
+        return serialized_data
+
+    @staticmethod
+    def _log_cache_read(root_block_usage_key, zp_data_from_cache):
+        """
+        Logs the result of reading the block structure from the shared
+        cache.  Returns whether it was found.
+        """
+        if not zp_data_from_cache:
+            logger.info(
+                "Did not find BlockStructure %r in the cache.",
+                root_block_usage_key,
+            )
+            return False
+        logger.info(
+            "Read BlockStructure %r from cache, size: %s",
+            root_block_usage_key,
+            len(zp_data_from_cache),
+        )
+        return True
+
     @classmethod
     def _encode_root_cache_key(cls, root_block_usage_key):
         """
         Returns the cache key to use for storing the block structure
         for the given root_block_usage_key.
         """
-        return "v{version}.root.key.{root_usage_key}".format(
+        return "v{version}.f{format_version}.root.key.{root_usage_key}".format(
+            version=unicode(BlockStructureBlockData.VERSION),
+            format_version=unicode(serializer.FORMAT_VERSION),
+            root_usage_key=unicode(root_block_usage_key),
+        )
+
+    @classmethod
+    def _encode_version_cache_key(cls, root_block_usage_key):
+        """
+        Returns the cache key to use for storing the version of the
+        block structure for the given root_block_usage_key.
+        """
+        return "v{version}.f{format_version}.root.version.{root_usage_key}".format(
             version=unicode(BlockStructureBlockData.VERSION),
+            format_version=unicode(serializer.FORMAT_VERSION),
             root_usage_key=unicode(root_block_usage_key),
         )
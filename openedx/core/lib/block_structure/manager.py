@@ -15,7 +15,7 @@ class BlockStructureManager(object):
     Top-level class for managing Block Structures.
     """
 
-    def __init__(self, root_block_usage_key, modulestore, cache):
+    def __init__(self, root_block_usage_key, modulestore, cache, local_cache=None):
         """
         Arguments:
             root_block_usage_key (UsageKey) - The usage_key for the root
@@ -28,10 +28,13 @@ class BlockStructureManager(object):
             cache (django.core.cache.backends.base.BaseCache) - The
                 cache to use for storing/retrieving the block structure's
                 collected data.
+
+            local_cache (BlockStructureLocalCache) - An optional
+                in-process cache to use in front of cache.
         """
         self.root_block_usage_key = root_block_usage_key
         self.modulestore = modulestore
-        self.block_structure_cache = BlockStructureCache(cache)
+        self.block_structure_cache = BlockStructureCache(cache, local_cache)
 
     def get_transformed(self, transformers, starting_block_usage_key=None, collected_block_structure=None):
         """
@@ -95,31 +98,53 @@ class BlockStructureManager(object):
         )
         cache_miss = block_structure is None
         if cache_miss or BlockStructureTransformers.is_collected_outdated(block_structure):
-            with self._bulk_operations():
-                block_structure = BlockStructureFactory.create_from_modulestore(
-                    self.root_block_usage_key,
-                    self.modulestore
-                )
-                BlockStructureTransformers.collect(block_structure)
-                self.block_structure_cache.add(block_structure)
+            previous_block_structure = (
+                self.block_structure_cache.get_previous(self.root_block_usage_key) if cache_miss else None
+            )
+            block_structure = self._collect(previous_block_structure)
         return block_structure
 
-    def update_collected(self):
+    def update_collected(self, force_full=False):
         """
         Updates the collected Block Structure for the root_block_usage_key.
 
-        Details: The cache is cleared and updated by collecting transformers
-        data from the modulestore.
+        Details: The cache is updated by collecting transformers data from
+        the modulestore.  If the previously collected block structure is
+        still in the cache, transformers that support it only recollect
+        data for the blocks that changed since then, unless force_full is
+        True, in which case all the data is collected again.
         """
-        self.clear()
-        self.get_collected()
+        previous_block_structure = (
+            None if force_full else self.block_structure_cache.get_previous(self.root_block_usage_key)
+        )
+        return self._collect(previous_block_structure)
 
-    def clear(self):
+    def clear(self, keep_previous=False):
         """
         Removes cached data for the block structure associated with the given
         root block key.
+
+        If keep_previous is True, the removed block structure remains
+        available to a later update_collected call for incremental
+        recollection.
         """
-        self.block_structure_cache.delete(self.root_block_usage_key)
+        self.block_structure_cache.delete(self.root_block_usage_key, keep_previous)
+
+    def _collect(self, previous_block_structure=None):
+        """
+        Collects the block structure from the modulestore, stores it in the
+        cache and returns it.  If a previously collected block structure is
+        given, transformers that support it recollect their data
+        incrementally.
+        """
+        with self._bulk_operations():
+            block_structure = BlockStructureFactory.create_from_modulestore(
+                self.root_block_usage_key,
+                self.modulestore
+            )
+            BlockStructureTransformers.collect(block_structure, previous_block_structure)
+            self.block_structure_cache.add(block_structure)
+        return block_structure
 
     @contextmanager
     def _bulk_operations(self):
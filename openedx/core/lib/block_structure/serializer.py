@@ -0,0 +1,183 @@
+"""
+Compact serialization of BlockStructureBlockData objects.
+
+Pickling a block structure as-is serializes an object graph of a
+_BlockRelations, a BlockData and a TransformerDataMap of TransformerData
+objects per block.  Instead, the serialized form is a tuple of plain
+containers:
+
+    * a table of the structure's usage keys, each serialized once,
+    * the parents and children of each block as lists of indices into
+      that table,
+    * the collected xBlock fields, stored per field name as a column of
+      (block indices, values),
+    * the collected block data of each transformer, stored the same way,
+    * the structure-wide transformer data.
+
+The tuple starts with FORMAT_VERSION, which must be incremented whenever
+the layout changes.  Data in any other format is rejected on load.
+"""
+# pylint: disable=protected-access
+import cPickle as pickle
+
+from .block_structure import _BlockRelations, BlockData, TransformerData, TransformerDataMap
+from .exceptions import BlockStructureSerializationError
+from .factory import BlockStructureFactory
+
+
+# The version of the serialization layout produced by serialize.
+FORMAT_VERSION = 1
+
+
+def serialize(block_structure):
+    """
+    Returns a compact serialization (str) of the given block structure.
+
+    Arguments:
+        block_structure (BlockStructureBlockData) - The block structure
+            to serialize.
+    """
+    usage_keys = list(block_structure._block_relations)
+    usage_keys.extend(
+        usage_key for usage_key in block_structure._block_data_map
+        if usage_key not in block_structure._block_relations
+    )
+    index_of = {usage_key: index for index, usage_key in enumerate(usage_keys)}
+
+    relations = [block_structure._block_relations[usage_key] for usage_key in usage_keys[:len(block_structure)]]
+    parents = [[index_of[parent] for parent in relation.parents] for relation in relations]
+    children = [[index_of[child] for child in relation.children] for relation in relations]
+
+    block_data_indices = []
+    xblock_fields = {}
+    transformer_block_fields = {}
+    for usage_key, block_data in block_structure._block_data_map.iteritems():
+        index = index_of[usage_key]
+        block_data_indices.append(index)
+        _add_to_columns(xblock_fields, index, block_data.fields)
+        for transformer_name, transformer_data in block_data.transformer_data.iteritems():
+            transformer_indices, transformer_columns = transformer_block_fields.setdefault(
+                transformer_name, ([], {})
+            )
+            transformer_indices.append(index)
+            _add_to_columns(transformer_columns, index, transformer_data.fields)
+
+    structure_transformer_fields = {
+        transformer_name: transformer_data.fields
+        for transformer_name, transformer_data in block_structure.transformer_data.iteritems()
+    }
+
+    return pickle.dumps(
+        (
+            FORMAT_VERSION,
+            usage_keys,
+            parents,
+            children,
+            block_data_indices,
+            xblock_fields,
+            transformer_block_fields,
+            structure_transformer_fields,
+        ),
+        pickle.HIGHEST_PROTOCOL,
+    )
+
+
+def deserialize(root_block_usage_key, serialized_data):
+    """
+    Returns the BlockStructureBlockData for the given serialization,
+    created by serialize.
+
+    Raises BlockStructureSerializationError if the data isn't in the
+    current FORMAT_VERSION.
+
+    Arguments:
+        root_block_usage_key (UsageKey) - The usage_key for the root
+            of the block structure.
+
+        serialized_data (str) - The serialized block structure.
+    """
+    data = pickle.loads(serialized_data)
+    if not isinstance(data, tuple) or not data or data[0] != FORMAT_VERSION:
+        raise BlockStructureSerializationError(
+            "Unsupported block structure serialization format: {}".format(
+                data[0] if isinstance(data, tuple) and data else None
+            )
+        )
+    (
+        _,
+        usage_keys,
+        parents,
+        children,
+        block_data_indices,
+        xblock_fields,
+        transformer_block_fields,
+        structure_transformer_fields,
+    ) = data
+
+    block_relations = {}
+    for index, (block_parents, block_children) in enumerate(zip(parents, children)):
+        block_relations[usage_keys[index]] = _new_instance(
+            _BlockRelations,
+            parents=[usage_keys[parent] for parent in block_parents],
+            children=[usage_keys[child] for child in block_children],
+        )
+
+    block_data_by_index = {
+        index: _new_instance(
+            BlockData, location=usage_keys[index], fields={}, transformer_data=TransformerDataMap()
+        )
+        for index in block_data_indices
+    }
+    _set_from_columns(block_data_by_index, xblock_fields)
+    for transformer_name, (transformer_indices, transformer_columns) in transformer_block_fields.iteritems():
+        transformer_data_by_index = {}
+        for index in transformer_indices:
+            transformer_data = _new_instance(TransformerData, fields={})
+            # Keys are transformer names already, so skip TransformerDataMap's key translation.
+            dict.__setitem__(block_data_by_index[index].transformer_data, transformer_name, transformer_data)
+            transformer_data_by_index[index] = transformer_data
+        _set_from_columns(transformer_data_by_index, transformer_columns)
+
+    transformer_data_map = TransformerDataMap()
+    for transformer_name, fields in structure_transformer_fields.iteritems():
+        transformer_data_map[transformer_name] = _new_instance(TransformerData, fields=fields)
+
+    return BlockStructureFactory.create_new(
+        root_block_usage_key,
+        block_relations,
+        transformer_data_map,
+        {block_data.location: block_data for block_data in block_data_by_index.itervalues()},
+    )
+
+
+def _new_instance(cls, **attributes):
+    """
+    Returns a new instance of cls with the given attributes, without
+    calling its __init__ or __setattr__, which are costly when creating
+    thousands of FieldData objects.
+    """
+    instance = cls.__new__(cls)
+    instance.__dict__.update(attributes)
+    return instance
+
+
+def _add_to_columns(columns, index, fields):
+    """
+    Appends the given fields of the block at index to columns, a dict of
+    field names to a (block indices, values) tuple.
+    """
+    for field_name, value in fields.iteritems():
+        field_indices, field_values = columns.setdefault(field_name, ([], []))
+        field_indices.append(index)
+        field_values.append(value)
+
+
+def _set_from_columns(field_data_by_index, columns):
+    """
+    Sets the fields stored in columns, a dict of field names to a
+    (block indices, values) tuple, on the FieldData objects of
+    field_data_by_index.
+    """
+    for field_name, (field_indices, field_values) in columns.iteritems():
+        for index, value in zip(field_indices, field_values):
+            field_data_by_index[index].fields[field_name] = value
@@ -0,0 +1,131 @@
+"""
+Benchmark of the block structure serializer against pickling the block
+structure's internal data, as BlockStructureCache did previously.
+
+Builds a large fixture course and reports the compressed and uncompressed
+size of each serialization, and the time to load each of them.  Run with:
+
+    python -m openedx.core.lib.block_structure.tests.benchmark_serializer [num_chapters]
+"""
+import cPickle as pickle
+import sys
+import timeit
+import zlib
+
+from opaque_keys.edx.locator import CourseLocator
+
+from .. import serializer
+from ..block_structure import BlockStructureBlockData
+from ..factory import BlockStructureFactory
+
+
+# Course outline of the fixture course, as (category, number of children
+# per parent) from the chapters down.
+FIXTURE_COURSE_OUTLINE = (('chapter', 20), ('sequential', 10), ('vertical', 5), ('problem', 4))
+
+# Transformers whose collected data is mimicked for each block.
+FIXTURE_TRANSFORMERS = ('blocks_api', 'grades', 'student_view', 'start_date', 'visibility')
+
+# Number of times each load is timed.
+LOAD_REPEAT = 5
+
+
+def create_fixture_block_structure(num_chapters=FIXTURE_COURSE_OUTLINE[0][1]):
+    """
+    Returns a BlockStructureBlockData for a fixture course with the given
+    number of chapters, with xBlock fields and transformer data collected
+    for each block similar to what the registered transformers collect.
+    """
+    course_key = CourseLocator('edX', 'Benchmark', 'Course')
+    root_block_usage_key = course_key.make_usage_key('course', 'course')
+    block_structure = BlockStructureBlockData(root_block_usage_key)
+    block_structure.transformer_data.get_or_create('grades').subsection_count = num_chapters
+    _add_fixture_fields(block_structure, root_block_usage_key, 0)
+
+    parents = [root_block_usage_key]
+    outline = ((FIXTURE_COURSE_OUTLINE[0][0], num_chapters),) + FIXTURE_COURSE_OUTLINE[1:]
+    for category, num_children in outline:
+        children = []
+        for parent in parents:
+            for _ in range(num_children):
+                usage_key = course_key.make_usage_key(category, '{}_{}'.format(category, len(children)))
+                block_structure._add_relation(parent, usage_key)  # pylint: disable=protected-access
+                _add_fixture_fields(block_structure, usage_key, len(children))
+                children.append(usage_key)
+        parents = children
+    return block_structure
+
+
+def _add_fixture_fields(block_structure, usage_key, index):
+    """
+    Sets fixture xBlock fields and transformer data for the given block.
+    """
+    block_data = block_structure._get_or_create_block(usage_key)  # pylint: disable=protected-access
+    block_data.display_name = u'{} {}'.format(usage_key.block_type, index)
+    block_data.category = usage_key.block_type
+    block_data.graded = index % 2 == 0
+    block_data.format = 'Homework' if block_data.graded else None
+    block_data.due = None
+    block_data.visible_to_staff_only = False
+    for transformer_name in FIXTURE_TRANSFORMERS:
+        block_structure.set_transformer_block_field(usage_key, transformer_name, 'merged_visible', True)
+        block_structure.set_transformer_block_field(usage_key, transformer_name, 'weight', float(index % 3))
+
+
+def pickle_serialize(block_structure):
+    """
+    Returns the pickle of the block structure's internal data.
+    """
+    return pickle.dumps(
+        (
+            block_structure._block_relations,  # pylint: disable=protected-access
+            block_structure.transformer_data,
+            block_structure._block_data_map,  # pylint: disable=protected-access
+        ),
+        pickle.HIGHEST_PROTOCOL,
+    )
+
+
+def pickle_deserialize(root_block_usage_key, serialized_data):
+    """
+    Returns the block structure for the given pickle_serialize output.
+    """
+    block_relations, transformer_data, block_data_map = pickle.loads(serialized_data)
+    return BlockStructureFactory.create_new(root_block_usage_key, block_relations, transformer_data, block_data_map)
+
+
+def run(num_chapters):
+    """
+    Returns the benchmark results as a list of
+    (name, size, compressed size, load seconds) tuples.
+    """
+    block_structure = create_fixture_block_structure(num_chapters)
+    results = []
+    for name, serialize, deserialize in (
+            ('pickle', pickle_serialize, pickle_deserialize),
+            ('serializer', serializer.serialize, serializer.deserialize),
+    ):
+        serialized_data = serialize(block_structure)
+        compressed_data = zlib.compress(serialized_data)
+        load_seconds = min(timeit.repeat(
+            # pylint: disable=cell-var-from-loop
+            lambda: deserialize(block_structure.root_block_usage_key, zlib.decompress(compressed_data)),
+            number=1,
+            repeat=LOAD_REPEAT,
+        ))
+        results.append((name, len(serialized_data), len(compressed_data), load_seconds))
+    return results
+
+
+def main():
+    """
+    Prints the benchmark results.
+    """
+    num_chapters = int(sys.argv[1]) if len(sys.argv) > 1 else FIXTURE_COURSE_OUTLINE[0][1]
+    print "{:<12}{:>14}{:>14}{:>12}".format('format', 'bytes', 'compressed', 'load (ms)')
+    for name, size, compressed_size, load_seconds in run(num_chapters):
+        print "{:<12}{:>14}{:>14}{:>12.1f}".format(name, size, compressed_size, load_seconds * 1000)
+
+
+if __name__ == '__main__':
+    main()
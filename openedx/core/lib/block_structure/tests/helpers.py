@@ -85,6 +85,7 @@ class MockCache(object):
         # An in-memory map of cache keys to cache values.
         self.map = {}
         self.set_call_count = 0
+        self.get_call_count = 0
         self.timeout_from_last_call = 0
 
     def set(self, key, val, timeout):
@@ -95,19 +96,43 @@ class MockCache(object):
         self.map[key] = val
         self.timeout_from_last_call = timeout
 
+    def set_many(self, data, timeout):
+        """
+        Associates each of the given keys with its value in the cache.
+        """
+        self.set_call_count += 1
+        self.map.update(data)
+        self.timeout_from_last_call = timeout
+
     def get(self, key, default=None):
         """
         Returns the value associated with the given key in the cache;
         returns default if not found.
         """
+        self.get_call_count += 1
         return self.map.get(key, default)
 
+    def get_many(self, keys):
+        """
+        Returns a dict of the given keys that are found in the cache
+        to their values.
+        """
+        self.get_call_count += 1
+        return {key: self.map[key] for key in keys if key in self.map}
+
     def delete(self, key):
         """
         Deletes the given key from the cache.
         """
         del self.map[key]
 
+    def delete_many(self, keys):
+        """
+        Deletes the given keys from the cache, if found.
+        """
+        for key in keys:
+            self.map.pop(key, None)
+
 
 class MockModulestoreFactory(object):
     """
@@ -4,7 +4,7 @@ Tests for block_structure/cache.py
 from nose.plugins.attrib import attr
 from unittest import TestCase
 
-from ..cache import BlockStructureCache
+from ..cache import BlockStructureCache, BlockStructureLocalCache
 from .helpers import ChildrenMapTestMixin, MockCache, MockTransformer
 
 
@@ -54,3 +54,95 @@ class TestBlockStructureCache(ChildrenMapTestMixin, TestCase):
         self.assertIsNone(
             self.block_structure_cache.get(self.block_structure.root_block_usage_key)
         )
+        self.assertIsNone(
+            self.block_structure_cache.get_previous(self.block_structure.root_block_usage_key)
+        )
+
+    def test_delete_keep_previous(self):
+        self.add_transformers()
+        self.block_structure_cache.add(self.block_structure)
+        self.block_structure_cache.delete(self.block_structure.root_block_usage_key, keep_previous=True)
+        self.assertIsNone(
+            self.block_structure_cache.get(self.block_structure.root_block_usage_key)
+        )
+        previous_value = self.block_structure_cache.get_previous(self.block_structure.root_block_usage_key)
+        self.assertIsNotNone(previous_value)
+        self.assert_block_structure(previous_value, self.children_map)
+
+
+@attr(shard=2)
+class TestBlockStructureCacheWithLocalCache(TestBlockStructureCache):
+    """
+    Tests for BlockStructureCache with a BlockStructureLocalCache in front.
+    """
+    def setUp(self):
+        super(TestBlockStructureCacheWithLocalCache, self).setUp()
+        self.local_cache = BlockStructureLocalCache(max_bytes=1024 * 1024)
+        self.block_structure_cache = BlockStructureCache(self.mock_cache, self.local_cache)
+
+    def test_get_from_local_cache(self):
+        self.add_transformers()
+        self.block_structure_cache.add(self.block_structure)
+        root_block_usage_key = self.block_structure.root_block_usage_key
+
+        self.mock_cache.get_call_count = 0
+        cached_value = self.block_structure_cache.get(root_block_usage_key)
+        self.assert_block_structure(cached_value, self.children_map)
+        # Only the version is read from the shared cache.
+        self.assertEquals(self.mock_cache.get_call_count, 1)
+        self.assertEquals((self.local_cache.hits, self.local_cache.misses), (1, 0))
+
+    def test_version_mismatch(self):
+        self.add_transformers()
+        self.block_structure_cache.add(self.block_structure)
+        root_block_usage_key = self.block_structure.root_block_usage_key
+
+        # Another process adds a new version of the block structure.
+        other_block_structure = self.create_block_structure(self.LINEAR_CHILDREN_MAP)
+        BlockStructureCache(self.mock_cache).add(other_block_structure)
+
+        cached_value = self.block_structure_cache.get(root_block_usage_key)
+        self.assert_block_structure(cached_value, self.LINEAR_CHILDREN_MAP)
+        self.assertEquals((self.local_cache.hits, self.local_cache.misses), (0, 1))
+
+        self.block_structure_cache.get(root_block_usage_key)
+        self.assertEquals((self.local_cache.hits, self.local_cache.misses), (1, 1))
+
+    def test_delete_from_other_process(self):
+        self.add_transformers()
+        self.block_structure_cache.add(self.block_structure)
+        root_block_usage_key = self.block_structure.root_block_usage_key
+
+        BlockStructureCache(self.mock_cache).delete(root_block_usage_key)
+        self.assertIsNone(self.block_structure_cache.get(root_block_usage_key))
+
+
+@attr(shard=2)
+class TestBlockStructureLocalCache(TestCase):
+    """
+    Tests for BlockStructureLocalCache
+    """
+    def test_lru_eviction(self):
+        local_cache = BlockStructureLocalCache(max_bytes=10)
+        local_cache.set('a', 'v1', 'aaaa')
+        local_cache.set('b', 'v1', 'bbbb')
+        self.assertEquals(local_cache.get('a', 'v1'), 'aaaa')
+
+        local_cache.set('c', 'v1', 'cccc')
+        self.assertIsNone(local_cache.get('b', 'v1'))
+        self.assertEquals(local_cache.get('a', 'v1'), 'aaaa')
+        self.assertEquals(local_cache.get('c', 'v1'), 'cccc')
+        self.assertEquals(local_cache.size_in_bytes, 8)
+        self.assertEquals(local_cache.evictions, 1)
+
+    def test_too_large(self):
+        local_cache = BlockStructureLocalCache(max_bytes=10)
+        local_cache.set('a', 'v1', 'a' * 11)
+        self.assertIsNone(local_cache.get('a', 'v1'))
+        self.assertEquals(local_cache.size_in_bytes, 0)
+
+    def test_stale_version(self):
+        local_cache = BlockStructureLocalCache(max_bytes=10)
+        local_cache.set('a', 'v1', 'aaaa')
+        self.assertIsNone(local_cache.get('a', 'v2'))
+        self.assertEquals(local_cache.size_in_bytes, 0)
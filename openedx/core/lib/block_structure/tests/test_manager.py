@@ -85,6 +85,33 @@ class TestTransformer1(MockTransformer):
         return data_key + 't1.val1.' + unicode(block_key)
 
 
+class TestIncrementalTransformer(TestTransformer1):
+    """
+    Test Transformer class that supports incremental collection.
+    """
+    SUPPORTS_INCREMENTAL_COLLECT = True
+    collect_incremental_block_keys = None
+
+    @classmethod
+    def collect_incremental(cls, block_structure, block_keys):
+        """
+        Collects block data for the given blocks of the block structure.
+        """
+        cls.collect_incremental_block_keys = block_keys
+        for block_key in block_keys:
+            block_structure.set_transformer_block_field(
+                block_key, cls, cls.collect_data_key, cls._create_block_value(block_key, cls.collect_data_key)
+            )
+
+
+class TestDefaultIncrementalTransformer(TestTransformer1):
+    """
+    Test Transformer class that supports incremental collection, without
+    overriding collect_incremental.
+    """
+    SUPPORTS_INCREMENTAL_COLLECT = True
+
+
 @attr(shard=2)
 class TestBlockStructureManager(TestCase, ChildrenMapTestMixin):
     """
@@ -94,6 +121,8 @@ class TestBlockStructureManager(TestCase, ChildrenMapTestMixin):
         super(TestBlockStructureManager, self).setUp()
 
         TestTransformer1.collect_call_count = 0
+        TestIncrementalTransformer.collect_call_count = 0
+        TestIncrementalTransformer.collect_incremental_block_keys = None
         self.registered_transformers = [TestTransformer1()]
         with mock_registered_transformers(self.registered_transformers):
             self.transformers = BlockStructureTransformers(self.registered_transformers)
@@ -184,3 +213,53 @@ class TestBlockStructureManager(TestCase, ChildrenMapTestMixin):
         self.bs_manager.clear()
         self.collect_and_verify(expect_modulestore_called=True, expect_cache_updated=True)
         self.assertEquals(TestTransformer1.collect_call_count, 2)
+
+    def _update_collected_after_edit(self, keep_previous, force_full=False):
+        """
+        Collects the block structure, edits block 3, clears the cache and
+        updates the collected block structure.  Returns the updated block
+        structure.
+        """
+        for xblock in self.modulestore.blocks.itervalues():
+            xblock.field_map['edited_on'] = 1
+        registered_transformers = [TestIncrementalTransformer(), TestTransformer1()]
+        with mock_registered_transformers(registered_transformers):
+            self.bs_manager.get_collected()
+            self.modulestore.blocks[3].field_map['edited_on'] = 2
+            self.bs_manager.clear(keep_previous=keep_previous)
+            self.bs_manager.update_collected(force_full=force_full)
+            block_structure = self.bs_manager.get_collected()
+        self.assert_block_structure(block_structure, self.children_map)
+        TestIncrementalTransformer.assert_collected(block_structure)
+        TestTransformer1.assert_collected(block_structure)
+        self.assertEquals(TestTransformer1.collect_call_count, 2)
+        return block_structure
+
+    def test_update_collected_incrementally(self):
+        self._update_collected_after_edit(keep_previous=True)
+        self.assertEquals(TestIncrementalTransformer.collect_call_count, 1)
+        self.assertEquals(TestIncrementalTransformer.collect_incremental_block_keys, {0, 1, 3})
+
+    def test_update_collected_without_previous(self):
+        self._update_collected_after_edit(keep_previous=False)
+        self.assertEquals(TestIncrementalTransformer.collect_call_count, 2)
+        self.assertIsNone(TestIncrementalTransformer.collect_incremental_block_keys)
+
+    def test_update_collected_force_full(self):
+        self._update_collected_after_edit(keep_previous=True, force_full=True)
+        self.assertEquals(TestIncrementalTransformer.collect_call_count, 2)
+        self.assertIsNone(TestIncrementalTransformer.collect_incremental_block_keys)
+
+    def test_update_collected_default_incremental(self):
+        # Transformers that don't override collect_incremental collect all their data again.
+        for xblock in self.modulestore.blocks.itervalues():
+            xblock.field_map['edited_on'] = 1
+        TestDefaultIncrementalTransformer.collect_call_count = 0
+        with mock_registered_transformers([TestDefaultIncrementalTransformer()]):
+            self.bs_manager.get_collected()
+            self.modulestore.blocks[3].field_map['edited_on'] = 2
+            self.bs_manager.clear(keep_previous=True)
+            self.bs_manager.update_collected()
+            block_structure = self.bs_manager.get_collected()
+        TestDefaultIncrementalTransformer.assert_collected(block_structure)
+        self.assertEquals(TestDefaultIncrementalTransformer.collect_call_count, 2)
@@ -0,0 +1,65 @@
+"""
+Tests for block_structure/serializer.py
+"""
+import cPickle as pickle
+from nose.plugins.attrib import attr
+from unittest import TestCase
+
+from .. import serializer
+from ..exceptions import BlockStructureSerializationError
+from .benchmark_serializer import create_fixture_block_structure, FIXTURE_TRANSFORMERS, run
+from .helpers import ChildrenMapTestMixin, MockTransformer
+
+
+@attr(shard=2)
+class TestSerializer(ChildrenMapTestMixin, TestCase):
+    """
+    Tests for serializer.serialize and serializer.deserialize
+    """
+    def test_round_trip(self):
+        block_structure = self.create_block_structure(self.DAG_CHILDREN_MAP)
+        # pylint: disable=protected-access
+        block_structure._add_transformer(MockTransformer)
+        for block_key in range(len(self.DAG_CHILDREN_MAP)):
+            block_structure._get_or_create_block(block_key).display_name = u'Block {}'.format(block_key)
+            if block_key % 2:
+                block_structure.set_transformer_block_field(block_key, MockTransformer, 'test', block_key)
+
+        deserialized = serializer.deserialize(0, serializer.serialize(block_structure))
+        self.assert_block_structure(deserialized, self.DAG_CHILDREN_MAP)
+        self.assertEquals(deserialized._get_transformer_data_version(MockTransformer), MockTransformer.VERSION)
+        for block_key in range(len(self.DAG_CHILDREN_MAP)):
+            self.assertEquals(deserialized.get_children(block_key), block_structure.get_children(block_key))
+            self.assertEquals(deserialized.get_parents(block_key), block_structure.get_parents(block_key))
+            self.assertEquals(deserialized.get_xblock_field(block_key, 'display_name'), u'Block {}'.format(block_key))
+            self.assertEquals(
+                deserialized.get_transformer_block_field(block_key, MockTransformer, 'test'),
+                block_key if block_key % 2 else None,
+            )
+
+    def test_fixture_course(self):
+        block_structure = create_fixture_block_structure(num_chapters=2)
+        deserialized = serializer.deserialize(
+            block_structure.root_block_usage_key, serializer.serialize(block_structure)
+        )
+        self.assertEquals(set(deserialized), set(block_structure))
+        for block_key in block_structure:
+            self.assertEquals(deserialized.get_children(block_key), block_structure.get_children(block_key))
+            self.assertEquals(
+                deserialized.get_xblock_field(block_key, 'display_name'),
+                block_structure.get_xblock_field(block_key, 'display_name'),
+            )
+            for transformer_name in FIXTURE_TRANSFORMERS:
+                self.assertEquals(
+                    deserialized.get_transformer_block_field(block_key, transformer_name, 'weight'),
+                    block_structure.get_transformer_block_field(block_key, transformer_name, 'weight'),
+                )
+
+    def test_smaller_than_pickle(self):
+        (_, pickle_size, _, _), (_, serializer_size, _, _) = run(num_chapters=2)
+        self.assertLess(serializer_size, pickle_size)
+
+    def test_unsupported_format(self):
+        serialized_data = pickle.dumps((serializer.FORMAT_VERSION + 1,), pickle.HIGHEST_PROTOCOL)
+        with self.assertRaises(BlockStructureSerializationError):
+            serializer.deserialize(0, serialized_data)
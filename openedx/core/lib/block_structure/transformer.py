@@ -28,6 +28,11 @@ class BlockStructureTransformer(object):
     #
     VERSION = 0
 
+    # Whether the transformer implements collect_incremental, allowing
+    # its previously collected data to be reused for blocks that did not
+    # change since the block structure was last collected.
+    SUPPORTS_INCREMENTAL_COLLECT = False
+
     @classmethod
     def name(cls):
         """
@@ -78,6 +83,33 @@ class BlockStructureTransformer(object):
         """
         pass
 
+    @classmethod
+    def collect_incremental(cls, block_structure, block_keys):
+        """
+        Collects the same data as the collect method, but only needs to
+        do so for the blocks identified by block_keys: the blocks that
+        changed since the block structure was last collected, along with
+        their ancestors.  Before this method is called, the transformer's
+        data previously collected for all other blocks, as well as its
+        non-block-specific data, is copied into the block_structure.
+
+        This method is only called if SUPPORTS_INCREMENTAL_COLLECT is
+        True.  A transformer should only support incremental collection
+        if the data it collects for a block depends only on the block
+        itself and its descendants, or if this method recollects any data
+        that depends on other blocks.  By default, all the data is
+        collected again with the collect method.
+
+        Arguments:
+            block_structure (BlockStructureModulestoreData) - A mutable
+                block structure that is to be modified with collected
+                data to be cached for the transformer.
+
+            block_keys (set(UsageKey)) - The usage keys of the blocks
+                whose data is to be collected.
+        """
+        cls.collect(block_structure)
+
     @abstractmethod
     def transform(self, usage_info, block_structure):
         """
@@ -4,6 +4,7 @@ Module for a collection of BlockStructureTransformers.
 import functools
 from logging import getLogger
 
+from .block_structure import EDITED_ON_FIELD_NAME
 from .exceptions import TransformerException
 from .transformer import FilteringTransformerMixin
 from .transformer_registry import TransformerRegistry
@@ -71,16 +72,42 @@ class BlockStructureTransformers(object):
         return self
 
     @classmethod
-    def collect(cls, block_structure):
+    def collect(cls, block_structure, previous_block_structure=None):
         """
         Collects data for each registered transformer.
+
+        If previous_block_structure, a previously collected block structure
+        for the same root, is provided and its data isn't outdated, the data
+        of transformers that support incremental collection is only
+        recollected for the blocks that changed since then, along with their
+        ancestors.
         """
+        # pylint: disable=protected-access
+        block_keys_to_recollect = None
+        if previous_block_structure is not None and not cls.is_collected_outdated(previous_block_structure):
+            block_keys_to_recollect = block_structure._get_blocks_to_recollect(previous_block_structure)
+            logger.info(
+                "Incrementally collecting BlockStructure %s, changed blocks and ancestors: %d of %d.",
+                block_structure.root_block_usage_key,
+                len(block_keys_to_recollect),
+                len(block_structure),
+            )
+
         for transformer in TransformerRegistry.get_registered_transformers():
-            block_structure._add_transformer(transformer)  # pylint: disable=protected-access
-            transformer.collect(block_structure)
+            if block_keys_to_recollect is not None and transformer.SUPPORTS_INCREMENTAL_COLLECT:
+                block_structure._copy_transformer_data(
+                    previous_block_structure, transformer, block_keys_to_recollect
+                )
+                block_structure._add_transformer(transformer)
+                transformer.collect_incremental(block_structure, block_keys_to_recollect)
+            else:
+                block_structure._add_transformer(transformer)
+                transformer.collect(block_structure)
 
-        # Collect all fields that were requested by the transformers.
-        block_structure._collect_requested_xblock_fields()  # pylint: disable=protected-access
+        # Collect all fields that were requested by the transformers, as
+        # well as the field used for detecting changed blocks.
+        block_structure.request_xblock_fields(EDITED_ON_FIELD_NAME)
+        block_structure._collect_requested_xblock_fields()
 
     @classmethod
     def is_collected_outdated(cls, block_structure):